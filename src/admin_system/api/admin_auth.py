@@ -16,7 +16,7 @@ from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.app_context import ConfigLoader
+from core.providers import get_configuration_provider
 from core.database import get_db_session
 from core.models.admin_user import AdminUser
 
@@ -68,8 +68,7 @@ class MeResponse(BaseModel):
 
 def _get_jwt_config() -> tuple[str, str, int]:
     """Get JWT configuration from environment."""
-    loader = ConfigLoader()
-    loader.load()
+    loader = get_configuration_provider()
     return (
         loader.get("security.jwt_secret_key", ""),
         loader.get("security.jwt_algorithm", "HS256"),
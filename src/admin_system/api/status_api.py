@@ -8,6 +8,12 @@ import platform
 from fastapi import APIRouter
 import psutil
 
+from core.line_dedup import get_line_event_deduplicator
+from core.line_dispatch import get_line_dispatch_stats
+from core.logging_config import get_logging_stats
+from core.outbox import get_outbox_dispatcher
+from core.services.email_queue import get_email_queue
+
 if TYPE_CHECKING:
     from core.app_context import AppContext
     from core.registry import ModuleRegistry
@@ -96,7 +102,8 @@ async def get_system_info() -> Dict[str, Any]:
             "used": disk.used,
             "free": disk.free,
             "percent": disk.percent
-        }
+        },
+        "logging": get_logging_stats()
     }
 
 
@@ -120,6 +127,62 @@ async def get_modules() -> Dict[str, List[Dict[str, Any]]]:
     return {"modules": modules_info}
 
 
+@router.get("/startup")
+async def get_startup_profile() -> Dict[str, Any]:
+    """
+    Get per-module startup timings (import, on_entry, async_startup).
+    
+    Returns:
+        JSON with module timings, slowest first
+    """
+    if not _registry:
+        return {"modules": [], "total_ms": 0.0}
+    return _registry.get_startup_report()
+
+
+@router.get("/line/queues")
+async def get_line_queues() -> Dict[str, Any]:
+    """
+    Get LINE webhook event queue metrics per module.
+    
+    Returns:
+        JSON with queue depth, throughput and rejection counters,
+        plus redelivery deduplication counters
+    """
+    return {
+        "queues": get_line_dispatch_stats(),
+        "dedup": get_line_event_deduplicator().get_stats(),
+    }
+
+
+@router.get("/email/queue")
+async def get_email_queue_stats() -> Dict[str, Any]:
+    """
+    Get outbound email queue metrics.
+    
+    Returns:
+        JSON with queue depth and sent / failed / retry counters
+    """
+    return get_email_queue().get_stats()
+
+
+@router.get("/outbox")
+async def get_outbox_stats() -> Dict[str, Any]:
+    """
+    Get notification outbox delivery metrics.
+    
+    Returns:
+        JSON with delivery counters, throughput, lag and pending backlog
+    """
+    dispatcher = get_outbox_dispatcher()
+    stats = dispatcher.get_stats()
+    try:
+        stats.update(await dispatcher.get_backlog())
+    except Exception as e:
+        stats["backlog_error"] = str(e)
+    return stats
+
+
 @router.get("/logs")
 async def get_logs(limit: int = 100) -> Dict[str, List[str]]:
     """
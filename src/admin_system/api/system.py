@@ -4,17 +4,29 @@ System API.
 Provides system status, logs, and module information for the web dashboard.
 """
 
+import asyncio
+import json
+import logging
 import time
 from datetime import datetime, timezone
-from typing import Annotated, Any
+from typing import Annotated, Any, AsyncIterator
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.admin_auth import CurrentAdmin
 from core.app_context import AppContext
+from core.database import get_db_session
+from core.dependencies import LogDep
+from core.event_stream import StreamEvent, encode_comment, get_event_broadcaster
+from core.health_monitor import HealthMonitor, HealthSnapshot, get_health_monitor
+from core.providers import EventLogEntry, LogService, get_log_service
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/system", tags=["System"])
 
 
@@ -48,8 +60,11 @@ class SystemStatusResponse(BaseModel):
 class LogEntry(BaseModel):
     """Single log entry."""
 
+    id: int
     message: str
     timestamp: str | None = None
+    level: str = "INFO"
+    source: str = ""
 
 
 class LogsResponse(BaseModel):
@@ -57,6 +72,7 @@ class LogsResponse(BaseModel):
 
     logs: list[LogEntry]
     total: int
+    next_cursor: int | None = None
 
 
 class ModuleInfo(BaseModel):
@@ -85,6 +101,8 @@ class ServiceHealth(BaseModel):
     status: str
     message: str = ""
     details: dict[str, str] = {}
+    checked_at: str | None = None
+    age_seconds: float | None = None
 
 
 class DashboardResponse(BaseModel):
@@ -135,6 +153,94 @@ def get_registry() -> Any:
     return _registry
 
 
+# -----------------------------------------------------------------------------
+# Health Checks
+# -----------------------------------------------------------------------------
+
+SYSTEM_LINE_BOT = "System LINE Bot"
+
+
+def configure_health_checks(app: Any) -> HealthMonitor:
+    """
+    Register the dashboard health checks (Ragic, module LINE bots, system bot).
+
+    LINE clients are created once here and reused by every probe instead of
+    opening a new HTTP client per dashboard refresh.
+
+    Args:
+        app: FastAPI application (provides the shared HTTP client for Ragic).
+
+    Returns:
+        The configured HealthMonitor.
+    """
+    from core.line_client import LineClient
+    from core.ragic.service import create_ragic_service
+
+    monitor = get_health_monitor()
+
+    async def check_ragic() -> dict:
+        return await create_ragic_service(app.state.http_client).check_connection()
+
+    monitor.register("Ragic", check_ragic)
+
+    registry = get_registry()
+    if registry is not None:
+        for module in registry.get_all_modules():
+            line_config = module.get_line_bot_config()
+            if line_config:
+                module_client = LineClient(
+                    channel_secret=line_config.get("channel_secret"),
+                    access_token=line_config.get("channel_access_token"),
+                )
+                monitor.register(
+                    f"LINE Bot ({module.get_module_name().capitalize()})",
+                    module_client.check_connection,
+                    close=module_client.close,
+                )
+
+    # System-wide bot, checked only if globally configured
+    system_client = LineClient(config=get_app_context().config)
+    if system_client.is_configured():
+        monitor.register(
+            SYSTEM_LINE_BOT, system_client.check_connection, close=system_client.close
+        )
+
+    return monitor
+
+
+def _services_from_snapshots(snapshots: list[HealthSnapshot]) -> list[ServiceHealth]:
+    """Convert snapshots to ServiceHealth, dropping the system bot if a module shares it."""
+    module_bot_ids = {
+        s.details.get("Bot ID")
+        for s in snapshots
+        if s.name != SYSTEM_LINE_BOT and s.details.get("Bot ID")
+    }
+
+    services = []
+    for snapshot in snapshots:
+        if snapshot.name == SYSTEM_LINE_BOT and snapshot.details.get("Bot ID") in module_bot_ids:
+            continue
+        services.append(ServiceHealth(
+            name=snapshot.name,
+            status=snapshot.status,
+            message=snapshot.message,
+            details=snapshot.details,
+            checked_at=datetime.fromtimestamp(snapshot.checked_at, tz=timezone.utc).isoformat(),
+            age_seconds=round(snapshot.age_seconds, 1),
+        ))
+    return services
+
+
+async def start_health_prober(app: Any) -> None:
+    """Configure the health checks and start the background prober (app startup)."""
+    configure_health_checks(app).start()
+
+
+async def stop_health_prober() -> None:
+    """Stop the background prober and close its clients (app shutdown)."""
+    await get_health_monitor().stop()
+
+
 # -----------------------------------------------------------------------------
 # Endpoints
 # -----------------------------------------------------------------------------
@@ -174,47 +280,32 @@ async def get_system_status(
 @router.get("/logs", response_model=LogsResponse)
 async def get_system_logs(
     admin: CurrentAdmin,
+    log: LogDep,
     limit: Annotated[int, Query(ge=1, le=500)] = 100,
-    offset: Annotated[int, Query(ge=0)] = 0,
+    before: Annotated[int | None, Query(ge=1)] = None,
+    level: Annotated[str | None, Query()] = None,
 ) -> LogsResponse:
     """
-    Get recent system logs.
+    Get recent system logs, newest first.
 
     Requires: Admin authentication
 
     Args:
         limit: Maximum number of logs to return (1-500)
-        offset: Number of logs to skip
+        before: Cursor from a previous page's `next_cursor`
+        level: Comma-separated levels to include (e.g., "WARNING,ERROR")
 
     Returns:
-        List of log entries
+        List of log entries and the cursor for the next (older) page
     """
-    context = get_app_context()
-    all_logs = context.get_event_log()
-
-    # Apply pagination (reverse order - newest first)
-    reversed_logs = list(reversed(all_logs))
-    paginated = reversed_logs[offset : offset + limit]
-
-    entries = []
-    for log_line in paginated:
-        # Parse log format: [HH:MM:SS] [LEVEL] message
-        # Extract timestamp if present
-        timestamp = None
-        message = log_line
-
-        if log_line.startswith("["):
-            try:
-                # Find closing bracket for timestamp
-                ts_end = log_line.index("]", 1)
-                timestamp = log_line[1:ts_end]
-                message = log_line[ts_end + 1 :].strip()
-            except ValueError:
-                pass
+    levels = {lvl.strip().upper() for lvl in level.split(",") if lvl.strip()} if level else None
+    page, next_cursor = log.get_entries(limit=limit, before=before, levels=levels)
 
-        entries.append(LogEntry(message=message, timestamp=timestamp))
-
-    return LogsResponse(logs=entries, total=len(all_logs))
+    return LogsResponse(
+        logs=[_log_entry_model(entry) for entry in page],
+        total=len(log),
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/modules", response_model=ModulesResponse)
@@ -274,7 +365,8 @@ async def get_dashboard_data(
     
     This endpoint aggregates:
     - Server status and uptime
-    - Core service health (Ragic, LINE)
+    - Core service health (Ragic, LINE), served from cached snapshots
+      with their age
     - All module statuses with details
     
     Requires: Admin authentication
@@ -282,6 +374,11 @@ async def get_dashboard_data(
     Returns:
         Complete dashboard data for rendering status cards
     """
+    return await _build_dashboard(request.app)
+
+
+async def _build_dashboard(app: Any) -> DashboardResponse:
+    """Assemble dashboard data (shared by the endpoint and the event stream)."""
     context = get_app_context()
     registry = get_registry()
     
@@ -298,102 +395,11 @@ async def get_dashboard_data(
         started_at=started_at,
     )
     
-    # Core services health check
-    services: list[ServiceHealth] = []
-    
-    # Check Ragic (requires HTTP client from request)
-    try:
-        from core.ragic.service import create_ragic_service
-        http_client = request.app.state.http_client
-        ragic_service = create_ragic_service(http_client)
-        ragic_health = await ragic_service.check_connection()
-        services.append(ServiceHealth(
-            name="Ragic",
-            status=ragic_health.get("status", "error"),
-            message=ragic_health.get("message", ""),
-            details=ragic_health.get("details", {}),
-        ))
-    except Exception as e:
-        services.append(ServiceHealth(
-            name="Ragic",
-            status="error",
-            message="Service unavailable",
-            details={"Error": str(e)[:50]},
-        ))
-    
-    # Check LINE Bots from Modules
-    if registry is not None:
-        for module in registry.get_all_modules():
-            line_config = module.get_line_bot_config()
-            if line_config:
-                module_name = module.get_module_name().capitalize()
-                service_name = f"LINE Bot ({module_name})"
-                
-                try:
-                    from core.line_client import LineClient
-                    # Create dedicated client for this module
-                    mod_line_client = LineClient(
-                        channel_secret=line_config.get("channel_secret"),
-                        access_token=line_config.get("channel_access_token")
-                    )
-                    
-                    line_health = await mod_line_client.check_connection()
-                    services.append(ServiceHealth(
-                        name=service_name,
-                        status=line_health.get("status", "error"),
-                        message=line_health.get("message", ""),
-                        details=line_health.get("details", {}),
-                    ))
-                    await mod_line_client.close()
-                    
-                except Exception as e:
-                    services.append(ServiceHealth(
-                        name=service_name,
-                        status="error",
-                        message="Service unavailable",
-                        details={"Error": str(e)[:50]},
-                    ))
-
-    # Check Core/Admin LINE Bot (if configured globally and distinct)
-    # This covers cases where there might be a system-wide bot not tied to a specific module
-    # or if the Administrative module uses the global config but we want to fail-safe check it.
-    try:
-        from core.line_client import LineClient
-        # Use global config provider
-        line_client = LineClient(config=context.config)
-        
-        # Only check if globally configured
-        if line_client.is_configured():
-            # Check if this global bot is already covered by a module to avoid duplicates
-            # (Simple heuristic: compare channel secret if possible, or just append distinct name)
-            # Since we can't easily peek secrets, we'll name it "System LINE Bot"
-            # It might duplicate "LINE Bot (Administrative)" if they share configs, 
-            # but that's acceptable for visibility.
-            
-            line_health = await line_client.check_connection()
-            
-            # Check for duplicates by Bot ID if available
-            bot_id = line_health.get("details", {}).get("Bot ID")
-            is_duplicate = False
-            for s in services:
-                if s.details.get("Bot ID") == bot_id:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                services.append(ServiceHealth(
-                    name="System LINE Bot",
-                    status=line_health.get("status", "error"),
-                    message=line_health.get("message", ""),
-                    details=line_health.get("details", {}),
-                ))
-            
-            await line_client.close()
-            
-    except Exception as e:
-         # Only report error if we expected a system bot but it failed
-         # If not configured, we ignore
-         pass
+    # Core services health (cached snapshots, refreshed by the background prober)
+    monitor = get_health_monitor()
+    if not monitor.has_checks:
+        configure_health_checks(app)
+    services = _services_from_snapshots(await monitor.get_snapshots())
     
     # Module statuses
     modules_info: list[ModuleInfo] = []
@@ -422,3 +428,174 @@ async def get_dashboard_data(
         services=services,
         modules=modules_info,
     )
+
+
+# -----------------------------------------------------------------------------
+# Event Stream
+# -----------------------------------------------------------------------------
+
+STREAM_HEARTBEAT_SECONDS = 15.0
+STATUS_PUBLISH_INTERVAL = 2.0
+
+_status_task: asyncio.Task | None = None
+_last_status_fingerprint: str | None = None
+
+
+def _log_entry_model(entry: EventLogEntry) -> LogEntry:
+    return LogEntry(
+        id=entry.seq,
+        message=entry.message,
+        timestamp=f"{entry.timestamp:%H:%M:%S}",
+        level=entry.level,
+        source=entry.source,
+    )
+
+
+def _log_event(entry: EventLogEntry) -> StreamEvent:
+    return StreamEvent("log", _log_entry_model(entry).model_dump(), id=str(entry.seq))
+
+
+def _forward_log_entry(entry: EventLogEntry) -> None:
+    """LogService listener: fan the entry out to all open streams."""
+    broadcaster = get_event_broadcaster()
+    if broadcaster.subscriber_count:
+        broadcaster.publish(_log_event(entry))
+
+
+def _status_fingerprint(dashboard: DashboardResponse) -> str:
+    """Hash of the dashboard without fields that change on every build."""
+    data = dashboard.model_dump(
+        exclude={"server": {"uptime_seconds"}, "services": {"__all__": {"age_seconds"}}},
+    )
+    return json.dumps(data, sort_keys=True, default=str)
+
+
+async def _status_event(app: Any) -> StreamEvent:
+    dashboard = await _build_dashboard(app)
+    return StreamEvent("status", dashboard.model_dump())
+
+
+async def _publish_status_changes(app: Any) -> None:
+    """Build the dashboard once per interval and publish it only when it changed."""
+    global _last_status_fingerprint
+    broadcaster = get_event_broadcaster()
+    while True:
+        await asyncio.sleep(STATUS_PUBLISH_INTERVAL)
+        if not broadcaster.subscriber_count:
+            _last_status_fingerprint = None
+            continue
+        try:
+            dashboard = await _build_dashboard(app)
+        except Exception as e:
+            logger.warning(f"Dashboard status build failed: {e}")
+            continue
+        fingerprint = _status_fingerprint(dashboard)
+        if fingerprint != _last_status_fingerprint:
+            _last_status_fingerprint = fingerprint
+            broadcaster.publish(StreamEvent("status", dashboard.model_dump()))
+
+
+async def start_event_stream(app: Any) -> None:
+    """Forward event log entries and status changes to SSE clients (app startup)."""
+    global _status_task
+    get_log_service().add_listener(_forward_log_entry)
+    if _status_task is None or _status_task.done():
+        _status_task = asyncio.create_task(
+            _publish_status_changes(app), name="DashboardStatusPublisher"
+        )
+
+
+async def stop_event_stream() -> None:
+    """Stop the status publisher (app shutdown)."""
+    global _status_task
+    get_log_service().remove_listener(_forward_log_entry)
+    if _status_task is not None:
+        _status_task.cancel()
+        try:
+            await _status_task
+        except asyncio.CancelledError:
+            pass
+        _status_task = None
+
+
+async def stream_events(
+    request: Request,
+    log: LogService,
+    after: int | None = None,
+) -> AsyncIterator[str]:
+    """
+    Yield SSE frames: missed log entries, the current status, then live events.
+
+    Args:
+        request: Incoming request (for disconnect detection).
+        log: Event log service.
+        after: Last log entry id the client has seen; None streams only new entries.
+    """
+    subscription = get_event_broadcaster().subscribe()
+    try:
+        # Subscribe before replaying so nothing falls between the two
+        cursor = after if after is not None else log.last_seq
+        for entry in log.get_entries_since(cursor):
+            yield _log_event(entry).encode()
+            cursor = entry.seq
+        yield (await _status_event(request.app)).encode()
+
+        while True:
+            if subscription.overflowed:
+                # Client fell behind: resync from the ring buffer and current status
+                subscription.drain()
+                for entry in log.get_entries_since(cursor):
+                    yield _log_event(entry).encode()
+                    cursor = entry.seq
+                yield (await _status_event(request.app)).encode()
+                continue
+
+            event = await subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+            if event is None:
+                if await request.is_disconnected():
+                    break
+                yield encode_comment()
+                continue
+
+            if event.event == "log":
+                seq = int(event.id)
+                if seq <= cursor:
+                    continue
+                cursor = seq
+            yield event.encode()
+    finally:
+        subscription.close()
+
+
+@router.get("/events")
+async def stream_system_events(
+    request: Request,
+    admin: CurrentAdmin,
+    db: Annotated[AsyncSession, Depends(get_db_session)],
+    log: LogDep,
+    last_event_id: Annotated[int | None, Header(alias="Last-Event-ID")] = None,
+    after: Annotated[int | None, Query(ge=0)] = None,
+) -> StreamingResponse:
+    """
+    Stream event log entries and dashboard status changes (Server-Sent Events).
+
+    Requires: Admin authentication
+
+    Events:
+        log: A new event log entry (id = entry id, usable as resume cursor)
+        status: Dashboard data, sent on connect and whenever it changes
+
+    Args:
+        last_event_id: Resume cursor sent by reconnecting clients
+        after: Resume cursor as a query parameter (overrides the header)
+    """
+    # The admin lookup is done; release the pooled connection for the
+    # lifetime of the stream
+    await db.close()
+    log.add_listener(_forward_log_entry)
+
+    return StreamingResponse(
+        stream_events(request, log, after if after is not None else last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
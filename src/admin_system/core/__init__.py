@@ -21,11 +21,14 @@ from core.http_client import (
 # Dependency Injection Providers
 from core.providers import (
     ConfigurationProvider,
+    EventLogEntry,
     LogService,
     ServerState,
     ServiceProvider,
     ProviderRegistry,
     get_configuration_provider,
+    reload_configuration_provider,
+    register_config_reload_hook,
     get_settings,
     get_log_service,
     get_line_client,
@@ -85,8 +88,9 @@ __all__ = [
     "get_http_client_from_app",
     # New DI exports
     "IModuleContext", "get_app_context", "IConfigurable", "ILoggable", "ModuleContext",
-    "ConfigurationProvider", "LogService", "ServerState", "ServiceProvider", "ProviderRegistry",
-    "get_configuration_provider", "get_settings", "get_log_service",
+    "ConfigurationProvider", "EventLogEntry", "LogService", "ServerState", "ServiceProvider", "ProviderRegistry",
+    "get_configuration_provider", "reload_configuration_provider", "register_config_reload_hook",
+    "get_settings", "get_log_service",
     "get_line_client", "get_server_state", "get_provider_registry",
     # FastAPI Dependencies
     "ConfigDep", "DbSessionDep", "LogDep",
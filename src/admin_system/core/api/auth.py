@@ -12,15 +12,16 @@ Framework-First Authentication:
 
 import logging
 import os
-from pathlib import Path
 from typing import Annotated
 
 from dotenv import load_dotenv  # 新增：確保 .env 被載入
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.app_context import ConfigLoader
+from core.api.templates import RenderedPage, get_template_cache
+from core.providers import get_configuration_provider
+from core.static_assets import if_none_match
 from core.database import get_db_session
 from core.schemas.auth import (
     MagicLinkRequest,
@@ -113,8 +114,7 @@ def _get_liff_id_for_app(app_context: str | None) -> str:
 
 def _get_app_config() -> dict:
     """Get application configuration."""
-    loader = ConfigLoader()
-    loader.load()
+    loader = get_configuration_provider()
     return {
         "app_name": loader.get("server.app_name", "Admin System"),
         "magic_link_expire_minutes": loader.get("security.magic_link_expire_minutes", 15),
@@ -125,15 +125,12 @@ def _get_app_config() -> dict:
 # Static HTML Template Engine
 # =============================================================================
 
-def _get_template_path(template_name: str) -> Path:
-    """Get the path to a template file."""
-    return Path(__file__).parent.parent / "static" / "auth" / template_name
-
-
 def _render_template(template_name: str, variables: dict[str, str]) -> str:
     """
     Render an HTML template with variable substitution.
     
+    Templates are compiled once and cached (see core.api.templates).
+    
     Args:
         template_name: Name of the template file (e.g., 'login.html')
         variables: Dictionary of {{VARIABLE}} -> value mappings
@@ -141,20 +138,24 @@ def _render_template(template_name: str, variables: dict[str, str]) -> str:
     Returns:
         Rendered HTML string
     """
-    template_path = _get_template_path(template_name)
-    
-    if not template_path.exists():
-        raise FileNotFoundError(f"Template not found: {template_path}")
-    
-    content = template_path.read_text(encoding="utf-8")
-    
-    for key, value in variables.items():
-        placeholder = "{{" + key + "}}"
-        # Ensure value is not None before replacing
-        safe_value = str(value) if value is not None else ""
-        content = content.replace(placeholder, safe_value)
+    return get_template_cache().render(template_name, variables)
+
+
+def _cached_page_response(request: Request, page: RenderedPage) -> Response:
+    """
+    Build a response for a pre-rendered page with ETag revalidation.
     
-    return content
+    Browsers may keep the page but must revalidate, so a LIFF ID change is
+    picked up on the next load; unchanged pages are answered with 304.
+    """
+    headers = {"ETag": page.etag, "Cache-Control": "no-cache"}
+    if if_none_match(request.headers.get("if-none-match"), page.etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=page.content, headers=headers)
+
+
+# Verify-result pages embed the magic link token and must never be cached
+_NO_STORE_HEADERS = {"Cache-Control": "no-store"}
 
 
 # =============================================================================
@@ -318,8 +319,9 @@ def get_verification_result_html(success: bool, message: str, app_context: str |
 
 @router.get("/page/login", response_class=HTMLResponse)
 async def get_login_page(
+    request: Request,
     app: Annotated[str | None, Query(description="App context for LIFF ID selection")] = None,
-) -> HTMLResponse:
+) -> Response:
     """
     Serve the unified login page with LIFF ID injection.
     
@@ -330,7 +332,7 @@ async def get_login_page(
         app: App context name (e.g., 'admin', 'chatbot'). Determines which LIFF ID to use.
         
     Returns:
-        HTMLResponse with the rendered login page
+        HTMLResponse with the rendered login page (or 304 if unchanged)
     """
     config = _get_app_config()
     app_context = app or "default"
@@ -343,13 +345,13 @@ async def get_login_page(
         logger.error(f"CRITICAL: No LIFF ID configured for app context: {app_context}. Login will fail.")
     
     try:
-        html_content = _render_template("login.html", {
+        page = get_template_cache().render_page("login.html", {
             "LIFF_ID": liff_id,
             "APP_CONTEXT": app_context,
             "APP_NAME": config["app_name"],
             "EXPIRE_MINUTES": str(config["magic_link_expire_minutes"]),
         })
-        return HTMLResponse(content=html_content)
+        return _cached_page_response(request, page)
     except FileNotFoundError as e:
         logger.error(f"Login template not found: {e}")
         return HTMLResponse(content=get_login_html("", error="系統錯誤：找不到登入頁面模板"), status_code=500)
@@ -377,7 +379,7 @@ async def get_verify_result_page(
             "APP_NAME": config["app_name"],
             "TOKEN": token or "",
         })
-        return HTMLResponse(content=html_content)
+        return HTMLResponse(content=html_content, headers=_NO_STORE_HEADERS)
     except FileNotFoundError as e:
         logger.error(f"Verify result template not found: {e}")
         return HTMLResponse(
@@ -428,7 +430,7 @@ async def request_magic_link(
         return HTMLResponse(content=get_login_html(line_sub, error="請填寫電子郵件"), status_code=400)
 
     try:
-        await auth_service.initiate_magic_link(email, line_sub, app_context=app_context)
+        await auth_service.initiate_magic_link(email, line_sub, app_context=app_context, db=db)
         return HTMLResponse(content=get_login_html(line_sub, success=f"驗證連結已發送至 {email}"))
     except EmailNotFoundError as e:
         return HTMLResponse(content=get_login_html(line_sub, error=str(e)), status_code=400)
@@ -469,7 +471,7 @@ async def verify_magic_link(
             "APP_NAME": config["app_name"],
             "TOKEN": token_val,
         })
-        return HTMLResponse(content=html_content)
+        return HTMLResponse(content=html_content, headers=_NO_STORE_HEADERS)
     except FileNotFoundError as e:
         logger.error(f"Verify result template not found: {e}")
         return HTMLResponse(content="System Error: Template not found", status_code=500)
@@ -491,7 +493,8 @@ async def api_request_magic_link(
         await auth_service.initiate_magic_link(
             request_data.email, 
             request_data.line_sub,
-            app_context=app_context
+            app_context=app_context,
+            db=db,
         )
         return MagicLinkResponse(message="Verification email sent", email_sent_to=request_data.email)
     except EmailNotFoundError as e:
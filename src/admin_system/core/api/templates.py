@@ -0,0 +1,209 @@
+"""
+Static HTML Template Cache.
+
+Serves the framework auth pages (`core/static/auth/*.html`) without touching
+the disk on each request:
+
+    - Templates are read once and pre-split into literal / `{{PLACEHOLDER}}`
+      segments, so rendering is a single `str.join`.
+    - Pages whose variables do not vary per request (e.g., the login page for
+      a given LIFF app context) are cached fully rendered together with an
+      ETag, so repeat requests cost a dict lookup.
+    - In debug mode (`app.debug`), template files are re-checked by mtime so
+      edits show up without restarting the server.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping
+
+from core.providers import get_configuration_provider
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "static" / "auth"
+
+_PLACEHOLDER_RE = re.compile(r"\{\{([A-Za-z0-9_]+)\}\}")
+
+
+class CompiledTemplate:
+    """
+    An HTML template pre-split into literal and placeholder segments.
+
+    `segments` alternates literal text and placeholder names:
+    [literal, name, literal, name, ..., literal].
+    """
+
+    def __init__(self, name: str, source: str, mtime: float = 0.0) -> None:
+        self.name = name
+        self.mtime = mtime
+        self.segments: list[str] = _PLACEHOLDER_RE.split(source)
+
+    @property
+    def placeholders(self) -> frozenset[str]:
+        """Names of all placeholders in the template."""
+        return frozenset(self.segments[1::2])
+
+    def render(self, variables: Mapping[str, object]) -> str:
+        """
+        Render the template.
+
+        Placeholders without a matching variable are left untouched and
+        None values render as empty strings.
+        """
+        parts = self.segments[:]
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            if name in variables:
+                value = variables[name]
+                parts[i] = str(value) if value is not None else ""
+            else:
+                parts[i] = "{{" + name + "}}"
+        return "".join(parts)
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    """A fully rendered page with its validator."""
+
+    content: str
+    etag: str
+
+
+def _make_etag(content: str) -> str:
+    return '"' + hashlib.sha256(content.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+class TemplateCache:
+    """
+    Cache of compiled templates and pre-rendered pages.
+    """
+
+    DEFAULT_MAX_RENDERED = 256
+
+    def __init__(
+        self,
+        directory: Path = TEMPLATE_DIR,
+        auto_reload: bool = False,
+        max_rendered: int = DEFAULT_MAX_RENDERED,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory containing the HTML templates.
+            auto_reload: Re-read templates whose file mtime changed (debug mode).
+            max_rendered: Maximum number of pre-rendered pages kept.
+        """
+        self._directory = directory
+        self._auto_reload = auto_reload
+        self._max_rendered = max_rendered
+        self._templates: dict[str, CompiledTemplate] = {}
+        # (template name, template mtime, variables) -> RenderedPage
+        self._rendered: OrderedDict[tuple, RenderedPage] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, name: str) -> CompiledTemplate:
+        path = self._directory / name
+        try:
+            mtime = path.stat().st_mtime
+            source = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Template not found: {path}") from None
+        logger.debug(f"Compiled template {name}")
+        return CompiledTemplate(name, source, mtime)
+
+    def get(self, name: str) -> CompiledTemplate:
+        """
+        Get a compiled template, loading it on first use.
+
+        Raises:
+            FileNotFoundError: If the template file does not exist.
+        """
+        template = self._templates.get(name)
+        if template is not None and self._auto_reload:
+            try:
+                if (self._directory / name).stat().st_mtime != template.mtime:
+                    template = None
+            except FileNotFoundError:
+                template = None
+
+        if template is None:
+            template = self._load(name)
+            with self._lock:
+                self._templates[name] = template
+        return template
+
+    def preload(self) -> int:
+        """
+        Compile every HTML template in the directory.
+
+        Returns:
+            Number of templates compiled.
+        """
+        count = 0
+        for path in sorted(self._directory.glob("*.html")):
+            self.get(path.name)
+            count += 1
+        return count
+
+    def render(self, name: str, variables: Mapping[str, object]) -> str:
+        """Render a template with per-request variables (not cached)."""
+        return self.get(name).render(variables)
+
+    def render_page(self, name: str, variables: Mapping[str, object]) -> RenderedPage:
+        """
+        Render a template and cache the result by its variables.
+
+        Use only for pages without per-request data (no tokens or user IDs),
+        since every distinct variable set occupies a cache slot.
+        """
+        template = self.get(name)
+        key = (name, template.mtime, tuple(sorted(variables.items())))
+
+        with self._lock:
+            page = self._rendered.get(key)
+            if page is not None:
+                self._rendered.move_to_end(key)
+                return page
+
+        content = template.render(variables)
+        page = RenderedPage(content=content, etag=_make_etag(content))
+
+        with self._lock:
+            self._rendered[key] = page
+            while len(self._rendered) > self._max_rendered:
+                self._rendered.popitem(last=False)
+        return page
+
+    def clear(self) -> None:
+        """Drop all compiled templates and rendered pages."""
+        with self._lock:
+            self._templates.clear()
+            self._rendered.clear()
+
+
+# Singleton
+_template_cache: TemplateCache | None = None
+
+
+def get_template_cache() -> TemplateCache:
+    """Get singleton TemplateCache instance (auto-reloads in debug mode)."""
+    global _template_cache
+    if _template_cache is None:
+        _template_cache = TemplateCache(
+            auto_reload=bool(get_configuration_provider().get("app.debug", False)),
+        )
+    return _template_cache
+
+
+def reset_template_cache() -> None:
+    """Reset singleton (for testing)."""
+    global _template_cache
+    _template_cache = None
+
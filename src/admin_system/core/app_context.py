@@ -313,14 +313,8 @@ class AppContext:
         context = cls()
         
         if config_overrides:
-            for key, value in config_overrides.items():
-                keys = key.split('.')
-                current = context._config_provider._config
-                for k in keys[:-1]:
-                    if k not in current:
-                        current[k] = {}
-                    current = current[k]
-                current[keys[-1]] = value
+            context._config_provider = context._config_provider.with_overrides(config_overrides)
+            context._server_state.port = context._config_provider.get("server.port", 8000)
         
         return context
 
@@ -6,7 +6,14 @@ Modules should use these components instead of creating their own connections.
 """
 
 from core.database.base import Base, TimestampMixin, UUIDPrimaryKey, CreatedAt, UpdatedAt
-from core.database.engine import get_engine, get_thread_local_engine, dispose_thread_local_engine, close_engine
+from core.database.engine import (
+    get_engine,
+    get_loop_database,
+    get_thread_local_engine,
+    dispose_thread_local_engine,
+    close_engine,
+    get_pool_stats,
+)
 from core.database.session import (
     get_session_factory,
     get_db_session,
@@ -26,9 +33,11 @@ __all__ = [
     "UpdatedAt",
     # Engine
     "get_engine",
+    "get_loop_database",
     "get_thread_local_engine",
     "dispose_thread_local_engine",
     "close_engine",
+    "get_pool_stats",
     # Session
     "get_session_factory",
     "get_db_session",
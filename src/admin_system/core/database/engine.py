@@ -2,7 +2,7 @@
 Database Engine Management Module.
 
 Provides a singleton AsyncEngine for the entire application.
-Uses configuration from core.app_context.ConfigLoader.
+Uses configuration from core.providers.get_configuration_provider().
 
 SSL Configuration:
     DATABASE_SSL_MODE controls SSL behavior:
@@ -12,23 +12,71 @@ SSL Configuration:
     - "disable": No SSL (only for local development)
     
     DATABASE_SSL_CERT_PATH: Path to CA certificate file (required for verify-full mode)
+
+Background Event Loops:
+    asyncpg connections are bound to the event loop that created them, so
+    background threads running their own loop (RagicSyncWorker, stats
+    updaters) cannot share the main engine. Instead of one engine per
+    thread, engines and their session factories are kept in a per-event-loop
+    registry: every loop gets exactly one small pooled engine that is reused
+    for all work on that loop and disposed together with it. Total
+    background connections are bounded by
+    (number of loops) x (LOOP_POOL_SIZE + LOOP_MAX_OVERFLOW).
 """
 
+import asyncio
 import logging
 import os
 import ssl
 import threading
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+import weakref
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-from core.app_context import ConfigLoader
+from core.providers import get_configuration_provider
 
 _logger = logging.getLogger(__name__)
 
 # Global engine instance (singleton for main thread)
 _engine: AsyncEngine | None = None
 
-# Thread-local storage for background thread engines
-_thread_local = threading.local()
+# Pool sizing for per-loop (background) engines
+LOOP_POOL_SIZE = 2
+LOOP_MAX_OVERFLOW = 3
+LOOP_POOL_RECYCLE = 1800  # seconds
+
+# Soft limit on concurrently registered loop engines (logged when exceeded)
+MAX_LOOP_ENGINES = 8
+
+
+@dataclass
+class LoopDatabase:
+    """Engine and session factory bound to one event loop."""
+
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+
+
+# Per-event-loop registry (entries vanish when the loop is garbage collected)
+_loop_databases: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LoopDatabase]" = (
+    weakref.WeakKeyDictionary()
+)
+_loop_databases_lock = threading.Lock()
+
+# SSL context is built once and shared by all engines
+_ssl_context: ssl.SSLContext | bool | None = None
+_ssl_context_loaded = False
+
+
+def _get_shared_ssl_context() -> ssl.SSLContext | bool | None:
+    """Get the process-wide SSL context (created on first use)."""
+    global _ssl_context, _ssl_context_loaded
+
+    if not _ssl_context_loaded:
+        _ssl_context = _get_ssl_context()
+        _ssl_context_loaded = True
+    return _ssl_context
 
 
 def _get_ssl_context() -> ssl.SSLContext | bool | None:
@@ -108,10 +156,7 @@ def get_engine(debug: bool = False) -> AsyncEngine:
     global _engine
 
     if _engine is None:
-        config_loader = ConfigLoader()
-        config_loader.load()
-        database_url = config_loader.get("database.url", "")
-        # app_debug = config_loader.get("app.debug", False) # Unused variable
+        database_url = get_configuration_provider().get("database.url", "")
 
         _engine = create_async_engine(
             str(database_url),
@@ -120,47 +165,92 @@ def get_engine(debug: bool = False) -> AsyncEngine:
             pool_size=20,  # Increased from 10 for high concurrency (100 users)
             max_overflow=40,  # Increased from 20 for burst traffic
             connect_args={
-                "ssl": _get_ssl_context(),  # Use permissive SSL context
+                "ssl": _get_shared_ssl_context(),  # Use permissive SSL context
             },
         )
 
     return _engine
 
 
-def get_thread_local_engine() -> AsyncEngine:
-    """
-    Get or create a thread-local async database engine.
+def _current_loop() -> asyncio.AbstractEventLoop:
+    """Get the running loop; loop engines can only be used inside one."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        raise RuntimeError(
+            "Loop-bound database engines must be requested from a coroutine "
+            "running on the event loop that will use them"
+        ) from None
 
-    This is specifically designed for background threads that run their own
-    event loops. Each thread gets its own engine to avoid cross-loop issues.
 
-    Returns:
-        AsyncEngine: Thread-local SQLAlchemy async engine instance.
+def get_loop_database() -> LoopDatabase:
+    """
+    Get or create the engine/session factory for the current event loop.
 
-    Example:
-        def background_task():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            engine = get_thread_local_engine()
-            # Use engine with this thread's loop
+    Returns:
+        LoopDatabase: Engine and session factory bound to the current loop.
     """
-    if not hasattr(_thread_local, "engine") or _thread_local.engine is None:
-        config_loader = ConfigLoader()
-        config_loader.load()
-        database_url = config_loader.get("database.url", "")
+    loop = _current_loop()
+
+    with _loop_databases_lock:
+        loop_db = _loop_databases.get(loop)
+        if loop_db is not None:
+            return loop_db
+
+        database_url = get_configuration_provider().get("database.url", "")
 
-        _thread_local.engine = create_async_engine(
+        engine = create_async_engine(
             str(database_url),
             echo=False,
             pool_pre_ping=True,
-            pool_size=2,  # Smaller pool for background threads
-            max_overflow=0,
+            pool_size=LOOP_POOL_SIZE,  # Small pool for background loops
+            max_overflow=LOOP_MAX_OVERFLOW,
+            pool_recycle=LOOP_POOL_RECYCLE,
             connect_args={
-                "ssl": _get_ssl_context(),  # Use permissive SSL context
+                "ssl": _get_shared_ssl_context(),
             },
         )
+        loop_db = LoopDatabase(
+            engine=engine,
+            session_factory=async_sessionmaker(
+                bind=engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autocommit=False,
+                autoflush=False,
+            ),
+        )
+        _loop_databases[loop] = loop_db
+
+        if len(_loop_databases) > MAX_LOOP_ENGINES:
+            _logger.warning(
+                f"{len(_loop_databases)} event-loop database engines registered "
+                f"(soft limit {MAX_LOOP_ENGINES}); background threads may not be "
+                "disposing their engines"
+            )
 
-    return _thread_local.engine
+    return loop_db
+
+
+def get_thread_local_engine() -> AsyncEngine:
+    """
+    Get or create the async database engine for the current event loop.
+
+    This is specifically designed for background threads that run their own
+    event loops. Each loop gets one pooled engine (see get_loop_database),
+    shared by all sessions created on that loop.
+
+    Returns:
+        AsyncEngine: Loop-bound SQLAlchemy async engine instance.
+
+    Example:
+        async def background_task():
+            engine = get_thread_local_engine()
+            # Use engine with this thread's loop
+
+        asyncio.run(background_task())
+    """
+    return get_loop_database().engine
 
 
 async def close_engine() -> None:
@@ -178,11 +268,34 @@ async def close_engine() -> None:
 
 async def dispose_thread_local_engine() -> None:
     """
-    Dispose the thread-local engine if it exists.
+    Dispose the current event loop's engine if it exists.
     
     This must be called before closing the event loop in a background thread
     to ensure all asyncpg connections are closed properly.
     """
-    if hasattr(_thread_local, "engine") and _thread_local.engine is not None:
-        await _thread_local.engine.dispose()
-        _thread_local.engine = None
+    loop = asyncio.get_running_loop()
+
+    with _loop_databases_lock:
+        loop_db = _loop_databases.pop(loop, None)
+
+    if loop_db is not None:
+        await loop_db.engine.dispose()
+
+
+def get_pool_stats() -> dict[str, str]:
+    """
+    Get connection pool status for the main engine and all loop engines.
+
+    Returns:
+        dict: Engine label -> SQLAlchemy pool status string.
+    """
+    stats: dict[str, str] = {}
+    if _engine is not None:
+        stats["main"] = _engine.pool.status()
+
+    with _loop_databases_lock:
+        loop_dbs = list(_loop_databases.values())
+
+    for index, loop_db in enumerate(loop_dbs):
+        stats[f"loop-{index}"] = loop_db.engine.pool.status()
+    return stats
@@ -12,7 +12,7 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from core.database.engine import get_engine, get_thread_local_engine, close_engine
+from core.database.engine import get_engine, get_loop_database, close_engine
 
 
 # Global session factory (initialized lazily)
@@ -94,11 +94,15 @@ async def get_thread_local_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Context manager for database sessions in background threads.
 
-    This creates a session using a thread-local engine, which is required
-    when running async code in a separate thread with its own event loop.
+    This creates a session from the current event loop's pooled engine and
+    cached session factory (see core.database.engine.get_loop_database), which
+    is required when running async code in a separate thread with its own
+    event loop.
 
     IMPORTANT: Only use this in background threads that have their own event loop.
-    For normal async code in the main thread, use get_standalone_session() instead.
+    For normal async code in the main thread (including LINE webhook event
+    handlers), use get_standalone_session() instead so work shares the main
+    connection pool.
 
     Yields:
         AsyncSession: Database session bound to the current thread's engine.
@@ -115,14 +119,7 @@ async def get_thread_local_session() -> AsyncGenerator[AsyncSession, None]:
 
             loop.run_until_complete(do_work())
     """
-    engine = get_thread_local_engine()
-    session_factory = async_sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autocommit=False,
-        autoflush=False,
-    )
+    session_factory = get_loop_database().session_factory
 
     async with session_factory() as session:
         try:
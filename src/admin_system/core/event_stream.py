@@ -0,0 +1,157 @@
+"""
+Server-Sent Events Fan-out.
+
+Open dashboards used to poll the logs and dashboard endpoints every couple
+of seconds, each poll rebuilding a full response. EventBroadcaster instead
+pushes each event once to every subscriber:
+
+    - publish() is thread-safe (LogService is written from worker threads)
+      and never blocks the publisher
+    - Each subscriber has a bounded queue; a client that falls behind is
+      flagged as overflowed instead of growing memory, and the stream
+      handler resynchronizes it from the log ring buffer
+    - Events carry ids so a reconnecting client can resume via the
+      standard `Last-Event-ID` header
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    """A single server-sent event."""
+
+    event: str
+    data: Any
+    id: Optional[str] = None
+
+    def encode(self) -> str:
+        """Encode in text/event-stream wire format."""
+        lines = []
+        if self.id is not None:
+            lines.append(f"id: {self.id}")
+        lines.append(f"event: {self.event}")
+        payload = json.dumps(self.data, ensure_ascii=False, separators=(",", ":"), default=str)
+        lines.extend(f"data: {line}" for line in payload.splitlines() or [""])
+        return "\n".join(lines) + "\n\n"
+
+
+def encode_comment(text: str = "keep-alive") -> str:
+    """Encode an SSE comment (ignored by clients; keeps proxies from timing out)."""
+    return f": {text}\n\n"
+
+
+class Subscription:
+    """
+    A subscriber's bounded event queue, bound to its event loop.
+    """
+
+    def __init__(self, broadcaster: "EventBroadcaster", maxsize: int) -> None:
+        self._broadcaster = broadcaster
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[StreamEvent] = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+        self.closed = False
+
+    def _put(self, event: StreamEvent) -> None:
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def offer(self, event: StreamEvent) -> None:
+        """Queue an event without blocking (callable from any thread)."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(event)
+        else:
+            try:
+                self._loop.call_soon_threadsafe(self._put, event)
+            except RuntimeError:
+                # Subscriber's loop is gone
+                self.close()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[StreamEvent]:
+        """Wait for the next event; returns None on timeout."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def drain(self) -> None:
+        """Drop queued events and clear the overflow flag (before a resync)."""
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self.overflowed = False
+
+    def close(self) -> None:
+        """Unsubscribe."""
+        self.closed = True
+        self._broadcaster._remove(self)
+
+
+class EventBroadcaster:
+    """
+    Publishes events to all current subscribers.
+    """
+
+    DEFAULT_QUEUE_SIZE = 256
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        self._queue_size = queue_size
+        self._subscribers: list[Subscription] = []
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        """Subscribe from the running event loop. Call close() when done."""
+        subscription = Subscription(self, self._queue_size)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def _remove(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def publish(self, event: StreamEvent) -> None:
+        """Send an event to every subscriber (thread-safe, non-blocking)."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.offer(event)
+
+
+# Singleton
+_broadcaster: EventBroadcaster | None = None
+
+
+def get_event_broadcaster() -> EventBroadcaster:
+    """Get singleton EventBroadcaster instance."""
+    global _broadcaster
+    if _broadcaster is None:
+        _broadcaster = EventBroadcaster()
+    return _broadcaster
+
+
+def reset_event_broadcaster() -> None:
+    """Reset singleton (for testing)."""
+    global _broadcaster
+    _broadcaster = None
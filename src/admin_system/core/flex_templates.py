@@ -0,0 +1,183 @@
+"""
+Pre-built LINE Flex Message Templates.
+
+Reply messages used to be rebuilt as large nested dicts for every event
+and then JSON-encoded again by the HTTP client. FlexTemplate serializes a
+message skeleton once at import time; rendering only encodes the values of
+its named slots and joins them with the pre-encoded chunks:
+
+    SOP_RESULT = FlexTemplate({
+        "type": "bubble",
+        "body": {"type": "text", "text": Slot("title")},
+    })
+    bubble = SOP_RESULT.render(title="請假流程")
+
+render() returns a PreparedMessage: a read-only mapping that carries its
+JSON encoding. LineClient sends PreparedMessages without re-encoding them;
+indexing one (e.g. in tests) decodes it lazily. Fully static messages can
+be rendered once and reused.
+"""
+
+import json
+import re
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+
+def _nested_default(value: Any) -> Any:
+    if isinstance(value, PreparedMessage):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: Any) -> bytes:
+    if isinstance(value, PreparedMessage):
+        return value.json
+    return json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), default=_nested_default
+    ).encode("utf-8")
+
+
+class Slot:
+    """Placeholder for a dynamic value in a FlexTemplate skeleton."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Slot({self.name!r})"
+
+
+class PreparedMessage(Mapping):
+    """
+    Read-only LINE message (or Flex container) with a cached JSON encoding.
+    """
+
+    __slots__ = ("_json", "_data")
+
+    def __init__(self, json_bytes: bytes) -> None:
+        self._json = json_bytes
+        self._data: dict[str, Any] | None = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PreparedMessage":
+        """Encode a message once."""
+        if isinstance(data, PreparedMessage):
+            return data
+        return cls(_dumps(data))
+
+    @property
+    def json(self) -> bytes:
+        """UTF-8 JSON encoding of the message."""
+        return self._json
+
+    def _view(self) -> dict[str, Any]:
+        if self._data is None:
+            self._data = json.loads(self._json)
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._view()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._view())
+
+    def __len__(self) -> int:
+        return len(self._view())
+
+    def to_dict(self) -> dict[str, Any]:
+        """Decode into a new, mutable dict."""
+        return json.loads(self._json)
+
+    def __repr__(self) -> str:
+        return f"PreparedMessage({self._json.decode('utf-8')[:80]}...)"
+
+
+_SLOT_MARKER = "\x00slot:{}\x00"
+_SLOT_PATTERN = re.compile(r'"\\u0000slot:(\w+)\\u0000"')
+
+
+class FlexTemplate:
+    """
+    Message skeleton serialized once, with named slots filled per render.
+    """
+
+    def __init__(self, skeleton: Mapping[str, Any]) -> None:
+        """
+        Initialize the template.
+
+        Args:
+            skeleton: Message structure; values that vary per message are
+                Slot instances. A slot may appear more than once.
+        """
+        encoded = json.dumps(
+            skeleton,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=self._encode_slot,
+        )
+        parts = _SLOT_PATTERN.split(encoded)
+        # parts alternate: literal chunk, slot name, literal chunk, ...
+        self._chunks = [part.encode("utf-8") for part in parts[0::2]]
+        self._slot_names = parts[1::2]
+        self.slots = frozenset(self._slot_names)
+
+    @staticmethod
+    def _encode_slot(value: Any) -> str:
+        if isinstance(value, Slot):
+            return _SLOT_MARKER.format(value.name)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def render(self, **values: Any) -> PreparedMessage:
+        """
+        Fill the slots.
+
+        Args:
+            **values: JSON-serializable value for every slot. PreparedMessage
+                values are embedded using their cached encoding.
+
+        Raises:
+            KeyError: If a slot has no value.
+        """
+        encoded = {name: _dumps(values[name]) for name in self.slots}
+        out = [self._chunks[0]]
+        for name, chunk in zip(self._slot_names, self._chunks[1:]):
+            out.append(encoded[name])
+            out.append(chunk)
+        return PreparedMessage(b"".join(out))
+
+
+_FLEX_MESSAGE = FlexTemplate({"type": "flex", "altText": Slot("alt_text"), "contents": Slot("contents")})
+
+
+def flex_message(alt_text: str, contents: Mapping[str, Any]) -> PreparedMessage:
+    """
+    Wrap a Flex container in a flex message, reusing its cached encoding.
+
+    Args:
+        alt_text: Notification / fallback text.
+        contents: Bubble or carousel (PreparedMessage or plain dict).
+    """
+    return _FLEX_MESSAGE.render(alt_text=alt_text, contents=contents)
+
+
+def has_prepared_content(message: Mapping[str, Any]) -> bool:
+    """Whether a message is, or directly wraps, a PreparedMessage."""
+    return isinstance(message, PreparedMessage) or isinstance(message.get("contents"), PreparedMessage)
+
+
+def _encode_message(message: Mapping[str, Any]) -> bytes:
+    if (
+        not isinstance(message, PreparedMessage)
+        and message.get("type") == "flex"
+        and message.keys() == {"type", "altText", "contents"}
+    ):
+        return flex_message(message["altText"], message["contents"]).json
+    return _dumps(message)
+
+
+def encode_messages(messages: list[Mapping[str, Any]]) -> bytes:
+    """JSON array of messages, reusing cached encodings of PreparedMessages."""
+    return b"[" + b",".join(_encode_message(message) for message in messages) + b"]"
@@ -0,0 +1,224 @@
+"""
+Upstream Health Monitor.
+
+The dashboard shows the health of upstream services (Ragic, LINE bots).
+Checking them inline on every dashboard refresh makes the page as slow as
+the sum of all upstream latencies and sends a burst of requests upstream per
+viewer. HealthMonitor instead:
+
+    - Runs all registered checks concurrently, each bounded by a timeout
+    - Caches the results as HealthSnapshots (with the time they were taken)
+    - Refreshes them from a background prober task every `interval` seconds
+    - Serves stale snapshots while a refresh runs (stale-while-revalidate),
+      so readers never wait on upstream services once the first probe is done
+
+Concurrent refresh requests share one in-flight probe.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+HealthCheck = Callable[[], Awaitable[Dict[str, Any]]]
+HealthCheckCloser = Callable[[], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class HealthSnapshot:
+    """Result of one health check at a point in time."""
+
+    name: str
+    status: str
+    message: str = ""
+    details: Dict[str, str] = field(default_factory=dict)
+    checked_at: float = field(default_factory=time.time)
+    duration_ms: float = 0.0
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the check ran."""
+        return max(0.0, time.time() - self.checked_at)
+
+
+class HealthMonitor:
+    """
+    Runs registered health checks concurrently and caches their results.
+    """
+
+    DEFAULT_TTL = 30.0
+    DEFAULT_TIMEOUT = 5.0
+    DEFAULT_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        timeout: float = DEFAULT_TIMEOUT,
+        interval: float = DEFAULT_INTERVAL,
+    ) -> None:
+        """
+        Initialize the monitor.
+
+        Args:
+            ttl: Age after which cached snapshots are refreshed on read.
+            timeout: Per-check timeout in seconds.
+            interval: Background prober period in seconds.
+        """
+        self._ttl = ttl
+        self._timeout = timeout
+        self._interval = interval
+        # Insertion order is the display order
+        self._checks: Dict[str, HealthCheck] = {}
+        self._closers: Dict[str, HealthCheckCloser] = {}
+        self._snapshots: Dict[str, HealthSnapshot] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._prober_task: Optional[asyncio.Task] = None
+
+    @property
+    def has_checks(self) -> bool:
+        """True when at least one check is registered."""
+        return bool(self._checks)
+
+    def register(
+        self,
+        name: str,
+        check: HealthCheck,
+        close: Optional[HealthCheckCloser] = None,
+    ) -> None:
+        """
+        Register a health check.
+
+        Args:
+            name: Display name (e.g., "Ragic", "LINE Bot (Chatbot)").
+            check: Coroutine function returning {"status", "message", "details"}.
+            close: Optional coroutine function releasing resources held by
+                   the check (e.g., a long-lived HTTP client).
+        """
+        self._checks[name] = check
+        if close is not None:
+            self._closers[name] = close
+
+    async def _run_check(self, name: str, check: HealthCheck) -> HealthSnapshot:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(check(), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            result = {"status": "error", "message": f"Timed out after {self._timeout:g}s"}
+        except Exception as e:
+            result = {
+                "status": "error",
+                "message": "Service unavailable",
+                "details": {"Error": str(e)[:50]},
+            }
+        return HealthSnapshot(
+            name=name,
+            status=result.get("status", "error"),
+            message=result.get("message", ""),
+            details=result.get("details", {}),
+            duration_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    async def _probe(self) -> Dict[str, HealthSnapshot]:
+        checks = list(self._checks.items())
+        results = await asyncio.gather(
+            *(self._run_check(name, check) for name, check in checks)
+        )
+        for snapshot in results:
+            self._snapshots[snapshot.name] = snapshot
+        return {snapshot.name: snapshot for snapshot in results}
+
+    def _start_refresh(self) -> asyncio.Task:
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._probe())
+            self._refresh_task = task
+        return task
+
+    async def refresh(self) -> Dict[str, HealthSnapshot]:
+        """
+        Run all checks now (joining a probe already in flight).
+
+        Returns:
+            Mapping of check name -> fresh snapshot.
+        """
+        return await asyncio.shield(self._start_refresh())
+
+    async def get_snapshots(self) -> list[HealthSnapshot]:
+        """
+        Get cached snapshots for all registered checks.
+
+        Waits for a probe only if some check has never run; stale snapshots
+        are returned immediately while a refresh runs in the background.
+
+        Returns:
+            Snapshots in registration order.
+        """
+        if any(name not in self._snapshots for name in self._checks):
+            await self.refresh()
+        elif any(
+            self._snapshots[name].age_seconds > self._ttl for name in self._checks
+        ):
+            self._start_refresh()
+
+        return [self._snapshots[name] for name in self._checks if name in self._snapshots]
+
+    def start(self) -> None:
+        """Start the background prober on the running event loop."""
+        if self._prober_task is not None and not self._prober_task.done():
+            return
+
+        async def prober() -> None:
+            while True:
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    logger.warning(f"Health probe failed: {e}")
+                await asyncio.sleep(self._interval)
+
+        self._prober_task = asyncio.create_task(prober(), name="HealthProber")
+        logger.info(
+            f"Health prober started: {len(self._checks)} check(s) every {self._interval:g}s"
+        )
+
+    async def stop(self) -> None:
+        """Stop the background prober and release check resources."""
+        for task in (self._prober_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._prober_task = None
+        self._refresh_task = None
+
+        for name, close in self._closers.items():
+            try:
+                await close()
+            except Exception as e:
+                logger.warning(f"Error closing health check '{name}': {e}")
+        self._closers.clear()
+        self._checks.clear()
+        self._snapshots.clear()
+
+
+# Singleton
+_health_monitor: HealthMonitor | None = None
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Get singleton HealthMonitor instance."""
+    global _health_monitor
+    if _health_monitor is None:
+        _health_monitor = HealthMonitor()
+    return _health_monitor
+
+
+def reset_health_monitor() -> None:
+    """Reset singleton (for testing)."""
+    global _health_monitor
+    _health_monitor = None
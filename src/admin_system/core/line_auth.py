@@ -36,7 +36,8 @@ from typing import Any, Annotated
 from fastapi import Depends, Header, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.app_context import ConfigLoader
+from core.flex_templates import FlexTemplate, PreparedMessage, Slot, flex_message
+from core.providers import get_configuration_provider
 from core.database import get_db_session
 from core.services.auth import (
     AuthService,
@@ -85,18 +86,72 @@ class VerifiedUser:
 # LINE Flex Message Templates (用於 Webhook 回覆)
 # =============================================================================
 
+_VERIFICATION_REQUIRED_TEMPLATE = FlexTemplate({
+    "type": "bubble",
+    "hero": {
+        "type": "image",
+        "url": Slot("hero_url"),
+        "size": "full",
+        "aspectRatio": "20:13",
+        "aspectMode": "fit",
+        "backgroundColor": "#FFFFFF",
+    },
+    "body": {
+        "type": "box",
+        "layout": "vertical",
+        "contents": [
+            {
+                "type": "text",
+                "text": "員工身份驗證",
+                "weight": "bold",
+                "size": "xl",
+                "align": "center",
+            },
+            {
+                "type": "text",
+                "text": AUTH_ERROR_MESSAGES["auth_required"],
+                "wrap": True,
+                "size": "sm",
+                "margin": "lg",
+                "align": "center",
+            },
+        ],
+        "paddingAll": "20px",
+    },
+    "footer": {
+        "type": "box",
+        "layout": "vertical",
+        "contents": [
+            {
+                "type": "button",
+                "action": {
+                    "type": "uri",
+                    "label": "驗證身份",
+                    "uri": Slot("login_url"),
+                },
+                "style": "primary",
+                "color": "#00B900",
+            }
+        ],
+        "paddingAll": "15px",
+    },
+})
+
+
 class LineAuthMessages:
     """
     Framework-level LINE Flex Message templates for authentication.
 
     All modules should use these templates to ensure consistent UX.
+    The message skeleton is serialized once; only the URLs are filled in
+    per user.
     """
 
     @staticmethod
     def get_verification_required_flex(
         line_user_id: str,
         app_context: str | None = None,
-    ) -> dict[str, Any]:
+    ) -> PreparedMessage:
         """
         Create a Flex Message prompting user to verify their identity.
 
@@ -111,71 +166,22 @@ class LineAuthMessages:
         Returns:
             Flex Message bubble content (not wrapped in flex message object).
         """
-        config_loader = ConfigLoader()
-        config_loader.load()
-        base_url = config_loader.get("server.base_url", "")
-        app_name = config_loader.get("server.app_name", "Admin System")
+        base_url = get_configuration_provider().get("server.base_url", "")
         # Use Template-based route for correct LIFF ID injection
         login_url = f"{base_url}/auth/page/login?line_sub={line_user_id}"
         if app_context:
             login_url += f"&app={app_context}"
 
-        return {
-            "type": "bubble",
-            "hero": {
-                "type": "image",
-                "url": f"{base_url}/static/crown.png?v=1",
-                "size": "full",
-                "aspectRatio": "20:13",
-                "aspectMode": "fit",
-                "backgroundColor": "#FFFFFF",
-            },
-            "body": {
-                "type": "box",
-                "layout": "vertical",
-                "contents": [
-                    {
-                        "type": "text",
-                        "text": "員工身份驗證",
-                        "weight": "bold",
-                        "size": "xl",
-                        "align": "center",
-                    },
-                    {
-                        "type": "text",
-                        "text": AUTH_ERROR_MESSAGES["auth_required"],
-                        "wrap": True,
-                        "size": "sm",
-                        "margin": "lg",
-                        "align": "center",
-                    },
-                ],
-                "paddingAll": "20px",
-            },
-            "footer": {
-                "type": "box",
-                "layout": "vertical",
-                "contents": [
-                    {
-                        "type": "button",
-                        "action": {
-                            "type": "uri",
-                            "label": "驗證身份",
-                            "uri": login_url,
-                        },
-                        "style": "primary",
-                        "color": "#00B900",
-                    }
-                ],
-                "paddingAll": "15px",
-            },
-        }
+        return _VERIFICATION_REQUIRED_TEMPLATE.render(
+            hero_url=f"{base_url}/static/crown.png?v=1",
+            login_url=login_url,
+        )
 
     @staticmethod
     def get_verification_required_messages(
         line_user_id: str,
         app_context: str | None = None,
-    ) -> list[dict[str, Any]]:
+    ) -> list[PreparedMessage]:
         """
         Get complete LINE message objects for verification required response.
 
@@ -191,13 +197,7 @@ class LineAuthMessages:
         flex_content = LineAuthMessages.get_verification_required_flex(
             line_user_id, app_context
         )
-        return [
-            {
-                "type": "flex",
-                "altText": AUTH_ERROR_MESSAGES["auth_required"],
-                "contents": flex_content,
-            }
-        ]
+        return [flex_message(AUTH_ERROR_MESSAGES["auth_required"], flex_content)]
 
 
 # =============================================================================
@@ -209,7 +209,7 @@ async def line_auth_check(
     db: AsyncSession,
     auth_service: AuthService | None = None,
     app_context: str | None = None,
-) -> tuple[bool, list[dict[str, Any]] | None]:
+) -> tuple[bool, list[PreparedMessage] | None]:
     """
     Check if a LINE user is authenticated (bound to company email).
 
@@ -2,15 +2,22 @@
 LINE Client - Pure HTTP communication with LINE API.
 Only responsible for sending/receiving data, no message formatting.
 """
-from typing import Any, Dict, List, Optional
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 import logging
 import hmac
 import hashlib
 import base64
+import json
 
 import httpx
 
 from core.app_context import ConfigLoader
+from core.flex_templates import encode_messages, has_prepared_content
+from core.line_profiles import get_line_profile_resolver
+
+if TYPE_CHECKING:
+    from core.line_notify import NotificationReport
 
 
 class LineClient:
@@ -58,6 +65,10 @@ class LineClient:
             self._access_token = ""
         
         self._client = httpx.AsyncClient(timeout=30.0)
+        
+        # All profile lookups go through the process-wide cached,
+        # deduplicating resolver of this channel
+        self._profiles = get_line_profile_resolver(self._access_token)
     
     def _headers(self) -> Dict[str, str]:
         return {
@@ -65,6 +76,19 @@ class LineClient:
             "Content-Type": "application/json"
         }
     
+    @staticmethod
+    def _message_body(payload: Dict[str, Any], messages: List[Mapping[str, Any]]) -> Dict[str, Any]:
+        """
+        Request kwargs for a message API call.
+
+        Pre-built messages (PreparedMessage) keep their cached JSON encoding
+        instead of being encoded again with the rest of the payload.
+        """
+        if not any(has_prepared_content(message) for message in messages):
+            return {"json": {**payload, "messages": messages}}
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return {"content": body[:-1] + b',"messages":' + encode_messages(messages) + b"}"}
+
     def is_configured(self) -> bool:
         """Check if credentials are set."""
         return bool(self._channel_secret and self._access_token)
@@ -170,7 +194,7 @@ class LineClient:
     async def post_reply(
         self, 
         reply_token: str, 
-        messages: List[Dict[str, Any]]
+        messages: List[Mapping[str, Any]]
     ) -> bool:
         """
         POST to /message/reply endpoint.
@@ -187,7 +211,7 @@ class LineClient:
             resp = await self._client.post(
                 f"{self.API_BASE}/message/reply",
                 headers=self._headers(),
-                json={"replyToken": reply_token, "messages": messages[:5]}
+                **self._message_body({"replyToken": reply_token}, messages[:5]),
             )
             return resp.status_code == 200
         except Exception as e:
@@ -197,7 +221,7 @@ class LineClient:
     async def post_push(
         self, 
         to: str, 
-        messages: List[Dict[str, Any]]
+        messages: List[Mapping[str, Any]]
     ) -> bool:
         """
         POST to /message/push endpoint.
@@ -208,12 +232,14 @@ class LineClient:
         """
         if not self.is_configured():
             return False
+        if len(messages) > 5:
+            self._logger.warning(f"Push truncated to 5 of {len(messages)} messages; use notify()")
         
         try:
             resp = await self._client.post(
                 f"{self.API_BASE}/message/push",
                 headers=self._headers(),
-                json={"to": to, "messages": messages[:5]}
+                **self._message_body({"to": to}, messages[:5]),
             )
             return resp.status_code == 200
         except Exception as e:
@@ -223,28 +249,105 @@ class LineClient:
     async def post_multicast(
         self, 
         to: List[str], 
-        messages: List[Dict[str, Any]]
+        messages: List[Mapping[str, Any]]
     ) -> bool:
         """POST to /message/multicast endpoint."""
         if not self.is_configured():
             return False
+        if len(to) > 500 or len(messages) > 5:
+            self._logger.warning(
+                f"Multicast truncated to 500 of {len(to)} recipients / 5 of "
+                f"{len(messages)} messages; use notify()"
+            )
         
         try:
             resp = await self._client.post(
                 f"{self.API_BASE}/message/multicast",
                 headers=self._headers(),
-                json={"to": to[:500], "messages": messages[:5]}
+                **self._message_body({"to": to[:500]}, messages[:5]),
             )
             return resp.status_code == 200
         except Exception as e:
             self._logger.error(f"Multicast failed: {e}")
             return False
     
+    async def send_messages(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        messages: List[Mapping[str, Any]],
+        retry_key: str | None = None,
+    ) -> httpx.Response:
+        """
+        POST to a /message/* endpoint and return the raw response.
+        
+        Unlike post_push()/post_multicast(), nothing is truncated or
+        swallowed: network errors propagate so callers can retry.
+        
+        Args:
+            endpoint: Endpoint below /message (e.g. "push", "multicast")
+            payload: Request fields other than "messages"
+            messages: Pre-formatted message objects (at most 5)
+            retry_key: Optional X-Line-Retry-Key for idempotent retries
+        """
+        headers = self._headers()
+        if retry_key:
+            headers["X-Line-Retry-Key"] = retry_key
+        return await self._client.post(
+            f"{self.API_BASE}/message/{endpoint}",
+            headers=headers,
+            **self._message_body(payload, messages),
+        )
+    
+    async def notify(
+        self,
+        recipients: List[str],
+        messages: List[Mapping[str, Any]],
+    ) -> "NotificationReport":
+        """
+        Send messages to any number of users (batched, retried).
+        
+        See core.line_notify.LineNotificationDispatcher.
+        
+        Returns:
+            Per-recipient delivery results
+        """
+        from core.line_notify import LineNotificationDispatcher
+        
+        return await LineNotificationDispatcher(self).send(recipients, messages)
+    
     async def get_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """GET user profile from /profile/{userId}."""
+        """
+        Get user profile (cached).
+        
+        Concurrent calls for the same user share one request to
+        /profile/{userId}; successful lookups are cached.
+        """
         if not self.is_configured():
             return None
         
+        return await self._profiles.resolve(user_id, self._fetch_profile)
+    
+    async def get_profiles(
+        self, 
+        user_ids: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get many user profiles at once (cached, bounded concurrency).
+        
+        Args:
+            user_ids: LINE user IDs (duplicates are collapsed)
+            
+        Returns:
+            Mapping of user ID -> profile dict (None if unavailable)
+        """
+        if not self.is_configured():
+            return {user_id: None for user_id in user_ids}
+        
+        return await self._profiles.resolve_many(user_ids, self._fetch_profile)
+    
+    async def _fetch_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """GET user profile from /profile/{userId}."""
         try:
             resp = await self._client.get(
                 f"{self.API_BASE}/profile/{user_id}",
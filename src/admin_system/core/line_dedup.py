@@ -0,0 +1,248 @@
+"""
+LINE Webhook Redelivery Deduplication.
+
+LINE redelivers webhook events it believes were not received (flagged
+with `deliveryContext.isRedelivery`), and every event carries a unique
+`webhookEventId`. Processing a redelivered event repeats all of its work
+(embedding, vector search, reply), so the webhook endpoint filters events
+through a LineEventDeduplicator before dispatching them:
+
+    - LineEventDeduplicator: in-process TTL + size-bounded LRU of seen IDs
+      (single instance deployments)
+    - DatabaseLineEventDeduplicator: additionally claims IDs in the
+      `processed_line_events` table with INSERT ... ON CONFLICT DO NOTHING,
+      so duplicates are recognised across instances
+
+Events without a `webhookEventId` are always processed. Events that could
+not be queued are released again so LINE's next redelivery is accepted.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def get_webhook_event_id(event: Dict[str, Any]) -> Optional[str]:
+    """LINE's unique ID of a webhook event, if present."""
+    return event.get("webhookEventId") or None
+
+
+class LineEventDeduplicator:
+    """
+    Remembers accepted webhook event IDs in memory, evicting oldest first.
+    """
+
+    DEFAULT_TTL = 86400.0  # 1 day
+    DEFAULT_MAX_ENTRIES = 10000
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        # event_id -> expires_at
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.accepted = 0
+        self.duplicates = 0
+
+    def _claim_local(self, event_ids: Iterable[str]) -> list[str]:
+        """Mark IDs as seen; returns those not seen before."""
+        now = time.monotonic()
+        claimed = []
+        with self._lock:
+            for event_id in event_ids:
+                expires_at = self._entries.get(event_id)
+                if expires_at is not None and expires_at > now:
+                    continue
+                self._entries[event_id] = now + self._ttl
+                self._entries.move_to_end(event_id)
+                claimed.append(event_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return claimed
+
+    def _release_local(self, event_ids: Iterable[str]) -> None:
+        with self._lock:
+            for event_id in event_ids:
+                self._entries.pop(event_id, None)
+
+    async def claim(self, module: str, event_ids: list[str]) -> set[str]:
+        """
+        Claim event IDs for processing.
+
+        Args:
+            module: Module receiving the events.
+            event_ids: Webhook event IDs of one delivery.
+
+        Returns:
+            The IDs not seen before (to be processed).
+        """
+        return set(self._claim_local(event_ids))
+
+    async def release(self, event_ids: list[str]) -> None:
+        """Forget claimed IDs (events that were not queued after all)."""
+        self._release_local(event_ids)
+
+    async def filter_new(self, module: str, events: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+        """
+        Drop events that were already accepted.
+
+        Args:
+            module: Module receiving the events.
+            events: Events of one webhook delivery.
+
+        Returns:
+            Events to process, in delivery order.
+        """
+        event_ids = [event_id for event_id in map(get_webhook_event_id, events) if event_id]
+        if not event_ids:
+            return events
+
+        claimed = await self.claim(module, event_ids)
+        fresh = []
+        for event in events:
+            event_id = get_webhook_event_id(event)
+            if event_id is None or event_id in claimed:
+                fresh.append(event)
+                # A batch may repeat an ID; only its first occurrence is new
+                claimed.discard(event_id)
+            else:
+                self.duplicates += 1
+                logger.info(f"[{module}] Skipping redelivered LINE event {event_id}")
+        self.accepted += len(fresh)
+        return fresh
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Deduplication metrics for monitoring."""
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "backend": self.backend,
+            "entries": entries,
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+        }
+
+    def clear(self) -> None:
+        """Forget all seen IDs."""
+        with self._lock:
+            self._entries.clear()
+
+
+class DatabaseLineEventDeduplicator(LineEventDeduplicator):
+    """
+    Claims event IDs in PostgreSQL so all instances share one view.
+
+    The in-memory LRU still answers for IDs this instance has seen, so
+    only first-seen IDs cost a query. Database errors fail open: events
+    are processed rather than lost.
+    """
+
+    PURGE_INTERVAL = 300.0  # seconds
+
+    backend = "database"
+
+    def __init__(
+        self,
+        ttl: float = LineEventDeduplicator.DEFAULT_TTL,
+        max_entries: int = LineEventDeduplicator.DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        super().__init__(ttl=ttl, max_entries=max_entries)
+        self._next_purge = 0.0
+
+    async def claim(self, module: str, event_ids: list[str]) -> set[str]:
+        candidates = self._claim_local(event_ids)
+        if not candidates:
+            return set()
+
+        from sqlalchemy import delete
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        from core.database import get_standalone_session
+        from core.models import ProcessedLineEvent
+
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self._ttl)
+        stmt = (
+            pg_insert(ProcessedLineEvent)
+            .values([
+                {"webhook_event_id": event_id, "module": module, "expires_at": expires_at}
+                for event_id in candidates
+            ])
+            .on_conflict_do_nothing(index_elements=["webhook_event_id"])
+            .returning(ProcessedLineEvent.webhook_event_id)
+        )
+        try:
+            async with get_standalone_session() as session:
+                result = await session.execute(stmt)
+                claimed = set(result.scalars())
+                if time.monotonic() >= self._next_purge:
+                    self._next_purge = time.monotonic() + self.PURGE_INTERVAL
+                    await session.execute(
+                        delete(ProcessedLineEvent).where(ProcessedLineEvent.expires_at < now)
+                    )
+        except Exception as e:
+            logger.warning(f"LINE event dedup query failed, processing events: {e}")
+            return set(candidates)
+        return claimed
+
+    async def release(self, event_ids: list[str]) -> None:
+        self._release_local(event_ids)
+        if not event_ids:
+            return
+
+        from sqlalchemy import delete
+
+        from core.database import get_standalone_session
+        from core.models import ProcessedLineEvent
+
+        try:
+            async with get_standalone_session() as session:
+                await session.execute(
+                    delete(ProcessedLineEvent).where(
+                        ProcessedLineEvent.webhook_event_id.in_(event_ids)
+                    )
+                )
+        except Exception as e:
+            logger.warning(f"Failed to release LINE event IDs: {e}")
+
+
+# Singleton
+_deduplicator: LineEventDeduplicator | None = None
+
+
+def get_line_event_deduplicator() -> LineEventDeduplicator:
+    """
+    Get singleton deduplicator.
+
+    The backend (`memory` or `database`) and record lifetime come from
+    `line.webhook_dedup_backend` and `line.webhook_dedup_ttl`.
+    """
+    global _deduplicator
+    if _deduplicator is None:
+        from core.providers import get_configuration_provider
+
+        config = get_configuration_provider()
+        ttl = config.get("line.webhook_dedup_ttl", LineEventDeduplicator.DEFAULT_TTL)
+        if config.get("line.webhook_dedup_backend", "memory") == "database":
+            _deduplicator = DatabaseLineEventDeduplicator(ttl=ttl)
+        else:
+            _deduplicator = LineEventDeduplicator(ttl=ttl)
+    return _deduplicator
+
+
+def reset_line_event_deduplicator() -> None:
+    """Reset singleton (for testing)."""
+    global _deduplicator
+    _deduplicator = None
@@ -0,0 +1,219 @@
+"""
+LINE Webhook Event Dispatch.
+
+LINE expects the webhook to answer quickly; handling every event inline
+(auth checks, embedding, vector search, reply) before responding can exceed
+the timeout and trigger redeliveries. The webhook endpoint therefore only
+verifies and enqueues events; a LineEventDispatcher per module processes
+them in the background:
+
+    - Events are sharded by source (user/group/room ID) onto worker queues,
+      so events from one user are handled in order while different users
+      are handled concurrently
+    - Queues are bounded; enqueue() reports rejection instead of growing
+      memory, and the endpoint answers 503 so LINE redelivers later; events
+      of the batch that were already queued are skipped on redelivery by
+      the webhook event deduplicator
+    - Counters (enqueued, processed, failed, rejected, queue depth) are
+      exposed via get_line_dispatch_stats()
+
+Workers are started lazily on the running event loop and drained on
+shutdown via shutdown_line_dispatchers().
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+LineEventHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+def _ordering_key(event: Dict[str, Any]) -> Optional[str]:
+    """Key whose events must be handled in order (user, group or room)."""
+    source = event.get("source") or {}
+    return source.get("userId") or source.get("groupId") or source.get("roomId")
+
+
+class LineEventDispatcher:
+    """
+    Bounded background queue of LINE events for one module.
+    """
+
+    DEFAULT_WORKERS = 8
+    DEFAULT_QUEUE_SIZE = 1000
+
+    def __init__(
+        self,
+        name: str,
+        handler: LineEventHandler,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        """
+        Initialize the dispatcher.
+
+        Args:
+            name: Module name (for logs and metrics).
+            handler: Coroutine function processing a single event.
+            workers: Number of concurrent worker tasks.
+            queue_size: Total queue capacity, split evenly across workers.
+        """
+        self._name = name
+        self._handler = handler
+        self._workers = max(1, workers)
+        self._shard_size = max(1, queue_size // self._workers)
+        self._round_robin = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queues: list[asyncio.Queue] = []
+        self._tasks: list[asyncio.Task] = []
+
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.high_watermark = 0
+        self._total_handle_ms = 0.0
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            logger.warning(f"[{self._name}] Event loop changed; restarting LINE event workers")
+        self._loop = loop
+        self._queues = [asyncio.Queue(maxsize=self._shard_size) for _ in range(self._workers)]
+        self._tasks = [
+            asyncio.create_task(self._worker(queue), name=f"LineWorker-{self._name}-{i}")
+            for i, queue in enumerate(self._queues)
+        ]
+        logger.info(f"[{self._name}] Started {self._workers} LINE event worker(s)")
+
+    def _shard(self, event: Dict[str, Any]) -> asyncio.Queue:
+        key = _ordering_key(event)
+        if key is None:
+            index = next(self._round_robin) % self._workers
+        else:
+            index = zlib.crc32(key.encode("utf-8")) % self._workers
+        return self._queues[index]
+
+    def enqueue(self, event: Dict[str, Any]) -> bool:
+        """
+        Queue an event for background processing.
+
+        Returns:
+            True if queued, False if the event's queue is full.
+        """
+        self._ensure_started()
+        try:
+            self._shard(event).put_nowait(event)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self.enqueued += 1
+        self.high_watermark = max(self.high_watermark, self.queued)
+        return True
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            event = await queue.get()
+            start = time.perf_counter()
+            try:
+                await self._handler(event)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error handling LINE event in '{self._name}': {e}")
+            finally:
+                self._total_handle_ms += (time.perf_counter() - start) * 1000
+                queue.task_done()
+
+    @property
+    def queued(self) -> int:
+        """Events waiting to be processed."""
+        return sum(queue.qsize() for queue in self._queues)
+
+    async def join(self) -> None:
+        """Wait until all queued events have been processed."""
+        for queue in list(self._queues):
+            await queue.join()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Drain queued events (up to `timeout` seconds), then stop the workers.
+        """
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[{self._name}] Stopping with {self.queued} LINE event(s) unprocessed")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queues = []
+        self._loop = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue metrics for monitoring."""
+        handled = self.processed + self.failed
+        return {
+            "module": self._name,
+            "workers": self._workers,
+            "capacity": self._shard_size * self._workers,
+            "queued": self.queued,
+            "high_watermark": self.high_watermark,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_handle_ms": round(self._total_handle_ms / handled, 1) if handled else 0.0,
+        }
+
+
+# Dispatchers by module name
+_dispatchers: Dict[str, LineEventDispatcher] = {}
+
+
+def get_line_event_dispatcher(name: str, handler: LineEventHandler) -> LineEventDispatcher:
+    """
+    Get (or create) the dispatcher for a module.
+
+    Worker count and queue size come from `line.webhook_workers` and
+    `line.webhook_queue_size`.
+    """
+    dispatcher = _dispatchers.get(name)
+    if dispatcher is None:
+        from core.providers import get_configuration_provider
+
+        config = get_configuration_provider()
+        dispatcher = LineEventDispatcher(
+            name,
+            handler,
+            workers=config.get("line.webhook_workers", LineEventDispatcher.DEFAULT_WORKERS),
+            queue_size=config.get("line.webhook_queue_size", LineEventDispatcher.DEFAULT_QUEUE_SIZE),
+        )
+        _dispatchers[name] = dispatcher
+    return dispatcher
+
+
+def get_line_dispatch_stats() -> list[Dict[str, Any]]:
+    """Metrics of all module dispatchers."""
+    return [dispatcher.get_stats() for dispatcher in _dispatchers.values()]
+
+
+async def shutdown_line_dispatchers(timeout: float = 10.0) -> None:
+    """Drain and stop all dispatchers (app shutdown)."""
+    for dispatcher in list(_dispatchers.values()):
+        await dispatcher.stop(timeout=timeout)
+
+
+def reset_line_dispatchers() -> None:
+    """Forget all dispatchers (for testing)."""
+    _dispatchers.clear()
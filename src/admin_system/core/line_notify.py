@@ -0,0 +1,248 @@
+"""
+LINE Push/Multicast Notification Dispatch.
+
+LineClient.post_push()/post_multicast() send a single request and
+truncate to LINE's per-request limits (5 messages, 500 multicast
+recipients). LineNotificationDispatcher notifies any number of users:
+
+    - Recipients are deduplicated and grouped into multicast chunks of
+      500 (a single recipient is sent with push)
+    - Messages are split into batches of 5, sent in order per chunk
+    - Requests run with bounded concurrency; 429 and 5xx responses and
+      network errors are retried with exponential backoff (honouring
+      Retry-After) under an X-Line-Retry-Key, so a retry of a request LINE
+      already accepted is not delivered twice
+    - The NotificationReport lists the delivery result of every recipient
+
+Usage:
+    report = await line_client.notify(user_ids, messages)
+    if not report.all_delivered:
+        logger.warning(f"LINE notification failed for {report.failed}")
+"""
+
+import asyncio
+import logging
+import random
+import uuid
+from dataclasses import dataclass, field
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+import httpx
+
+if TYPE_CHECKING:
+    from core.line_client import LineClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeliveryResult:
+    """
+    Delivery outcome for one recipient.
+
+    Attributes:
+        recipient: LINE user ID.
+        delivered: True if every message batch was accepted by LINE.
+        batches_sent: Number of message batches accepted.
+        status_code: HTTP status of the last request (None on network error).
+        error: Error description if not delivered.
+    """
+
+    recipient: str
+    delivered: bool = False
+    batches_sent: int = 0
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class NotificationReport:
+    """Results of one LineNotificationDispatcher.send() call."""
+
+    results: Dict[str, DeliveryResult] = field(default_factory=dict)
+    requests: int = 0
+    retries: int = 0
+
+    @property
+    def delivered(self) -> List[str]:
+        """Recipients that received all messages."""
+        return [r.recipient for r in self.results.values() if r.delivered]
+
+    @property
+    def failed(self) -> List[str]:
+        """Recipients that did not receive all messages."""
+        return [r.recipient for r in self.results.values() if not r.delivered]
+
+    @property
+    def all_delivered(self) -> bool:
+        return all(r.delivered for r in self.results.values())
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds from a Retry-After header, if present and numeric."""
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _error_message(response: httpx.Response) -> str:
+    try:
+        detail = response.json().get("message")
+    except Exception:
+        detail = None
+    return f"HTTP {response.status_code}" + (f": {detail}" if detail else "")
+
+
+class LineNotificationDispatcher:
+    """
+    Sends messages to many LINE users in batched, retried requests.
+    """
+
+    MAX_RECIPIENTS = 500  # per multicast request
+    MAX_MESSAGES = 5  # per request
+    DEFAULT_MAX_CONCURRENCY = 4
+    DEFAULT_MAX_RETRIES = 3
+    DEFAULT_BACKOFF = 1.0  # seconds, doubled per retry
+    MAX_BACKOFF = 30.0
+
+    def __init__(
+        self,
+        client: "LineClient",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> None:
+        """
+        Initialize the dispatcher.
+
+        Args:
+            client: Configured LineClient used for the requests.
+            max_concurrency: Maximum requests in flight at once.
+            max_retries: Retries per request after the first attempt.
+            backoff: Initial retry delay in seconds.
+        """
+        self._client = client
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_retries = max_retries
+        self._backoff = backoff
+
+    async def send(
+        self,
+        recipients: Iterable[str],
+        messages: List[Mapping[str, Any]],
+    ) -> NotificationReport:
+        """
+        Send messages to all recipients.
+
+        Args:
+            recipients: LINE user IDs (duplicates and empty IDs are ignored).
+            messages: Message objects, in order; any number.
+
+        Returns:
+            Per-recipient delivery results.
+        """
+        unique = list(dict.fromkeys(r for r in recipients if r))
+        report = NotificationReport(results={r: DeliveryResult(r) for r in unique})
+        if not unique or not messages:
+            for result in report.results.values():
+                result.delivered = True
+            return report
+        if not self._client.is_configured():
+            for result in report.results.values():
+                result.error = "LINE client not configured"
+            return report
+
+        batches = [
+            messages[i:i + self.MAX_MESSAGES]
+            for i in range(0, len(messages), self.MAX_MESSAGES)
+        ]
+        chunks = [
+            unique[i:i + self.MAX_RECIPIENTS]
+            for i in range(0, len(unique), self.MAX_RECIPIENTS)
+        ]
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        await asyncio.gather(
+            *(self._deliver_chunk(chunk, batches, report, semaphore) for chunk in chunks)
+        )
+
+        if report.failed:
+            logger.warning(
+                f"LINE notification: {len(report.failed)}/{len(unique)} recipient(s) failed"
+            )
+        return report
+
+    async def _deliver_chunk(
+        self,
+        chunk: List[str],
+        batches: List[List[Mapping[str, Any]]],
+        report: NotificationReport,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        results = [report.results[r] for r in chunk]
+        # Batches go out in order; stop at the first failure so recipients
+        # never get later messages without the earlier ones
+        for batch in batches:
+            status_code, error = await self._send_with_retry(chunk, batch, report, semaphore)
+            for result in results:
+                result.status_code = status_code
+            if error is not None:
+                for result in results:
+                    result.error = error
+                return
+            for result in results:
+                result.batches_sent += 1
+        for result in results:
+            result.delivered = True
+
+    async def _send_with_retry(
+        self,
+        chunk: List[str],
+        batch: List[Mapping[str, Any]],
+        report: NotificationReport,
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[Optional[int], Optional[str]]:
+        """Send one request; returns (status code, error or None)."""
+        if len(chunk) == 1:
+            endpoint, payload = "push", {"to": chunk[0]}
+        else:
+            endpoint, payload = "multicast", {"to": chunk}
+        # Same key on every attempt: LINE answers 409 if it already accepted it
+        retry_key = str(uuid.uuid4())
+
+        for attempt in range(self._max_retries + 1):
+            retry_after = None
+            try:
+                async with semaphore:
+                    report.requests += 1
+                    response = await self._client.send_messages(
+                        endpoint, payload, batch, retry_key=retry_key
+                    )
+                status_code = response.status_code
+                if status_code == 200 or (status_code == 409 and attempt > 0):
+                    return status_code, None
+                error = _error_message(response)
+                if status_code != 429 and status_code < 500:
+                    return status_code, error
+                retry_after = _retry_after(response)
+                if retry_after is not None:
+                    # Never let the server stall a send longer than our own backoff cap
+                    retry_after = min(self.MAX_BACKOFF, retry_after)
+            except httpx.HTTPError as e:
+                status_code, error = None, str(e) or type(e).__name__
+
+            if attempt == self._max_retries:
+                return status_code, error
+            report.retries += 1
+            if retry_after is None:
+                delay = min(self.MAX_BACKOFF, self._backoff * 2 ** attempt)
+                retry_after = delay * (0.5 + random.random() / 2)
+            logger.warning(
+                f"LINE {endpoint} to {len(chunk)} recipient(s) failed ({error}); "
+                f"retrying in {retry_after:.1f}s"
+            )
+            await asyncio.sleep(retry_after)
+
+        return None, "No attempts made"
@@ -0,0 +1,217 @@
+"""
+LINE Profile Resolution - Cached, deduplicated profile lookups.
+
+LINE's `/profile/{userId}` endpoint is one HTTP call per user. Dashboards
+and notification fan-out resolve many users at once and often the same
+users repeatedly, so LineClient routes all profile fetches through a
+LineProfileResolver. Resolvers are process-wide, one per channel access
+token (get_line_profile_resolver), so short-lived clients share the cache
+and in-flight lookups:
+
+    - LineProfileCache: TTL + size-bounded cache of successful lookups
+    - In-flight deduplication: concurrent lookups for the same user ID
+      share a single HTTP request
+    - Bounded concurrency: at most `max_concurrency` profile requests are
+      sent to LINE in parallel (per event loop)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+ProfileFetcher = Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class LineProfileCache:
+    """
+    TTL cache of LINE user ID -> profile dict, evicting oldest entries first.
+    """
+
+    DEFAULT_TTL = 3600.0  # 1 hour
+    DEFAULT_MAX_ENTRIES = 5000
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        # user_id -> (profile, expires_at)
+        self._entries: OrderedDict[str, tuple[Dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a cached profile copy, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            profile, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            return dict(profile)
+
+    def set(self, user_id: str, profile: Dict[str, Any]) -> None:
+        """Cache a profile."""
+        with self._lock:
+            self._entries[user_id] = (dict(profile), time.monotonic() + self._ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a cached profile (e.g., after a profile change)."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached profiles."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class LineProfileResolver:
+    """
+    Resolves LINE profiles through a cache with deduplicated, bounded fetches.
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 10
+
+    def __init__(
+        self,
+        cache: LineProfileCache | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        """
+        Initialize the resolver.
+
+        Args:
+            cache: Profile cache (a new one is created if None).
+            max_concurrency: Maximum parallel LINE API calls per event loop.
+        """
+        self._cache = cache or LineProfileCache()
+        self._max_concurrency = max_concurrency
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # asyncio primitives are loop-bound; keep one semaphore per loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def cache(self) -> LineProfileCache:
+        """The underlying profile cache."""
+        return self._cache
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _fetch_and_cache(
+        self, user_id: str, fetch: ProfileFetcher
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            async with self._semaphore():
+                profile = await fetch(user_id)
+            if profile is not None:
+                self._cache.set(user_id, profile)
+            return profile
+        finally:
+            # A newer task may have replaced this one (e.g. on another loop)
+            if self._inflight.get(user_id) is asyncio.current_task():
+                del self._inflight[user_id]
+
+    async def resolve(
+        self, user_id: str, fetch: ProfileFetcher
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a single profile.
+
+        Args:
+            user_id: LINE user ID.
+            fetch: Coroutine function performing the actual LINE API call
+                   on a miss. Returns the profile dict, or None if
+                   unavailable. Concurrent lookups of the same user share
+                   the first caller's request.
+
+        Returns:
+            Profile dict, or None if LINE returned no profile.
+        """
+        cached = self._cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(user_id)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._fetch_and_cache(user_id, fetch))
+            self._inflight[user_id] = task
+
+        profile = await asyncio.shield(task)
+        return dict(profile) if profile is not None else None
+
+    async def resolve_many(
+        self, user_ids: Iterable[str], fetch: ProfileFetcher
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resolve many profiles at once.
+
+        Duplicate IDs are collapsed; cache hits cost no HTTP call and misses
+        are fetched concurrently within the concurrency limit.
+
+        Args:
+            user_ids: LINE user IDs.
+            fetch: Profile fetcher used for misses (see resolve()).
+
+        Returns:
+            Mapping of user ID -> profile dict (or None).
+        """
+        unique_ids = list(dict.fromkeys(user_ids))
+        results = await asyncio.gather(
+            *(self.resolve(user_id, fetch) for user_id in unique_ids)
+        )
+        return dict(zip(unique_ids, results))
+
+
+# Process-wide resolvers, one per channel access token
+_resolvers: Dict[str, LineProfileResolver] = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_line_profile_resolver(access_token: str) -> LineProfileResolver:
+    """
+    Get the shared profile resolver of a LINE channel.
+
+    Args:
+        access_token: Channel access token the profiles are fetched with.
+
+    Returns:
+        LineProfileResolver shared by every client of that channel.
+    """
+    with _resolvers_lock:
+        resolver = _resolvers.get(access_token)
+        if resolver is None:
+            resolver = LineProfileResolver()
+            _resolvers[access_token] = resolver
+        return resolver
+
+
+def reset_line_profile_resolvers() -> None:
+    """Drop all shared resolvers and their caches (for testing)."""
+    with _resolvers_lock:
+        _resolvers.clear()
@@ -4,12 +4,18 @@ Logging Configuration Module.
 Provides centralized logging setup with rotating file handler.
 Logs are saved to the project's logs directory (headless mode).
 Includes automatic masking of sensitive data (passwords, tokens, secrets, emails).
+Optionally logs through a bounded queue drained by a background thread, so
+request handlers never block on disk or stdout.
 """
 
+import atexit
 import logging
+import queue
 import re
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Any, Optional
 import sys
 
 
@@ -19,6 +25,7 @@ MAX_BYTES = 10 * 1024 * 1024  # 10 MB
 BACKUP_COUNT = 5
 LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_QUEUE_SIZE = 10000  # Records buffered in queue mode before dropping
 
 # --- Sensitive Data Patterns ---
 # Patterns for data that should be masked in logs
@@ -78,6 +85,54 @@ SENSITIVE_PATTERNS = [
 ]
 
 
+# Lowercase substrings, one of which occurs in any text the pattern at the
+# same position in SENSITIVE_PATTERNS can match (None: always applied).
+# Patterns overlap (e.g. "Bearer token=x"), so they are still applied one
+# after another in order; the triggers only skip passes that cannot match.
+_PATTERN_TRIGGERS: tuple[Optional[tuple[str, ...]], ...] = (
+    ("://",),
+    ("password", "secret", "token", "key", "authorization", "cookie",
+     "credential", "line_user_id", "line_sub"),
+    ("bearer",),
+    ("eyj",),
+    ("token", "key", "secret", "password"),
+    ("ragic.com",),
+    None,
+    ("@",),
+)
+_MASKERS = [
+    (pattern, replacement, triggers)
+    for (pattern, replacement), triggers in zip(SENSITIVE_PATTERNS, _PATTERN_TRIGGERS, strict=True)
+]
+
+# Any text matched by some pattern contains one of these (LINE user IDs
+# have no such literal and are detected with _LINE_USER_ID_HINT instead)
+_MASK_TRIGGERS = tuple(sorted({t for triggers in _PATTERN_TRIGGERS if triggers for t in triggers}))
+_LINE_USER_ID_HINT = re.compile(r"U[a-f0-9]{32}")
+
+
+def mask_sensitive_data(text: str) -> str:
+    """
+    Mask sensitive data in text.
+
+    Applies SENSITIVE_PATTERNS in order, skipping patterns whose trigger
+    substrings are absent. Lines without any trigger substring are
+    returned unchanged without running a regex.
+    """
+    lowered = text.lower()
+    if not any(trigger in lowered for trigger in _MASK_TRIGGERS) and not _LINE_USER_ID_HINT.search(text):
+        return text
+
+    for pattern, replacement, triggers in _MASKERS:
+        if triggers is not None and not any(trigger in lowered for trigger in triggers):
+            continue
+        masked = pattern.sub(replacement, text)
+        if masked != text:
+            text = masked
+            lowered = text.lower()
+    return text
+
+
 class SensitiveDataFormatter(logging.Formatter):
     """
     Custom log formatter that masks sensitive data.
@@ -91,15 +146,7 @@ class SensitiveDataFormatter(logging.Formatter):
     
     def format(self, record: logging.LogRecord) -> str:
         """Format the log record, masking any sensitive data."""
-        # Get the original formatted message
-        original_msg = super().format(record)
-        
-        # Apply all masking patterns
-        masked_msg = original_msg
-        for pattern, replacement in SENSITIVE_PATTERNS:
-            masked_msg = pattern.sub(replacement, masked_msg)
-        
-        return masked_msg
+        return mask_sensitive_data(super().format(record))
 
 
 def get_log_path() -> Path:
@@ -117,22 +164,131 @@ def get_log_path() -> Path:
     return logs_dir / LOG_FILENAME
 
 
-def setup_logging(log_level: int = logging.INFO) -> None:
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    Records are handed to a background QueueListener; when the bounded
+    queue is full the record is dropped and counted instead of stalling
+    the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class _DropReportingListener(QueueListener):
+    """QueueListener that reports records dropped by the queue handler."""
+
+    def __init__(self, log_queue: queue.Queue, source: BoundedQueueHandler, *handlers: logging.Handler) -> None:
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self._source = source
+        self._reported = 0
+
+    def enqueue_sentinel(self) -> None:
+        # Block (rather than raise queue.Full) so stop() always flushes
+        self.queue.put(self._sentinel)
+
+    def handle(self, record: logging.LogRecord) -> None:
+        dropped = self._source.dropped
+        if dropped > self._reported:
+            notice = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                f"Log queue full: {dropped - self._reported} record(s) dropped", None, None,
+            )
+            self._reported = dropped
+            super().handle(notice)
+        super().handle(record)
+
+
+# Queue logging state (set by setup_logging when use_queue=True)
+_queue_handler: Optional[BoundedQueueHandler] = None
+_queue_listener: Optional[QueueListener] = None
+
+
+def get_logging_stats() -> dict[str, Any]:
+    """
+    Get queue logging statistics.
+
+    Returns:
+        {"mode": "queue", "queued", "capacity", "dropped"} in queue mode,
+        {"mode": "sync"} otherwise.
+    """
+    handler = _queue_handler
+    if handler is None:
+        return {"mode": "sync"}
+    return {
+        "mode": "queue",
+        "queued": handler.queue.qsize(),
+        "capacity": handler.queue.maxsize,
+        "dropped": handler.dropped,
+    }
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the queue listener, flushing all queued records to the handlers.
+
+    Safe to call more than once and in sync mode (no-op).
+    """
+    global _queue_handler, _queue_listener
+    listener, _queue_listener = _queue_listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        try:
+            handler.flush()
+        except (OSError, ValueError):
+            # Stream already closed (e.g. at interpreter exit)
+            pass
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        for handler in listener.handlers:
+            logging.getLogger().addHandler(handler)
+        _queue_handler = None
+
+
+def setup_logging(
+    log_level: int = logging.INFO,
+    use_queue: bool = False,
+    queue_size: int = LOG_QUEUE_SIZE,
+) -> None:
     """
     Configure application logging with rotation.
 
     Args:
         log_level: The logging level (default: logging.INFO).
+        use_queue: Hand records to a background thread through a bounded
+            queue, so file/stdout stalls never block the caller (records
+            are dropped and counted when the queue is full).
+        queue_size: Queue capacity in records (queue mode only).
     
     In Docker containers (detected via /.dockerenv), only console logging is used
     since Docker automatically captures stdout. In non-container environments,
     both file and console logging are enabled.
+
+    In queue mode, call shutdown_logging() on exit to flush queued records
+    (also registered with atexit).
     """
     import os
+    global _queue_handler, _queue_listener
     
     log_file_path = get_log_path()
     is_docker = os.path.exists("/.dockerenv")
 
+    # Stop a listener from a previous setup before replacing handlers
+    shutdown_logging()
+
     # Create root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
@@ -161,11 +317,24 @@ def setup_logging(log_level: int = logging.INFO) -> None:
     console_handler.setFormatter(formatter)
     root_logger.addHandler(console_handler)
 
+    # --- Queue Mode: root logs to the queue, a listener thread writes out ---
+    if use_queue:
+        handlers = list(root_logger.handlers)
+        root_logger.handlers.clear()
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        _queue_handler = BoundedQueueHandler(log_queue)
+        root_logger.addHandler(_queue_handler)
+        _queue_listener = _DropReportingListener(log_queue, _queue_handler, *handlers)
+        _queue_listener.start()
+        atexit.unregister(shutdown_logging)
+        atexit.register(shutdown_logging)
+
     # Log initialization
+    mode = f"queue mode, capacity {queue_size}" if use_queue else "sync mode"
     if is_docker:
-        root_logger.info("Logging initialized (Docker mode - console only)")
+        root_logger.info(f"Logging initialized (Docker mode - console only, {mode})")
     else:
-        root_logger.info(f"Logging initialized. Log file: {log_file_path}")
+        root_logger.info(f"Logging initialized ({mode}). Log file: {log_file_path}")
 
     # Suppress noisy loggers
     logging.getLogger("watchfiles.main").setLevel(logging.WARNING)
@@ -6,5 +6,15 @@ Exports system-wide database models for use across all modules.
 
 from core.models.user import User, UsedToken
 from core.models.admin_user import AdminUser
+from core.models.line_event import ProcessedLineEvent
+from core.models.outbox import NotificationOutbox, OutboxChannel, OutboxStatus
 
-__all__ = ["User", "UsedToken", "AdminUser"]
+__all__ = [
+    "User",
+    "UsedToken",
+    "AdminUser",
+    "ProcessedLineEvent",
+    "NotificationOutbox",
+    "OutboxChannel",
+    "OutboxStatus",
+]
@@ -0,0 +1,50 @@
+"""
+LINE Webhook Event Model.
+
+Records processed LINE webhook event IDs so redelivered events can be
+recognised across application instances.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.database.base import Base, CreatedAt
+
+
+class ProcessedLineEvent(Base):
+    """
+    A LINE webhook event that has already been accepted for processing.
+
+    Rows are short-lived and removed after `expires_at`.
+
+    Attributes:
+        webhook_event_id: LINE's unique `webhookEventId`.
+        module: Module that received the event.
+        created_at: When the event was first accepted.
+        expires_at: When the record may be purged.
+    """
+
+    __tablename__ = "processed_line_events"
+
+    webhook_event_id: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="LINE webhookEventId",
+    )
+    module: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="Module that received the event",
+    )
+    created_at: Mapped[CreatedAt]
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+        comment="Record expiration time (for cleanup)",
+    )
+
+    def __repr__(self) -> str:
+        return f"<ProcessedLineEvent(id={self.webhook_event_id}, module={self.module})>"
@@ -0,0 +1,119 @@
+"""
+Notification Outbox Model.
+
+Outgoing emails and LINE pushes are written to this table in the same
+transaction as the business change that triggers them, and delivered by
+core.outbox.OutboxDispatcher.
+
+Recipients, subjects and message content are encrypted (AES-GCM, see
+core.security), since emails such as magic links carry live login tokens
+for the whole retention period.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.database.base import Base, CreatedAt, UUIDPrimaryKey
+from core.security import EncryptedJSONType, EncryptedType
+
+
+class OutboxChannel:
+    """Delivery channels."""
+
+    EMAIL = "email"
+    LINE = "line"
+
+
+class OutboxStatus:
+    """Delivery states."""
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class NotificationOutbox(Base):
+    """
+    A notification waiting for (or done with) delivery.
+
+    Attributes:
+        id: Primary key.
+        channel: "email" or "line".
+        sender: LINE client name for the line channel ("core" or a module).
+        recipient: Email address or LINE user ID.
+        subject: Email subject (email channel only).
+        payload: Email {"html", "text"} or LINE {"messages"}.
+        status: pending / sent / failed.
+        attempts: Delivery attempts made.
+        next_attempt_at: Earliest time of the next attempt.
+        last_error: Error of the last failed attempt.
+        created_at: When the notification was written.
+        sent_at: When delivery succeeded.
+    """
+
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[UUIDPrimaryKey]
+    channel: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        comment="Delivery channel (email / line)",
+    )
+    sender: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        default="core",
+        comment="LINE client name (line channel)",
+    )
+    recipient: Mapped[str] = mapped_column(
+        EncryptedType(512),
+        nullable=False,
+        comment="Email address or LINE user ID (Encrypted)",
+    )
+    subject: Mapped[Optional[str]] = mapped_column(
+        EncryptedType(2048),
+        nullable=True,
+        comment="Email subject (Encrypted)",
+    )
+    payload: Mapped[dict[str, Any]] = mapped_column(
+        EncryptedJSONType(),
+        nullable=False,
+        comment="Message content (Encrypted)",
+    )
+    status: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        default=OutboxStatus.PENDING,
+        index=True,
+        comment="pending / sent / failed",
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Delivery attempts made",
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        index=True,
+        comment="Earliest time of the next attempt",
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Error of the last failed attempt",
+    )
+    created_at: Mapped[CreatedAt]
+    sent_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Delivery time",
+    )
+
+    def __repr__(self) -> str:
+        return f"<NotificationOutbox(id={self.id}, channel={self.channel}, status={self.status})>"
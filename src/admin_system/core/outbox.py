@@ -0,0 +1,471 @@
+"""
+Transactional Notification Outbox.
+
+Notifications sent inline are slow when SMTP is slow and lost when it
+fails. Instead, callers add them to the `notification_outbox` table in the
+same transaction as the business change:
+
+    add_email(db, to_email, subject, html_content)
+    add_line_push(db, line_user_id, messages)
+    await db.commit()
+    get_outbox_dispatcher().wake()
+
+OutboxDispatcher drains the table in the background:
+
+    - Due rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED and
+      leased by moving next_attempt_at forward, so several instances can
+      dispatch concurrently without sending twice; sending happens after
+      the claim is committed, outside any transaction
+    - Emails of a batch are sent over one pooled SMTP connection
+    - LINE pushes with identical messages are merged into multicast
+      requests via LineNotificationDispatcher
+    - Failed rows are retried with exponential backoff; permanent
+      rejections and rows out of attempts are marked failed
+    - Sent and failed rows are purged after RETENTION
+    - Throughput and lag (creation to delivery) are exposed via
+      get_stats() / get_backlog()
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.flex_templates import encode_messages
+from core.models.outbox import NotificationOutbox, OutboxChannel, OutboxStatus
+
+if TYPE_CHECKING:
+    from core.line_client import LineClient
+
+logger = logging.getLogger(__name__)
+
+
+def add_email(
+    db: AsyncSession,
+    to_email: str,
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None,
+) -> NotificationOutbox:
+    """
+    Add an email to the outbox (delivered after the caller commits).
+
+    Args:
+        db: Session of the business transaction.
+        to_email: Recipient address.
+        subject: Email subject.
+        html_content: HTML body.
+        text_content: Optional plain text body.
+    """
+    row = NotificationOutbox(
+        channel=OutboxChannel.EMAIL,
+        recipient=to_email,
+        subject=subject,
+        payload={"html": html_content, "text": text_content},
+    )
+    db.add(row)
+    return row
+
+
+def add_line_push(
+    db: AsyncSession,
+    line_user_id: str,
+    messages: List[Mapping[str, Any]],
+    sender: str = "core",
+) -> NotificationOutbox:
+    """
+    Add a LINE push message to the outbox (delivered after the caller commits).
+
+    Args:
+        db: Session of the business transaction.
+        line_user_id: Recipient LINE user ID.
+        messages: LINE message objects (plain dicts or PreparedMessages),
+            stored as plain JSON.
+        sender: Name of the LINE client to send with (see
+            OutboxDispatcher.register_line_client).
+    """
+    row = NotificationOutbox(
+        channel=OutboxChannel.LINE,
+        sender=sender,
+        recipient=line_user_id,
+        payload={"messages": json.loads(encode_messages(messages))},
+    )
+    db.add(row)
+    return row
+
+
+class OutboxDispatcher:
+    """
+    Background task delivering pending outbox rows.
+    """
+
+    DEFAULT_BATCH_SIZE = 50
+    DEFAULT_POLL_INTERVAL = 5.0  # seconds
+    DEFAULT_MAX_ATTEMPTS = 5
+    DEFAULT_BACKOFF = 30.0  # seconds, doubled per retry
+    RETENTION = timedelta(days=7)  # sent and failed rows are purged after this
+    CLAIM_LEASE = timedelta(minutes=5)  # claimed rows are not re-claimed before this
+    PURGE_INTERVAL = 3600.0  # seconds
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> None:
+        """
+        Initialize the dispatcher.
+
+        Args:
+            batch_size: Rows claimed per transaction.
+            poll_interval: Seconds between polls when not woken.
+            max_attempts: Delivery attempts per row.
+            backoff: Delay before the first retry in seconds.
+        """
+        self._batch_size = max(1, batch_size)
+        self._poll_interval = poll_interval
+        self._max_attempts = max(1, max_attempts)
+        self._backoff = backoff
+        self._line_clients: Dict[str, "LineClient"] = {}
+        self._owned_line_client: Optional["LineClient"] = None
+        self._smtp_pool = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._next_purge = 0.0
+
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.batches = 0
+        # (monotonic send time, lag seconds) of recent deliveries
+        self._recent: deque[tuple[float, float]] = deque(maxlen=1000)
+
+    def register_line_client(self, name: str, client: "LineClient") -> None:
+        """Use `client` for LINE rows whose sender is `name`."""
+        self._line_clients[name] = client
+
+    def _line_client(self, name: str) -> Optional["LineClient"]:
+        client = self._line_clients.get(name)
+        if client is None and name == "core":
+            from core.line_client import LineClient
+            from core.providers import get_configuration_provider
+
+            client = LineClient(get_configuration_provider())
+            self._line_clients[name] = client
+            self._owned_line_client = client
+        return client
+
+    def _get_smtp_pool(self):
+        if self._smtp_pool is None:
+            from core.services.email import get_email_service
+            from core.services.email_queue import SMTPConnectionPool
+
+            self._smtp_pool = SMTPConnectionPool(get_email_service().config, size=1)
+        return self._smtp_pool
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background loop on the running event loop."""
+        if self.running:
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="OutboxDispatcher")
+        logger.info("Outbox dispatcher started")
+
+    def wake(self) -> None:
+        """Dispatch now instead of at the next poll (call after commit)."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self) -> None:
+        """Stop the loop and close SMTP connections. Pending rows stay queued."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._smtp_pool is not None:
+            await self._smtp_pool.close()
+            self._smtp_pool = None
+        if self._owned_line_client is not None:
+            self._line_clients.pop("core", None)
+            await self._owned_line_client.close()
+            self._owned_line_client = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.dispatch_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox dispatch failed: {e}")
+                claimed = 0
+            if claimed >= self._batch_size:
+                continue  # more rows are probably due
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    # -------------------------------------------------------------------------
+    # Dispatch
+    # -------------------------------------------------------------------------
+
+    async def dispatch_once(self) -> int:
+        """
+        Claim and deliver one batch of due rows.
+
+        Rows are claimed in a short transaction that pushes their
+        next_attempt_at out by CLAIM_LEASE, so no connection or row lock is
+        held while sending. Results are written in a second transaction;
+        rows of a dispatcher that died mid-batch become due again when the
+        lease runs out.
+
+        Returns:
+            Number of rows claimed.
+        """
+        from sqlalchemy import delete, or_, select, update
+
+        from core.database import get_standalone_session
+
+        now = datetime.now(timezone.utc)
+        async with get_standalone_session() as session:
+            result = await session.execute(
+                select(NotificationOutbox)
+                .where(
+                    NotificationOutbox.status == OutboxStatus.PENDING,
+                    NotificationOutbox.next_attempt_at <= now,
+                )
+                .order_by(NotificationOutbox.next_attempt_at)
+                .limit(self._batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = list(result.scalars())
+            for row in rows:
+                row.next_attempt_at = now + self.CLAIM_LEASE
+
+            if time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + self.PURGE_INTERVAL
+                await session.execute(
+                    delete(NotificationOutbox).where(
+                        or_(
+                            (NotificationOutbox.status == OutboxStatus.SENT)
+                            & (NotificationOutbox.sent_at < now - self.RETENTION),
+                            (NotificationOutbox.status == OutboxStatus.FAILED)
+                            & (NotificationOutbox.created_at < now - self.RETENTION),
+                        )
+                    )
+                )
+
+        if not rows:
+            return 0
+
+        self.batches += 1
+        await self._deliver(rows)
+
+        async with get_standalone_session() as session:
+            await session.execute(
+                update(NotificationOutbox),
+                [
+                    {
+                        "id": row.id,
+                        "status": row.status,
+                        "attempts": row.attempts,
+                        "next_attempt_at": row.next_attempt_at,
+                        "last_error": row.last_error,
+                        "sent_at": row.sent_at,
+                    }
+                    for row in rows
+                ],
+            )
+        return len(rows)
+
+    async def _deliver(self, rows: List[NotificationOutbox]) -> None:
+        """Send rows and record the outcome on each (saved by the caller)."""
+        emails = [row for row in rows if row.channel == OutboxChannel.EMAIL]
+        pushes = [row for row in rows if row.channel == OutboxChannel.LINE]
+        for row in rows:
+            if row.channel not in (OutboxChannel.EMAIL, OutboxChannel.LINE):
+                self._mark_failed(row, f"Unknown channel: {row.channel}", permanent=True)
+        if emails:
+            await self._send_emails(emails)
+        if pushes:
+            await self._send_line_pushes(pushes)
+
+    async def _send_emails(self, rows: List[NotificationOutbox]) -> None:
+        import aiosmtplib
+
+        from core.services.email import get_email_service
+        from core.services.email_queue import is_permanent_smtp_error
+
+        email_service = get_email_service()
+        if not email_service.is_configured:
+            for row in rows:
+                self._mark_failed(row, "Email service not configured")
+            return
+
+        remaining = list(rows)
+        try:
+            async with self._get_smtp_pool().connection() as smtp:
+                while remaining:
+                    row = remaining[0]
+                    message = email_service._create_message(
+                        row.recipient,
+                        row.subject or "",
+                        row.payload.get("html", ""),
+                        row.payload.get("text"),
+                    )
+                    try:
+                        await smtp.send_message(message)
+                    except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused) as e:
+                        # Rejected message; the connection itself is fine
+                        self._mark_failed(row, str(e), permanent=is_permanent_smtp_error(e))
+                    else:
+                        self._mark_sent(row)
+                    remaining.pop(0)
+        except Exception as e:
+            # Connection-level failure: retry the rest later
+            for row in remaining:
+                self._mark_failed(row, str(e) or type(e).__name__)
+
+    async def _send_line_pushes(self, rows: List[NotificationOutbox]) -> None:
+        from core.line_notify import LineNotificationDispatcher
+
+        # Same sender and messages -> one multicast
+        groups: Dict[tuple[str, str], List[NotificationOutbox]] = {}
+        for row in rows:
+            key = (row.sender, json.dumps(row.payload.get("messages", []), sort_keys=True))
+            groups.setdefault(key, []).append(row)
+
+        for (sender, _), group in groups.items():
+            client = self._line_client(sender)
+            if client is None:
+                for row in group:
+                    self._mark_failed(row, f"No LINE client registered for {sender!r}", permanent=True)
+                continue
+            report = await LineNotificationDispatcher(client).send(
+                [row.recipient for row in group],
+                group[0].payload.get("messages", []),
+            )
+            for row in group:
+                result = report.results.get(row.recipient)
+                if result is not None and result.delivered:
+                    self._mark_sent(row)
+                else:
+                    error = result.error if result is not None else "Invalid recipient"
+                    status_code = result.status_code if result is not None else None
+                    permanent = status_code is not None and 400 <= status_code < 500 and status_code != 429
+                    self._mark_failed(row, error or "LINE delivery failed", permanent=permanent)
+
+    def _mark_sent(self, row: NotificationOutbox) -> None:
+        now = datetime.now(timezone.utc)
+        row.status = OutboxStatus.SENT
+        row.attempts += 1
+        row.sent_at = now
+        row.last_error = None
+        self.sent += 1
+        lag = (now - row.created_at).total_seconds() if row.created_at else 0.0
+        self._recent.append((time.monotonic(), max(0.0, lag)))
+
+    def _mark_failed(self, row: NotificationOutbox, error: str, permanent: bool = False) -> None:
+        row.attempts += 1
+        row.last_error = error[:1000]
+        if permanent or row.attempts >= self._max_attempts:
+            row.status = OutboxStatus.FAILED
+            self.failed += 1
+            logger.error(
+                f"Outbox {row.channel} to {row.recipient} failed after "
+                f"{row.attempts} attempt(s): {error}"
+            )
+            return
+        self.retries += 1
+        delay = self._backoff * 2 ** (row.attempts - 1)
+        row.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        logger.warning(
+            f"Outbox {row.channel} to {row.recipient} failed ({error}); retrying in {delay:.0f}s"
+        )
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Delivery counters, throughput and lag of recent deliveries."""
+        cutoff = time.monotonic() - 60.0
+        lags = [lag for _, lag in self._recent]
+        return {
+            "running": self.running,
+            "batches": self.batches,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "sent_last_minute": sum(1 for sent_at, _ in self._recent if sent_at >= cutoff),
+            "lag_avg_seconds": round(sum(lags) / len(lags), 3) if lags else 0.0,
+            "lag_max_seconds": round(max(lags), 3) if lags else 0.0,
+        }
+
+    async def get_backlog(self) -> Dict[str, Any]:
+        """Pending row count and age of the oldest pending row (queries the DB)."""
+        from sqlalchemy import func, select
+
+        from core.database import get_standalone_session
+
+        async with get_standalone_session() as session:
+            result = await session.execute(
+                select(func.count(), func.min(NotificationOutbox.created_at))
+                .where(NotificationOutbox.status == OutboxStatus.PENDING)
+            )
+            pending, oldest = result.one()
+        age = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0.0
+        return {"pending": pending, "oldest_pending_seconds": round(age, 3)}
+
+
+# Singleton
+_outbox_dispatcher: OutboxDispatcher | None = None
+
+
+def get_outbox_dispatcher() -> OutboxDispatcher:
+    """
+    Get singleton OutboxDispatcher.
+
+    Batch size, poll interval and attempts come from `outbox.batch_size`,
+    `outbox.poll_interval` and `outbox.max_attempts`.
+    """
+    global _outbox_dispatcher
+    if _outbox_dispatcher is None:
+        from core.providers import get_configuration_provider
+
+        config = get_configuration_provider()
+        _outbox_dispatcher = OutboxDispatcher(
+            batch_size=config.get("outbox.batch_size", OutboxDispatcher.DEFAULT_BATCH_SIZE),
+            poll_interval=config.get("outbox.poll_interval", OutboxDispatcher.DEFAULT_POLL_INTERVAL),
+            max_attempts=config.get("outbox.max_attempts", OutboxDispatcher.DEFAULT_MAX_ATTEMPTS),
+        )
+    return _outbox_dispatcher
+
+
+async def shutdown_outbox_dispatcher() -> None:
+    """Stop the dispatcher (app shutdown)."""
+    if _outbox_dispatcher is not None:
+        await _outbox_dispatcher.stop()
+
+
+def reset_outbox_dispatcher() -> None:
+    """Reset singleton (for testing)."""
+    global _outbox_dispatcher
+    _outbox_dispatcher = None
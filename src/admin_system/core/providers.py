@@ -11,12 +11,15 @@ Each provider follows:
 """
 
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Generic, Optional, Protocol, TypeVar, TYPE_CHECKING
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Generic, Mapping, Optional, Protocol, TypeVar, TYPE_CHECKING
 import logging
 import os
+import threading
 
 from dotenv import load_dotenv
 
@@ -46,16 +49,51 @@ class IConfigurationProvider(Protocol):
         ...
 
 
+_MISSING = object()
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively wrap nested dicts in read-only mapping proxies."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Recursively copy read-only mappings back into plain dicts."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
+
+def _compile_paths(config: Mapping[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flatten a nested config into a {"dotted.key": value} lookup table."""
+    paths: Dict[str, Any] = {}
+    for key, value in config.items():
+        path = f"{prefix}{key}"
+        paths[path] = value
+        if isinstance(value, Mapping):
+            paths.update(_compile_paths(value, f"{path}."))
+    return paths
+
+
 @dataclass
 class ConfigurationProvider:
     """
     Provides configuration values loaded from environment variables.
     
     Implements IConfigurationProvider protocol for type-safe configuration access.
+    
+    Once loaded, the configuration is an immutable snapshot: nested sections
+    are read-only mappings and every dotted key path is precompiled, so
+    `get()` is a single dict lookup. Use the process-wide instance from
+    `get_configuration_provider()`; call `reload_configuration_provider()`
+    to pick up environment changes.
     """
     
-    _config: Dict[str, Any] = field(default_factory=dict)
+    _config: Mapping[str, Any] = field(default_factory=dict)
     _loaded: bool = field(default=False)
+    _paths: Dict[str, Any] = field(default_factory=dict, repr=False)
     
     def load(self, env_path: Optional[str] = None) -> "ConfigurationProvider":
         """
@@ -86,7 +124,9 @@ class ConfigurationProvider:
             },
             "app": {
                 "debug": os.getenv("APP_DEBUG", "true").lower() == "true",
-                "log_level": os.getenv("APP_LOG_LEVEL", "INFO")
+                "log_level": os.getenv("APP_LOG_LEVEL", "INFO"),
+                "log_async": os.getenv("APP_LOG_ASYNC", "true").lower() == "true",
+                "log_queue_size": int(os.getenv("APP_LOG_QUEUE_SIZE", "10000"))
             },
             "database": {
                 "url": os.getenv("DATABASE_URL", "")
@@ -103,7 +143,14 @@ class ConfigurationProvider:
                 "username": os.getenv("SMTP_USERNAME", ""),
                 "password": os.getenv("SMTP_PASSWORD", ""),
                 "from_email": os.getenv("SMTP_FROM_EMAIL", ""),
-                "from_name": os.getenv("SMTP_FROM_NAME", "Admin System")
+                "from_name": os.getenv("SMTP_FROM_NAME", "Admin System"),
+                "queue_workers": int(os.getenv("EMAIL_QUEUE_WORKERS", "2")),
+                "queue_size": int(os.getenv("EMAIL_QUEUE_SIZE", "500"))
+            },
+            "outbox": {
+                "batch_size": int(os.getenv("OUTBOX_BATCH_SIZE", "50")),
+                "poll_interval": float(os.getenv("OUTBOX_POLL_INTERVAL", "5")),
+                "max_attempts": int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
             },
             "vector": {
                 "model_name": os.getenv("EMBEDDING_MODEL_NAME", "paraphrase-multilingual-MiniLM-L12-v2"),
@@ -114,7 +161,12 @@ class ConfigurationProvider:
             "line": {
                 "channel_id": os.getenv("LINE_CHANNEL_ID", ""),
                 "channel_secret": os.getenv("LINE_CHANNEL_SECRET", ""),
-                "channel_access_token": os.getenv("LINE_CHANNEL_ACCESS_TOKEN", "")
+                "channel_access_token": os.getenv("LINE_CHANNEL_ACCESS_TOKEN", ""),
+                "local_id_token_verify": os.getenv("LINE_LOCAL_ID_TOKEN_VERIFY", "true").lower() == "true",
+                "webhook_workers": int(os.getenv("LINE_WEBHOOK_WORKERS", "8")),
+                "webhook_queue_size": int(os.getenv("LINE_WEBHOOK_QUEUE_SIZE", "1000")),
+                "webhook_dedup_backend": os.getenv("LINE_WEBHOOK_DEDUP_BACKEND", "memory").lower(),
+                "webhook_dedup_ttl": float(os.getenv("LINE_WEBHOOK_DEDUP_TTL", "86400"))
             },
             "ragic": {
                 "api_key": os.getenv("RAGIC_API_KEY", ""),
@@ -134,6 +186,8 @@ class ConfigurationProvider:
                 }
             }
         }
+        self._config = _freeze(self._config)
+        self._paths = _compile_paths(self._config)
         self._loaded = True
         return self
     
@@ -148,15 +202,41 @@ class ConfigurationProvider:
         Returns:
             Configuration value or default
         """
-        keys = key.split('.')
-        value = self._config
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
+        value = self._paths.get(key, _MISSING)
+        if value is _MISSING:
+            return default
         return value
     
+    def with_overrides(self, overrides: Mapping[str, Any]) -> "ConfigurationProvider":
+        """
+        Create a copy of this snapshot with some values replaced.
+        
+        The snapshot itself is left untouched; the copy is frozen and its
+        key paths recompiled like a freshly loaded one.
+        
+        Args:
+            overrides: Values keyed by dot notation path (e.g., "app.debug")
+            
+        Returns:
+            A new ConfigurationProvider
+        """
+        config = _thaw(self._config)
+        for key, value in overrides.items():
+            *parents, leaf = key.split(".")
+            current = config
+            for part in parents:
+                if not isinstance(current.get(part), dict):
+                    current[part] = {}
+                current = current[part]
+            current[leaf] = _thaw(value)
+        
+        frozen = _freeze(config)
+        return ConfigurationProvider(
+            _config=frozen,
+            _loaded=True,
+            _paths=_compile_paths(frozen),
+        )
+    
     def is_line_configured(self) -> bool:
         """Check if LINE credentials are set."""
         return bool(
@@ -174,6 +254,8 @@ class ConfigurationProvider:
 
 # Singleton instance
 _configuration_provider: Optional[ConfigurationProvider] = None
+_configuration_lock = threading.Lock()
+_reload_hooks: list[Callable[[ConfigurationProvider], None]] = []
 
 
 def get_configuration_provider() -> ConfigurationProvider:
@@ -184,10 +266,59 @@ def get_configuration_provider() -> ConfigurationProvider:
         ConfigurationProvider: The configuration provider
     """
     global _configuration_provider
-    if _configuration_provider is None:
-        _configuration_provider = ConfigurationProvider()
-        _configuration_provider.load()
-    return _configuration_provider
+    provider = _configuration_provider
+    if provider is None:
+        with _configuration_lock:
+            if _configuration_provider is None:
+                _configuration_provider = ConfigurationProvider().load()
+            provider = _configuration_provider
+    return provider
+
+
+def register_config_reload_hook(hook: Callable[[ConfigurationProvider], None]) -> None:
+    """
+    Register a callback invoked with the new snapshot after each reload.
+    
+    Use this to drop values derived from configuration (cached keys,
+    clients built from credentials, etc.).
+    
+    Args:
+        hook: Callable receiving the freshly loaded ConfigurationProvider
+    """
+    if hook not in _reload_hooks:
+        _reload_hooks.append(hook)
+
+
+def reload_configuration_provider(env_path: Optional[str] = None) -> ConfigurationProvider:
+    """
+    Build a new configuration snapshot and swap it in atomically.
+    
+    Readers holding the previous snapshot keep a consistent view; new
+    calls to `get_configuration_provider()` see the new one.
+    
+    Args:
+        env_path: Optional path to .env file
+        
+    Returns:
+        ConfigurationProvider: The new configuration provider
+    """
+    global _configuration_provider
+    provider = ConfigurationProvider().load(env_path)
+    with _configuration_lock:
+        _configuration_provider = provider
+    for hook in list(_reload_hooks):
+        try:
+            hook(provider)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Config reload hook {hook!r} failed: {e}")
+    return provider
+
+
+def reset_configuration_provider() -> None:
+    """Reset singleton (for testing)."""
+    global _configuration_provider
+    with _configuration_lock:
+        _configuration_provider = None
 
 
 def get_settings() -> ConfigurationProvider:
@@ -211,37 +342,145 @@ class ILogService(Protocol):
         ...
 
 
-@dataclass
+# Event log levels; any other "level" passed to log_event (e.g., "LOADER",
+# "CHATBOT") is treated as the entry's source with INFO severity
+EVENT_LOG_LEVELS = frozenset({"DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL"})
+
+
+@dataclass(frozen=True)
+class EventLogEntry:
+    """A structured event log entry."""
+    
+    seq: int
+    timestamp: datetime
+    level: str
+    source: str
+    message: str
+    
+    def format(self) -> str:
+        """Format as "[HH:MM:SS] [TAG] message" (TAG is the source, else the level)."""
+        return f"[{self.timestamp:%H:%M:%S}] [{self.source or self.level}] {self.message}"
+
+
 class LogService:
     """
     Centralized logging service with event history.
     
     Provides both standard logging and an in-memory event log
-    for GUI/dashboard display.
+    for GUI/dashboard display. The event log is a fixed-capacity ring
+    buffer of structured entries; each entry gets a monotonically
+    increasing sequence number used as the pagination cursor.
     """
     
-    _event_log: list[str] = field(default_factory=list)
-    _max_entries: int = 500
-    _logger: logging.Logger = field(default_factory=lambda: logging.getLogger("LogService"))
+    DEFAULT_MAX_ENTRIES = 500
     
-    def log_event(self, message: str, level: str = "INFO") -> None:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self._event_log: deque[EventLogEntry] = deque(maxlen=max_entries)
+        self._next_seq = 1
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[EventLogEntry], None]] = []
+        self._logger = logging.getLogger("LogService")
+    
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest entry (0 if none yet)."""
+        return self._next_seq - 1
+    
+    def log_event(self, message: str, level: str = "INFO", source: str = "") -> None:
         """
         Log an event to both logger and event log.
         
         Args:
             message: The message to log
-            level: Log level (INFO, ERROR, SUCCESS, WARN, etc.)
+            level: Log level (INFO, ERROR, SUCCESS, WARN, etc.) or a source
+                   tag such as "LOADER"
+            source: Component that produced the event
         """
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted = f"[{timestamp}] [{level}] {message}"
+        level = level.upper()
+        if level == "WARN":
+            level = "WARNING"
+        if level not in EVENT_LOG_LEVELS:
+            source = source or level
+            level = "INFO"
         
-        self._event_log.append(formatted)
-        if len(self._event_log) > self._max_entries:
-            self._event_log = self._event_log[-self._max_entries:]
+        with self._lock:
+            entry = EventLogEntry(
+                seq=self._next_seq,
+                timestamp=datetime.now(),
+                level=level,
+                source=source,
+                message=message,
+            )
+            self._next_seq += 1
+            self._event_log.append(entry)
         
         # Map to standard logging levels
-        log_level = getattr(logging, level.upper(), logging.INFO)
+        log_level = getattr(logging, level, logging.INFO)
         self._logger.log(log_level, message)
+        
+        for listener in list(self._listeners):
+            try:
+                listener(entry)
+            except Exception as e:
+                self._logger.warning(f"Event log listener failed: {e}")
+    
+    def add_listener(self, listener: Callable[[EventLogEntry], None]) -> None:
+        """
+        Call `listener(entry)` for every new entry (e.g., to stream it).
+        
+        Listeners run on the logging thread and must not block.
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[EventLogEntry], None]) -> None:
+        """Stop calling a listener."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+    
+    def get_entries(
+        self,
+        limit: int = 100,
+        before: Optional[int] = None,
+        levels: Optional[set[str]] = None,
+    ) -> tuple[list[EventLogEntry], Optional[int]]:
+        """
+        Get a page of entries, newest first.
+        
+        Args:
+            limit: Maximum number of entries to return
+            before: Cursor; only entries with a lower sequence number are returned
+            levels: Only return entries with these levels
+        
+        Returns:
+            (entries, next_cursor); next_cursor is None when there are no
+            older matching entries.
+        """
+        page: list[EventLogEntry] = []
+        with self._lock:
+            for entry in reversed(self._event_log):
+                if before is not None and entry.seq >= before:
+                    continue
+                if levels and entry.level not in levels:
+                    continue
+                if len(page) == limit:
+                    return page, page[-1].seq
+                page.append(entry)
+        return page, None
+    
+    def get_entries_since(self, after: int) -> list[EventLogEntry]:
+        """
+        Get entries newer than a cursor, oldest first (for resuming streams).
+        
+        Args:
+            after: Sequence number of the last entry the caller has seen
+        """
+        with self._lock:
+            if not self._event_log or self._event_log[-1].seq <= after:
+                return []
+            return [entry for entry in self._event_log if entry.seq > after]
     
     def get_event_log(self) -> list[str]:
         """
@@ -250,11 +489,16 @@ class LogService:
         Returns:
             List of formatted log entries
         """
-        return self._event_log.copy()
+        with self._lock:
+            return [entry.format() for entry in self._event_log]
     
     def clear_event_log(self) -> None:
         """Clear the event log."""
-        self._event_log.clear()
+        with self._lock:
+            self._event_log.clear()
+    
+    def __len__(self) -> int:
+        return len(self._event_log)
 
 
 # Singleton instance
@@ -29,7 +29,7 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
-from core.app_context import ConfigLoader
+from core.providers import get_configuration_provider
 
 logger = logging.getLogger(__name__)
 
@@ -66,9 +66,7 @@ class RagicService:
         
         # Load from config if not provided
         if not api_key or not base_url:
-            config = ConfigLoader()
-            config.load()
-            ragic_config = config.get("ragic", {})
+            ragic_config = get_configuration_provider().get("ragic", {})
             
             self._api_key = api_key or ragic_config.get("api_key", "")
             self._base_url = (base_url or ragic_config.get("base_url", "https://ap13.ragic.com")).rstrip("/")
@@ -632,6 +632,10 @@ class RagicSyncManager:
         if self._startup_complete:
             return
         
+        from core.readiness import get_readiness
+        readiness = get_readiness()
+        readiness.register("initial_sync", "Initial Ragic sync")
+        
         def sync_worker() -> None:
             """
             Background sync worker function.
@@ -670,12 +674,21 @@ class RagicSyncManager:
                             f"[{key}] Sync complete: "
                             f"{result.synced} synced, {result.errors} errors"
                         )
+                    
+                    failed = [key for key, result in results.items() if result.errors]
+                    if failed:
+                        readiness.mark_failed(
+                            "initial_sync", f"Sync errors in: {', '.join(failed)}"
+                        )
+                    else:
+                        readiness.mark_ready("initial_sync", f"{len(results)} service(s) synced")
             
             try:
                 loop.run_until_complete(run_sync())
                     
             except Exception as e:
                 logger.exception(f"Background sync failed: {e}")
+                readiness.mark_failed("initial_sync", str(e))
                 
             finally:
                 # Cleanup thread-local database engine
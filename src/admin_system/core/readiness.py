@@ -0,0 +1,138 @@
+"""
+Startup Readiness Tracking.
+
+`/health` only tells whether the process is alive. Right after a deploy the
+instance still has to connect to the database, warm the embedding model and
+run the initial Ragic sync; traffic routed to it before then hits a cold
+model. Components register a readiness phase when they start warming up and
+mark it finished when done:
+
+    readiness = get_readiness()
+    readiness.register("embedding_model", "Embedding model warmup")
+    ...
+    readiness.mark_ready("embedding_model")
+
+`/ready` returns 503 until every registered phase has finished. A phase that
+finished with an error (e.g., Ragic unreachable) does not block readiness
+forever; it is reported and the instance is flagged as degraded.
+
+Thread Safety:
+    Phases are marked from background threads (model preload, sync worker),
+    so all access goes through a threading.Lock.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PHASE_PENDING = "pending"
+PHASE_READY = "ready"
+PHASE_FAILED = "failed"
+
+
+@dataclass
+class ReadinessPhase:
+    """A single startup phase."""
+
+    name: str
+    description: str = ""
+    status: str = PHASE_PENDING
+    detail: Optional[str] = None
+    started_at: float = field(default_factory=time.monotonic)
+    duration_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "description": self.description,
+            "status": self.status,
+            "detail": self.detail,
+            "duration_ms": round(self.duration_ms, 1) if self.duration_ms is not None else None,
+        }
+
+
+class ReadinessTracker:
+    """
+    Tracks startup phases and decides whether the instance can take traffic.
+    """
+
+    def __init__(self) -> None:
+        self._phases: Dict[str, ReadinessPhase] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, description: str = "") -> None:
+        """
+        Register a phase as pending (re-registering restarts it).
+
+        Args:
+            name: Phase key (e.g., "database", "embedding_model").
+            description: Human-readable description.
+        """
+        with self._lock:
+            self._phases[name] = ReadinessPhase(name=name, description=description)
+        logger.debug(f"Readiness phase registered: {name}")
+
+    def _finish(self, name: str, status: str, detail: Optional[str]) -> None:
+        with self._lock:
+            phase = self._phases.get(name)
+            if phase is None:
+                phase = ReadinessPhase(name=name)
+                self._phases[name] = phase
+            phase.status = status
+            phase.detail = detail
+            phase.duration_ms = (time.monotonic() - phase.started_at) * 1000
+
+    def mark_ready(self, name: str, detail: Optional[str] = None) -> None:
+        """Mark a phase as successfully finished."""
+        self._finish(name, PHASE_READY, detail)
+        logger.info(f"Readiness phase ready: {name}")
+
+    def mark_failed(self, name: str, detail: str) -> None:
+        """Mark a phase as finished with an error."""
+        self._finish(name, PHASE_FAILED, detail)
+        logger.warning(f"Readiness phase failed: {name}: {detail}")
+
+    def get_phase_status(self, name: str) -> Optional[str]:
+        """Get the status of a phase, or None if it is not registered."""
+        with self._lock:
+            phase = self._phases.get(name)
+            return phase.status if phase is not None else None
+
+    def is_ready(self) -> bool:
+        """True when no registered phase is still pending."""
+        with self._lock:
+            return all(p.status != PHASE_PENDING for p in self._phases.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the readiness state for the `/ready` endpoint.
+
+        Returns:
+            Dict with "ready", "degraded" and per-phase details.
+        """
+        with self._lock:
+            phases = {name: phase.to_dict() for name, phase in self._phases.items()}
+            ready = all(p.status != PHASE_PENDING for p in self._phases.values())
+            degraded = any(p.status == PHASE_FAILED for p in self._phases.values())
+        return {"ready": ready, "degraded": degraded, "phases": phases}
+
+
+# Singleton
+_readiness: ReadinessTracker | None = None
+
+
+def get_readiness() -> ReadinessTracker:
+    """Get singleton ReadinessTracker instance."""
+    global _readiness
+    if _readiness is None:
+        _readiness = ReadinessTracker()
+    return _readiness
+
+
+def reset_readiness() -> None:
+    """Reset singleton (for testing)."""
+    global _readiness
+    _readiness = None
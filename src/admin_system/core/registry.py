@@ -10,9 +10,11 @@ Key Principles:
 - SRP: Registry only handles module lifecycle, not business logic
 """
 
+from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional, Type
 import inspect
 import logging
+import time
 
 from core.interface import IAppModule, IModuleContext, ModuleContext
 from core.providers import (
@@ -29,6 +31,29 @@ if TYPE_CHECKING:
     from core.app_context import AppContext
 
 
+@dataclass
+class ModuleStartupTiming:
+    """Startup cost of a single module, in milliseconds."""
+    
+    name: str
+    import_ms: float = 0.0
+    on_entry_ms: float = 0.0
+    async_startup_ms: float = 0.0
+    
+    @property
+    def total_ms(self) -> float:
+        return self.import_ms + self.on_entry_ms + self.async_startup_ms
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "import_ms": round(self.import_ms, 1),
+            "on_entry_ms": round(self.on_entry_ms, 1),
+            "async_startup_ms": round(self.async_startup_ms, 1),
+            "total_ms": round(self.total_ms, 1),
+        }
+
+
 class ModuleRegistry:
     """
     Registry for managing application modules.
@@ -63,6 +88,7 @@ class ModuleRegistry:
         self._logger = logging.getLogger(__name__)
         self._context: Optional["AppContext"] = None
         self._module_context: Optional[IModuleContext] = None
+        self._startup_timings: Dict[str, ModuleStartupTiming] = {}
         self._initialized = True
     
     def set_context(self, context: "AppContext") -> None:
@@ -113,12 +139,15 @@ class ModuleRegistry:
         
         # Initialize module if context is available
         if self._context:
+            start = time.perf_counter()
             try:
                 module.on_entry(self._context)
                 self._context.log_event(f"Module '{module_name}' initialized", "SUCCESS")
             except Exception as e:
                 self._logger.error(f"Failed to initialize module '{module_name}': {e}")
                 self._context.log_event(f"Module '{module_name}' init failed: {e}", "ERROR")
+            finally:
+                self._get_timing(module_name).on_entry_ms = (time.perf_counter() - start) * 1000
         
         return True
     
@@ -293,12 +322,52 @@ class ModuleRegistry:
         """
         for module_name, module in self._modules.items():
             if hasattr(module, 'async_startup'):
+                start = time.perf_counter()
                 try:
                     await module.async_startup()
                     self._logger.info(f"Module '{module_name}' async startup completed.")
                 except Exception as e:
                     self._logger.error(f"Module '{module_name}' async startup failed: {e}")
+                finally:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    self._get_timing(module_name).async_startup_ms = elapsed_ms
 
+    # -------------------------------------------------------------------------
+    # Startup Profiling
+    # -------------------------------------------------------------------------
+    
+    def _get_timing(self, module_name: str) -> ModuleStartupTiming:
+        timing = self._startup_timings.get(module_name)
+        if timing is None:
+            timing = ModuleStartupTiming(name=module_name)
+            self._startup_timings[module_name] = timing
+        return timing
+    
+    def record_import_time(self, module_name: str, import_ms: float) -> None:
+        """
+        Record how long importing a module's code took (set by ModuleLoader).
+        
+        Args:
+            module_name: Registered module name
+            import_ms: Import time in milliseconds
+        """
+        self._get_timing(module_name).import_ms = import_ms
+    
+    def get_startup_report(self) -> Dict[str, Any]:
+        """
+        Get per-module startup timings, slowest first.
+        
+        Returns:
+            Dict with "modules" (list of timing dicts) and "total_ms"
+        """
+        timings = sorted(
+            self._startup_timings.values(), key=lambda t: t.total_ms, reverse=True
+        )
+        return {
+            "modules": [t.to_dict() for t in timings],
+            "total_ms": round(sum(t.total_ms for t in timings), 1),
+        }
+    
     def shutdown_all(self) -> None:
         """Shutdown all registered modules."""
         for module_name in list(self._modules.keys()):
@@ -320,6 +389,7 @@ class ModuleRegistry:
             cls._instance._modules.clear()
             cls._instance._context = None
             cls._instance._module_context = None
+            cls._instance._startup_timings.clear()
         cls._instance = None
     
     @classmethod
@@ -397,17 +467,12 @@ class ModuleLoader:
                     module_file
                 )
                 if spec and spec.loader:
+                    start = time.perf_counter()
                     module = importlib.util.module_from_spec(spec)
                     spec.loader.exec_module(module)
+                    import_ms = (time.perf_counter() - start) * 1000
                     
-                    # Look for module classes that implement IAppModule
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if (isinstance(attr, type) and 
-                            issubclass(attr, IAppModule) and 
-                            attr is not IAppModule):
-                            if self._registry.register_class(attr):
-                                loaded_count += 1
+                    loaded_count += self._register_module_classes(module, import_ms)
                                 
             except Exception as e:
                 self._logger.error(f"Error loading module from '{module_file}': {e}")
@@ -426,19 +491,42 @@ class ModuleLoader:
             try:
                 # Import the package using its dotted name
                 package_name = f"modules.{subdir.name}"
+                start = time.perf_counter()
                 module = importlib.import_module(package_name)
+                import_ms = (time.perf_counter() - start) * 1000
                 
-                # Look for IAppModule implementations
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
-                    if (isinstance(attr, type) and 
-                        issubclass(attr, IAppModule) and 
-                        attr is not IAppModule):
-                        if self._registry.register_class(attr):
-                            loaded_count += 1
-                            self._logger.info(f"Loaded package module: {subdir.name}")
+                registered = self._register_module_classes(module, import_ms)
+                if registered:
+                    loaded_count += registered
+                    self._logger.info(
+                        f"Loaded package module: {subdir.name} (import {import_ms:.0f} ms)"
+                    )
                             
             except Exception as e:
                 self._logger.error(f"Error loading package module '{subdir.name}': {e}")
         
         return loaded_count
+    
+    def _register_module_classes(self, module: Any, import_ms: float) -> int:
+        """
+        Register every IAppModule implementation found in an imported module.
+        
+        Args:
+            module: The imported Python module
+            import_ms: Time spent importing it, recorded for the startup report
+            
+        Returns:
+            int: Number of modules registered
+        """
+        registered = 0
+        for attr_name in dir(module):
+            attr = getattr(module, attr_name)
+            if (isinstance(attr, type) and 
+                issubclass(attr, IAppModule) and 
+                attr is not IAppModule):
+                before = set(self._registry.get_module_names())
+                if self._registry.register_class(attr):
+                    registered += 1
+                    for module_name in set(self._registry.get_module_names()) - before:
+                        self._registry.record_import_time(module_name, import_ms)
+        return registered
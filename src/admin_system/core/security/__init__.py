@@ -6,6 +6,7 @@ and webhook signature validation.
 """
 
 from core.security.encryption import (
+    EncryptedJSONType,
     EncryptedType,
     EncryptionService,
     KeyDerivationService,
@@ -23,6 +24,7 @@ from core.security.webhook import (
 
 __all__ = [
     # Encryption
+    "EncryptedJSONType",
     "EncryptedType",
     "EncryptionService",
     "KeyDerivationService",
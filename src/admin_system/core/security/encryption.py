@@ -28,6 +28,7 @@ Alternatively, set ENCRYPTION_LEGACY_MODE=true to use the old key derivation
 
 import hashlib
 import hmac
+import json
 import os
 from enum import Enum
 from typing import Any
@@ -36,10 +37,10 @@ from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
-from sqlalchemy import String, TypeDecorator
+from sqlalchemy import String, Text, TypeDecorator
 from sqlalchemy.engine import Dialect
 
-from core.app_context import ConfigLoader
+from core.providers import get_configuration_provider
 
 
 class KeyPurpose(Enum):
@@ -130,9 +131,7 @@ def _load_master_key() -> bytes:
     Raises:
         ValueError: If key is not found or invalid.
     """
-    config_loader = ConfigLoader()
-    config_loader.load()
-    security_key = config_loader.get("security.key", os.getenv("SECURITY_KEY", ""))
+    security_key = get_configuration_provider().get("security.key", os.getenv("SECURITY_KEY", ""))
     
     if not security_key:
         raise ValueError(
@@ -349,6 +348,39 @@ class EncryptedType(TypeDecorator):
         return service.decrypt(encrypted_bytes)
 
 
+class EncryptedJSONType(TypeDecorator):
+    """
+    SQLAlchemy TypeDecorator for encrypted JSON documents.
+    
+    Serializes the value to JSON, encrypts it like EncryptedType and
+    stores the hex string in a TEXT column. The content cannot be queried
+    in SQL.
+    
+    Usage:
+        class Outbox(Base):
+            payload: Mapped[dict] = mapped_column(EncryptedJSONType())
+    """
+    
+    impl = Text
+    cache_ok = True
+    
+    def process_bind_param(self, value: Any, dialect: Dialect) -> str | None:
+        """Serialize and encrypt value before storing in database."""
+        if value is None:
+            return None
+        
+        service = get_encryption_service()
+        return service.encrypt(json.dumps(value, ensure_ascii=False)).hex()
+    
+    def process_result_value(self, value: str | None, dialect: Dialect) -> Any:
+        """Decrypt and deserialize value when reading from database."""
+        if value is None:
+            return None
+        
+        service = get_encryption_service()
+        return json.loads(service.decrypt(bytes.fromhex(value)))
+
+
 def generate_blind_index(value: str) -> str:
     """
     Helper function to generate blind index for a value.
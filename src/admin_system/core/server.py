@@ -13,8 +13,11 @@ import logging
 
 from fastapi import FastAPI, Header, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from core.app_context import AppContext
+from core.line_dedup import get_line_event_deduplicator, get_webhook_event_id
+from core.line_dispatch import get_line_event_dispatcher
 
 if TYPE_CHECKING:
     from core.registry import ModuleRegistry
@@ -161,10 +164,17 @@ def create_base_app(
 def _register_core_routes(app: FastAPI) -> None:
     """Register core API routes (health check, root redirect)."""
     from core.api.auth import router as auth_router
+    from core.api.templates import get_template_cache
 
     # Include authentication router
     app.include_router(auth_router)
 
+    # Compile auth page templates up front so the first request skips disk I/O
+    try:
+        get_template_cache().preload()
+    except OSError as e:
+        _logger.warning(f"Auth template preload failed: {e}")
+
     @app.get("/")
     async def root() -> dict[str, str]:
         """Root endpoint - redirects to login page."""
@@ -177,6 +187,22 @@ def _register_core_routes(app: FastAPI) -> None:
         """Health check endpoint."""
         return {"status": "ok", "service": "Admin System Core"}
 
+    @app.get("/ready")
+    async def readiness_check() -> JSONResponse:
+        """
+        Readiness endpoint for load balancers.
+
+        Returns 503 until startup warmup (database, embedding model, initial
+        sync) has finished; `/health` stays a pure liveness check.
+        """
+        from core.readiness import get_readiness
+
+        report = get_readiness().snapshot()
+        return JSONResponse(
+            status_code=200 if report["ready"] else 503,
+            content=report,
+        )
+
 
 def _register_line_webhook_routes(app: FastAPI) -> None:
     """Register LINE webhook routes with signature verification."""
@@ -254,17 +280,40 @@ def _register_line_webhook_routes(app: FastAPI) -> None:
         events = payload.get("events", [])
         context.log_event(f"LINE webhook: {len(events)} event(s) for {module_name}", "WEBHOOK")
 
-        # 6. Process events
-        responses: list[dict[str, Any]] = []
-        for event in events:
-            try:
-                response = await module.handle_line_event(event, context)
-                responses.append({"status": "ok", "response": response})
-            except Exception as e:
-                _logger.error(f"Error handling LINE event in '{module_name}': {e}")
-                responses.append({"status": "error", "error": str(e)})
-
-        return {"processed": len(responses), "results": responses}
+        # 6. Skip redelivered events that were already accepted
+        deduplicator = get_line_event_deduplicator()
+        fresh_events = await deduplicator.filter_new(module_name, events)
+        if len(fresh_events) < len(events):
+            context.log_event(
+                f"LINE webhook: {len(events) - len(fresh_events)} redelivered event(s) skipped for {module_name}",
+                "WEBHOOK",
+            )
+
+        # 7. Enqueue events for background workers and acknowledge immediately
+        async def handle_event(event: dict[str, Any]) -> Any:
+            return await module.handle_line_event(event, context)
+
+        dispatcher = get_line_event_dispatcher(module_name, handle_event)
+        rejected = [event for event in fresh_events if not dispatcher.enqueue(event)]
+        if rejected:
+            # Queue full: let LINE redeliver the batch later. Events of the
+            # batch that were queued stay marked as seen and are skipped as
+            # duplicates on redelivery; the rejected ones are released so
+            # the redelivery accepts them.
+            _logger.warning(f"LINE event queue full for '{module_name}': {len(rejected)} event(s) rejected")
+            context.log_event(
+                f"LINE webhook: event queue full, {len(rejected)} event(s) rejected for {module_name}",
+                "WARNING",
+            )
+            await deduplicator.release(
+                [event_id for event_id in map(get_webhook_event_id, rejected) if event_id]
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Event queue full",
+            )
+
+        return {"accepted": len(fresh_events), "duplicates": len(events) - len(fresh_events)}
 
 
 def _verify_line_signature(body: bytes, signature: str, channel_secret: str) -> bool:
@@ -29,6 +29,15 @@ from core.services.auth_token import (
     create_magic_link_token,
     decode_magic_link_token,
 )
+from core.services.binding_cache import (
+    LineBindingCache,
+    get_binding_cache,
+)
+from core.services.line_jwks import (
+    LineJwksVerifier,
+    VerifiedTokenCache,
+    get_line_jwks_verifier,
+)
 from core.services.email import (
     EmailService,
     EmailSendError,
@@ -36,6 +45,17 @@ from core.services.email import (
     EmailTemplates,
     get_email_service,
 )
+from core.services.email_templates import (
+    EmailTemplate,
+    EmailTemplateRegistry,
+    RenderedEmail,
+    get_email_template_registry,
+)
+from core.services.email_queue import (
+    EmailQueue,
+    SMTPConnectionPool,
+    get_email_queue,
+)
 from core.services.user_sync import (
     UserSyncService,
     UserRagicWriter,
@@ -66,6 +86,13 @@ __all__ = [
     "LineIdTokenInvalidError",
     "AccountNotBoundError",
     "get_auth_service",
+    # LINE Binding Cache
+    "LineBindingCache",
+    "get_binding_cache",
+    # LINE ID Token (local JWKS verification)
+    "LineJwksVerifier",
+    "VerifiedTokenCache",
+    "get_line_jwks_verifier",
     # Token
     "MagicLinkPayload",
     "create_magic_link_token",
@@ -76,6 +103,15 @@ __all__ = [
     "EmailConfig",
     "EmailTemplates",
     "get_email_service",
+    # Email Templates (precompiled)
+    "EmailTemplate",
+    "EmailTemplateRegistry",
+    "RenderedEmail",
+    "get_email_template_registry",
+    # Email Queue (background delivery)
+    "EmailQueue",
+    "SMTPConnectionPool",
+    "get_email_queue",
     # User Sync (Ragic Master)
     "UserSyncService",
     "UserRagicWriter",
@@ -20,13 +20,26 @@ from typing import Any
 from urllib.parse import urlencode
 
 import httpx
+import jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.app_context import ConfigLoader
+from core.providers import (
+    ConfigurationProvider,
+    get_configuration_provider,
+    register_config_reload_hook,
+)
 from core.models import User, UsedToken
 from core.schemas.auth import UserResponse
 from core.security import generate_blind_index
+from core.services.binding_cache import LineBindingCache, get_binding_cache
+from core.services.line_jwks import (
+    JwksUnavailableError,
+    LineJwksVerifier,
+    VerifiedTokenCache,
+    get_line_jwks_verifier,
+)
 from core.services.ragic import (
     EmployeeVerificationService,
     get_employee_verification_service,
@@ -50,7 +63,7 @@ class EmailNotFoundError(AuthError):
 
 
 # Import EmailSendError from email module for consistency
-from core.services.email import EmailSendError
+from core.services.email import EmailSendError, EmailTemplates
 
 
 class UserBindingError(AuthError):
@@ -122,6 +135,8 @@ class AuthService:
         self,
         ragic_service: EmployeeVerificationService | None = None,
         config_loader: ConfigLoader | None = None,
+        binding_cache: LineBindingCache | None = None,
+        jwks_verifier: LineJwksVerifier | None = None,
     ) -> None:
         """
         Initialize AuthService with injectable dependencies.
@@ -131,6 +146,10 @@ class AuthService:
                           If None, creates a new instance.
             config_loader: ConfigLoader instance for configuration.
                           If None, creates and loads a new instance.
+            binding_cache: LineBindingCache for webhook auth checks.
+                          If None, uses the process-wide singleton.
+            jwks_verifier: LineJwksVerifier for offline ID Token checks.
+                          If None, uses the process-wide singleton.
 
         Note:
             For unit testing, inject mock dependencies:
@@ -139,13 +158,10 @@ class AuthService:
             >>> service = AuthService(ragic_service=mock_ragic, config_loader=mock_config)
         """
         self._ragic_service = ragic_service or get_employee_verification_service()
+        self._binding_cache = binding_cache or get_binding_cache()
 
-        # Use injected config loader or create new one
-        if config_loader is not None:
-            self._config_loader = config_loader
-        else:
-            self._config_loader = ConfigLoader()
-            self._config_loader.load()
+        # Use injected config loader or the process-wide snapshot
+        self._config_loader = config_loader or get_configuration_provider()
 
         self._security_config = self._config_loader.get("security", {})
         self._email_config = self._config_loader.get("email", {})
@@ -154,6 +170,12 @@ class AuthService:
 
         # LINE Channel ID for token verification (aud check)
         self._line_channel_id = self._config_loader.get("line.channel_id", "")
+
+        # Offline ID Token verification (JWKS) + verified-token cache
+        self._local_id_token_verify = self._config_loader.get(
+            "line.local_id_token_verify", True)
+        self._jwks_verifier = jwks_verifier or get_line_jwks_verifier()
+        self._token_cache = VerifiedTokenCache()
         
         # Helper for LIFF deep link generation
         self._liff_id_verify = os.getenv("ADMIN_LINE_LIFF_ID_VERIFY", "")
@@ -188,6 +210,11 @@ class AuthService:
         across all channels under the same provider. This solves the problem
         of different userId per channel.
 
+        Verification order:
+            1. Verified-token cache (keyed by token hash)
+            2. Local ES256 signature check against cached LINE JWKS
+            3. LINE Verify API (fallback for tokens that cannot be checked locally)
+
         Args:
             id_token: The LINE ID Token from LIFF frontend.
 
@@ -203,8 +230,6 @@ class AuthService:
             LineIdTokenInvalidError: If the token is invalid.
             LineIdTokenError: For other verification failures.
         """
-        logger.info("Verifying LINE ID Token")
-
         if not id_token:
             raise LineIdTokenInvalidError("ID Token is required")
 
@@ -213,6 +238,56 @@ class AuthService:
             raise LineIdTokenError(
                 "LINE Channel ID not configured in server settings")
 
+        cached = self._token_cache.get(id_token)
+        if cached is not None:
+            return cached
+
+        logger.info("Verifying LINE ID Token")
+
+        claims: dict[str, Any] | None = None
+        if self._local_id_token_verify:
+            try:
+                claims = await self._jwks_verifier.verify(
+                    id_token, self._line_channel_id)
+            except JwksUnavailableError as e:
+                logger.info(
+                    f"Local LINE ID Token verification unavailable, using LINE API: {e}")
+            except jwt.ExpiredSignatureError:
+                raise LineIdTokenExpiredError("LINE ID Token has expired")
+            except jwt.InvalidTokenError as e:
+                logger.warning(f"LINE Token local verification failed: {e}")
+                raise LineIdTokenInvalidError(f"Invalid LINE ID Token: {e}")
+
+        if claims is None:
+            claims = await self._verify_line_id_token_remote(id_token)
+
+        # Extract 'sub' - this is REQUIRED and always present in valid tokens
+        sub = claims.get("sub")
+        if not sub:
+            logger.error("LINE ID Token does not contain 'sub' claim")
+            raise LineIdTokenInvalidError(
+                "Invalid token: missing 'sub' claim")
+
+        logger.info(
+            f"LINE ID Token verified successfully for sub: {sub[:8]}...")
+
+        token_data = {
+            "sub": sub,
+            "name": claims.get("name"),
+            "picture": claims.get("picture"),
+            # LINE email, NOT company email
+            "email": claims.get("email"),
+        }
+        self._token_cache.set(id_token, token_data, claims.get("exp"))
+        return token_data
+
+    async def _verify_line_id_token_remote(self, id_token: str) -> dict[str, Any]:
+        """
+        Verify LINE ID Token via LINE's Verify API.
+
+        Returns:
+            dict: Verified token payload (issuer and audience already checked).
+        """
         try:
             # Call LINE Verify API
             response = await self._client.post(
@@ -260,23 +335,7 @@ class AuthService:
                 raise LineIdTokenInvalidError(
                     "Token audience does not match this application")
 
-            # Extract 'sub' - this is REQUIRED and always present in valid tokens
-            sub = token_data.get("sub")
-            if not sub:
-                logger.error("LINE ID Token does not contain 'sub' claim")
-                raise LineIdTokenInvalidError(
-                    "Invalid token: missing 'sub' claim")
-
-            logger.info(
-                f"LINE ID Token verified successfully for sub: {sub[:8]}...")
-
-            return {
-                "sub": sub,
-                "name": token_data.get("name"),
-                "picture": token_data.get("picture"),
-                # LINE email, NOT company email
-                "email": token_data.get("email"),
-            }
+            return token_data
 
         except (LineIdTokenError, LineIdTokenExpiredError, LineIdTokenInvalidError):
             raise
@@ -373,8 +432,9 @@ class AuthService:
         """
         Check if a LINE user is authenticated (bound to a company email).
 
-        This is an alias for is_user_bound, accepting LINE userId from webhook events.
-        The userId is used as the identity key for lookup.
+        Cached variant of is_user_bound, accepting LINE userId from webhook events.
+        Answers are served from the LineBindingCache when fresh, so regular
+        chat traffic does not need a DB round trip.
 
         Args:
             line_id: LINE user ID from webhook event or OIDC sub.
@@ -383,7 +443,13 @@ class AuthService:
         Returns:
             True if user has bound their account, False otherwise.
         """
-        return await self.is_user_bound(line_id, db)
+        cached = self._binding_cache.get(line_id)
+        if cached is not None:
+            return cached
+
+        is_bound = await self.is_user_bound(line_id, db)
+        self._binding_cache.set(line_id, is_bound)
+        return is_bound
 
     # =========================================================================
     # Magic Link Binding Flow
@@ -397,6 +463,7 @@ class AuthService:
         email: str,
         line_sub: str,
         app_context: str | None = None,
+        db: AsyncSession | None = None,
     ) -> str:
         """
         Initiate magic link authentication flow for LINE account binding.
@@ -412,6 +479,9 @@ class AuthService:
             line_sub: LINE ID Token 'sub' claim.
             app_context: Optional app context (e.g., 'admin', 'chatbot') for
                         determining which LIFF ID to use in the magic link.
+            db: Database session. If given, the email is written to the
+                notification outbox and delivered in the background;
+                otherwise it is sent inline.
 
         Returns:
             str: Generic status message (always the same, regardless of email validity).
@@ -445,11 +515,23 @@ class AuthService:
 
             magic_link = self.generate_magic_link(email, line_sub, app_context=app_context)
 
-            await self._send_verification_email(
-                to_email=email,
-                employee_name=employee.name,
-                magic_link=magic_link,
-            )
+            if db is not None:
+                from core.outbox import get_outbox_dispatcher
+
+                await self._queue_verification_email(
+                    db,
+                    to_email=email,
+                    employee_name=employee.name,
+                    magic_link=magic_link,
+                )
+                await db.commit()
+                get_outbox_dispatcher().wake()
+            else:
+                await self._send_verification_email(
+                    to_email=email,
+                    employee_name=employee.name,
+                    magic_link=magic_link,
+                )
 
             logger.info(f"Magic link sent to: {email_masked}")
 
@@ -575,6 +657,8 @@ class AuthService:
                 db, email=payload.email, line_sub=payload.line_sub
             )
 
+            previous_line_sub = existing_user.line_user_id if existing_user else None
+
             if existing_user:
                 user = await self._update_user_binding(
                     db, user=existing_user, email=payload.email, line_sub=payload.line_sub
@@ -587,6 +671,9 @@ class AuthService:
             await db.commit()
             await db.refresh(user)
 
+            # Binding changed: drop stale (typically negative) cache entries
+            self._binding_cache.invalidate(payload.line_sub, previous_line_sub)
+
             logger.info(
                 f"User binding successful: {user.email} <-> LINE sub: {payload.line_sub[:8]}...")
             return UserResponse.model_validate(user)
@@ -763,15 +850,44 @@ class AuthService:
         
         return user
 
+    def _build_verification_email(
+        self, employee_name: str, magic_link: str
+    ) -> tuple[str, str, str]:
+        """Build (subject, text, HTML) of the verification email with magic link."""
+        expire_minutes = int(self._security_config.get(
+            "magic_link_expire_minutes", 15))
+        subject, html_content, text_content = EmailTemplates.magic_link_verification(
+            employee_name=employee_name,
+            magic_link=magic_link,
+            expire_minutes=expire_minutes,
+            app_name=self._app_name,
+        )
+        return subject, text_content, html_content
+
+    async def _queue_verification_email(
+        self, db: AsyncSession, to_email: str, employee_name: str, magic_link: str
+    ) -> None:
+        """Add the verification email to the notification outbox (caller commits)."""
+        from core.outbox import add_email
+
+        subject, text_content, html_content = self._build_verification_email(
+            employee_name, magic_link
+        )
+        add_email(
+            db,
+            to_email=to_email,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content,
+        )
+        logger.info(f"Verification email queued for: {self._mask_email(to_email)}")
+
     async def _send_verification_email(
         self, to_email: str, employee_name: str, magic_link: str
     ) -> None:
         """Send verification email with magic link."""
         logger.info(f"Sending verification email to: {to_email}")
 
-        # Get config values
-        expire_minutes = int(self._security_config.get(
-            "magic_link_expire_minutes", 15))
         smtp_from_name = self._email_config.get("from_name", "Admin System")
         smtp_from_email = self._email_config.get("from_email", "")
         smtp_host = self._email_config.get("host", "")
@@ -780,42 +896,13 @@ class AuthService:
         smtp_pass = self._email_config.get("password", "")
 
         try:
+            subject, text_content, html_content = self._build_verification_email(
+                employee_name, magic_link
+            )
             msg = MIMEMultipart("alternative")
-            msg["Subject"] = f"🔐 {self._app_name} - 綁定您的 LINE 帳號"
+            msg["Subject"] = subject
             msg["From"] = f"{smtp_from_name} <{smtp_from_email}>"
             msg["To"] = to_email
-
-            text_content = f"""
-您好 {employee_name}，
-
-您正在將 LINE 帳號與 {self._app_name} 進行綁定。
-
-請點擊以下連結完成驗證：
-{magic_link}
-
-此連結將在 {expire_minutes} 分鐘後失效。
-
-如果您沒有發起此請求，請忽略此郵件。
-
-{self._app_name} 團隊
-""".strip()
-
-            html_content = f"""
-<!DOCTYPE html>
-<html>
-<head><meta charset="UTF-8"></head>
-<body style="font-family: sans-serif;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-        <h2 style="color: #00B900;">🔐 {self._app_name}</h2>
-        <p>您好 <strong>{employee_name}</strong>，</p>
-        <p>您正在將 LINE 帳號與系統進行綁定。</p>
-        <p><a href="{magic_link}" style="background: #00B900; color: white; padding: 15px 30px; text-decoration: none; border-radius: 5px; display: inline-block;">✅ 完成綁定</a></p>
-        <p style="color: #888; font-size: 12px;">此連結將在 {expire_minutes} 分鐘後失效。</p>
-    </div>
-</body>
-</html>
-"""
-
             msg.attach(MIMEText(text_content, "plain"))
             msg.attach(MIMEText(html_content, "html"))
 
@@ -846,3 +933,12 @@ def get_auth_service() -> AuthService:
     if _auth_service is None:
         _auth_service = AuthService()
     return _auth_service
+
+
+def _reset_auth_service_on_reload(_config: ConfigurationProvider) -> None:
+    """Drop the cached AuthService so it is rebuilt from the new config snapshot."""
+    global _auth_service
+    _auth_service = None
+
+
+register_config_reload_hook(_reset_auth_service_on_reload)
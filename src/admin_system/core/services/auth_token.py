@@ -11,7 +11,7 @@ from typing import Any
 import jwt
 from pydantic import BaseModel, Field
 
-from core.app_context import ConfigLoader
+from core.providers import get_configuration_provider
 
 import logging
 
@@ -61,9 +61,7 @@ def _get_security_config() -> dict[str, Any]:
     Raises:
         TokenConfigurationError: If JWT secret key is too short.
     """
-    loader = ConfigLoader()
-    loader.load()
-    config = loader.get("security", {})
+    config = get_configuration_provider().get("security", {})
     
     # Validate JWT secret key length for security
     jwt_secret = config.get("jwt_secret_key", "")
@@ -0,0 +1,151 @@
+"""
+LINE Binding Status Cache.
+
+In-process cache of "is this LINE user bound to a company email?" answers.
+
+Every LINE message and follow event runs `line_auth_check`, which used to
+hit the `users` table via blind index each time. A user's binding changes
+at most a handful of times, so the answer is cached here:
+
+    - Positive entries (bound) live for a long TTL.
+    - Negative entries (not bound) live for a short TTL, so a user who
+      just completed the Magic Link flow in another process is picked up
+      quickly even without explicit invalidation.
+
+Invalidation Points:
+    - AuthService.verify_magic_token (new or changed binding)
+    - UserSyncService record sync / full sync (Ragic is master)
+    - User deletion (webhook delete, orphan cleanup)
+
+Thread Safety:
+    The cache is shared between the main event loop and background sync
+    threads, so all access goes through a threading.Lock.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LineBindingCache:
+    """
+    TTL cache of LINE user ID -> binding status.
+
+    Entries are kept in insertion/refresh order so the oldest entry is
+    evicted first once `max_entries` is reached.
+    """
+
+    DEFAULT_POSITIVE_TTL = 600.0  # 10 minutes
+    DEFAULT_NEGATIVE_TTL = 30.0  # 30 seconds
+    DEFAULT_MAX_ENTRIES = 10000
+
+    def __init__(
+        self,
+        positive_ttl: float = DEFAULT_POSITIVE_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            positive_ttl: Seconds to trust a "bound" answer.
+            negative_ttl: Seconds to trust a "not bound" answer.
+            max_entries: Maximum number of cached LINE user IDs.
+        """
+        self._positive_ttl = positive_ttl
+        self._negative_ttl = negative_ttl
+        self._max_entries = max_entries
+        # line_user_id -> (is_bound, expires_at)
+        self._entries: OrderedDict[str, tuple[bool, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, line_user_id: str) -> Optional[bool]:
+        """
+        Get cached binding status.
+
+        Args:
+            line_user_id: LINE user ID (or OIDC sub).
+
+        Returns:
+            True/False if a fresh entry exists, None on miss or expiry.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(line_user_id)
+            if entry is None:
+                self._misses += 1
+                return None
+            is_bound, expires_at = entry
+            if expires_at <= now:
+                del self._entries[line_user_id]
+                self._misses += 1
+                return None
+            self._hits += 1
+            return is_bound
+
+    def set(self, line_user_id: str, is_bound: bool) -> None:
+        """
+        Store binding status for a LINE user.
+
+        Args:
+            line_user_id: LINE user ID (or OIDC sub).
+            is_bound: Whether the user is bound to a company email.
+        """
+        ttl = self._positive_ttl if is_bound else self._negative_ttl
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            self._entries[line_user_id] = (is_bound, expires_at)
+            self._entries.move_to_end(line_user_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *line_user_ids: Optional[str]) -> None:
+        """
+        Drop cached entries for the given LINE user IDs.
+
+        None values are ignored so callers can pass optional IDs directly.
+        """
+        with self._lock:
+            for line_user_id in line_user_ids:
+                if line_user_id:
+                    self._entries.pop(line_user_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries (e.g., after a full user sync)."""
+        with self._lock:
+            self._entries.clear()
+        logger.debug("LINE binding cache cleared")
+
+    def get_stats(self) -> dict[str, int]:
+        """Get cache statistics for status reporting."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+# Singleton
+_binding_cache: LineBindingCache | None = None
+
+
+def get_binding_cache() -> LineBindingCache:
+    """Get singleton LineBindingCache instance."""
+    global _binding_cache
+    if _binding_cache is None:
+        _binding_cache = LineBindingCache()
+    return _binding_cache
+
+
+def reset_binding_cache() -> None:
+    """Reset singleton (for testing)."""
+    global _binding_cache
+    _binding_cache = None
@@ -15,7 +15,16 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Any, Optional
 
-from core.app_context import ConfigLoader
+from core.providers import (
+    ConfigurationProvider,
+    get_configuration_provider,
+    register_config_reload_hook,
+)
+from core.services.email_templates import (
+    LEAVE_REQUEST_CONFIRMATION,
+    MAGIC_LINK_VERIFICATION,
+    get_email_template_registry,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -107,18 +116,14 @@ class EmailService:
             config: Email configuration dict. If None, loads from config.yaml.
         """
         if config is None:
-            loader = ConfigLoader()
-            loader.load()
-            config = loader.get("email", {})
+            config = get_configuration_provider().get("email", {})
         
         self._config = EmailConfig(config)
         self._app_name = "Admin System"
         
         # Load app name from config if available
         try:
-            loader = ConfigLoader()
-            loader.load()
-            self._app_name = loader.get("app.name", self._app_name)
+            self._app_name = get_configuration_provider().get("app.name", self._app_name)
         except Exception:
             pass
     
@@ -290,6 +295,8 @@ class EmailTemplates:
     Pre-built email templates for common use cases.
     
     Modules can use these directly or as references for custom templates.
+    Bodies are parsed once in the template registry
+    (core.services.email_templates); these helpers only fill them in.
     """
     
     @staticmethod
@@ -311,40 +318,13 @@ class EmailTemplates:
         Returns:
             tuple: (subject, html_content, text_content)
         """
-        subject = f"🔐 {app_name} - 綁定您的 LINE 帳號"
-        
-        text_content = f"""
-您好 {employee_name}，
-
-您正在將 LINE 帳號與 {app_name} 進行綁定。
-
-請點擊以下連結完成驗證：
-{magic_link}
-
-此連結將在 {expire_minutes} 分鐘後失效。
-
-如果您沒有發起此請求，請忽略此郵件。
-
-{app_name} 團隊
-""".strip()
-        
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head><meta charset="UTF-8"></head>
-<body style="font-family: sans-serif;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-        <h2 style="color: #00B900;">🔐 {app_name}</h2>
-        <p>您好 <strong>{employee_name}</strong>，</p>
-        <p>您正在將 LINE 帳號與系統進行綁定。</p>
-        <p><a href="{magic_link}" style="background: #00B900; color: white; padding: 15px 30px; text-decoration: none; border-radius: 5px; display: inline-block;">✅ 完成綁定</a></p>
-        <p style="color: #888; font-size: 12px;">此連結將在 {expire_minutes} 分鐘後失效。</p>
-    </div>
-</body>
-</html>
-"""
-        
-        return subject, html_content, text_content
+        email = get_email_template_registry().get(MAGIC_LINK_VERIFICATION).render(
+            employee_name=employee_name,
+            magic_link=magic_link,
+            expire_minutes=expire_minutes,
+            app_name=app_name,
+        )
+        return email.subject, email.html, email.text
     
     @staticmethod
     def leave_request_confirmation(
@@ -381,177 +361,20 @@ class EmailTemplates:
         else:
             dates_display = f"{leave_dates[0]} 至 {leave_dates[-1]}"
         
-        all_dates_list = "、".join(leave_dates)
-        
-        subject = f"【{company_name}】請假申請已送出 - {leave_request_no}"
-        
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <style>
-        body {{
-            font-family: 'Microsoft JhengHei', '微軟正黑體', Arial, sans-serif;
-            line-height: 1.8;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #1a5f7a, #2c8fb5);
-            color: white;
-            padding: 25px;
-            text-align: center;
-            border-radius: 8px 8px 0 0;
-        }}
-        .header h1 {{ margin: 0; font-size: 22px; font-weight: 600; }}
-        .content {{
-            background: #ffffff;
-            padding: 30px;
-            border: 1px solid #e0e0e0;
-            border-top: none;
-        }}
-        .info-box {{
-            background: #f8f9fa;
-            border-left: 4px solid #1a5f7a;
-            padding: 20px;
-            margin: 20px 0;
-            border-radius: 0 8px 8px 0;
-        }}
-        .info-row {{
-            display: flex;
-            margin: 10px 0;
-            padding: 8px 0;
-            border-bottom: 1px dashed #e0e0e0;
-        }}
-        .info-row:last-child {{ border-bottom: none; }}
-        .info-label {{ font-weight: 600; color: #555; min-width: 100px; }}
-        .info-value {{ color: #333; }}
-        .status-badge {{
-            display: inline-block;
-            background: #ffc107;
-            color: #333;
-            padding: 5px 15px;
-            border-radius: 20px;
-            font-weight: 600;
-            font-size: 14px;
-        }}
-        .action-section {{
-            background: #e8f4f8;
-            padding: 20px;
-            margin: 25px 0;
-            border-radius: 8px;
-            text-align: center;
-        }}
-        .action-btn {{
-            display: inline-block;
-            background: #1a5f7a;
-            color: white !important;
-            padding: 12px 30px;
-            text-decoration: none;
-            border-radius: 25px;
-            font-weight: 600;
-            margin-top: 10px;
-        }}
-        .note {{
-            font-size: 13px;
-            color: #666;
-            margin-top: 20px;
-            padding: 15px;
-            background: #fff3cd;
-            border-radius: 8px;
-        }}
-        .footer {{
-            background: #f5f5f5;
-            padding: 20px;
-            text-align: center;
-            font-size: 12px;
-            color: #888;
-            border-radius: 0 0 8px 8px;
-            border: 1px solid #e0e0e0;
-            border-top: none;
-        }}
-        .company-name {{ font-weight: 600; color: #1a5f7a; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>📋 請假申請通知</h1>
-    </div>
-    
-    <div class="content">
-        <div class="greeting">
-            <strong>{employee_name}</strong> 您好：
-        </div>
-        
-        <p>您的請假申請已成功送出，目前正在等待主管簽核。</p>
-        
-        <div class="info-box">
-            <div class="info-row">
-                <span class="info-label">📌 請假單號</span>
-                <span class="info-value"><strong>{leave_request_no}</strong></span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">📅 請假類型</span>
-                <span class="info-value">{leave_type}</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">📆 請假期間</span>
-                <span class="info-value">{dates_display}</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">📝 請假日期</span>
-                <span class="info-value">{all_dates_list}</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">⏱️ 請假天數</span>
-                <span class="info-value"><strong>{len(leave_dates)}</strong> 天</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">💬 請假事由</span>
-                <span class="info-value">{reason}</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">👤 直屬主管</span>
-                <span class="info-value">{direct_supervisor or '未指定'}</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">👥 部門負責人</span>
-                <span class="info-value">{dept_manager or '未指定'}</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">📊 目前狀態</span>
-                <span class="info-value"><span class="status-badge">⏳ 等待簽核</span></span>
-            </div>
-        </div>
-        
-        <div class="action-section">
-            <p style="margin: 0 0 10px 0; color: #555;">想確認簽核進度？</p>
-            <a href="{status_url}" class="action-btn" target="_blank">
-                🔍 查看簽核狀態
-            </a>
-        </div>
-        
-        <div class="note">
-            <strong>📢 提醒：</strong><br>
-            • 請假申請將由您的直屬主管與部門負責人依序審核<br>
-            • 審核結果將另行通知，請耐心等候<br>
-            • 如有疑問，請聯繫您的直屬主管
-        </div>
-    </div>
-    
-    <div class="footer">
-        <p class="company-name">{company_name}</p>
-        <p>此為系統自動發送之郵件，請勿直接回覆</p>
-        <p style="margin-top: 10px;">© 2026 {company_name} All Rights Reserved.</p>
-    </div>
-</body>
-</html>
-"""
-        
-        return subject, html_content
+        email = get_email_template_registry().get(LEAVE_REQUEST_CONFIRMATION).render(
+            employee_name=employee_name,
+            leave_request_no=leave_request_no,
+            leave_type=leave_type,
+            dates_display=dates_display,
+            all_dates_list="、".join(leave_dates),
+            day_count=len(leave_dates),
+            reason=reason,
+            direct_supervisor=direct_supervisor or "未指定",
+            dept_manager=dept_manager or "未指定",
+            status_url=status_url,
+            company_name=company_name,
+        )
+        return email.subject, email.html
 
 
 # =============================================================================
@@ -567,3 +390,12 @@ def get_email_service() -> EmailService:
     if _email_service is None:
         _email_service = EmailService()
     return _email_service
+
+
+def _reset_email_service_on_reload(_config: ConfigurationProvider) -> None:
+    """Drop the cached EmailService so it is rebuilt from the new config snapshot."""
+    global _email_service
+    _email_service = None
+
+
+register_config_reload_hook(_reset_email_service_on_reload)
@@ -0,0 +1,350 @@
+"""
+Outbound Email Queue.
+
+Sending mail inside a request (smtplib) blocks the event loop for the whole
+SMTP handshake, and connecting per message repeats TLS and login every
+time. EmailQueue moves delivery off the request path:
+
+    - enqueue() only builds the message and puts it on a bounded queue;
+      callers return immediately
+    - Background worker tasks send via aiosmtplib using an
+      SMTPConnectionPool of persistent, already-authenticated connections
+    - Transient failures (connection errors, 4xx replies) are retried with
+      exponential backoff; permanent 5xx rejections are not
+    - Counters are exposed via get_stats()
+
+Workers are started lazily on the running event loop and drained on
+shutdown via shutdown_email_queue().
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import Any, AsyncIterator, Dict, Optional
+
+from core.services.email import EmailConfig, EmailService, get_email_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboundEmail:
+    """A queued email and its delivery attempts."""
+
+    to_email: str
+    subject: str
+    message: Message
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class SMTPConnectionPool:
+    """
+    Reuses authenticated aiosmtplib connections across messages.
+    """
+
+    DEFAULT_SIZE = 2
+    DEFAULT_MAX_IDLE = 60.0  # seconds; servers drop idle sessions
+
+    def __init__(
+        self,
+        config: EmailConfig,
+        size: int = DEFAULT_SIZE,
+        max_idle: float = DEFAULT_MAX_IDLE,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            config: SMTP server and credentials.
+            size: Maximum number of open connections.
+            max_idle: Idle seconds after which a connection is reopened.
+        """
+        self._config = config
+        self._size = max(1, size)
+        self._max_idle = max_idle
+        # (connection, last_used) of connections not in use
+        self._idle: list[tuple[Any, float]] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.connects = 0
+
+    def _create(self) -> Any:
+        import aiosmtplib
+
+        return aiosmtplib.SMTP(
+            hostname=self._config.host,
+            port=self._config.port,
+            start_tls=self._config.use_tls,
+            username=self._config.username or None,
+            password=self._config.password or None,
+        )
+
+    async def _discard(self, connection: Any) -> None:
+        try:
+            if connection.is_connected:
+                await connection.quit()
+        except Exception:
+            connection.close()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        """
+        Borrow a connected SMTP client.
+
+        A connection that raised while borrowed is closed instead of being
+        returned to the pool.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._size)
+        async with self._semaphore:
+            connection = None
+            while self._idle:
+                candidate, last_used = self._idle.pop()
+                if candidate.is_connected and time.monotonic() - last_used < self._max_idle:
+                    connection = candidate
+                    break
+                await self._discard(candidate)
+            if connection is None:
+                connection = self._create()
+                await connection.connect()
+                self.connects += 1
+
+            try:
+                yield connection
+            except BaseException:
+                await self._discard(connection)
+                raise
+            self._idle.append((connection, time.monotonic()))
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            await self._discard(connection)
+        self._semaphore = None
+
+
+def is_permanent_smtp_error(error: Exception) -> bool:
+    """SMTP 5xx replies will fail the same way on retry."""
+    import aiosmtplib
+
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return True
+    code = getattr(error, "code", None)
+    return isinstance(error, aiosmtplib.SMTPResponseException) and isinstance(code, int) and code >= 500
+
+
+class EmailQueue:
+    """
+    Bounded queue of outgoing emails with background sender tasks.
+    """
+
+    DEFAULT_WORKERS = 2
+    DEFAULT_QUEUE_SIZE = 500
+    DEFAULT_MAX_ATTEMPTS = 4
+    DEFAULT_BACKOFF = 2.0  # seconds, doubled per retry
+
+    def __init__(
+        self,
+        email_service: EmailService,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            email_service: Builds messages and provides the SMTP config.
+            workers: Concurrent sender tasks (also the connection pool size).
+            queue_size: Maximum queued emails.
+            max_attempts: Delivery attempts per email.
+            backoff: Delay before the first retry in seconds.
+        """
+        self._email_service = email_service
+        self._workers = max(1, workers)
+        self._queue_size = queue_size
+        self._max_attempts = max(1, max_attempts)
+        self._backoff = backoff
+        self._pool = SMTPConnectionPool(email_service.config, size=self._workers)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue[OutboundEmail]] = None
+        self._tasks: list[asyncio.Task] = []
+        self._retry_tasks: set[asyncio.Task] = set()
+
+        self.enqueued = 0
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.rejected = 0
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._pool = SMTPConnectionPool(self._email_service.config, size=self._workers)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"EmailWorker-{i}")
+            for i in range(self._workers)
+        ]
+        logger.info(f"Started {self._workers} email worker(s)")
+
+    def enqueue(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+    ) -> bool:
+        """
+        Queue an email for background delivery.
+
+        Must be called from the event loop. Never blocks.
+
+        Returns:
+            True if queued; False if not configured, no recipient, or the
+            queue is full.
+        """
+        if not self._email_service.is_configured:
+            logger.warning("Email service not configured, skipping send")
+            return False
+        if not to_email:
+            logger.warning("No recipient email provided, skipping send")
+            return False
+
+        self._ensure_started()
+        message = self._email_service._create_message(to_email, subject, html_content, text_content)
+        try:
+            self._queue.put_nowait(OutboundEmail(to_email, subject, message))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            logger.error(f"Email queue full, dropping email to {to_email}: {subject}")
+            return False
+        self.enqueued += 1
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            email = await self._queue.get()
+            try:
+                await self._deliver(email)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, email: OutboundEmail) -> None:
+        email.attempts += 1
+        try:
+            async with self._pool.connection() as smtp:
+                await smtp.send_message(email.message)
+        except Exception as e:
+            if is_permanent_smtp_error(e) or email.attempts >= self._max_attempts:
+                self.failed += 1
+                logger.error(
+                    f"Failed to send email to {email.to_email} after "
+                    f"{email.attempts} attempt(s): {e}"
+                )
+                return
+            self.retries += 1
+            delay = self._backoff * 2 ** (email.attempts - 1)
+            logger.warning(f"Email to {email.to_email} failed ({e}); retrying in {delay:.0f}s")
+            task = asyncio.create_task(self._requeue_later(email, delay))
+            self._retry_tasks.add(task)
+            task.add_done_callback(self._retry_tasks.discard)
+            return
+
+        self.sent += 1
+        logger.info(f"Email sent successfully to {email.to_email}")
+
+    async def _requeue_later(self, email: OutboundEmail, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self._queue.put(email)
+
+    @property
+    def queued(self) -> int:
+        """Emails waiting to be sent (including scheduled retries)."""
+        waiting = self._queue.qsize() if self._queue is not None else 0
+        return waiting + len(self._retry_tasks)
+
+    async def join(self) -> None:
+        """Wait until all queued emails (and their retries) are handled."""
+        while self._queue is not None:
+            await self._queue.join()
+            if not self._retry_tasks:
+                return
+            await asyncio.gather(*self._retry_tasks, return_exceptions=True)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Deliver queued emails (up to `timeout` seconds), then stop the
+        workers and close SMTP connections.
+        """
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stopping email queue with {self.queued} email(s) unsent")
+        for task in [*self._tasks, *self._retry_tasks]:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._retry_tasks, return_exceptions=True)
+        await self._pool.close()
+        self._tasks = []
+        self._retry_tasks = set()
+        self._queue = None
+        self._loop = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue metrics for monitoring."""
+        return {
+            "workers": self._workers,
+            "capacity": self._queue_size,
+            "queued": self.queued,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "smtp_connects": self._pool.connects,
+        }
+
+
+# Singleton
+_email_queue: EmailQueue | None = None
+
+
+def get_email_queue() -> EmailQueue:
+    """
+    Get singleton EmailQueue instance.
+
+    Worker count and queue size come from `email.queue_workers` and
+    `email.queue_size`.
+    """
+    global _email_queue
+    if _email_queue is None:
+        from core.providers import get_configuration_provider
+
+        config = get_configuration_provider()
+        _email_queue = EmailQueue(
+            get_email_service(),
+            workers=config.get("email.queue_workers", EmailQueue.DEFAULT_WORKERS),
+            queue_size=config.get("email.queue_size", EmailQueue.DEFAULT_QUEUE_SIZE),
+        )
+    return _email_queue
+
+
+async def shutdown_email_queue(timeout: float = 10.0) -> None:
+    """Deliver pending emails and stop the queue (app shutdown)."""
+    if _email_queue is not None:
+        await _email_queue.stop(timeout=timeout)
+
+
+def reset_email_queue() -> None:
+    """Reset singleton (for testing)."""
+    global _email_queue
+    _email_queue = None
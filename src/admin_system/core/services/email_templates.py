@@ -0,0 +1,415 @@
+"""
+Preparsed Email Templates.
+
+Email bodies used to be long f-strings duplicated in several places. An
+EmailTemplate parses its source once into literal chunks (markup and
+inline CSS) and field slots; rendering fills the slots and joins the
+chunks, with no per-call parsing:
+
+    GREETING = EmailTemplate("<p>您好 <strong>{employee_name}</strong></p>")
+    html = GREETING.render(employee_name="王小明")
+
+Sources use str.format syntax ("{name}" fields, "{{" / "}}" for literal
+braces), so f-string bodies move over unchanged. EmailTemplateRegistry
+groups subject / HTML / text templates under a name; the framework's
+templates are registered at import time and modules can add their own:
+
+    registry = get_email_template_registry()
+    registry.register("administrative.notice", subject="...", html="...")
+    email = registry.render("administrative.notice", employee_name="王小明")
+"""
+
+import keyword
+import string
+from typing import Any, NamedTuple, Optional
+
+
+class EmailTemplate:
+    """
+    Template source parsed once into literal chunks and field slots.
+    """
+
+    __slots__ = ("_chunks", "_slots", "fields")
+
+    def __init__(self, source: str) -> None:
+        """
+        Parse the template.
+
+        Args:
+            source: Template text with "{name}" fields.
+
+        Raises:
+            ValueError: If a field is not a plain name (format specs,
+                conversions, attributes and indexes are not supported).
+        """
+        chunks: list[str] = []
+        slots: list[tuple[int, str]] = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if literal:
+                chunks.append(literal)
+            if field is None:
+                continue
+            if not field.isidentifier() or keyword.iskeyword(field) or spec or conversion:
+                raise ValueError(f"Unsupported template field: {{{field}}}")
+            slots.append((len(chunks), field))
+            chunks.append("")
+        self._chunks = chunks
+        self._slots = tuple(slots)
+        self.fields = frozenset(field for _, field in slots)
+
+    def render(self, **values: Any) -> str:
+        """
+        Fill the fields (values for other names are ignored).
+
+        Raises:
+            TypeError: If a field has no value.
+        """
+        chunks = self._chunks.copy()
+        try:
+            for index, field in self._slots:
+                chunks[index] = format(values[field])
+        except KeyError as e:
+            raise TypeError(f"Missing value for template field {e.args[0]!r}") from None
+        return "".join(chunks)
+
+
+class RenderedEmail(NamedTuple):
+    """Rendered email content."""
+
+    subject: str
+    html: str
+    text: Optional[str] = None
+
+
+class EmailTemplateSet:
+    """
+    Subject, HTML and optional plain text templates of one email.
+    """
+
+    __slots__ = ("_subject", "_html", "_text", "fields", "has_text")
+
+    def __init__(self, subject: str, html: str, text: Optional[str] = None) -> None:
+        """
+        Parse the templates.
+
+        `render(**values)` returns a RenderedEmail (values for names no
+        part uses are ignored) and raises TypeError if a field has no value.
+        """
+        self._subject = EmailTemplate(subject)
+        self._html = EmailTemplate(html)
+        self._text = EmailTemplate(text) if text is not None else None
+        self.fields = self._subject.fields | self._html.fields | (
+            self._text.fields if self._text is not None else frozenset()
+        )
+        self.has_text = text is not None
+
+    def render(self, **values: Any) -> RenderedEmail:
+        """Render all parts with one set of values."""
+        return RenderedEmail(
+            self._subject.render(**values),
+            self._html.render(**values),
+            self._text.render(**values) if self._text is not None else None,
+        )
+
+
+class EmailTemplateRegistry:
+    """
+    Named email templates, parsed on registration.
+    """
+
+    def __init__(self) -> None:
+        self._templates: dict[str, EmailTemplateSet] = {}
+
+    def register(
+        self,
+        name: str,
+        subject: str,
+        html: str,
+        text: Optional[str] = None,
+    ) -> EmailTemplateSet:
+        """
+        Parse and register a template (replacing one of the same name).
+
+        Args:
+            name: Template name (modules should prefix their module name).
+            subject: Subject template.
+            html: HTML body template.
+            text: Optional plain text body template.
+        """
+        template = EmailTemplateSet(subject, html, text)
+        self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> EmailTemplateSet:
+        """
+        Get a registered template.
+
+        Raises:
+            KeyError: If no template has this name.
+        """
+        return self._templates[name]
+
+    def render(self, name: str, /, **values: Any) -> RenderedEmail:
+        """Render a registered template (fields may include `name`)."""
+        return self._templates[name].render(**values)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._templates
+
+    @property
+    def names(self) -> list[str]:
+        return sorted(self._templates)
+
+
+# =============================================================================
+# Framework Templates
+# =============================================================================
+
+MAGIC_LINK_VERIFICATION = "magic_link_verification"
+LEAVE_REQUEST_CONFIRMATION = "leave_request_confirmation"
+
+_MAGIC_LINK_SUBJECT = "🔐 {app_name} - 綁定您的 LINE 帳號"
+
+_MAGIC_LINK_TEXT = """
+您好 {employee_name}，
+
+您正在將 LINE 帳號與 {app_name} 進行綁定。
+
+請點擊以下連結完成驗證：
+{magic_link}
+
+此連結將在 {expire_minutes} 分鐘後失效。
+
+如果您沒有發起此請求，請忽略此郵件。
+
+{app_name} 團隊
+""".strip()
+
+_MAGIC_LINK_HTML = """
+<!DOCTYPE html>
+<html>
+<head><meta charset="UTF-8"></head>
+<body style="font-family: sans-serif;">
+    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+        <h2 style="color: #00B900;">🔐 {app_name}</h2>
+        <p>您好 <strong>{employee_name}</strong>，</p>
+        <p>您正在將 LINE 帳號與系統進行綁定。</p>
+        <p><a href="{magic_link}" style="background: #00B900; color: white; padding: 15px 30px; text-decoration: none; border-radius: 5px; display: inline-block;">✅ 完成綁定</a></p>
+        <p style="color: #888; font-size: 12px;">此連結將在 {expire_minutes} 分鐘後失效。</p>
+    </div>
+</body>
+</html>
+"""
+
+_LEAVE_REQUEST_SUBJECT = "【{company_name}】請假申請已送出 - {leave_request_no}"
+
+_LEAVE_REQUEST_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body {{
+            font-family: 'Microsoft JhengHei', '微軟正黑體', Arial, sans-serif;
+            line-height: 1.8;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #1a5f7a, #2c8fb5);
+            color: white;
+            padding: 25px;
+            text-align: center;
+            border-radius: 8px 8px 0 0;
+        }}
+        .header h1 {{
+            margin: 0;
+            font-size: 22px;
+            font-weight: 600;
+        }}
+        .content {{
+            background: #ffffff;
+            padding: 30px;
+            border: 1px solid #e0e0e0;
+            border-top: none;
+        }}
+        .greeting {{
+            font-size: 16px;
+            margin-bottom: 20px;
+        }}
+        .info-box {{
+            background: #f8f9fa;
+            border-left: 4px solid #1a5f7a;
+            padding: 20px;
+            margin: 20px 0;
+            border-radius: 0 8px 8px 0;
+        }}
+        .info-row {{
+            display: flex;
+            margin: 10px 0;
+            padding: 8px 0;
+            border-bottom: 1px dashed #e0e0e0;
+        }}
+        .info-row:last-child {{
+            border-bottom: none;
+        }}
+        .info-label {{
+            font-weight: 600;
+            color: #555;
+            min-width: 100px;
+        }}
+        .info-value {{
+            color: #333;
+        }}
+        .status-badge {{
+            display: inline-block;
+            background: #ffc107;
+            color: #333;
+            padding: 5px 15px;
+            border-radius: 20px;
+            font-weight: 600;
+            font-size: 14px;
+        }}
+        .action-section {{
+            background: #e8f4f8;
+            padding: 20px;
+            margin: 25px 0;
+            border-radius: 8px;
+            text-align: center;
+        }}
+        .action-btn {{
+            display: inline-block;
+            background: #1a5f7a;
+            color: white !important;
+            padding: 12px 30px;
+            text-decoration: none;
+            border-radius: 25px;
+            font-weight: 600;
+            margin-top: 10px;
+        }}
+        .action-btn:hover {{
+            background: #2c8fb5;
+        }}
+        .note {{
+            font-size: 13px;
+            color: #666;
+            margin-top: 20px;
+            padding: 15px;
+            background: #fff3cd;
+            border-radius: 8px;
+        }}
+        .footer {{
+            background: #f5f5f5;
+            padding: 20px;
+            text-align: center;
+            font-size: 12px;
+            color: #888;
+            border-radius: 0 0 8px 8px;
+            border: 1px solid #e0e0e0;
+            border-top: none;
+        }}
+        .company-name {{
+            font-weight: 600;
+            color: #1a5f7a;
+        }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>📋 請假申請通知</h1>
+    </div>
+    
+    <div class="content">
+        <div class="greeting">
+            <strong>{employee_name}</strong> 您好：
+        </div>
+        
+        <p>您的請假申請已成功送出，目前正在等待主管簽核。</p>
+        
+        <div class="info-box">
+            <div class="info-row">
+                <span class="info-label">📌 請假單號</span>
+                <span class="info-value"><strong>{leave_request_no}</strong></span>
+            </div>
+            <div class="info-row">
+                <span class="info-label">📅 請假類型</span>
+                <span class="info-value">{leave_type}</span>
+            </div>
+            <div class="info-row">
+                <span class="info-label">📆 請假期間</span>
+                <span class="info-value">{dates_display}</span>
+            </div>
+            <div class="info-row">
+                <span class="info-label">📝 請假日期</span>
+                <span class="info-value">{all_dates_list}</span>
+            </div>
+            <div class="info-row">
+                <span class="info-label">⏱️ 請假天數</span>
+                <span class="info-value"><strong>{day_count}</strong> 天</span>
+            </div>
+            <div class="info-row">
+                <span class="info-label">💬 請假事由</span>
+                <span class="info-value">{reason}</span>
+            </div>
+            <div class="info-row">
+                <span class="info-label">👤 直屬主管</span>
+                <span class="info-value">{direct_supervisor}</span>
+            </div>
+            <div class="info-row">
+                <span class="info-label">👥 部門負責人</span>
+                <span class="info-value">{dept_manager}</span>
+            </div>
+            <div class="info-row">
+                <span class="info-label">📊 目前狀態</span>
+                <span class="info-value"><span class="status-badge">⏳ 等待簽核</span></span>
+            </div>
+        </div>
+        
+        <div class="action-section">
+            <p style="margin: 0 0 10px 0; color: #555;">想確認簽核進度？</p>
+            <a href="{status_url}" class="action-btn" target="_blank">
+                🔍 查看簽核狀態
+            </a>
+        </div>
+        
+        <div class="note">
+            <strong>📢 提醒：</strong><br>
+            • 請假申請將由您的直屬主管與部門負責人依序審核<br>
+            • 審核結果將另行通知，請耐心等候<br>
+            • 如有疑問，請聯繫您的直屬主管
+        </div>
+    </div>
+    
+    <div class="footer">
+        <p class="company-name">{company_name}</p>
+        <p>此為系統自動發送之郵件，請勿直接回覆</p>
+        <p style="margin-top: 10px;">© 2026 {company_name} All Rights Reserved.</p>
+    </div>
+</body>
+</html>
+"""
+
+
+# Singleton
+_registry: EmailTemplateRegistry | None = None
+
+
+def get_email_template_registry() -> EmailTemplateRegistry:
+    """Get singleton registry (framework templates pre-registered)."""
+    global _registry
+    if _registry is None:
+        _registry = EmailTemplateRegistry()
+        _registry.register(
+            MAGIC_LINK_VERIFICATION,
+            subject=_MAGIC_LINK_SUBJECT,
+            html=_MAGIC_LINK_HTML,
+            text=_MAGIC_LINK_TEXT,
+        )
+        _registry.register(
+            LEAVE_REQUEST_CONFIRMATION,
+            subject=_LEAVE_REQUEST_SUBJECT,
+            html=_LEAVE_REQUEST_HTML,
+        )
+    return _registry
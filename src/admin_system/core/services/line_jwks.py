@@ -0,0 +1,298 @@
+"""
+Local LINE ID Token Verification.
+
+Verifies LIFF ID Tokens (ES256) offline against LINE's published JWKS,
+instead of calling LINE's `/oauth2/v2.1/verify` endpoint on every request.
+
+Components:
+    - LineJwksVerifier: Caches LINE signing keys and validates signature,
+      issuer, audience and expiry locally.
+    - VerifiedTokenCache: Short-lived cache of verified claims keyed by
+      token hash, so repeated LIFF calls with the same token skip even
+      the signature check.
+
+Key Refresh Strategy:
+    - First use loads the JWKS synchronously (awaited).
+    - Stale keys keep being used while a background refresh runs
+      (stale-while-revalidate).
+    - An unknown `kid` forces a refresh, rate-limited to avoid letting
+      forged tokens hammer LINE's JWKS endpoint.
+
+Tokens that cannot be verified locally (unsupported algorithm such as
+HS256 LINE Login tokens, or JWKS unavailable) raise JwksUnavailableError
+so the caller can fall back to the remote verify endpoint.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+import jwt
+
+logger = logging.getLogger(__name__)
+
+
+class JwksUnavailableError(Exception):
+    """Raised when a token cannot be verified locally (caller should fall back)."""
+    pass
+
+
+# =============================================================================
+# JWKS Verifier
+# =============================================================================
+
+
+class LineJwksVerifier:
+    """
+    Offline verifier for LINE ID Tokens using cached JWKS keys.
+    """
+
+    JWKS_URL = "https://api.line.me/oauth2/v2.1/certs"
+    ISSUER = "https://access.line.me"
+    SUPPORTED_ALGORITHMS = ("ES256",)
+
+    DEFAULT_REFRESH_INTERVAL = 3600.0  # 1 hour
+    DEFAULT_MIN_REFRESH_INTERVAL = 60.0  # Throttle for unknown-kid refreshes
+    DEFAULT_LEEWAY = 30  # Clock skew tolerance (seconds)
+
+    def __init__(
+        self,
+        fetch_jwks: Callable[[], Awaitable[dict[str, Any]]] | None = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL,
+        leeway: int = DEFAULT_LEEWAY,
+    ) -> None:
+        """
+        Initialize the verifier.
+
+        Args:
+            fetch_jwks: Optional coroutine factory returning the JWKS document.
+                        Defaults to an HTTP GET against JWKS_URL.
+            refresh_interval: Seconds after which keys are refreshed in background.
+            min_refresh_interval: Minimum seconds between forced refreshes.
+            leeway: Allowed clock skew in seconds for exp/iat checks.
+        """
+        self._fetch_jwks = fetch_jwks or self._fetch_jwks_http
+        self._refresh_interval = refresh_interval
+        self._min_refresh_interval = min_refresh_interval
+        self._leeway = leeway
+
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._fetched_at: float = 0.0
+        self._last_attempt_at: float = 0.0
+        self._refresh_task: asyncio.Task | None = None
+        self._http_client: httpx.AsyncClient | None = None
+
+    # -------------------------------------------------------------------------
+    # Key Management
+    # -------------------------------------------------------------------------
+
+    async def _fetch_jwks_http(self) -> dict[str, Any]:
+        """Fetch the JWKS document from LINE."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=httpx.Timeout(10.0))
+        response = await self._http_client.get(self.JWKS_URL)
+        response.raise_for_status()
+        return response.json()
+
+    def load_jwks(self, jwks: dict[str, Any]) -> int:
+        """
+        Replace cached keys with the given JWKS document.
+
+        Args:
+            jwks: JWKS document ({"keys": [...]}).
+
+        Returns:
+            Number of usable keys loaded.
+        """
+        keys: dict[str, jwt.PyJWK] = {}
+        for jwk in jwks.get("keys", []):
+            kid = jwk.get("kid")
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwt.PyJWK(jwk)
+            except (jwt.PyJWKError, jwt.InvalidKeyError) as e:
+                logger.warning(f"Skipping unusable LINE JWK {kid}: {e}")
+
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        return len(keys)
+
+    async def refresh(self) -> None:
+        """
+        Refresh signing keys from LINE, coalescing concurrent callers.
+
+        Failures are logged and the previous keys are kept.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._do_refresh())
+        await asyncio.shield(self._refresh_task)
+
+    async def _do_refresh(self) -> None:
+        """Fetch and load the JWKS document."""
+        self._last_attempt_at = time.monotonic()
+        try:
+            count = self.load_jwks(await self._fetch_jwks())
+            logger.info(f"LINE JWKS refreshed: {count} keys")
+        except Exception as e:
+            logger.warning(f"LINE JWKS refresh failed, keeping {len(self._keys)} cached keys: {e}")
+
+    def _is_stale(self) -> bool:
+        return time.monotonic() - self._fetched_at >= self._refresh_interval
+
+    def _schedule_refresh(self) -> None:
+        """Start a background refresh if none is running."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._do_refresh())
+
+    async def _get_key(self, kid: str | None) -> jwt.PyJWK:
+        """
+        Resolve the signing key for a token's `kid`.
+
+        Raises:
+            JwksUnavailableError: If no matching key can be obtained.
+        """
+        if not self._keys:
+            await self.refresh()
+        elif self._is_stale():
+            self._schedule_refresh()
+
+        key = self._keys.get(kid) if kid else None
+        if key is None and kid:
+            if time.monotonic() - self._last_attempt_at >= self._min_refresh_interval:
+                await self.refresh()
+                key = self._keys.get(kid)
+
+        if key is None:
+            raise JwksUnavailableError(f"No LINE signing key for kid: {kid}")
+        return key
+
+    # -------------------------------------------------------------------------
+    # Verification
+    # -------------------------------------------------------------------------
+
+    async def verify(self, id_token: str, audience: str) -> dict[str, Any]:
+        """
+        Verify a LINE ID Token locally.
+
+        Args:
+            id_token: The LINE ID Token from LIFF.
+            audience: Expected `aud` claim (LINE Login Channel ID).
+
+        Returns:
+            dict: Verified token claims.
+
+        Raises:
+            jwt.ExpiredSignatureError: If the token has expired.
+            jwt.InvalidTokenError: If signature, issuer or audience is invalid.
+            JwksUnavailableError: If the token cannot be verified locally.
+        """
+        header = jwt.get_unverified_header(id_token)
+        algorithm = header.get("alg")
+        if algorithm not in self.SUPPORTED_ALGORITHMS:
+            raise JwksUnavailableError(f"Unsupported algorithm for local verification: {algorithm}")
+
+        key = await self._get_key(header.get("kid"))
+
+        return jwt.decode(
+            id_token,
+            key.key,
+            algorithms=list(self.SUPPORTED_ALGORITHMS),
+            audience=audience,
+            issuer=self.ISSUER,
+            leeway=self._leeway,
+            options={"require": ["exp", "iat", "iss", "aud", "sub"]},
+        )
+
+    async def close(self) -> None:
+        """Close HTTP client."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+
+# =============================================================================
+# Verified Token Cache
+# =============================================================================
+
+
+class VerifiedTokenCache:
+    """
+    Short-lived cache of verified LINE ID Token data keyed by token hash.
+
+    Entries never outlive the token's own `exp` claim.
+    """
+
+    DEFAULT_TTL = 300.0  # 5 minutes
+    DEFAULT_MAX_ENTRIES = 2000
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        # token_hash -> (token_data, expires_at epoch seconds)
+        self._entries: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash(id_token: str) -> str:
+        return hashlib.sha256(id_token.encode()).hexdigest()
+
+    def get(self, id_token: str) -> Optional[dict[str, Any]]:
+        """Get cached token data, or None if missing or expired."""
+        token_hash = self._hash(id_token)
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is None:
+                return None
+            token_data, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[token_hash]
+                return None
+            return dict(token_data)
+
+    def set(self, id_token: str, token_data: dict[str, Any], exp: float | None) -> None:
+        """
+        Cache verified token data.
+
+        Args:
+            id_token: The raw ID Token.
+            token_data: Data returned to callers for this token.
+            exp: Token `exp` claim (epoch seconds), if known.
+        """
+        expires_at = time.time() + self._ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+
+        token_hash = self._hash(id_token)
+        with self._lock:
+            self._entries[token_hash] = (dict(token_data), expires_at)
+            self._entries.move_to_end(token_hash)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached tokens."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Singleton
+_line_jwks_verifier: LineJwksVerifier | None = None
+
+
+def get_line_jwks_verifier() -> LineJwksVerifier:
+    """Get singleton LineJwksVerifier instance (shares keys process-wide)."""
+    global _line_jwks_verifier
+    if _line_jwks_verifier is None:
+        _line_jwks_verifier = LineJwksVerifier()
+    return _line_jwks_verifier
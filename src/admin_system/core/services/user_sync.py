@@ -38,6 +38,7 @@ from core.ragic import get_user_form
 from core.ragic.service import RagicService, create_ragic_service
 from core.ragic.sync_base import BaseRagicSyncService, SyncResult
 from core.security import generate_blind_index
+from core.services.binding_cache import get_binding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -375,6 +376,9 @@ class UserSyncService(BaseRagicSyncService[User]):
                     # No valid UUIDs from Ragic - this might be a data issue
                     # Don't delete anything to be safe
                     logger.warning("No valid UUIDs found in Ragic records, skipping delete phase")
+            
+            # Bindings may have been added, moved, deactivated or deleted
+            get_binding_cache().clear()
                     
         except Exception as e:
             result.errors += 1
@@ -461,6 +465,9 @@ class UserSyncService(BaseRagicSyncService[User]):
         is_created = existing_instance is None
         
         if existing_instance:
+            # LINE binding may move to a different user ID; drop both entries
+            get_binding_cache().invalidate(existing_instance.line_user_id, data.get("line_user_id"))
+            
             # Update existing record
             for key, value in data.items():
                 if hasattr(existing_instance, key):
@@ -479,6 +486,7 @@ class UserSyncService(BaseRagicSyncService[User]):
                     logger.warning(f"Invalid UUID from Ragic: {local_db_id}, generating new UUID")
             instance = User(**data)
             session.add(instance)
+            get_binding_cache().invalidate(data.get("line_user_id"))
             logger.debug(f"Created new user (ragic_id={ragic_id})")
         
         # Flush to persist changes
@@ -581,6 +589,18 @@ class UserSyncService(BaseRagicSyncService[User]):
             logger.error(f"Failed to map Ragic record: {e}")
             return None
     
+    async def delete_record(self, ragic_id: int) -> bool:
+        """
+        Delete a user record and drop cached LINE binding status.
+        
+        The deleted user's LINE ID is not known after deletion, so the
+        whole binding cache is cleared (deletions are rare).
+        """
+        deleted = await super().delete_record(ragic_id)
+        if deleted:
+            get_binding_cache().clear()
+        return deleted
+    
     async def find_user_by_ragic_id(self, ragic_id: int) -> Optional[User]:
         """
         Find a local User by Ragic ID.
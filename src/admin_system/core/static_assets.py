@@ -0,0 +1,349 @@
+"""
+Precompressed Static Asset Serving.
+
+LIFF pages and the dashboard are opened from LINE's in-app browser, often
+over mobile networks. Instead of streaming files from disk uncompressed on
+every request, assets are loaded into memory once and served with:
+
+    - Precompressed representations (gzip, plus brotli when the optional
+      `brotli` package is installed), chosen per `Accept-Encoding`
+    - Strong ETags (content hash per representation) and 304 revalidation
+    - A content fingerprint for cache-busting URLs (`?v=<fingerprint>`);
+      requests carrying the current fingerprint are served as `immutable`
+
+Files are re-checked by mtime/size on access, so edits are picked up
+without a restart.
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Mapping, Optional
+
+import anyio
+from fastapi import Request
+from fastapi.responses import Response
+from fastapi.staticfiles import StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli  # Optional: enables "br" encoding
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+)
+
+# Preferred order when the client accepts several encodings
+_ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """Check whether an If-None-Match header matches the given ETag."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return etag in candidates
+
+
+def _parse_accept_encoding(header: Optional[str]) -> dict[str, float]:
+    """Parse an Accept-Encoding header into {encoding: q}."""
+    accepted: dict[str, float] = {}
+    if not header:
+        return accepted
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def _is_compressible(media_type: str) -> bool:
+    return media_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    """
+    An in-memory static asset with all its encoded representations.
+    """
+
+    name: str
+    media_type: str
+    digest: str
+    # encoding ("identity", "gzip", "br") -> body
+    representations: Mapping[str, bytes] = field(repr=False)
+    mtime: float = 0.0
+    size: int = 0
+
+    @property
+    def fingerprint(self) -> str:
+        """Short content hash for cache-busting URLs."""
+        return self.digest[:12]
+
+    def etag(self, encoding: str = "identity") -> str:
+        """Strong ETag for a representation."""
+        if encoding == "identity":
+            return f'"{self.digest[:32]}"'
+        return f'"{self.digest[:32]}-{encoding}"'
+
+    def select_encoding(self, accept_encoding: Optional[str]) -> str:
+        """Pick the best available representation for an Accept-Encoding header."""
+        if len(self.representations) == 1:
+            return "identity"
+        accepted = _parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        for encoding in _ENCODING_PREFERENCE:
+            if encoding in self.representations and accepted.get(encoding, wildcard) > 0:
+                return encoding
+        return "identity"
+
+
+def build_asset(
+    name: str,
+    data: bytes,
+    media_type: Optional[str] = None,
+    mtime: float = 0.0,
+) -> StaticAsset:
+    """
+    Fingerprint and precompress asset content.
+
+    Args:
+        name: Asset name (used to guess the media type if not given).
+        data: Raw content.
+        media_type: Content type; guessed from the name if None.
+        mtime: Source file modification time (0 for generated content).
+
+    Returns:
+        StaticAsset with identity and (where worthwhile) compressed bodies.
+    """
+    if media_type is None:
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if media_type.startswith("text/") and "charset" not in media_type:
+        media_type = f"{media_type}; charset=utf-8"
+
+    representations: dict[str, bytes] = {"identity": data}
+    if _is_compressible(media_type) and len(data) >= MIN_COMPRESS_SIZE:
+        gzipped = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        if len(gzipped) < len(data):
+            representations["gzip"] = gzipped
+        if brotli is not None:
+            compressed = brotli.compress(data, quality=BROTLI_QUALITY)
+            if len(compressed) < len(data):
+                representations["br"] = compressed
+
+    return StaticAsset(
+        name=name,
+        media_type=media_type,
+        digest=hashlib.sha256(data).hexdigest(),
+        representations=representations,
+        mtime=mtime,
+        size=len(data),
+    )
+
+
+def asset_response(asset: StaticAsset, request: Request) -> Response:
+    """
+    Build the response for an asset.
+
+    Requests whose `v` query parameter matches the asset fingerprint get
+    immutable caching; all others must revalidate via ETag.
+    """
+    encoding = asset.select_encoding(request.headers.get("accept-encoding"))
+    etag = asset.etag(encoding)
+
+    immutable = request.query_params.get("v") == asset.fingerprint
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+    }
+    if len(asset.representations) > 1:
+        headers["Vary"] = "Accept-Encoding"
+
+    if if_none_match(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=asset.representations[encoding],
+        media_type=asset.media_type,
+        headers=headers,
+    )
+
+
+class StaticAssetStore:
+    """
+    In-memory store of precompressed assets backed by a directory.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory the asset names are resolved against.
+        """
+        self._directory = Path(directory)
+        self._root = self._directory.resolve()
+        self._assets: dict[str, StaticAsset] = {}
+        # name -> (source digest, dependency key, derived asset)
+        self._derived: dict[str, tuple[str, str, StaticAsset]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def _resolve(self, name: str) -> Optional[Path]:
+        path = (self._root / name).resolve()
+        if not path.is_relative_to(self._root) or not path.is_file():
+            return None
+        return path
+
+    def get(self, name: str) -> Optional[StaticAsset]:
+        """
+        Get an asset, loading or reloading it if the file changed.
+
+        Returns:
+            StaticAsset, or None if the file does not exist.
+        """
+        path = self._resolve(name)
+        if path is None:
+            return None
+
+        stat = path.stat()
+        asset = self._assets.get(name)
+        if asset is not None and asset.mtime == stat.st_mtime and asset.size == stat.st_size:
+            return asset
+
+        asset = build_asset(name, path.read_bytes(), mtime=stat.st_mtime)
+        with self._lock:
+            self._assets[name] = asset
+        logger.debug(
+            f"Loaded static asset {name}: {asset.size} bytes, "
+            f"encodings={sorted(asset.representations)}"
+        )
+        return asset
+
+    def derive(
+        self,
+        name: str,
+        source: StaticAsset,
+        transform: Callable[[bytes], bytes],
+        key: str = "",
+    ) -> StaticAsset:
+        """
+        Get an asset generated from another asset (e.g., HTML with rewritten URLs).
+
+        The result is rebuilt only when the source content or `key` changes.
+
+        Args:
+            name: Name of the derived asset.
+            source: Asset the content is generated from.
+            transform: Function producing the derived content.
+            key: Extra cache key for inputs other than the source (e.g., a URL).
+        """
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == source.digest and cached[1] == key:
+            return cached[2]
+
+        asset = build_asset(
+            name,
+            transform(source.representations["identity"]),
+            media_type=source.media_type,
+        )
+        with self._lock:
+            self._derived[name] = (source.digest, key, asset)
+        return asset
+
+    def preload(self) -> int:
+        """
+        Load and compress every file in the directory.
+
+        Returns:
+            Number of assets loaded.
+        """
+        count = 0
+        for path in sorted(self._directory.rglob("*")):
+            if path.is_file():
+                if self.get(path.relative_to(self._directory).as_posix()) is not None:
+                    count += 1
+        return count
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles mount that serves files from a StaticAssetStore.
+
+    Anything the store cannot serve (directories, missing files, non-GET
+    methods) falls through to the standard StaticFiles behaviour.
+    """
+
+    def __init__(self, *, directory: Path, store: "StaticAssetStore | None" = None, **kwargs) -> None:
+        super().__init__(directory=str(directory), **kwargs)
+        self.store = store or StaticAssetStore(Path(directory))
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        asset = await anyio.to_thread.run_sync(self.store.get, path)
+        if asset is None:
+            return await super().get_response(path, scope)
+        return asset_response(asset, Request(scope))
+
+
+# Stores preloaded at application startup
+_registered_stores: list[StaticAssetStore] = []
+
+
+def register_static_assets(store: StaticAssetStore) -> StaticAssetStore:
+    """Register a store to be preloaded at startup. Returns the store."""
+    if store not in _registered_stores:
+        _registered_stores.append(store)
+    return store
+
+
+def preload_static_assets() -> int:
+    """
+    Load and precompress all registered stores (blocking; run in a thread).
+
+    Returns:
+        Total number of assets loaded.
+    """
+    total = 0
+    for store in list(_registered_stores):
+        try:
+            total += store.preload()
+        except OSError as e:
+            logger.warning(f"Static asset preload failed for {store.directory}: {e}")
+    return total
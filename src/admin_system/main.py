@@ -10,6 +10,7 @@ Or run directly:
     python main.py
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -17,14 +18,24 @@ from typing import AsyncGenerator
 
 import uvicorn
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 
 from core.app_context import AppContext
 from core.database import close_db_connections, init_database
 from core.http_client import create_http_client_context
+from core.line_dispatch import shutdown_line_dispatchers
+from core.outbox import get_outbox_dispatcher, shutdown_outbox_dispatcher
+from core.services.email_queue import shutdown_email_queue
 from core.logging_config import setup_logging
+from core.providers import get_configuration_provider
+from core.readiness import get_readiness
 from core.registry import ModuleLoader, ModuleRegistry
 from core.server import create_base_app, set_registry
+from core.static_assets import (
+    PrecompressedStaticFiles,
+    StaticAssetStore,
+    preload_static_assets,
+    register_static_assets,
+)
 
 # Module directory path (relative to this file's parent)
 MODULES_DIR = "modules"
@@ -85,6 +96,13 @@ def create_registry(context: AppContext) -> ModuleRegistry:
     count = loader.load_from_directory(str(modules_path))
     context.log_event(f"Loaded {count} module(s) from {MODULES_DIR}/", "LOADER")
 
+    for timing in registry.get_startup_report()["modules"]:
+        context.log_event(
+            f"Module '{timing['name']}' startup: import {timing['import_ms']:.0f} ms, "
+            f"on_entry {timing['on_entry_ms']:.0f} ms",
+            "LOADER",
+        )
+
     return registry
 
 
@@ -132,7 +150,14 @@ def create_fastapi_app(context: AppContext, registry: ModuleRegistry) -> FastAPI
     logger = logging.getLogger(__name__)
     static_dir = Path(__file__).parent / "static"
     if static_dir.exists():
-        app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+        app.mount(
+            "/static",
+            PrecompressedStaticFiles(
+                directory=static_dir,
+                store=register_static_assets(StaticAssetStore(static_dir)),
+            ),
+            name="static",
+        )
         logger.info(f"Mounted static files at /static from {static_dir}")
     else:
         logger.warning(f"Static directory not found: {static_dir}")
@@ -140,7 +165,14 @@ def create_fastapi_app(context: AppContext, registry: ModuleRegistry) -> FastAPI
     # Mount core framework static files (auth pages, etc.)
     core_static_dir = Path(__file__).parent / "core" / "static"
     if core_static_dir.exists():
-        app.mount("/static/core", StaticFiles(directory=str(core_static_dir)), name="core-static")
+        app.mount(
+            "/static/core",
+            PrecompressedStaticFiles(
+                directory=core_static_dir,
+                store=register_static_assets(StaticAssetStore(core_static_dir)),
+            ),
+            name="core-static",
+        )
         logger.debug(f"Mounted core static files at /static/core")
     else:
         logger.warning(f"Core static directory not found: {core_static_dir}")
@@ -167,12 +199,22 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     async with create_http_client_context(app, timeout=30.0, max_connections=100) as http_manager:
         logger.info("HTTP client initialized (stored in app.state for DI)")
 
+        readiness = get_readiness()
+        readiness.register("database", "Database connection and schema")
         try:
             await init_database()
             logger.info("Database initialized")
         except Exception as e:
             logger.error(f"Database initialization failed: {e}")
             raise
+        readiness.mark_ready("database")
+
+        # Load and precompress static assets off the event loop
+        asset_count = await asyncio.to_thread(preload_static_assets)
+        logger.info(f"Static assets precompressed: {asset_count}")
+
+        # Deliver emails / LINE pushes written to the notification outbox
+        get_outbox_dispatcher().start()
 
         # Register core sync services (User Identity Ragic sync)
         _register_core_sync_services()
@@ -190,6 +232,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             await _registry.async_startup_all()
             logger.info("Module async startup completed")
 
+        # Probe Ragic/LINE health in the background and stream dashboard
+        # updates to connected clients
+        from api.system import (
+            start_event_stream,
+            start_health_prober,
+            stop_event_stream,
+            stop_health_prober,
+        )
+        await start_health_prober(app)
+        await start_event_stream(app)
+
         # Update server status
         context = _context
         if context:
@@ -201,6 +254,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         # Shutdown
         logger.info("Shutting down Admin System Core...")
 
+        await stop_event_stream()
+        await stop_health_prober()
+
+        # Finish LINE events already acknowledged to LINE before modules stop
+        await shutdown_line_dispatchers()
+
+        # Deliver queued emails (e.g. leave confirmations)
+        await shutdown_email_queue()
+        await shutdown_outbox_dispatcher()
+
         if _registry:
             module_count = len(_registry.get_module_names())
             _registry.shutdown_all()
@@ -215,8 +278,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 # Module-level Application Instance
 # -----------------------------------------------------------------------------
 
-# Setup logging first
-setup_logging()
+# Setup logging first (queue mode keeps file/stdout writes off the event loop)
+_log_config = get_configuration_provider()
+setup_logging(
+    use_queue=_log_config.get("app.log_async", True),
+    queue_size=_log_config.get("app.log_queue_size", 10000),
+)
 
 # Create core components
 _context = create_app_context()
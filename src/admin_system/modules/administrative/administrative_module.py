@@ -377,7 +377,7 @@ class AdministrativeModule(IAppModule):
         if not reply_token:
             return
 
-        from core.database.session import get_thread_local_session
+        from core.database.session import get_standalone_session
         from core.line_auth import line_auth_check
         from core.line_client import LineClient
 
@@ -388,7 +388,7 @@ class AdministrativeModule(IAppModule):
         )
 
         try:
-            async with get_thread_local_session() as db:
+            async with get_standalone_session() as db:
                 is_auth, auth_messages = await line_auth_check(
                     user_id, db, app_context="administrative"
                 )
@@ -409,7 +409,8 @@ class AdministrativeModule(IAppModule):
         if not reply_token:
             return
 
-        from core.database.session import get_thread_local_session
+        from core.database.session import get_standalone_session
+        from core.flex_templates import flex_message
         from core.services import get_auth_service
         from modules.administrative.messages import (
             create_admin_menu_flex,
@@ -422,20 +423,20 @@ class AdministrativeModule(IAppModule):
         auth_service = get_auth_service()
 
         # Check if user is authenticated
-        async with get_thread_local_session() as db:
+        async with get_standalone_session() as db:
             is_auth = await auth_service.is_user_authenticated(user_id, db)
 
         if is_auth:
             # Show admin menu
             flex_content = create_admin_menu_flex()
             await line_service.reply(reply_token, [
-                {"type": "flex", "altText": "行政作業模組", "contents": flex_content}
+                flex_message("行政作業模組", flex_content)
             ])
         else:
             # Show auth required message
             flex_content = create_auth_required_flex(user_id)
             await line_service.reply(reply_token, [
-                {"type": "flex", "altText": "請先驗證身份", "contents": flex_content}
+                flex_message("請先驗證身份", flex_content)
             ])
 
     async def _handle_postback(
@@ -445,6 +446,7 @@ class AdministrativeModule(IAppModule):
         if not reply_token:
             return
 
+        from core.flex_templates import flex_message
         from modules.chatbot.services import get_line_service
         from modules.administrative.messages import create_coming_soon_flex
 
@@ -458,7 +460,7 @@ class AdministrativeModule(IAppModule):
         if action == "coming_soon":
             flex_content = create_coming_soon_flex(feature)
             await line_service.reply(reply_token, [
-                {"type": "flex", "altText": "功能開發中", "contents": flex_content}
+                flex_message("功能開發中", flex_content)
             ])
 
     # =========================================================================
@@ -4,27 +4,22 @@ Administrative Module LINE Flex Message Templates.
 Contains reusable Flex Message templates for LINE Bot integration.
 """
 
+from functools import lru_cache
 from typing import Any
 
+from core.flex_templates import FlexTemplate, PreparedMessage, Slot
 from modules.administrative.core.config import get_admin_settings
 
 
-def create_admin_menu_flex() -> dict[str, Any]:
+def _build_admin_menu_template() -> FlexTemplate:
     """
-    Create the Administrative Module main menu Flex Message.
+    Build the main menu skeleton (only the leave request URI varies).
 
     Layout: 2x3 grid with 6 buttons
     - Button 1: Leave Request (active)
     - Buttons 2-6: Coming Soon (disabled/greyed)
-
-    Returns:
-        Flex Message bubble content.
     """
-    settings = get_admin_settings()
-    liff_id = settings.line_liff_id_leave
-
-    # LIFF URL or fallback message
-    leave_uri = f"line://app/{liff_id}" if liff_id else "https://line.me"
+    leave_uri = Slot("leave_uri")
 
     # Button styles
     active_style = {
@@ -143,7 +138,7 @@ def create_admin_menu_flex() -> dict[str, Any]:
         "spacing": "sm",
     }
 
-    return {
+    return FlexTemplate({
         "type": "bubble",
         "size": "mega",
         "header": {
@@ -196,10 +191,92 @@ def create_admin_menu_flex() -> dict[str, Any]:
             ],
             "paddingAll": "10px",
         },
-    }
+    })
+
+
+_ADMIN_MENU_TEMPLATE = _build_admin_menu_template()
+
+
+@lru_cache(maxsize=8)
+def _render_admin_menu(leave_uri: str) -> PreparedMessage:
+    return _ADMIN_MENU_TEMPLATE.render(leave_uri=leave_uri)
+
+
+def create_admin_menu_flex() -> PreparedMessage:
+    """
+    Create the Administrative Module main menu Flex Message.
+
+    The menu is static apart from the leave request LIFF URL, so it is
+    rendered once per URL and reused.
+
+    Returns:
+        Flex Message bubble content.
+    """
+    settings = get_admin_settings()
+    liff_id = settings.line_liff_id_leave
+
+    # LIFF URL or fallback message
+    leave_uri = f"line://app/{liff_id}" if liff_id else "https://line.me"
+
+    return _render_admin_menu(leave_uri)
 
 
-def create_coming_soon_flex(feature_name: str) -> dict[str, Any]:
+_COMING_SOON_LABELS = {
+    "overtime": "加班申請",
+    "expense": "費用報銷",
+    "approval": "簽核進度",
+    "announcement": "公告查詢",
+    "more": "更多功能",
+}
+
+_COMING_SOON_TEMPLATE = FlexTemplate({
+    "type": "bubble",
+    "body": {
+        "type": "box",
+        "layout": "vertical",
+        "contents": [
+            {
+                "type": "text",
+                "text": "🚧",
+                "size": "4xl",
+                "align": "center",
+            },
+            {
+                "type": "text",
+                "text": "功能開發中",
+                "weight": "bold",
+                "size": "xl",
+                "align": "center",
+                "margin": "lg",
+            },
+            {
+                "type": "separator",
+                "margin": "lg",
+            },
+            {
+                "type": "text",
+                "text": Slot("message"),
+                "wrap": True,
+                "size": "sm",
+                "align": "center",
+                "margin": "lg",
+                "color": "#666666",
+            },
+            {
+                "type": "text",
+                "text": "敬請期待！",
+                "size": "sm",
+                "align": "center",
+                "margin": "md",
+                "color": "#888888",
+            },
+        ],
+        "paddingAll": "25px",
+    },
+})
+
+
+def create_coming_soon_flex(feature_name: str) -> PreparedMessage:
     """
     Create a "Coming Soon" response Flex Message.
 
@@ -209,64 +286,64 @@ def create_coming_soon_flex(feature_name: str) -> dict[str, Any]:
     Returns:
         Flex Message bubble content.
     """
-    feature_labels = {
-        "overtime": "加班申請",
-        "expense": "費用報銷",
-        "approval": "簽核進度",
-        "announcement": "公告查詢",
-        "more": "更多功能",
-    }
+    label = _COMING_SOON_LABELS.get(feature_name, feature_name)
+    return _COMING_SOON_TEMPLATE.render(message=f"「{label}」功能即將推出")
 
-    label = feature_labels.get(feature_name, feature_name)
 
-    return {
-        "type": "bubble",
-        "body": {
-            "type": "box",
-            "layout": "vertical",
-            "contents": [
-                {
-                    "type": "text",
-                    "text": "🚧",
-                    "size": "4xl",
-                    "align": "center",
-                },
-                {
-                    "type": "text",
-                    "text": "功能開發中",
-                    "weight": "bold",
-                    "size": "xl",
-                    "align": "center",
-                    "margin": "lg",
-                },
-                {
-                    "type": "separator",
-                    "margin": "lg",
-                },
-                {
-                    "type": "text",
-                    "text": f"「{label}」功能即將推出",
-                    "wrap": True,
-                    "size": "sm",
-                    "align": "center",
-                    "margin": "lg",
-                    "color": "#666666",
-                },
-                {
-                    "type": "text",
-                    "text": "敬請期待！",
-                    "size": "sm",
-                    "align": "center",
-                    "margin": "md",
-                    "color": "#888888",
+_AUTH_REQUIRED_TEMPLATE = FlexTemplate({
+    "type": "bubble",
+    "hero": {
+        "type": "image",
+        "url": Slot("hero_url"),
+        "size": "full",
+        "aspectRatio": "20:13",
+        "aspectMode": "fit",
+        "backgroundColor": "#FFFFFF",
+    },
+    "body": {
+        "type": "box",
+        "layout": "vertical",
+        "contents": [
+            {
+                "type": "text",
+                "text": "員工身份驗證",
+                "weight": "bold",
+                "size": "xl",
+                "align": "center",
+            },
+            {
+                "type": "text",
+                "text": "請先驗證您的員工身份才能使用行政作業功能。",
+                "wrap": True,
+                "size": "sm",
+                "margin": "lg",
+                "align": "center",
+                "color": "#666666",
+            },
+        ],
+        "paddingAll": "20px",
+    },
+    "footer": {
+        "type": "box",
+        "layout": "vertical",
+        "contents": [
+            {
+                "type": "button",
+                "action": {
+                    "type": "uri",
+                    "label": "驗證身份",
+                    "uri": Slot("login_url"),
                 },
-            ],
-            "paddingAll": "25px",
-        },
-    }
+                "style": "primary",
+                "color": "#1A1A2E",
+            },
+        ],
+        "paddingAll": "15px",
+    },
+})
 
 
-def create_auth_required_flex(line_user_id: str) -> dict[str, Any]:
+def create_auth_required_flex(line_user_id: str) -> PreparedMessage:
     """
     Create authentication required Flex Message for Administrative module.
 
@@ -280,62 +357,13 @@ def create_auth_required_flex(line_user_id: str) -> dict[str, Any]:
         Uses the Framework-First login page with app context parameter
         to ensure correct LIFF ID injection for automatic window closing.
     """
-    from core.app_context import ConfigLoader
+    from core.providers import get_configuration_provider
 
-    config_loader = ConfigLoader()
-    config_loader.load()
-    base_url = config_loader.get("server.base_url", "")
+    base_url = get_configuration_provider().get("server.base_url", "")
     # Use Template-based route with app parameter for correct LIFF ID injection
     login_url = f"{base_url}/auth/page/login?line_sub={line_user_id}&app=administrative"
 
-    return {
-        "type": "bubble",
-        "hero": {
-            "type": "image",
-            "url": f"{base_url}/static/crown.png?v=2",
-            "size": "full",
-            "aspectRatio": "20:13",
-            "aspectMode": "fit",
-            "backgroundColor": "#FFFFFF",
-        },
-        "body": {
-            "type": "box",
-            "layout": "vertical",
-            "contents": [
-                {
-                    "type": "text",
-                    "text": "員工身份驗證",
-                    "weight": "bold",
-                    "size": "xl",
-                    "align": "center",
-                },
-                {
-                    "type": "text",
-                    "text": "請先驗證您的員工身份才能使用行政作業功能。",
-                    "wrap": True,
-                    "size": "sm",
-                    "margin": "lg",
-                    "align": "center",
-                    "color": "#666666",
-                },
-            ],
-            "paddingAll": "20px",
-        },
-        "footer": {
-            "type": "box",
-            "layout": "vertical",
-            "contents": [
-                {
-                    "type": "button",
-                    "action": {
-                        "type": "uri",
-                        "label": "驗證身份",
-                        "uri": login_url,
-                    },
-                    "style": "primary",
-                    "color": "#1A1A2E",
-                },
-            ],
-            "paddingAll": "15px",
-        },
-    }
+    return _AUTH_REQUIRED_TEMPLATE.render(
+        hero_url=f"{base_url}/static/crown.png?v=2",
+        login_url=login_url,
+    )
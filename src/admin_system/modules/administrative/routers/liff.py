@@ -5,11 +5,17 @@ Serves LIFF HTML pages for LINE integration.
 """
 
 import logging
+import re
 from pathlib import Path
 
-from fastapi import APIRouter
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi import APIRouter, Request
+from fastapi.responses import HTMLResponse, Response
 
+from core.static_assets import (
+    StaticAssetStore,
+    asset_response,
+    register_static_assets,
+)
 from modules.administrative.core.config import get_admin_settings
 
 logger = logging.getLogger(__name__)
@@ -19,6 +25,24 @@ router = APIRouter(prefix="/liff", tags=["LIFF"])
 # Path to static files
 STATIC_DIR = Path(__file__).parent.parent / "static"
 
+# URL prefix the routes below are served under (module routers mount at /api)
+LIFF_URL_PREFIX = "/api/administrative/liff"
+
+# Precompressed, fingerprinted copies of the LIFF static files
+_assets = register_static_assets(StaticAssetStore(STATIC_DIR))
+
+# Script tag reference rewritten to the fingerprinted JS URL
+_LEAVE_FORM_JS_SRC_RE = re.compile(
+    re.escape(f"{LIFF_URL_PREFIX}/leave_form.js") + r"(\?v=[^\"']*)?"
+)
+
+
+def _leave_form_js_name() -> str:
+    """Serve the V5 version explicitly if present, otherwise the default script."""
+    if _assets.get("leave_form_v5.js") is not None:
+        return "leave_form_v5.js"
+    return "leave_form.js"
+
 
 @router.get(
     "/leave-form",
@@ -26,55 +50,52 @@ STATIC_DIR = Path(__file__).parent.parent / "static"
     summary="Leave Request Form",
     description="Serve the LIFF leave request form page.",
 )
-async def serve_leave_form() -> FileResponse:
+async def serve_leave_form(request: Request) -> Response:
     """
     Serve the LIFF leave request form.
 
     LIFF Endpoint should be set to:
     https://your-domain.com/api/administrative/liff/leave-form
+
+    The page itself is revalidated on every load (ETag); its script tag is
+    rewritten to a fingerprinted URL so the JS can be cached as immutable.
     """
-    html_path = STATIC_DIR / "leave_form.html"
+    html = _assets.get("leave_form.html")
 
-    if not html_path.exists():
-        logger.error(f"Leave form not found: {html_path}")
+    if html is None:
+        logger.error(f"Leave form not found: {STATIC_DIR / 'leave_form.html'}")
         return HTMLResponse(
             content="<html><body><h1>Page Not Found</h1></body></html>",
             status_code=404,
         )
 
-    # Add no-store headers to prevent caching issues during dev
-    response = FileResponse(
-        path=html_path,
-        media_type="text/html",
+    js = _assets.get(_leave_form_js_name())
+    if js is None:
+        return asset_response(html, request)
+
+    js_url = f"{LIFF_URL_PREFIX}/leave_form.js?v={js.fingerprint}"
+    page = _assets.derive(
+        "leave_form.html",
+        html,
+        lambda data: _LEAVE_FORM_JS_SRC_RE.sub(js_url, data.decode("utf-8")).encode("utf-8"),
+        key=js_url,
     )
-    response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
-    return response
+    return asset_response(page, request)
 
 
 @router.get(
     "/leave_form.js",
-    response_class=FileResponse,
+    response_class=Response,
     summary="Leave Form Script",
     description="Serve the JS for leave form."
 )
-async def serve_leave_form_js() -> FileResponse:
-    # Serve the V5 version explicitly to ensure fresh code
-    js_path = STATIC_DIR / "leave_form_v5.js"
-    if not js_path.exists():
-        # Fallback if v5 missing
-        js_path = STATIC_DIR / "leave_form.js"
-
-    if not js_path.exists():
+async def serve_leave_form_js(request: Request) -> Response:
+    js = _assets.get(_leave_form_js_name())
+
+    if js is None:
         return HTMLResponse(content="console.error('JS Not Found');", status_code=404)
 
-    response = FileResponse(
-        path=js_path,
-        media_type="application/javascript",
-    )
-    # Prevent caching for dev
-    response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+    response = asset_response(js, request)
     response.headers["Content-Disposition"] = "inline"
     return response
 
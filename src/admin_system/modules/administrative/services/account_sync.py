@@ -9,10 +9,13 @@ import logging
 from datetime import date, datetime
 from typing import Any, Dict, Optional
 
+import httpx
+
 from core.ragic.registry import get_ragic_registry
-from core.ragic.sync_base import BaseRagicSyncService
+from core.ragic.sync_base import BaseRagicSyncService, SyncResult
 from core.security import generate_blind_index
 from modules.administrative.models import AdministrativeAccount
+from modules.administrative.services.org_hierarchy import get_org_hierarchy_cache
 
 logger = logging.getLogger(__name__)
 
@@ -779,6 +782,28 @@ class AccountSyncService(BaseRagicSyncService[AdministrativeAccount]):
             logger.error(f"Error mapping account record: {e}")
             return None
 
+    async def sync_all_data(self, http_client: httpx.AsyncClient) -> SyncResult:
+        """Sync all accounts and rebuild the org hierarchy cache."""
+        result = await super().sync_all_data(http_client)
+        await get_org_hierarchy_cache().rebuild()
+        return result
+
+    async def sync_single_record(
+        self,
+        ragic_id: int,
+        http_client: httpx.AsyncClient,
+    ) -> Optional[AdministrativeAccount]:
+        """Sync one account and invalidate the org hierarchy cache."""
+        instance = await super().sync_single_record(ragic_id, http_client)
+        get_org_hierarchy_cache().invalidate()
+        return instance
+
+    async def delete_record(self, ragic_id: int) -> bool:
+        """Delete one account and invalidate the org hierarchy cache."""
+        deleted = await super().delete_record(ragic_id)
+        get_org_hierarchy_cache().invalidate()
+        return deleted
+
 
 # =============================================================================
 # Singleton Helper
@@ -24,6 +24,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_standalone_session
+from core.outbox import get_outbox_dispatcher
 from core.ragic import RagicService
 from core.ragic.service import create_ragic_service
 from core.security import generate_blind_index
@@ -32,8 +33,15 @@ from modules.administrative.core.config import (
     RagicLeaveFieldMapping,
     get_admin_settings,
 )
-from modules.administrative.models import AdministrativeAccount, LeaveType
+from modules.administrative.models import AdministrativeAccount
 from modules.administrative.services.email_notification import get_email_notification_service
+from modules.administrative.services.leave_type_sync import get_leave_type_lookup
+from modules.administrative.services.org_hierarchy import (
+    ApprovalChain,
+    OrgMember,
+    extract_chinese_name,
+    get_org_hierarchy_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -183,78 +191,53 @@ class LeaveService:
 
     async def _get_mentor_account(
         self, mentor_id_card: str, db: AsyncSession
-    ) -> AdministrativeAccount | None:
+    ) -> OrgMember | None:
         """
-        Get mentor's account from local cache by ID card number.
+        Get mentor's account from the org hierarchy cache by ID card number.
         
         Args:
             mentor_id_card: Mentor's ID card number (身份證字號).
-            db: Database session.
+            db: Database session (used only when the cache needs loading).
 
         Returns:
-            AdministrativeAccount or None if not found.
+            OrgMember or None if not found.
         """
         if not mentor_id_card:
             return None
 
-        result = await db.execute(
-            select(AdministrativeAccount).where(
-                AdministrativeAccount.id_card_number == mentor_id_card
-            )
-        )
-        return result.scalar_one_or_none()
+        hierarchy = await get_org_hierarchy_cache().get(db)
+        return hierarchy.by_id_card(mentor_id_card)
 
-    async def _get_account_by_name(
-        self, name: str, db: AsyncSession
-    ) -> AdministrativeAccount | None:
-        """
-        Get account profile from local cache by name.
-        
-        Used to find manager emails when we only have their name.
-        
-        Args:
-            name: Person's name (姓名).
-            db: Database session.
-
-        Returns:
-            AdministrativeAccount or None if not found.
+    async def _get_approval_chain(
+        self, email: str, db: AsyncSession
+    ) -> ApprovalChain:
         """
-        if not name:
-            return None
+        Get the applicant and their approvers by email.
 
-        result = await db.execute(
-            select(AdministrativeAccount).where(
-                AdministrativeAccount.name == name,
-                AdministrativeAccount.status == True  # Only active accounts
-            )
-        )
-        return result.scalar_one_or_none()
+        Reads the precomputed approval chain from the org hierarchy cache
+        (rebuilt after each account sync), so no query is made unless the
+        cache needs loading.
 
-    async def _get_manager_email(
-        self, manager_name: str, db: AsyncSession
-    ) -> str | None:
-        """
-        Get manager's email by looking up their name in the account table.
-        
-        This is used to find the email for sales_dept_manager and direct_supervisor
-        when we only have their names stored in the applicant's record.
-        
         Args:
-            manager_name: Manager's name (姓名).
-            db: Database session.
+            email: Employee email address.
+            db: Database session (used only when the cache needs loading).
 
         Returns:
-            Manager's primary email or None if not found.
+            ApprovalChain for the applicant.
+
+        Raises:
+            EmployeeNotFoundError: If not found in cache.
         """
-        if not manager_name:
-            return None
+        chain = await get_org_hierarchy_cache().find_approval_chain(email, db)
 
-        account = await self._get_account_by_name(manager_name, db)
-        if account:
-            return account.primary_email
-        
-        logger.warning(f"Manager account not found for name: {manager_name}")
-        return None
+        if chain is None:
+            logger.warning(f"Account not found in cache for email: {email}")
+            raise EmployeeNotFoundError(
+                f"Account profile not found for {email}. "
+                "Please ensure Ragic data has been synced."
+            )
+
+        return chain
 
     # =========================================================================
     # Helper Methods
@@ -381,14 +364,7 @@ class LeaveService:
         Returns:
             Name with English suffix removed.
         """
-        if not name:
-            return ""
-        
-        import re
-        # Remove English letters and common suffixes at the end
-        # Keep only Chinese characters and numbers at the start
-        result = re.sub(r'[A-Za-z]+$', '', name).strip()
-        return result if result else name
+        return extract_chinese_name(name)
 
     async def _resolve_leave_type_name(
         self, leave_type_input: str, db: AsyncSession
@@ -397,8 +373,9 @@ class LeaveService:
         Resolve leave type input to exact Ragic option name.
         
         Ragic dropdown fields require exact match with option names.
-        This method looks up the leave type from cache and returns
-        the exact name that Ragic expects.
+        This method looks up the leave type in the in-memory leave type
+        table (LeaveTypeLookup, loaded from cache and refreshed after each
+        leave type sync) and returns the exact name that Ragic expects.
         
         Matching logic:
         1. Exact match on leave_type_code (假別編號)
@@ -408,7 +385,7 @@ class LeaveService:
         
         Args:
             leave_type_input: User input for leave type (code or name).
-            db: Database session.
+            db: Database session (used only when the table needs loading).
             
         Returns:
             Exact leave type name from Ragic, or original input if no match.
@@ -416,32 +393,10 @@ class LeaveService:
         if not leave_type_input:
             return ""
         
-        # Try exact match by code
-        result = await db.execute(
-            select(LeaveType).where(LeaveType.leave_type_code == leave_type_input)
-        )
-        leave_type = result.scalar_one_or_none()
-        if leave_type:
-            logger.info(f"Leave type resolved by code: {leave_type_input} -> {leave_type.leave_type_name}")
-            return leave_type.leave_type_name
-        
-        # Try exact match by name
-        result = await db.execute(
-            select(LeaveType).where(LeaveType.leave_type_name == leave_type_input)
-        )
-        leave_type = result.scalar_one_or_none()
-        if leave_type:
-            logger.info(f"Leave type exact match: {leave_type_input}")
-            return leave_type.leave_type_name
-        
-        # Try partial match (contains)
-        result = await db.execute(
-            select(LeaveType).where(LeaveType.leave_type_name.like(f"%{leave_type_input}%"))
-        )
-        leave_type = result.scalar_one_or_none()
-        if leave_type:
-            logger.info(f"Leave type partial match: {leave_type_input} -> {leave_type.leave_type_name}")
-            return leave_type.leave_type_name
+        leave_type_name = await get_leave_type_lookup().resolve(leave_type_input, db)
+        if leave_type_name:
+            logger.info(f"Leave type resolved: {leave_type_input} -> {leave_type_name}")
+            return leave_type_name
         
         # No match found, return original (may cause Ragic to show empty)
         logger.warning(f"Leave type not found in cache: {leave_type_input}, using as-is")
@@ -514,10 +469,9 @@ class LeaveService:
             }
 
         # Production mode - look up account by email
-        account = await self._get_account_by_email(email, db)
-
-        # org_name 實際上是直屬主管名稱，需去除英文後綴
-        direct_supervisor = self._extract_chinese_name(account.org_name or "")
+        chain = await self._get_approval_chain(email, db)
+        account = chain.account
+        direct_supervisor = chain.direct_supervisor_name
 
         # Return safe data (NO supervisor email exposed to frontend, only names)
         return {
@@ -544,8 +498,8 @@ class LeaveService:
 
         This is the core workflow:
             1. Receive verified email from Router (authenticated via LINE ID Token)
-            2. Fetch account profile from cache
-            3. Fetch mentor info from cache (using mentor_id_card)
+            2. Fetch account profile and approvers from cache (one query)
+            3. Resolve leave type from the in-memory leave type table
             4. Construct Ragic payload with supervisor info
             5. POST to Ragic Leave Request form for each date
 
@@ -597,24 +551,17 @@ class LeaveService:
 
             logger.info(
                 f"[DEV MODE] Leave submission using account: {account.name}")
+            hierarchy = await get_org_hierarchy_cache().get(db)
+            chain = hierarchy.chain_for(account.ragic_id)
         else:
-            # Production mode - look up account by verified email
-            account = await self._get_account_by_email(email, db)
+            # Production mode - look up account and approvers by verified email
+            chain = await self._get_approval_chain(email, db)
 
-        # org_name 實際上是直屬主管名稱，需去除英文後綴
-        direct_supervisor_name = self._extract_chinese_name(account.org_name or "")
-        
-        # 查找直屬主管的 email（用去除英文後綴的名稱查找）
-        direct_supervisor_email = None
-        if direct_supervisor_name:
-            direct_supervisor_email = await self._get_manager_email(direct_supervisor_name, db)
-
-        # Get sales department manager info
-        # sales_dept_manager field contains the manager's name, need to look up email
-        sales_dept_manager_name = account.sales_dept_manager
-        sales_dept_manager_email = None
-        if sales_dept_manager_name:
-            sales_dept_manager_email = await self._get_manager_email(sales_dept_manager_name, db)
+        account = chain.account
+        direct_supervisor_name = chain.direct_supervisor_name
+        direct_supervisor_email = chain.direct_supervisor_email
+        sales_dept_manager_name = chain.sales_dept_manager_name
+        sales_dept_manager_email = chain.sales_dept_manager_email
 
         # Resolve leave type to exact Ragic option name
         resolved_leave_type = await self._resolve_leave_type_name(leave_type, db)
@@ -734,10 +681,11 @@ class LeaveService:
 
             logger.info(f"Leave request with {len(submitted_dates)} days submitted successfully")
             
-            # Send confirmation email to the applicant
+            # Queue confirmation email to the applicant in the notification
+            # outbox (sent in background, so the response does not wait on SMTP)
             try:
                 email_service = get_email_notification_service()
-                email_sent = email_service.send_leave_request_confirmation(
+                email_queued = await email_service.queue_leave_request_confirmation(
                     to_email=account.primary_email or email,
                     employee_name=account.name,
                     leave_dates=submitted_dates,
@@ -746,14 +694,17 @@ class LeaveService:
                     leave_request_no=leave_request_no,
                     direct_supervisor=direct_supervisor_name,
                     sales_dept_manager=sales_dept_manager_name,
+                    db=db,
                 )
-                if email_sent:
-                    logger.info(f"Confirmation email sent to {account.primary_email or email}")
+                if email_queued:
+                    await db.commit()
+                    get_outbox_dispatcher().wake()
+                    logger.info(f"Confirmation email queued for {account.primary_email or email}")
                 else:
-                    logger.warning(f"Failed to send confirmation email to {account.primary_email or email}")
+                    logger.warning(f"Failed to queue confirmation email to {account.primary_email or email}")
             except Exception as email_error:
                 # Don't fail the submission if email fails
-                logger.error(f"Error sending confirmation email: {email_error}")
+                logger.error(f"Error queueing confirmation email: {email_error}")
             
             return {
                 "success": True,
@@ -6,10 +6,15 @@ Refactored to use the Core BaseRagicSyncService with RagicRegistry.
 """
 
 import logging
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.ragic.registry import get_ragic_registry
-from core.ragic.sync_base import BaseRagicSyncService
+from core.ragic.sync_base import BaseRagicSyncService, SyncResult
 from modules.administrative.models import LeaveType
 
 logger = logging.getLogger(__name__)
@@ -118,6 +123,135 @@ def _parse_int(value: Any) -> Optional[int]:
     return None
 
 
+# =============================================================================
+# Leave Type Lookup
+# =============================================================================
+
+
+class LeaveTypeLookup:
+    """
+    In-memory leave type table for resolving user input to Ragic option names.
+
+    Leave types are a few dozen rows that only change when synced from Ragic,
+    so they are loaded once and matched in memory instead of querying
+    administrative_leave_types on every leave submission.
+    LeaveTypeSyncService invalidates the table after each sync; the TTL
+    covers syncs that ran in another worker process.
+
+    Matching order:
+        1. Exact match on leave_type_code (假別編號)
+        2. Exact match on leave_type_name (請假類別)
+        3. Partial match (contains) on leave_type_name, if only one matches
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._by_code: Dict[str, str] = {}
+        self._names: Tuple[str, ...] = ()
+        self._loaded_at: Optional[float] = None
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the table has not been loaded or has expired."""
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self._ttl_seconds
+        )
+
+    def load(self, leave_types: Iterable[Tuple[str, str]]) -> None:
+        """
+        Replace the table contents.
+
+        Args:
+            leave_types: (leave_type_code, leave_type_name) pairs.
+        """
+        by_code: Dict[str, str] = {}
+        names: Dict[str, None] = {}
+        for code, name in leave_types:
+            by_code[code] = name
+            names[name] = None
+        self._by_code = by_code
+        self._names = tuple(names)
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Reload from the database on next use."""
+        self._loaded_at = None
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Load all leave types in one query."""
+        result = await db.execute(
+            select(LeaveType.leave_type_code, LeaveType.leave_type_name)
+        )
+        self.load(result.all())
+        logger.debug(f"Leave type lookup loaded: {len(self._by_code)} types")
+
+    def match(self, leave_type_input: str) -> Optional[str]:
+        """
+        Match input against the loaded table.
+
+        Args:
+            leave_type_input: Leave type code or (part of a) name.
+
+        Returns:
+            Exact leave type name, or None if nothing (or more than one
+            partial match) was found.
+        """
+        if not leave_type_input:
+            return None
+
+        name = self._by_code.get(leave_type_input)
+        if name is not None:
+            return name
+
+        if leave_type_input in self._names:
+            return leave_type_input
+
+        partial = [candidate for candidate in self._names if leave_type_input in candidate]
+        if len(partial) == 1:
+            return partial[0]
+        if partial:
+            logger.warning(f"Leave type '{leave_type_input}' is ambiguous: {partial}")
+        return None
+
+    async def resolve(self, leave_type_input: str, db: AsyncSession) -> Optional[str]:
+        """
+        Match input, loading the table first if it is stale.
+
+        Args:
+            leave_type_input: Leave type code or (part of a) name.
+            db: Database session used when the table needs loading.
+
+        Returns:
+            Exact leave type name, or None if not found.
+        """
+        if self.is_stale:
+            await self.refresh(db)
+        return self.match(leave_type_input)
+
+
+_leave_type_lookup: Optional[LeaveTypeLookup] = None
+
+
+def get_leave_type_lookup() -> LeaveTypeLookup:
+    """
+    Get the singleton LeaveTypeLookup instance.
+
+    Returns:
+        LeaveTypeLookup instance.
+    """
+    global _leave_type_lookup
+    if _leave_type_lookup is None:
+        _leave_type_lookup = LeaveTypeLookup()
+    return _leave_type_lookup
+
+
+def reset_leave_type_lookup() -> None:
+    """Reset the singleton (for testing)."""
+    global _leave_type_lookup
+    _leave_type_lookup = None
+
+
 # =============================================================================
 # Sync Service
 # =============================================================================
@@ -196,6 +330,28 @@ class LeaveTypeSyncService(BaseRagicSyncService[LeaveType]):
             logger.error(f"Error mapping leave type record: {e}")
             return None
 
+    async def sync_all_data(self, http_client: httpx.AsyncClient) -> SyncResult:
+        """Sync all leave types and invalidate the leave type lookup."""
+        result = await super().sync_all_data(http_client)
+        get_leave_type_lookup().invalidate()
+        return result
+
+    async def sync_single_record(
+        self,
+        ragic_id: int,
+        http_client: httpx.AsyncClient,
+    ) -> Optional[LeaveType]:
+        """Sync one leave type and invalidate the leave type lookup."""
+        instance = await super().sync_single_record(ragic_id, http_client)
+        get_leave_type_lookup().invalidate()
+        return instance
+
+    async def delete_record(self, ragic_id: int) -> bool:
+        """Delete one leave type and invalidate the leave type lookup."""
+        deleted = await super().delete_record(ragic_id)
+        get_leave_type_lookup().invalidate()
+        return deleted
+
 
 # =============================================================================
 # Singleton Helper
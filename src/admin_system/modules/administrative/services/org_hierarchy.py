@@ -0,0 +1,374 @@
+"""
+Org Hierarchy Cache.
+
+In-memory snapshot of the account table for approval chain lookups.
+
+The leave flow needs each applicant's direct supervisor, sales-dept manager
+and mentor, which are stored on the applicant's record as names / ID card
+numbers. Instead of querying administrative_accounts for each of them on
+every request, AccountSyncService builds an OrgHierarchy snapshot after each
+sync (name -> account, ID card -> account, account -> approval chain) and
+swaps it in atomically, so lookups are plain dictionary reads.
+
+Privacy:
+    Only the columns needed for approvals are kept. ID card numbers are
+    indexed by blind index, never held in plain text.
+"""
+
+import asyncio
+import logging
+import re
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from core.database import get_thread_local_session
+from core.security import generate_blind_index
+from modules.administrative.models import AdministrativeAccount
+
+logger = logging.getLogger(__name__)
+
+
+def extract_chinese_name(name: str) -> str:
+    """
+    Extract Chinese name by removing English suffix.
+
+    Examples:
+        "林文中VP" -> "林文中"
+        "王小明Manager" -> "王小明"
+        "張三" -> "張三"
+
+    Args:
+        name: Name that may contain English suffix.
+
+    Returns:
+        Name with English suffix removed.
+    """
+    if not name:
+        return ""
+
+    # Remove English letters and common suffixes at the end
+    # Keep only Chinese characters and numbers at the start
+    result = re.sub(r'[A-Za-z]+$', '', name).strip()
+    return result if result else name
+
+
+# =============================================================================
+# Snapshot Data
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class OrgMember:
+    """Account fields used by the leave flow and approval chain."""
+
+    ragic_id: int
+    name: str
+    status: bool
+    primary_email: Optional[str]
+    org_name: Optional[str]
+    sales_dept: Optional[str]
+    sales_dept_manager: Optional[str]
+
+    @classmethod
+    def from_account(cls, account: AdministrativeAccount) -> "OrgMember":
+        """Copy the needed fields from an account row."""
+        return cls(
+            ragic_id=account.ragic_id,
+            name=account.name,
+            status=bool(account.status),
+            primary_email=account.primary_email,
+            org_name=account.org_name,
+            sales_dept=account.sales_dept,
+            sales_dept_manager=account.sales_dept_manager,
+        )
+
+
+@dataclass(frozen=True)
+class ApprovalChain:
+    """Applicant with the names and emails of their approvers."""
+
+    account: OrgMember
+    direct_supervisor_name: str
+    direct_supervisor_email: Optional[str]
+    sales_dept_manager_name: Optional[str]
+    sales_dept_manager_email: Optional[str]
+    mentor: Optional[OrgMember]
+
+
+class OrgHierarchy:
+    """
+    Immutable lookup tables built from one read of the account table.
+
+    Approvers are matched by name among active accounts; the direct
+    supervisor name is org_name without its English suffix. A name shared
+    by several active accounts is ambiguous and matches nobody. Mentors are
+    resolved while building, so their ID card numbers are not kept.
+    """
+
+    def __init__(
+        self,
+        accounts: Iterable[
+            Tuple[OrgMember, Optional[str], Optional[str], Optional[str]]
+        ],
+    ) -> None:
+        """
+        Build the lookup tables.
+
+        Args:
+            accounts: (member, primary_email_hash, id_card_number,
+                mentor_id_card) per account.
+        """
+        self._members: Dict[int, OrgMember] = {}
+        self._by_email_hash: Dict[str, OrgMember] = {}
+        self._by_id_card_hash: Dict[str, OrgMember] = {}
+        active_by_name: Dict[str, List[OrgMember]] = {}
+        mentor_hashes: Dict[int, str] = {}
+
+        for member, email_hash, id_card_number, mentor_id_card in accounts:
+            self._members[member.ragic_id] = member
+            if email_hash:
+                self._by_email_hash[email_hash] = member
+            if id_card_number:
+                self._by_id_card_hash[_id_card_hash(id_card_number)] = member
+            if mentor_id_card:
+                mentor_hashes[member.ragic_id] = _id_card_hash(mentor_id_card)
+            if member.status:
+                active_by_name.setdefault(member.name, []).append(member)
+
+        self._by_name: Dict[str, OrgMember] = {}
+        for name, members in active_by_name.items():
+            if len(members) == 1:
+                self._by_name[name] = members[0]
+            else:
+                logger.warning(f"Account name is ambiguous ({len(members)} active accounts): {name}")
+
+        self._chains: Dict[int, ApprovalChain] = {
+            ragic_id: self._build_chain(member, mentor_hashes.get(ragic_id))
+            for ragic_id, member in self._members.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def _build_chain(
+        self, member: OrgMember, mentor_hash: Optional[str]
+    ) -> ApprovalChain:
+        # org_name 實際上是直屬主管名稱，需去除英文後綴
+        direct_supervisor_name = extract_chinese_name(member.org_name or "")
+        supervisor = self.by_name(direct_supervisor_name)
+        sales_manager = self.by_name(member.sales_dept_manager)
+        return ApprovalChain(
+            account=member,
+            direct_supervisor_name=direct_supervisor_name,
+            direct_supervisor_email=supervisor.primary_email if supervisor else None,
+            sales_dept_manager_name=member.sales_dept_manager,
+            sales_dept_manager_email=sales_manager.primary_email if sales_manager else None,
+            mentor=self._by_id_card_hash.get(mentor_hash) if mentor_hash else None,
+        )
+
+    def by_email(self, email: str) -> Optional[OrgMember]:
+        """Account whose primary email is `email` (case-insensitive)."""
+        return self._by_email_hash.get(generate_blind_index(email.strip().lower()))
+
+    def by_name(self, name: Optional[str]) -> Optional[OrgMember]:
+        """The one active account named `name`."""
+        if not name:
+            return None
+        return self._by_name.get(name)
+
+    def by_id_card(self, id_card_number: Optional[str]) -> Optional[OrgMember]:
+        """Account with ID card number `id_card_number`."""
+        if not id_card_number:
+            return None
+        return self._by_id_card_hash.get(_id_card_hash(id_card_number))
+
+    def chain_for(self, ragic_id: int) -> Optional[ApprovalChain]:
+        """Precomputed approval chain of an account."""
+        return self._chains.get(ragic_id)
+
+    def chain_for_email(self, email: str) -> Optional[ApprovalChain]:
+        """Precomputed approval chain of the account with this primary email."""
+        member = self.by_email(email)
+        return self._chains.get(member.ragic_id) if member else None
+
+
+def _id_card_hash(id_card_number: str) -> str:
+    return generate_blind_index(id_card_number.strip().upper())
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+
+_ACCOUNT_COLUMNS = (
+    AdministrativeAccount.ragic_id,
+    AdministrativeAccount.name,
+    AdministrativeAccount.status,
+    AdministrativeAccount.emails,
+    AdministrativeAccount.primary_email_hash,
+    AdministrativeAccount.id_card_number,
+    AdministrativeAccount.org_name,
+    AdministrativeAccount.sales_dept,
+    AdministrativeAccount.sales_dept_manager,
+    AdministrativeAccount.mentor_id_card,
+)
+
+
+class OrgHierarchyCache:
+    """
+    Holds the current OrgHierarchy snapshot.
+
+    The snapshot is rebuilt by AccountSyncService after each full sync and
+    loaded lazily when missing or older than the TTL (syncs run by another
+    worker process). A lookup miss reloads once if the snapshot is older
+    than `min_reload_interval`, so accounts synced elsewhere are found
+    without letting unknown emails force a reload on every request.
+
+    Concurrent requests that find the snapshot stale wait for a single
+    load (one lock per event loop) instead of each querying the table.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 600.0,
+        min_reload_interval: float = 60.0,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._min_reload_interval = min_reload_interval
+        # (snapshot, loaded_at) replaced as a whole so readers in other
+        # threads never see a half-updated pair
+        self._state: Optional[Tuple[OrgHierarchy, float]] = None
+        # asyncio primitives are loop-bound; keep one load lock per loop
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[loop] = lock
+        return lock
+
+    def _age(self) -> float:
+        if self._state is None:
+            return float("inf")
+        return time.monotonic() - self._state[1]
+
+    @property
+    def is_stale(self) -> bool:
+        """True if no snapshot is loaded or it has expired."""
+        return self._age() > self._ttl_seconds
+
+    async def load(self, db: AsyncSession) -> OrgHierarchy:
+        """
+        Build a new snapshot from the account table and swap it in.
+
+        Args:
+            db: Database session.
+
+        Returns:
+            The new snapshot.
+        """
+        start = time.monotonic()
+        result = await db.execute(
+            select(AdministrativeAccount).options(load_only(*_ACCOUNT_COLUMNS))
+        )
+        hierarchy = OrgHierarchy(
+            (
+                OrgMember.from_account(a),
+                a.primary_email_hash,
+                a.id_card_number,
+                a.mentor_id_card,
+            )
+            for a in result.scalars()
+        )
+        self._state = (hierarchy, time.monotonic())
+        logger.info(
+            f"Org hierarchy loaded: {len(hierarchy)} accounts "
+            f"({(time.monotonic() - start) * 1000:.0f}ms)"
+        )
+        return hierarchy
+
+    async def get(self, db: AsyncSession) -> OrgHierarchy:
+        """
+        Current snapshot, loading it first if stale.
+
+        Args:
+            db: Database session used when a load is needed.
+        """
+        state = self._state
+        if state is None or self.is_stale:
+            return await self._load_if_older(self._ttl_seconds, db)
+        return state[0]
+
+    async def _load_if_older(self, max_age: float, db: AsyncSession) -> OrgHierarchy:
+        # Requests that queued behind a load reuse its snapshot
+        async with self._lock():
+            state = self._state
+            if state is not None and time.monotonic() - state[1] <= max_age:
+                return state[0]
+            return await self.load(db)
+
+    async def rebuild(self) -> None:
+        """Rebuild the snapshot in its own session (called after a sync)."""
+        try:
+            async with get_thread_local_session() as session:
+                await self.load(session)
+        except Exception as e:
+            logger.error(f"Failed to rebuild org hierarchy: {e}")
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Reload from the database on next use."""
+        self._state = None
+
+    async def find_approval_chain(
+        self, email: str, db: AsyncSession
+    ) -> Optional[ApprovalChain]:
+        """
+        Approval chain of the account with this primary email.
+
+        Args:
+            email: Employee email address.
+            db: Database session used when a load is needed.
+
+        Returns:
+            ApprovalChain, or None if no account has this email.
+        """
+        hierarchy = await self.get(db)
+        chain = hierarchy.chain_for_email(email)
+        if chain is None and self._age() > self._min_reload_interval:
+            hierarchy = await self._load_if_older(self._min_reload_interval, db)
+            chain = hierarchy.chain_for_email(email)
+        return chain
+
+
+_org_hierarchy_cache: Optional[OrgHierarchyCache] = None
+
+
+def get_org_hierarchy_cache() -> OrgHierarchyCache:
+    """
+    Get the singleton OrgHierarchyCache instance.
+
+    Returns:
+        OrgHierarchyCache instance.
+    """
+    global _org_hierarchy_cache
+    if _org_hierarchy_cache is None:
+        _org_hierarchy_cache = OrgHierarchyCache()
+    return _org_hierarchy_cache
+
+
+def reset_org_hierarchy_cache() -> None:
+    """Reset the singleton (for testing)."""
+    global _org_hierarchy_cache
+    _org_hierarchy_cache = None
@@ -26,8 +26,12 @@ def mock_admin_settings():
 def mock_account():
     """Create mock AdministrativeAccount."""
     account = MagicMock()
+    account.ragic_id = 1
+    account.status = True
     account.name = "John Doe"
     account.primary_email = "john.doe@company.com"
+    account.primary_email_hash = "h:john.doe@company.com"
+    account.id_card_number = None
     account.emails = "john.doe@company.com"
     account.sales_dept = "Sales Division"
     account.sales_dept_manager = "Manager Name"
@@ -72,16 +76,32 @@ class TestLeaveServiceInit:
             assert service._settings == mock_admin_settings
 
 
+@pytest.fixture
+def org_cache():
+    """Fresh OrgHierarchyCache with a deterministic blind index."""
+    from modules.administrative.services.org_hierarchy import OrgHierarchyCache
+
+    cache = OrgHierarchyCache()
+    with patch('modules.administrative.services.leave.get_org_hierarchy_cache', return_value=cache), \
+            patch('modules.administrative.services.org_hierarchy.generate_blind_index',
+                  side_effect=lambda value: f"h:{value}"):
+        yield cache
+
+
+def _accounts_result(accounts):
+    """Mock result of the org hierarchy load query."""
+    result = MagicMock()
+    result.scalars.return_value = accounts
+    return result
+
+
 class TestLeaveServiceGetInitData:
     """Tests for get_init_data method."""
 
     @pytest.mark.asyncio
-    async def test_get_init_data_success(self, leave_service, mock_account, mock_db_session):
+    async def test_get_init_data_success(self, leave_service, mock_account, mock_db_session, org_cache):
         """Test successful init data retrieval."""
-        # Setup mock query result
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_account
-        mock_db_session.execute = AsyncMock(return_value=mock_result)
+        mock_db_session.execute = AsyncMock(return_value=_accounts_result([mock_account]))
 
         result = await leave_service.get_init_data("john.doe@company.com", mock_db_session)
 
@@ -93,19 +113,36 @@ class TestLeaveServiceGetInitData:
         assert "direct_supervisor" in result
 
     @pytest.mark.asyncio
-    async def test_get_init_data_employee_not_found(self, leave_service, mock_db_session):
+    async def test_get_init_data_employee_not_found(self, leave_service, mock_db_session, org_cache):
         """Test raises EmployeeNotFoundError when account not in cache."""
         from modules.administrative.services.leave import EmployeeNotFoundError
-        
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db_session.execute = AsyncMock(return_value=mock_result)
+
+        mock_db_session.execute = AsyncMock(return_value=_accounts_result([]))
 
         with pytest.raises(EmployeeNotFoundError) as exc_info:
             await leave_service.get_init_data("unknown@company.com", mock_db_session)
 
         assert "unknown@company.com" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_get_init_data_reads_cached_chain(self, leave_service, mock_account, mock_db_session, org_cache):
+        """Repeated requests are served from the org hierarchy snapshot."""
+        from modules.administrative.services.org_hierarchy import extract_chinese_name
+
+        mock_db_session.execute = AsyncMock(return_value=_accounts_result([mock_account]))
+
+        for _ in range(3):
+            result = await leave_service.get_init_data(" John.Doe@Company.com ", mock_db_session)
+            assert result == {
+                "name": "John Doe",
+                "email": "john.doe@company.com",
+                "sales_dept": "Sales Division",
+                "sales_dept_manager": "Manager Name",
+                "direct_supervisor": extract_chinese_name("Jane Manager/HR"),
+            }
+
+        assert mock_db_session.execute.await_count == 1
+
 
 class TestLeaveServiceSubmitRequest:
     """Tests for submit_leave_request method."""
@@ -144,3 +181,91 @@ class TestGetLeaveServiceSingleton:
             service2 = get_leave_service()
             
             assert service1 is service2
+
+
+
+class TestApprovalChain:
+    """Tests for resolving the applicant and approvers from the org hierarchy cache."""
+
+    @pytest.fixture
+    def hierarchy_cache(self):
+        cache = MagicMock()
+        with patch('modules.administrative.services.leave.get_org_hierarchy_cache', return_value=cache):
+            yield cache
+
+    @pytest.mark.asyncio
+    async def test_chain_from_cache(self, leave_service, mock_db_session, hierarchy_cache):
+        """The approval chain comes from the cache without querying."""
+        chain = MagicMock()
+        hierarchy_cache.find_approval_chain = AsyncMock(return_value=chain)
+
+        result = await leave_service._get_approval_chain("john.doe@company.com", mock_db_session)
+
+        assert result is chain
+        hierarchy_cache.find_approval_chain.assert_awaited_once_with("john.doe@company.com", mock_db_session)
+        mock_db_session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_employee_not_found(self, leave_service, mock_db_session, hierarchy_cache):
+        """Raises EmployeeNotFoundError when no account has the email."""
+        from modules.administrative.services.leave import EmployeeNotFoundError
+
+        hierarchy_cache.find_approval_chain = AsyncMock(return_value=None)
+
+        with pytest.raises(EmployeeNotFoundError):
+            await leave_service._get_approval_chain("unknown@company.com", mock_db_session)
+
+
+class TestLeaveTypeLookup:
+    """Tests for the in-memory leave type table."""
+
+    @pytest.fixture
+    def lookup(self):
+        from modules.administrative.services.leave_type_sync import LeaveTypeLookup
+
+        lookup = LeaveTypeLookup()
+        lookup.load([("A01", "特別休假"), ("B02", "病假"), ("B03", "生理假"), ("C01", "事假")])
+        return lookup
+
+    def test_match_order(self, lookup):
+        """Code, then exact name, then a unique partial match."""
+        assert lookup.match("A01") == "特別休假"
+        assert lookup.match("病假") == "病假"
+        assert lookup.match("特別") == "特別休假"
+        assert lookup.match("假") is None  # ambiguous
+        assert lookup.match("婚假") is None
+
+    @pytest.mark.asyncio
+    async def test_resolve_loads_once(self, mock_db_session):
+        """The table is loaded on first use and reused until invalidated."""
+        from modules.administrative.services.leave_type_sync import LeaveTypeLookup
+
+        mock_result = MagicMock()
+        mock_result.all.return_value = [("A01", "特別休假")]
+        mock_db_session.execute = AsyncMock(return_value=mock_result)
+        lookup = LeaveTypeLookup()
+
+        assert await lookup.resolve("A01", mock_db_session) == "特別休假"
+        assert await lookup.resolve("特別休假", mock_db_session) == "特別休假"
+        assert mock_db_session.execute.await_count == 1
+
+        lookup.invalidate()
+        await lookup.resolve("A01", mock_db_session)
+        assert mock_db_session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_invalidates_lookup(self):
+        """A leave type sync makes the next lookup reload."""
+        from core.ragic.sync_base import BaseRagicSyncService, SyncResult
+        from modules.administrative.services import leave_type_sync
+
+        leave_type_sync.reset_leave_type_lookup()
+        lookup = leave_type_sync.get_leave_type_lookup()
+        lookup.load([])
+        assert not lookup.is_stale
+
+        with patch.object(BaseRagicSyncService, "sync_all_data", AsyncMock(return_value=SyncResult())):
+            await leave_type_sync.LeaveTypeSyncService().sync_all_data(MagicMock())
+
+        assert lookup.is_stale
+        leave_type_sync.reset_leave_type_lookup()
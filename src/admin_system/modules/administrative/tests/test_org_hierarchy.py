@@ -0,0 +1,187 @@
+"""
+Unit Tests for the Org Hierarchy Cache.
+
+Tests name / ID card / email lookups, precomputed approval chains and
+snapshot loading and invalidation.
+"""
+
+import asyncio
+import dataclasses
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+@pytest.fixture(autouse=True)
+def blind_index():
+    """Deterministic blind index without SECURITY_KEY."""
+    with patch(
+        'modules.administrative.services.org_hierarchy.generate_blind_index',
+        side_effect=lambda value: f"h:{value}",
+    ):
+        yield
+
+
+def _account(ragic_id, name, email=None, status=True, **kwargs):
+    """Create mock AdministrativeAccount row."""
+    account = MagicMock()
+    account.ragic_id = ragic_id
+    account.name = name
+    account.status = status
+    account.primary_email = email
+    account.primary_email_hash = f"h:{email}" if email else None
+    account.id_card_number = kwargs.get("id_card_number")
+    account.org_name = kwargs.get("org_name")
+    account.sales_dept = kwargs.get("sales_dept")
+    account.sales_dept_manager = kwargs.get("sales_dept_manager")
+    account.mentor_id_card = kwargs.get("mentor_id_card")
+    return account
+
+
+@pytest.fixture
+def accounts():
+    return [
+        _account(1, "林文中", "lin@company.com", id_card_number="A123456789"),
+        _account(2, "陳經理", "chen@company.com"),
+        _account(3, "王小明", "wang@company.com",
+                 org_name="林文中VP", sales_dept="北區營業部",
+                 sales_dept_manager="陳經理", mentor_id_card="A123456789"),
+        _account(4, "張三", "zhang1@company.com"),
+        _account(5, "張三", "zhang2@company.com"),
+        _account(6, "李四", "li@company.com", org_name="張三", sales_dept_manager="離職者"),
+        _account(7, "離職者", "gone@company.com", status=False),
+    ]
+
+
+def _hierarchy(accounts):
+    from modules.administrative.services.org_hierarchy import OrgHierarchy, OrgMember
+
+    return OrgHierarchy(
+        (OrgMember.from_account(a), a.primary_email_hash, a.id_card_number, a.mentor_id_card)
+        for a in accounts
+    )
+
+
+class TestOrgHierarchy:
+    """Tests for OrgHierarchy lookups."""
+
+    def test_approval_chain(self, accounts):
+        """Supervisor, sales-dept manager and mentor are resolved up front."""
+        chain = _hierarchy(accounts).chain_for_email(" Wang@Company.com ")
+
+        assert chain.account.name == "王小明"
+        assert chain.direct_supervisor_name == "林文中"
+        assert chain.direct_supervisor_email == "lin@company.com"
+        assert chain.sales_dept_manager_name == "陳經理"
+        assert chain.sales_dept_manager_email == "chen@company.com"
+        assert chain.mentor.ragic_id == 1
+
+    def test_ambiguous_and_inactive_approvers(self, accounts):
+        """Duplicate active names and inactive accounts match nobody."""
+        hierarchy = _hierarchy(accounts)
+        chain = hierarchy.chain_for(6)
+
+        assert chain.direct_supervisor_name == "張三"
+        assert chain.direct_supervisor_email is None
+        assert chain.sales_dept_manager_email is None
+        assert hierarchy.by_name("張三") is None
+        assert hierarchy.by_name("離職者") is None
+
+    def test_id_card_not_held_in_plain_text(self, accounts):
+        """ID card numbers are only kept as blind index keys."""
+        hierarchy = _hierarchy(accounts)
+
+        assert hierarchy.by_id_card("a123456789 ").ragic_id == 1
+        assert "A123456789" not in hierarchy._by_id_card_hash
+        assert hierarchy.chain_for_email("unknown@company.com") is None
+
+    def test_mentor_id_card_not_kept(self, accounts):
+        """Mentors are resolved at build time; members keep no mentor ID card."""
+        from modules.administrative.services.org_hierarchy import OrgMember
+
+        chain = _hierarchy(accounts).chain_for(3)
+
+        assert chain.mentor.ragic_id == 1
+        assert "mentor_id_card" not in {f.name for f in dataclasses.fields(OrgMember)}
+        assert "A123456789" not in repr(chain)
+
+
+class TestOrgHierarchyCache:
+    """Tests for OrgHierarchyCache loading and invalidation."""
+
+    @pytest.fixture
+    def db(self, accounts):
+        session = AsyncMock()
+        result = MagicMock()
+        result.scalars.return_value = accounts
+        session.execute = AsyncMock(return_value=result)
+        return session
+
+    @pytest.mark.asyncio
+    async def test_loaded_once(self, db):
+        """Lookups after the first load make no queries."""
+        from modules.administrative.services.org_hierarchy import OrgHierarchyCache
+
+        cache = OrgHierarchyCache()
+        for _ in range(3):
+            chain = await cache.find_approval_chain("wang@company.com", db)
+            assert chain.direct_supervisor_email == "lin@company.com"
+
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_miss_reloads_only_after_interval(self, db):
+        """Unknown emails reload a snapshot only once it is old enough."""
+        from modules.administrative.services.org_hierarchy import OrgHierarchyCache
+
+        cache = OrgHierarchyCache(min_reload_interval=60)
+        assert await cache.find_approval_chain("new@company.com", db) is None
+        assert await cache.find_approval_chain("new@company.com", db) is None
+        assert db.execute.await_count == 1
+
+        cache = OrgHierarchyCache(min_reload_interval=0)
+        await cache.find_approval_chain("new@company.com", db)
+        assert db.execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_load(self, db, accounts):
+        """Requests arriving while the snapshot loads wait for that load."""
+        from modules.administrative.services.org_hierarchy import OrgHierarchyCache
+
+        result = MagicMock()
+        result.scalars.return_value = accounts
+
+        async def slow_execute(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return result
+
+        db.execute = AsyncMock(side_effect=slow_execute)
+        cache = OrgHierarchyCache(min_reload_interval=0)
+
+        chains = await asyncio.gather(
+            *(cache.find_approval_chain("wang@company.com", db) for _ in range(5)),
+            cache.get(db),
+        )
+
+        assert db.execute.await_count == 1
+        assert all(chain.account.ragic_id == 3 for chain in chains[:5])
+
+    @pytest.mark.asyncio
+    async def test_sync_rebuilds_and_webhook_invalidates(self):
+        """Full syncs rebuild the snapshot; single-record syncs invalidate it."""
+        from core.ragic.sync_base import BaseRagicSyncService, SyncResult
+        from modules.administrative.services.account_sync import AccountSyncService
+
+        cache = MagicMock()
+        cache.rebuild = AsyncMock()
+        service = AccountSyncService()
+
+        with patch('modules.administrative.services.account_sync.get_org_hierarchy_cache', return_value=cache), \
+                patch.object(BaseRagicSyncService, "sync_all_data", AsyncMock(return_value=SyncResult())), \
+                patch.object(BaseRagicSyncService, "sync_single_record", AsyncMock(return_value=None)):
+            await service.sync_all_data(MagicMock())
+            cache.rebuild.assert_awaited_once()
+            cache.invalidate.assert_not_called()
+
+            await service.sync_single_record(3, MagicMock())
+            cache.invalidate.assert_called_once()
@@ -7,12 +7,15 @@ Implements IAppModule interface for integration with the admin system framework.
 import asyncio
 import logging
 import threading
+import time
+from collections.abc import Mapping
 from typing import Any, Dict, Optional, TYPE_CHECKING
 
 from fastapi import APIRouter
 
 from core.interface import IAppModule
 from core.ragic import get_sync_manager
+from core.readiness import PHASE_FAILED, PHASE_PENDING, get_readiness
 from modules.chatbot.core.config import get_chatbot_settings
 from modules.chatbot.routers import sop_router
 from modules.chatbot.services.ragic_sync import get_sop_sync_service
@@ -23,6 +26,11 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_READINESS_PHASE = "embedding_model"
+
+# Sent with the reply token when the search misses the reply deadline
+SEARCHING_MESSAGE = {"type": "text", "text": "🔍 正在搜尋相關 SOP，結果將於稍後傳送給您。"}
+
 
 class ChatbotModule(IAppModule):
     """
@@ -40,6 +48,8 @@ class ChatbotModule(IAppModule):
     def __init__(self) -> None:
         self._context = None
         self._api_router: Optional[APIRouter] = None
+        # How search answers were delivered (see _handle_text_message)
+        self._reply_paths = {"direct": 0, "deferred": 0, "reply_failed": 0, "push_failed": 0}
 
     def get_module_name(self) -> str:
         return "chatbot"
@@ -83,18 +93,27 @@ class ChatbotModule(IAppModule):
         """Preload the embedding model in background to reduce first query latency."""
         import threading
 
+        readiness = get_readiness()
+
         def load():
             try:
                 from modules.chatbot.services.vector_service import get_vector_service
                 service = get_vector_service()
-                service._get_model()  # Trigger model loading
+                service.warmup()  # Load model and run a dummy encode
+                readiness.mark_ready(EMBEDDING_READINESS_PHASE, service._model_name)
                 logger.info("Embedding model preloaded successfully")
             except Exception as e:
+                readiness.mark_failed(EMBEDDING_READINESS_PHASE, str(e))
                 logger.warning(f"Failed to preload embedding model: {e}")
 
-        # Load in background thread to not block startup
-        thread = threading.Thread(target=load, daemon=True)
-        thread.start()
+        # Load in background thread to not block startup; /ready reports
+        # not-ready until the warmup finishes
+        if get_chatbot_settings().preload_embedding_model:
+            readiness.register(EMBEDDING_READINESS_PHASE, "Embedding model warmup")
+            thread = threading.Thread(target=load, daemon=True)
+            thread.start()
+        else:
+            logger.info("Embedding model preload disabled; loading on first query")
 
         # Start stats updater
         self._start_stats_updater()
@@ -215,7 +234,9 @@ class ChatbotModule(IAppModule):
                 message_data = event.get("message", {})
                 if message_data.get("type") == "text":
                     text = message_data.get("text", "").strip()
-                    await self._handle_text_message(user_id, text, reply_token)
+                    await self._handle_text_message(
+                        user_id, text, reply_token, event.get("timestamp")
+                    )
             else:
                 logger.debug(f"Unhandled LINE event type: {event_type}")
 
@@ -235,13 +256,13 @@ class ChatbotModule(IAppModule):
         if not reply_token:
             return
 
-        from core.database.session import get_thread_local_session
+        from core.database.session import get_standalone_session
         from core.line_auth import line_auth_check
         from modules.chatbot.services import get_line_service
 
         line_service = get_line_service()
 
-        async with get_thread_local_session() as db:
+        async with get_standalone_session() as db:
             is_auth, auth_messages = await line_auth_check(user_id, db, app_context="chatbot")
 
         if is_auth:
@@ -252,24 +273,30 @@ class ChatbotModule(IAppModule):
             await line_service.reply(reply_token, auth_messages)
 
     async def _handle_text_message(
-        self, user_id: str, text: str, reply_token: str | None
+        self,
+        user_id: str,
+        text: str,
+        reply_token: str | None,
+        event_timestamp: int | None = None,
     ) -> None:
-        """Handle LINE text message event (SOP search)."""
+        """
+        Handle LINE text message event (SOP search).
+
+        Reply tokens expire shortly after the event. If the search result
+        is not ready within the reply deadline (counted from the event
+        timestamp, so time spent queued is included), the reply token is
+        used for a "searching" message and the result is pushed later.
+        """
         if not reply_token:
             return
 
-        from core.database.session import get_thread_local_session
+        from core.database.session import get_standalone_session
         from core.line_auth import line_auth_check
-        from modules.chatbot.services import get_line_service, get_vector_service
-        from modules.chatbot.routers.bot import (
-            create_sop_result_flex,
-            create_no_result_flex,
-        )
+        from modules.chatbot.services import get_line_service
 
         line_service = get_line_service()
-        vector_service = get_vector_service()
 
-        async with get_thread_local_session() as db:
+        async with get_standalone_session() as db:
             # 使用框架統一的驗證機制
             is_auth, auth_messages = await line_auth_check(user_id, db, app_context="chatbot")
 
@@ -277,30 +304,81 @@ class ChatbotModule(IAppModule):
                 await line_service.reply(reply_token, auth_messages)
                 return
 
-            try:
-                result = await vector_service.get_best_match(text, db)
+            search = asyncio.create_task(self._search_messages(text, db))
+            budget = get_chatbot_settings().reply_deadline_seconds
+            if event_timestamp:
+                budget -= time.time() - event_timestamp / 1000
+            done, _ = await asyncio.wait({search}, timeout=max(0.0, budget))
+
+            if search in done:
+                messages = search.result()
+                if await line_service.reply(reply_token, messages):
+                    self._reply_paths["direct"] += 1
+                    return
+                # Reply token already expired or invalid: fall back to push
+                self._reply_paths["reply_failed"] += 1
+                logger.warning(f"LINE reply failed for user {user_id}; pushing result instead")
+            else:
+                # Deadline missed: acknowledge now, deliver the answer via push
+                await line_service.reply(reply_token, [SEARCHING_MESSAGE])
+                messages = await search
+                self._reply_paths["deferred"] += 1
+
+            if not await line_service.push(user_id, messages):
+                # Hand the answer to the notification outbox, which retries
+                self._reply_paths["push_failed"] += 1
+                logger.warning(f"LINE push of search result failed for user {user_id}; queued for retry")
+                await self._queue_push(db, line_service, user_id, messages)
+
+    async def _queue_push(
+        self, db: Any, line_service: Any, user_id: str, messages: list[Mapping[str, Any]]
+    ) -> None:
+        """Write a push to the notification outbox, sent with the chatbot LINE client."""
+        from core.outbox import add_line_push, get_outbox_dispatcher
 
-                if result:
-                    doc, similarity = result
-                    flex_content = create_sop_result_flex(
-                        doc.title, doc.content, similarity, doc.category
-                    )
-                    await line_service.reply(reply_token, [
-                        {"type": "flex", "altText": f"SOP: {doc.title}",
-                            "contents": flex_content}
-                    ])
-                else:
-                    flex_content = create_no_result_flex(text)
-                    await line_service.reply(reply_token, [
-                        {"type": "flex", "altText": "找不到相關 SOP",
-                            "contents": flex_content}
-                    ])
+        dispatcher = get_outbox_dispatcher()
+        dispatcher.register_line_client(self.get_module_name(), line_service.client)
+        add_line_push(db, user_id, messages, sender=self.get_module_name())
+        await db.commit()
+        dispatcher.wake()
 
-            except Exception as e:
-                logger.error(f"Search error: {e}")
-                await line_service.reply(reply_token, [
-                    {"type": "text", "text": "⚠️ 搜尋時發生錯誤，請稍後再試。"}
-                ])
+    @property
+    def reply_path_stats(self) -> Dict[str, int]:
+        """
+        Counts of how search answers were delivered.
+
+        direct: replied within the deadline; deferred: "searching" reply,
+        answer pushed; reply_failed: reply rejected, answer pushed instead;
+        push_failed: the push did not go through either and the answer was
+        queued in the notification outbox for retry.
+        """
+        return dict(self._reply_paths)
+
+    async def _search_messages(self, text: str, db: Any) -> list[Mapping[str, Any]]:
+        """Search SOPs and build the answer messages."""
+        from core.flex_templates import flex_message
+        from modules.chatbot.services import get_vector_service
+        from modules.chatbot.routers.bot import (
+            create_sop_result_flex,
+            create_no_result_flex,
+        )
+
+        try:
+            result = await get_vector_service().get_best_match(text, db)
+
+            if result:
+                doc, similarity = result
+                flex_content = create_sop_result_flex(
+                    doc.title, doc.content, similarity, doc.category
+                )
+                return [flex_message(f"SOP: {doc.title}", flex_content)]
+
+            flex_content = create_no_result_flex(text)
+            return [flex_message("找不到相關 SOP", flex_content)]
+
+        except Exception as e:
+            logger.error(f"Search error: {e}")
+            return [{"type": "text", "text": "⚠️ 搜尋時發生錯誤，請稍後再試。"}]
 
     def get_menu_config(self) -> Optional[Dict[str, Any]]:
         """Return menu configuration for GUI integration."""
@@ -342,14 +420,25 @@ class ChatbotModule(IAppModule):
         # 1. Check Vector Model Status
         try:
             svc = get_vector_service()
-            # Check if model is loaded (checking private attribute _model)
-            is_loaded = svc._model is not None
+            # Warmup phase is authoritative while preloading; fall back to
+            # the model attribute when preload is disabled
+            phase = get_readiness().get_phase_status(EMBEDDING_READINESS_PHASE)
+            if phase == PHASE_PENDING:
+                model_status = "Warming up..."
+            elif phase == PHASE_FAILED:
+                model_status = "Warmup failed"
+            elif svc._model is not None:
+                model_status = "Ready"
+            else:
+                model_status = "Not loaded (loads on first query)"
             details["Embedding Model"] = svc._model_name
-            details["Model Status"] = "Ready" if is_loaded else "Loading..."
+            details["Model Status"] = model_status
             details["Device"] = svc.get_device()
 
-            if not is_loaded:
+            if phase == PHASE_PENDING:
                 status = "initializing"
+            elif phase == PHASE_FAILED:
+                status = "warning"
         except Exception as e:
             details["Vector Service"] = "Error"
             logger.error(f"Error getting vector service status: {e}")
@@ -360,6 +449,14 @@ class ChatbotModule(IAppModule):
             details["SOP Documents"] = str(self._stats.get("sop_count", 0))
             details["LINE Users"] = str(self._stats.get("user_count", 0))
         
+        # 3b. How search answers reached users
+        paths = self._reply_paths
+        if any(paths.values()):
+            details["Replies (direct / deferred)"] = f"{paths['direct']} / {paths['deferred']}"
+            failed = paths["reply_failed"] + paths["push_failed"]
+            if failed:
+                details["Failed Replies"] = str(failed)
+
         # 4. Ragic Sync Status (from core SyncManager)
         try:
             sync_manager = get_sync_manager()
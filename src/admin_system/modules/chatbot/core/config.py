@@ -65,6 +65,26 @@ class ChatbotSettings(BaseSettings):
         Field(default=768, description="Embedding dimension", validation_alias="SOP_BOT_EMBEDDING_DIMENSION")
     ] = 768
 
+    preload_embedding_model: Annotated[
+        bool,
+        Field(
+            default=True,
+            description="Load the embedding model in background at startup (False: load on first query)",
+            validation_alias="SOP_BOT_PRELOAD_EMBEDDING_MODEL",
+        )
+    ] = True
+
+    # LINE reply latency budget
+    reply_deadline_seconds: Annotated[
+        float,
+        Field(
+            default=5.0,
+            description="Seconds (since the LINE event) to wait for a search result before replying "
+                        "with a 'searching' message and pushing the result later",
+            validation_alias="SOP_BOT_REPLY_DEADLINE_SECONDS",
+        )
+    ] = 5.0
+
     # Magic Link
     magic_link_expire_minutes: Annotated[
         int,
@@ -15,7 +15,7 @@ from typing import Any
 import jwt
 from pydantic import BaseModel, Field
 
-from core.app_context import ConfigLoader
+from core.providers import get_configuration_provider
 
 import logging
 
@@ -51,9 +51,7 @@ class TokenInvalidError(TokenError):
 
 def _get_security_config() -> dict[str, Any]:
     """Helper to load security config."""
-    loader = ConfigLoader()
-    loader.load()
-    return loader.get("security", {})
+    return get_configuration_provider().get("security", {})
 
 
 def create_magic_link_token(email: str, line_sub: str) -> str:
@@ -11,23 +11,26 @@ Note: Authentication Flex Messages are now handled by core.line_auth.LineAuthMes
       The create_auth_required_flex function has been removed to avoid duplication.
 """
 
+from functools import lru_cache
 from typing import Any
 import re
 
+from core.flex_templates import FlexTemplate, PreparedMessage, Slot
+
+
+# Pattern 1: Match full URLs with http/https protocol
+_URL_FULL_PATTERN = re.compile(r'https?://[^\s\u4e00-\u9fa5,，。!！?？;；()（）\]\[<>「」『』【】]+')
+
+# Pattern 2: Match domain-only URLs (without http://)
+# Matches patterns like: example.com, sub.example.com.tw, ap13.ragic.com/path
+# Common TLDs: com, tw, org, net, gov, edu, io, co, etc.
+_URL_DOMAIN_PATTERN = re.compile(r'(?:^|[\s\u4e00-\u9fa5：:])([a-zA-Z0-9][-a-zA-Z0-9]*\.[a-zA-Z0-9][-a-zA-Z0-9.]*\.(?:com|tw|org|net|gov|edu|io|co)(?:\.[a-zA-Z]{2,3})?(?:/[^\s\u4e00-\u9fa5,，。!！?？;；\]\[<>「」『』【】]*)?)')
+
 
 def _extract_urls(text: str) -> list[str]:
     """Extract URLs from text."""
-    urls = []
-    
-    # Pattern 1: Match full URLs with http/https protocol
-    pattern_full = r'https?://[^\s\u4e00-\u9fa5,，。!！?？;；()（）\]\[<>「」『』【】]+'
-    urls.extend(re.findall(pattern_full, text))
-    
-    # Pattern 2: Match domain-only URLs (without http://)
-    # Matches patterns like: example.com, sub.example.com.tw, ap13.ragic.com/path
-    # Common TLDs: com, tw, org, net, gov, edu, io, co, etc.
-    pattern_domain = r'(?:^|[\s\u4e00-\u9fa5：:])([a-zA-Z0-9][-a-zA-Z0-9]*\.[a-zA-Z0-9][-a-zA-Z0-9.]*\.(?:com|tw|org|net|gov|edu|io|co)(?:\.[a-zA-Z]{2,3})?(?:/[^\s\u4e00-\u9fa5,，。!！?？;；\]\[<>「」『』【】]*)?)'
-    domain_matches = re.findall(pattern_domain, text)
+    urls = _URL_FULL_PATTERN.findall(text)
+    domain_matches = _URL_DOMAIN_PATTERN.findall(text)
     
     # Clean up and add https:// prefix to domain-only URLs
     cleaned_urls = []
@@ -42,7 +45,23 @@ def _extract_urls(text: str) -> list[str]:
             # Add https:// prefix for LINE to recognize as clickable link
             cleaned_urls.append(f'https://{domain}')
     
-    return list(set(cleaned_urls))  # Remove duplicates
+    return list(dict.fromkeys(cleaned_urls))  # Remove duplicates, keep order
+
+
+@lru_cache(maxsize=256)
+def _link_buttons(content: str) -> tuple[dict[str, Any], ...]:
+    """Footer link buttons for an SOP document (cached per content)."""
+    urls = _extract_urls(content)
+    buttons = []
+    for i, url in enumerate(urls[:3]):  # Limit to 3 links
+        label = "🔗 開啟連結"
+        if len(urls) > 1:
+            label += f" {i+1}"
+        buttons.append(
+            {"type": "button", "action": {"type": "uri", "label": label, "uri": url},
+             "style": "secondary", "margin": "sm"}
+        )
+    return tuple(buttons)
 
 
 # NOTE: create_auth_required_flex has been removed.
@@ -50,12 +69,56 @@ def _extract_urls(text: str) -> list[str]:
 # or core.line_auth.line_auth_check() for authentication prompts.
 
 
+def _build_sop_result_template(with_category: bool, with_links: bool) -> FlexTemplate:
+    contents: list[dict] = [
+        {"type": "text", "text": Slot("title"), "weight": "bold", "size": "lg", "wrap": True}]
+    if with_category:
+        contents.append({"type": "text", "text": Slot("category"),
+                        "size": "xs", "color": "#888888", "margin": "sm"})
+    contents.extend([
+        {"type": "box", "layout": "baseline", "contents": [
+            {"type": "text", "text": Slot("match_text"),
+                "size": "sm", "color": Slot("match_color"), "weight": "bold"}
+        ], "margin": "md"},
+        {"type": "separator", "margin": "lg"},
+        {"type": "text", "text": Slot("content"),
+            "wrap": True, "size": "sm", "margin": "lg"}
+    ])
+
+    bubble: dict[str, Any] = {
+        "type": "bubble",
+        "size": "mega",
+        "header": {"type": "box", "layout": "vertical", "contents": [
+            {"type": "text", "text": "📋 SOP 查詢結果",
+                "color": "#FFFFFF", "size": "md", "weight": "bold"}
+        ], "backgroundColor": "#00B900", "paddingAll": "15px"},
+        "body": {"type": "box", "layout": "vertical", "contents": contents, "paddingAll": "20px"},
+    }
+    if with_links:
+        bubble["footer"] = {
+            "type": "box", 
+            "layout": "vertical", 
+            "contents": Slot("buttons"),
+            "paddingAll": "15px"
+        }
+    return FlexTemplate(bubble)
+
+
+# Skeletons for every combination of optional parts, keyed by
+# (with_category, with_links)
+_SOP_RESULT_TEMPLATES = {
+    (with_category, with_links): _build_sop_result_template(with_category, with_links)
+    for with_category in (False, True)
+    for with_links in (False, True)
+}
+
+
 def create_sop_result_flex(
     title: str,
     content: str,
     similarity: float,
     category: str | None = None,
-) -> dict[str, Any]:
+) -> PreparedMessage:
     """
     Create a Flex Message bubble displaying SOP search result.
 
@@ -75,56 +138,36 @@ def create_sop_result_flex(
     match_color = "#00B900" if similarity >= 0.8 else (
         "#FFA500" if similarity >= 0.6 else "#888888")
 
-    contents: list[dict] = [
-        {"type": "text", "text": title, "weight": "bold", "size": "lg", "wrap": True}]
-    if category:
-        contents.append({"type": "text", "text": f"📁 {category}",
-                        "size": "xs", "color": "#888888", "margin": "sm"})
-    contents.extend([
-        {"type": "box", "layout": "baseline", "contents": [
-            {"type": "text", "text": f"相符度 {match_percent}%",
-                "size": "sm", "color": match_color, "weight": "bold"}
-        ], "margin": "md"},
-        {"type": "separator", "margin": "lg"},
-        {"type": "text", "text": display_content,
-            "wrap": True, "size": "sm", "margin": "lg"}
-    ])
-
-    bubble = {
-        "type": "bubble",
-        "size": "mega",
-        "header": {"type": "box", "layout": "vertical", "contents": [
-            {"type": "text", "text": "📋 SOP 查詢結果",
-                "color": "#FFFFFF", "size": "md", "weight": "bold"}
-        ], "backgroundColor": "#00B900", "paddingAll": "15px"},
-        "body": {"type": "box", "layout": "vertical", "contents": contents, "paddingAll": "20px"},
-    }
-
     # Extract URLs and add buttons
-    urls = _extract_urls(content)
-    if urls:
-        footer_contents = []
-        for i, url in enumerate(urls[:3]):  # Limit to 3 links
-            label = "🔗 開啟連結"
-            if len(urls) > 1:
-                label += f" {i+1}"
-            
-            footer_contents.append(
-                {"type": "button", "action": {"type": "uri", "label": label, "uri": url}, 
-                 "style": "secondary", "margin": "sm"}
-            )
-        
-        bubble["footer"] = {
-            "type": "box", 
-            "layout": "vertical", 
-            "contents": footer_contents,
-            "paddingAll": "15px"
-        }
-
-    return bubble
+    buttons = _link_buttons(content)
+
+    template = _SOP_RESULT_TEMPLATES[(bool(category), bool(buttons))]
+    return template.render(
+        title=title,
+        category=f"📁 {category}",
+        match_text=f"相符度 {match_percent}%",
+        match_color=match_color,
+        content=display_content,
+        buttons=buttons,
+    )
+
+
+_NO_RESULT_TEMPLATE = FlexTemplate({
+    "type": "bubble",
+    "body": {"type": "box", "layout": "vertical", "contents": [
+        {"type": "text", "text": "🔍", "size": "3xl", "align": "center"},
+        {"type": "text", "text": "找不到相關 SOP", "weight": "bold",
+            "size": "lg", "align": "center", "margin": "lg"},
+        {"type": "separator", "margin": "lg"},
+        {"type": "text", "text": Slot("query_text"),
+            "wrap": True, "size": "sm", "margin": "lg"},
+        {"type": "text", "text": "請嘗試不同關鍵字", "wrap": True,
+            "size": "sm", "color": "#888888", "margin": "md"}
+    ], "paddingAll": "20px"},
+})
 
 
-def create_no_result_flex(query: str) -> dict[str, Any]:
+def create_no_result_flex(query: str) -> PreparedMessage:
     """
     Create a Flex Message bubble when no SOP results are found.
 
@@ -134,19 +177,7 @@ def create_no_result_flex(query: str) -> dict[str, Any]:
     Returns:
         Flex Message bubble content.
     """
-    return {
-        "type": "bubble",
-        "body": {"type": "box", "layout": "vertical", "contents": [
-            {"type": "text", "text": "🔍", "size": "3xl", "align": "center"},
-            {"type": "text", "text": "找不到相關 SOP", "weight": "bold",
-                "size": "lg", "align": "center", "margin": "lg"},
-            {"type": "separator", "margin": "lg"},
-            {"type": "text", "text": f"您的查詢: {query}",
-                "wrap": True, "size": "sm", "margin": "lg"},
-            {"type": "text", "text": "請嘗試不同關鍵字", "wrap": True,
-                "size": "sm", "color": "#888888", "margin": "md"}
-        ], "paddingAll": "20px"},
-    }
+    return _NO_RESULT_TEMPLATE.render(query_text=f"您的查詢: {query}")
 
 
 # =============================================================================
@@ -6,9 +6,11 @@ This wraps the core LineClient with chatbot-specific credentials.
 """
 
 import logging
+from collections.abc import Mapping
 from typing import Any, Dict, List
 
 from core.line_client import LineClient
+from core.line_notify import NotificationReport
 from modules.chatbot.core.config import get_chatbot_settings
 
 
@@ -29,6 +31,11 @@ class LineService:
             access_token=settings.line_channel_access_token.get_secret_value(),
         )
     
+    @property
+    def client(self) -> LineClient:
+        """The underlying LINE client."""
+        return self._client
+    
     def verify_signature(self, body: bytes, signature: str) -> bool:
         """Verify LINE webhook signature."""
         return self._client.verify_signature(body, signature)
@@ -37,18 +44,26 @@ class LineService:
         """Check if LINE credentials are configured."""
         return self._client.is_configured()
     
-    async def reply(self, reply_token: str, messages: List[Dict[str, Any]]) -> bool:
+    async def reply(self, reply_token: str, messages: List[Mapping[str, Any]]) -> bool:
         """Send reply message."""
         return await self._client.post_reply(reply_token, messages)
     
-    async def push(self, to: str, messages: List[Dict[str, Any]]) -> bool:
+    async def push(self, to: str, messages: List[Mapping[str, Any]]) -> bool:
         """Send push message."""
         return await self._client.post_push(to, messages)
     
+    async def notify(self, to: List[str], messages: List[Mapping[str, Any]]) -> NotificationReport:
+        """Send messages to many users (batched multicast with retries)."""
+        return await self._client.notify(to, messages)
+    
     async def get_profile(self, user_id: str) -> Dict[str, Any] | None:
         """Get user profile."""
         return await self._client.get_profile(user_id)
     
+    async def get_profiles(self, user_ids: List[str]) -> Dict[str, Dict[str, Any] | None]:
+        """Get many user profiles (cached, deduplicated)."""
+        return await self._client.get_profiles(user_ids)
+    
     async def close(self) -> None:
         """Close the underlying HTTP client."""
         await self._client.close()
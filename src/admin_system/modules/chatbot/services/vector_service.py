@@ -7,17 +7,20 @@ Handles embedding generation and vector similarity search.
 import asyncio
 import logging
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from sentence_transformers import SentenceTransformer
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.app_context import ConfigLoader
+from core.providers import get_configuration_provider
 from modules.chatbot.core.config import ChatbotSettings, get_chatbot_settings
 from modules.chatbot.models import SOPDocument
 from modules.chatbot.schemas import SearchResponse, SearchResult, SOPDocumentResponse
 
+if TYPE_CHECKING:
+    # Imported lazily in _get_model(): pulls in torch, which dominates startup time
+    from sentence_transformers import SentenceTransformer
+
 
 logger = logging.getLogger(__name__)
 
@@ -64,21 +67,33 @@ class VectorService:
         self._settings = settings or get_chatbot_settings()
 
         # Load global vector config
-        config_loader = ConfigLoader()
-        config_loader.load()
-        self._vector_config = config_loader.get("vector", {})
+        self._vector_config = get_configuration_provider().get("vector", {})
 
         self._model_name = self._vector_config.get(
             "model_name", "paraphrase-multilingual-MiniLM-L12-v2")
-        self._model: SentenceTransformer | None = None
+        self._model: "SentenceTransformer | None" = None
 
-    def _get_model(self) -> SentenceTransformer:
+    def _get_model(self) -> "SentenceTransformer":
         if self._model is None:
+            from sentence_transformers import SentenceTransformer
+
             logger.info(f"Loading embedding model: {self._model_name}")
             self._model = SentenceTransformer(self._model_name)
             logger.info(f"Model loaded: {self._model_name}")
         return self._model
 
+    def warmup(self) -> None:
+        """
+        Load the model and run one dummy encode.
+
+        The first encode after loading pays for lazy kernel/tokenizer
+        initialization; doing it at startup keeps that off the first query.
+
+        Raises:
+            EmbeddingError: If the model cannot be loaded or encode fails.
+        """
+        self.generate_embedding("warmup")
+
     def get_device(self) -> str:
         """Get the device (cpu/cuda) the model is running on."""
         if self._model is None:
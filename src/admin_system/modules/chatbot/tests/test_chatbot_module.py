@@ -197,5 +197,137 @@ class TestRagicServiceFuzzyMatch:
         assert RagicService._fuzzy_match("完全不同", "email", 0.8) is False
 
 
+class TestReplyDeadline:
+    """Test the reply-token latency budget of SOP searches."""
+
+    @pytest.fixture
+    def db(self):
+        session = MagicMock()
+        session.commit = AsyncMock()
+        return session
+
+    @pytest.fixture
+    def module_env(self, db):
+        """ChatbotModule with auth, DB session, LINE service and settings mocked."""
+        from contextlib import asynccontextmanager
+        from modules.chatbot.chatbot_module import ChatbotModule
+
+        @asynccontextmanager
+        async def session():
+            yield db
+
+        line_service = MagicMock()
+        line_service.reply = AsyncMock(return_value=True)
+        line_service.push = AsyncMock(return_value=True)
+        settings = MagicMock(reply_deadline_seconds=0.05)
+
+        with patch("core.database.session.get_standalone_session", session), \
+             patch("core.line_auth.line_auth_check", AsyncMock(return_value=(True, None))), \
+             patch("modules.chatbot.services.get_line_service", return_value=line_service), \
+             patch("modules.chatbot.chatbot_module.get_chatbot_settings", return_value=settings):
+            yield ChatbotModule(), line_service
+
+    @pytest.mark.asyncio
+    async def test_fast_search_replies_directly(self, module_env):
+        """A result within the deadline is sent with the reply token."""
+        module, line_service = module_env
+        answer = [{"type": "text", "text": "answer"}]
+
+        async def search(text, db):
+            return answer
+
+        with patch.object(module, "_search_messages", search):
+            await module._handle_text_message("U1", "請假", "reply-token")
+
+        line_service.reply.assert_awaited_once_with("reply-token", answer)
+        line_service.push.assert_not_awaited()
+        assert module.reply_path_stats["direct"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_search_acknowledges_then_pushes(self, module_env):
+        """A late result is pushed after an immediate 'searching' reply."""
+        import asyncio
+        from modules.chatbot.chatbot_module import SEARCHING_MESSAGE
+        module, line_service = module_env
+        answer = [{"type": "text", "text": "answer"}]
+
+        async def search(text, db):
+            await asyncio.sleep(0.2)
+            return answer
+
+        with patch.object(module, "_search_messages", search):
+            await module._handle_text_message("U1", "請假", "reply-token")
+
+        line_service.reply.assert_awaited_once_with("reply-token", [SEARCHING_MESSAGE])
+        line_service.push.assert_awaited_once_with("U1", answer)
+        assert module.reply_path_stats["deferred"] == 1
+
+    @pytest.mark.asyncio
+    async def test_time_spent_queued_counts_against_deadline(self, module_env):
+        """An event older than the deadline gets the 'searching' reply at once."""
+        import asyncio
+        import time
+        from modules.chatbot.chatbot_module import SEARCHING_MESSAGE
+        module, line_service = module_env
+
+        async def search(text, db):
+            await asyncio.sleep(0.01)
+            return [{"type": "text", "text": "answer"}]
+
+        stale = int((time.time() - 10) * 1000)
+        with patch.object(module, "_search_messages", search):
+            await module._handle_text_message("U1", "請假", "reply-token", stale)
+
+        line_service.reply.assert_awaited_once_with("reply-token", [SEARCHING_MESSAGE])
+        assert module.reply_path_stats["deferred"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_reply_falls_back_to_push(self, module_env):
+        """If LINE rejects the reply token, the answer is pushed instead."""
+        module, line_service = module_env
+        line_service.reply.return_value = False
+        answer = [{"type": "text", "text": "answer"}]
+
+        async def search(text, db):
+            return answer
+
+        with patch.object(module, "_search_messages", search):
+            await module._handle_text_message("U1", "請假", "reply-token")
+
+        line_service.push.assert_awaited_once_with("U1", answer)
+        assert module.reply_path_stats["reply_failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_push_queued_in_outbox(self, module_env, db):
+        """An answer LINE refused to push is retried through the outbox."""
+        from core.flex_templates import flex_message
+        from core.models.outbox import OutboxChannel
+
+        module, line_service = module_env
+        line_service.reply.return_value = False
+        line_service.push.return_value = False
+        answer = [flex_message("SOP", {"type": "bubble", "body": {"type": "box"}})]
+        dispatcher = MagicMock()
+
+        async def search(text, db):
+            return answer
+
+        with patch.object(module, "_search_messages", search), \
+                patch("core.outbox.get_outbox_dispatcher", return_value=dispatcher):
+            await module._handle_text_message("U1", "請假", "reply-token")
+
+        row = db.add.call_args[0][0]
+        assert row.channel == OutboxChannel.LINE
+        assert row.sender == "chatbot"
+        assert row.recipient == "U1"
+        assert row.payload["messages"] == [
+            {"type": "flex", "altText": "SOP", "contents": {"type": "bubble", "body": {"type": "box"}}}
+        ]
+        dispatcher.register_line_client.assert_called_once_with("chatbot", line_service.client)
+        db.commit.assert_awaited_once()
+        dispatcher.wake.assert_called_once()
+        assert module.reply_path_stats["push_failed"] == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
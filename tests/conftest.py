@@ -15,6 +15,26 @@ from typing import Any, Callable
 # =============================================================================
 
 
+@pytest.fixture(autouse=True)
+def fresh_config_snapshot():
+    """Rebuild the process-wide configuration snapshot for every test."""
+    from core.providers import reset_configuration_provider
+
+    reset_configuration_provider()
+    yield
+    reset_configuration_provider()
+
+
+@pytest.fixture(autouse=True)
+def fresh_line_profile_resolvers():
+    """Start every test with empty process-wide LINE profile caches."""
+    from core.line_profiles import reset_line_profile_resolvers
+
+    reset_line_profile_resolvers()
+    yield
+    reset_line_profile_resolvers()
+
+
 @pytest.fixture
 def mock_env_vars(monkeypatch):
     """Set up mock environment variables for testing."""
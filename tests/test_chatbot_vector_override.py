@@ -31,16 +31,16 @@ async def test_keyword_override():
     """
     
     # Mock dependencies
-    # 1. ConfigLoader
+    # 1. Configuration snapshot
     # 2. get_chatbot_settings
-    # 3. SentenceTransformer (heavy model loading)
+    # 3. Embedding model (heavy model loading)
     
-    with patch('modules.chatbot.services.vector_service.ConfigLoader') as MockConfigLoader, \
+    with patch('modules.chatbot.services.vector_service.get_configuration_provider') as MockConfigProvider, \
          patch('modules.chatbot.services.vector_service.get_chatbot_settings'), \
-         patch('modules.chatbot.services.vector_service.SentenceTransformer'):
+         patch.object(VectorService, '_get_model'):
         
         # Setup config mock
-        mock_config_instance = MockConfigLoader.return_value
+        mock_config_instance = MockConfigProvider.return_value
         mock_config_instance.get.return_value = {}  # Empty dict or minimal config
         
         # Initialize service
@@ -85,7 +85,8 @@ async def test_keyword_override():
         response1 = await service.search(query=query1, db=mock_db)
         
         assert len(response1.results) == 1
-        assert response1.results[0].document.sop_id == "SOP-020"
+        assert response1.results[0].document.id == sop_020.id
+        assert response1.results[0].document.title == "Company Regulations"
         assert response1.results[0].similarity_score == 1.0
         logger.info("Test Query 1 Passed: Override triggered.")
 
@@ -95,7 +96,7 @@ async def test_keyword_override():
         response2 = await service.search(query=query2, db=mock_db)
         
         assert len(response2.results) == 1
-        assert response2.results[0].document.sop_id == "SOP-020"
+        assert response2.results[0].document.id == sop_020.id
         assert response2.results[0].similarity_score == 1.0
         logger.info("Test Query 2 Passed: Override triggered (fuzzy match).")
 
@@ -106,7 +107,7 @@ async def test_keyword_override():
         response3 = await service.search(query=query3, db=mock_db)
         
         assert len(response3.results) == 1
-        assert response3.results[0].document.sop_id == "SOP-020"
+        assert response3.results[0].document.id == sop_020.id
         logger.info("Test Query 3 Passed: Override triggered (long keyword).")
         
         # Scenario 2: No Override
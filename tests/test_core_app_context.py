@@ -86,6 +86,144 @@ class TestConfigLoader:
         assert loader.is_ragic_configured() is False
 
 
+class TestConfigurationSnapshot:
+    """Tests for the process-wide immutable configuration snapshot."""
+    
+    def test_snapshot_is_shared(self, mock_env_vars):
+        """Test get_configuration_provider() returns one loaded instance."""
+        from core.providers import get_configuration_provider
+        
+        first = get_configuration_provider()
+        assert first is get_configuration_provider()
+        assert first.get("server.port") == 8000
+    
+    def test_sections_are_read_only(self, config_loader):
+        """Test nested sections cannot be mutated by callers."""
+        security = config_loader.get("security")
+        
+        assert security["jwt_algorithm"] == "HS256"
+        with pytest.raises(TypeError):
+            security["jwt_algorithm"] = "none"
+        with pytest.raises(TypeError):
+            config_loader.get("webhook.secrets")["ragic"] = "x"
+    
+    def test_precompiled_paths_match_nested_values(self, config_loader):
+        """Test every dotted path resolves to the nested value."""
+        assert config_loader.get("webhook.secrets.ragic") == ""
+        assert config_loader.get("server") == config_loader._config["server"]
+        assert config_loader.get("server.port.value", "missing") == "missing"
+        assert config_loader.get("", "missing") == "missing"
+    
+    def test_snapshot_ignores_env_changes_until_reload(self, mock_env_vars, monkeypatch):
+        """Test env changes apply only after an explicit reload."""
+        from core.providers import get_configuration_provider, reload_configuration_provider
+        
+        old = get_configuration_provider()
+        monkeypatch.setenv("SERVER_PORT", "9000")
+        
+        assert get_configuration_provider().get("server.port") == 8000
+        
+        new = reload_configuration_provider()
+        assert new is get_configuration_provider()
+        assert new.get("server.port") == 9000
+        assert old.get("server.port") == 8000
+    
+    def test_with_overrides_returns_new_snapshot(self, config_loader):
+        """Test overrides apply to a frozen copy, leaving the original intact."""
+        overridden = config_loader.with_overrides({
+            "app.debug": False,
+            "webhook.secrets.ragic": "s3cret",
+            "feature.flags": {"beta": True},
+        })
+        
+        assert overridden.get("app.debug") is False
+        assert overridden.get("app.log_level") == config_loader.get("app.log_level")
+        assert overridden.get("webhook.secrets.ragic") == "s3cret"
+        assert overridden.get("feature.flags.beta") is True
+        assert config_loader.get("app.debug") is True
+        assert config_loader.get("webhook.secrets.ragic") == ""
+        with pytest.raises(TypeError):
+            overridden.get("feature.flags")["beta"] = False
+    
+    def test_reload_runs_hooks(self, mock_env_vars):
+        """Test registered hooks receive the new snapshot; failing hooks are isolated."""
+        from core import providers
+        
+        seen = []
+        
+        def failing_hook(config):
+            raise RuntimeError("boom")
+        
+        with patch.object(providers, "_reload_hooks", []):
+            providers.register_config_reload_hook(failing_hook)
+            providers.register_config_reload_hook(seen.append)
+            providers.register_config_reload_hook(seen.append)
+            
+            new = providers.reload_configuration_provider()
+        
+        assert seen == [new]
+
+
+class TestLogServiceRingBuffer:
+    """Tests for the structured LogService ring buffer."""
+    
+    def test_entries_are_structured(self):
+        """Test category tags become the source with INFO severity."""
+        from core.providers import LogService
+        
+        log = LogService()
+        log.log_event("Loaded module", "LOADER")
+        log.log_event("Disk low", "WARN")
+        
+        entries, _ = log.get_entries()
+        assert (entries[0].level, entries[0].source) == ("WARNING", "")
+        assert (entries[1].level, entries[1].source) == ("INFO", "LOADER")
+        assert log.get_event_log()[0].endswith("[LOADER] Loaded module")
+    
+    def test_capacity_is_fixed(self):
+        """Test the buffer keeps only the newest max_entries entries."""
+        from core.providers import LogService
+        
+        log = LogService(max_entries=3)
+        for i in range(10):
+            log.log_event(f"Message {i}")
+        
+        entries, _ = log.get_entries()
+        assert len(log) == 3
+        assert [e.message for e in entries] == ["Message 9", "Message 8", "Message 7"]
+    
+    def test_cursor_pagination(self):
+        """Test pages are stable across new events via the seq cursor."""
+        from core.providers import LogService
+        
+        log = LogService()
+        for i in range(5):
+            log.log_event(f"Message {i}")
+        
+        first, cursor = log.get_entries(limit=2)
+        log.log_event("Newer message")
+        second, cursor2 = log.get_entries(limit=2, before=cursor)
+        last, cursor3 = log.get_entries(limit=2, before=cursor2)
+        
+        assert [e.message for e in first] == ["Message 4", "Message 3"]
+        assert [e.message for e in second] == ["Message 2", "Message 1"]
+        assert [e.message for e in last] == ["Message 0"]
+        assert cursor3 is None
+    
+    def test_level_filter(self):
+        """Test server-side level filtering."""
+        from core.providers import LogService
+        
+        log = LogService()
+        log.log_event("ok")
+        log.log_event("boom", "ERROR")
+        log.log_event("ok again")
+        
+        entries, cursor = log.get_entries(levels={"ERROR"})
+        assert [e.message for e in entries] == ["boom"]
+        assert cursor is None
+
+
 class TestAppContext:
     """Tests for AppContext class."""
     
@@ -103,6 +241,19 @@ class TestAppContext:
         assert isinstance(app_context.config, ConfigLoader)
         assert app_context.config.get("server.host") == "127.0.0.1"
     
+    def test_create_test_context_applies_overrides(self, mock_env_vars):
+        """Test config overrides are visible through the test context only."""
+        from core.app_context import AppContext
+        from core.providers import get_configuration_provider
+        
+        ctx = AppContext.create_test_context(
+            config_overrides={"app.debug": False, "server.port": 9100}
+        )
+        
+        assert ctx.config.get("app.debug") is False
+        assert ctx.get_server_status()[1] == 9100
+        assert get_configuration_provider().get("app.debug") is True
+    
     def test_log_event_adds_to_log(self, app_context):
         """Test log_event() adds formatted message to event log."""
         app_context.log_event("Test message", "INFO")
@@ -113,9 +264,10 @@ class TestAppContext:
     
     def test_log_event_respects_max_entries(self, app_context):
         """Test log_event() trims old entries when max reached."""
-        # Access log service to set max entries
-        app_context._log_service._max_entries = 5
-        app_context._log_service._event_log.clear()
+        from core.providers import LogService
+        
+        # Swap in a log service with a small capacity
+        app_context._log_service = LogService(max_entries=5)
         
         for i in range(10):
             app_context.log_event(f"Message {i}")
@@ -108,6 +108,114 @@ class TestSessionManagement:
             assert session is mock_session
 
 
+class TestLoopEngineRegistry:
+    """Tests for the per-event-loop engine/session factory registry."""
+    
+    @pytest.fixture(autouse=True)
+    def reset_registry(self):
+        """Reset loop registry and shared SSL context before each test."""
+        import core.database.engine as engine_module
+        engine_module._loop_databases.clear()
+        engine_module._ssl_context_loaded = False
+        yield
+        engine_module._loop_databases.clear()
+        engine_module._ssl_context_loaded = False
+    
+    @pytest.mark.asyncio
+    @patch('core.database.engine.create_async_engine')
+    async def test_same_loop_reuses_engine_and_factory(self, mock_create_engine, mock_env_vars):
+        """Test repeated calls on one loop share the engine and session factory."""
+        from core.database.engine import get_loop_database, get_thread_local_engine
+        
+        mock_create_engine.return_value = MagicMock(spec=AsyncEngine)
+        
+        first = get_loop_database()
+        second = get_loop_database()
+        
+        assert first is second
+        assert get_thread_local_engine() is first.engine
+        assert isinstance(first.session_factory, async_sessionmaker)
+        assert mock_create_engine.call_count == 1
+    
+    def test_outside_running_loop_raises(self, mock_env_vars):
+        """Test loop engines cannot be requested without a running loop."""
+        from core.database.engine import get_loop_database
+        
+        with pytest.raises(RuntimeError, match="coroutine"):
+            get_loop_database()
+    
+    @patch('core.database.engine.create_async_engine')
+    def test_each_loop_gets_own_pooled_engine(self, mock_create_engine, mock_env_vars):
+        """Test background threads with their own loops get separate engines."""
+        import asyncio
+        import threading
+        from core.database.engine import get_loop_database, LOOP_POOL_SIZE, LOOP_MAX_OVERFLOW
+        
+        mock_create_engine.side_effect = lambda *a, **kw: MagicMock(spec=AsyncEngine)
+        engines: dict[int, list] = {0: [], 1: []}
+        
+        def worker(index):
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            
+            async def use_db():
+                engines[index].append(get_loop_database().engine)
+                engines[index].append(get_loop_database().engine)
+            
+            loop.run_until_complete(use_db())
+            loop.close()
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert engines[0][0] is engines[0][1]
+        assert engines[1][0] is engines[1][1]
+        assert engines[0][0] is not engines[1][0]
+        assert mock_create_engine.call_count == 2
+        kwargs = mock_create_engine.call_args.kwargs
+        assert kwargs["pool_size"] == LOOP_POOL_SIZE
+        assert kwargs["max_overflow"] == LOOP_MAX_OVERFLOW
+    
+    @pytest.mark.asyncio
+    @patch('core.database.engine._get_ssl_context')
+    @patch('core.database.engine.create_async_engine')
+    async def test_ssl_context_created_once(self, mock_create_engine, mock_ssl, mock_env_vars):
+        """Test SSL context is shared between the main and loop engines."""
+        import core.database.engine as engine_module
+        from core.database.engine import get_engine, get_loop_database
+        
+        mock_create_engine.side_effect = lambda *a, **kw: MagicMock(spec=AsyncEngine)
+        mock_ssl.return_value = object()
+        engine_module._engine = None
+        
+        try:
+            get_engine()
+            get_loop_database()
+        finally:
+            engine_module._engine = None
+        
+        mock_ssl.assert_called_once()
+    
+    @pytest.mark.asyncio
+    @patch('core.database.engine.create_async_engine')
+    async def test_dispose_removes_loop_engine(self, mock_create_engine, mock_env_vars):
+        """Test dispose_thread_local_engine() disposes and unregisters the loop engine."""
+        from core.database.engine import get_loop_database, dispose_thread_local_engine
+        
+        mock_engine = AsyncMock(spec=AsyncEngine)
+        mock_create_engine.return_value = mock_engine
+        
+        get_loop_database()
+        await dispose_thread_local_engine()
+        
+        mock_engine.dispose.assert_called_once()
+        get_loop_database()
+        assert mock_create_engine.call_count == 2
+
+
 class TestBaseModels:
     """Tests for database base models and mixins."""
     
@@ -0,0 +1,212 @@
+"""
+Unit Tests for core.services.email_queue module.
+
+Tests background email delivery: connection reuse, retry of transient
+failures, no retry of permanent rejections, bounded queue and draining.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiosmtplib
+import pytest
+
+from core.services.email import EmailService
+
+
+def _service() -> EmailService:
+    return EmailService({
+        "host": "smtp.example.com",
+        "port": 587,
+        "username": "user",
+        "password": "secret",
+        "from_email": "noreply@example.com",
+    })
+
+
+class FakeSMTP:
+    """Stands in for aiosmtplib.SMTP; records connects and sends."""
+
+    instances: list["FakeSMTP"] = []
+    send_errors: list[Exception] = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.is_connected = False
+        self.sent: list = []
+        FakeSMTP.instances.append(self)
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def send_message(self, message):
+        if FakeSMTP.send_errors:
+            raise FakeSMTP.send_errors.pop(0)
+        self.sent.append(message)
+
+    async def quit(self):
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+
+
+@pytest.fixture(autouse=True)
+def fake_smtp():
+    FakeSMTP.instances = []
+    FakeSMTP.send_errors = []
+    with patch.object(aiosmtplib, "SMTP", FakeSMTP):
+        yield FakeSMTP
+
+
+class TestEmailQueue:
+    """Tests for EmailQueue."""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_returns_immediately_and_reuses_connection(self, fake_smtp):
+        """Queued emails are sent in the background over one connection."""
+        from core.services.email_queue import EmailQueue
+
+        queue = EmailQueue(_service(), workers=1)
+        for i in range(3):
+            assert queue.enqueue(f"user{i}@example.com", "Subject", "<p>hi</p>")
+        assert queue.sent == 0
+
+        await queue.join()
+
+        assert queue.sent == 3
+        assert len(fake_smtp.instances) == 1
+        assert fake_smtp.instances[0].kwargs["username"] == "user"
+        assert [m["To"] for m in fake_smtp.instances[0].sent] == [
+            "user0@example.com", "user1@example.com", "user2@example.com"
+        ]
+        await queue.stop()
+        assert not fake_smtp.instances[0].is_connected
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_retried_on_new_connection(self, fake_smtp):
+        """A dropped connection is discarded and the email retried."""
+        from core.services.email_queue import EmailQueue
+
+        fake_smtp.send_errors = [aiosmtplib.SMTPServerDisconnected("gone")]
+        queue = EmailQueue(_service(), workers=1, backoff=0.01)
+        queue.enqueue("user@example.com", "Subject", "<p>hi</p>")
+        await queue.join()
+
+        stats = queue.get_stats()
+        assert stats["sent"] == 1
+        assert stats["retries"] == 1
+        assert stats["smtp_connects"] == 2
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_permanent_rejection_not_retried(self, fake_smtp):
+        """SMTP 5xx replies fail the email without retrying."""
+        from core.services.email_queue import EmailQueue
+
+        fake_smtp.send_errors = [aiosmtplib.SMTPResponseException(550, "No such user")]
+        queue = EmailQueue(_service(), workers=1, backoff=0.01)
+        queue.enqueue("nobody@example.com", "Subject", "<p>hi</p>")
+        await queue.join()
+
+        assert queue.failed == 1
+        assert queue.retries == 0
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, fake_smtp):
+        """Transient failures stop being retried after max_attempts."""
+        from core.services.email_queue import EmailQueue
+
+        fake_smtp.send_errors = [aiosmtplib.SMTPResponseException(451, "Try later")] * 3
+        queue = EmailQueue(_service(), workers=1, max_attempts=3, backoff=0.01)
+        queue.enqueue("user@example.com", "Subject", "<p>hi</p>")
+        await queue.join()
+
+        assert queue.failed == 1
+        assert queue.retries == 2
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects(self):
+        """enqueue() returns False instead of blocking when full."""
+        from core.services.email_queue import EmailQueue
+
+        queue = EmailQueue(_service(), workers=1, queue_size=2)
+        results = [queue.enqueue(f"u{i}@example.com", "S", "<p></p>") for i in range(4)]
+
+        assert results == [True, True, False, False]
+        assert queue.get_stats()["rejected"] == 2
+        await queue.stop()
+        assert queue.sent == 2
+
+    @pytest.mark.asyncio
+    async def test_not_configured_skips(self):
+        """Nothing is queued without SMTP configuration."""
+        from core.services.email_queue import EmailQueue
+
+        queue = EmailQueue(EmailService({"host": "", "username": "", "password": "", "from_email": ""}))
+        assert not queue.enqueue("user@example.com", "Subject", "<p>hi</p>")
+        assert queue.enqueued == 0
+
+
+class TestQueueLeaveRequestConfirmation:
+    """Tests for EmailNotificationService.queue_leave_request_confirmation."""
+
+    @pytest.mark.asyncio
+    async def test_queues_rendered_confirmation(self):
+        """The confirmation is built and handed to the queue, not sent inline."""
+        from modules.administrative.services.email_notification import EmailNotificationService
+
+        service = EmailNotificationService()
+        service._email_service = MagicMock(is_configured=True, send_sync=MagicMock())
+        queue = MagicMock()
+        queue.enqueue.return_value = True
+
+        with patch(
+            "modules.administrative.services.email_notification.get_email_queue",
+            return_value=queue,
+        ):
+            result = await service.queue_leave_request_confirmation(
+                to_email="user@example.com",
+                employee_name="王小明",
+                leave_dates=["2026-02-01", "2026-02-02"],
+                leave_type="特休",
+                reason="家庭旅遊",
+                leave_request_no="LR-001",
+                direct_supervisor="李主管",
+                sales_dept_manager="陳經理",
+            )
+
+        assert result is True
+        service._email_service.send_sync.assert_not_called()
+        to_email, subject, html_content = queue.enqueue.call_args[0]
+        assert to_email == "user@example.com"
+        assert "LR-001" in subject
+        assert "王小明" in html_content
+        assert "2026-02-01 至 2026-02-02" in html_content
+
+    @pytest.mark.asyncio
+    async def test_outbox_row_left_to_callers_transaction(self):
+        """With a session the row is added to the outbox; the caller commits."""
+        from modules.administrative.services.email_notification import EmailNotificationService
+
+        service = EmailNotificationService()
+        service._email_service = MagicMock(is_configured=True)
+        db = MagicMock()
+        db.commit = AsyncMock()
+
+        result = await service.queue_leave_request_confirmation(
+            to_email="user@example.com",
+            employee_name="王小明",
+            leave_dates=["2026-02-01"],
+            leave_type="特休",
+            reason="家庭旅遊",
+            leave_request_no="LR-001",
+            direct_supervisor="李主管",
+            sales_dept_manager="陳經理",
+            db=db,
+        )
+
+        assert result is True
+        assert db.add.call_args[0][0].recipient == "user@example.com"
+        db.commit.assert_not_awaited()
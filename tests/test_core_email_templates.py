@@ -0,0 +1,130 @@
+"""
+Unit Tests for core.services.email_templates module.
+
+Tests template compilation, rendering and the template registry used by
+EmailTemplates and the administrative email notifications.
+"""
+
+import pytest
+
+
+class TestEmailTemplate:
+    """Tests for EmailTemplate."""
+
+    def test_render_matches_str_format(self):
+        """Rendering gives the same text as str.format, including escapes and quotes."""
+        from core.services.email_templates import EmailTemplate
+
+        source = "<style>p {{ color: red; }}</style>\n<p title='{name}'>\"{name}\" {count} 天</p>\\"
+        template = EmailTemplate(source)
+
+        assert template.fields == {"name", "count"}
+        assert template.render(name="王小明", count=3) == source.format(name="王小明", count=3)
+
+    def test_extra_values_ignored(self):
+        """Values for names the template does not use are ignored."""
+        from core.services.email_templates import EmailTemplate
+
+        assert EmailTemplate("Hi {name}").render(name="A", unused=1) == "Hi A"
+        assert EmailTemplate("static").render(unused=1) == "static"
+
+    def test_missing_value_raises(self):
+        """Every field needs a value."""
+        from core.services.email_templates import EmailTemplate
+
+        with pytest.raises(TypeError):
+            EmailTemplate("Hi {name}").render()
+
+    @pytest.mark.parametrize("source", ["{name!r}", "{count:>5}", "{user.name}", "{items[0]}", "{class}"])
+    def test_unsupported_fields_rejected(self, source):
+        """Only plain names are allowed as fields."""
+        from core.services.email_templates import EmailTemplate
+
+        with pytest.raises(ValueError):
+            EmailTemplate(source)
+
+
+class TestEmailTemplateRegistry:
+    """Tests for EmailTemplateRegistry and the registered templates."""
+
+    def test_register_and_render(self):
+        """Subject, HTML and text share one set of values."""
+        from core.services.email_templates import EmailTemplateRegistry
+
+        registry = EmailTemplateRegistry()
+        registry.register("test.notice", subject="通知 {no}", html="<b>{name}</b>", text="{name} {no}")
+
+        email = registry.render("test.notice", name="王小明", no="LR-1")
+
+        assert "test.notice" in registry
+        assert email.subject == "通知 LR-1"
+        assert email.html == "<b>王小明</b>"
+        assert email.text == "王小明 LR-1"
+        assert registry.get("test.notice").fields == {"name", "no"}
+
+    def test_html_only_template(self):
+        """Templates without a text part render text as None."""
+        from core.services.email_templates import EmailTemplateRegistry
+
+        registry = EmailTemplateRegistry()
+        registry.register("test.html", subject="S", html="<p>{x}</p>")
+
+        assert registry.render("test.html", x=1).text is None
+
+    def test_framework_templates_registered(self):
+        """Core and administrative templates are available by name."""
+        from core.services.email_templates import (
+            LEAVE_REQUEST_CONFIRMATION,
+            MAGIC_LINK_VERIFICATION,
+            get_email_template_registry,
+        )
+        from modules.administrative.services.email_notification import EMAIL_VERIFICATION_TEMPLATE
+
+        registry = get_email_template_registry()
+        assert MAGIC_LINK_VERIFICATION in registry
+        assert LEAVE_REQUEST_CONFIRMATION in registry
+        assert EMAIL_VERIFICATION_TEMPLATE in registry
+
+
+class TestEmailTemplates:
+    """Tests for the EmailTemplates helpers built on the registry."""
+
+    def test_magic_link_verification(self):
+        """Magic link email contains the link, expiry and app name."""
+        from core.services.email import EmailTemplates
+
+        subject, html, text = EmailTemplates.magic_link_verification(
+            employee_name="王小明",
+            magic_link="https://example.com/verify?token=abc",
+            expire_minutes=15,
+            app_name="Admin System",
+        )
+
+        assert subject == "🔐 Admin System - 綁定您的 LINE 帳號"
+        assert 'href="https://example.com/verify?token=abc"' in html
+        assert "此連結將在 15 分鐘後失效" in text
+        assert text.startswith("您好 王小明")
+
+    def test_leave_request_confirmation(self):
+        """Date range, day count and unassigned approvers are filled in."""
+        from core.services.email import EmailTemplates
+
+        subject, html = EmailTemplates.leave_request_confirmation(
+            employee_name="王小明",
+            leave_request_no="LR-001",
+            leave_type="特休",
+            leave_dates=["2026-02-01", "2026-02-02", "2026-02-03"],
+            reason="家庭旅遊",
+            direct_supervisor="",
+            dept_manager="陳經理",
+            status_url="https://example.com/status",
+        )
+
+        assert subject == "【高成保險經紀人股份有限公司】請假申請已送出 - LR-001"
+        assert "2026-02-01 至 2026-02-03" in html
+        assert "2026-02-01、2026-02-02、2026-02-03" in html
+        assert "<strong>3</strong> 天" in html
+        assert "未指定" in html
+        assert "陳經理" in html
+        assert 'href="https://example.com/status"' in html
+        assert ".info-row:last-child {" in html
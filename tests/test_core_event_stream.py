@@ -0,0 +1,140 @@
+"""
+Unit Tests for core.event_stream and the dashboard event stream.
+
+Tests SSE encoding, fan-out, per-subscriber backpressure and resuming
+from a log cursor.
+"""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def fresh_broadcaster():
+    """Use a fresh EventBroadcaster singleton per test."""
+    from core.event_stream import reset_event_broadcaster
+
+    reset_event_broadcaster()
+    yield
+    reset_event_broadcaster()
+
+
+class TestEventBroadcaster:
+    """Tests for EventBroadcaster and Subscription."""
+
+    async def test_encode_sse_frame(self):
+        """Events are encoded as id/event/data lines ending in a blank line."""
+        from core.event_stream import StreamEvent
+
+        frame = StreamEvent("log", {"message": "hi"}, id="7").encode()
+
+        assert frame == 'id: 7\nevent: log\ndata: {"message":"hi"}\n\n'
+
+    async def test_publish_fans_out_to_all_subscribers(self):
+        """One publish reaches every subscriber."""
+        from core.event_stream import EventBroadcaster, StreamEvent
+
+        broadcaster = EventBroadcaster()
+        subs = [broadcaster.subscribe() for _ in range(3)]
+
+        broadcaster.publish(StreamEvent("status", {"ok": True}))
+
+        for sub in subs:
+            assert (await sub.get(timeout=1)).data == {"ok": True}
+
+    async def test_publish_from_worker_thread(self):
+        """Events published from another thread are delivered on the loop."""
+        from core.event_stream import EventBroadcaster, StreamEvent
+
+        broadcaster = EventBroadcaster()
+        sub = broadcaster.subscribe()
+
+        thread = threading.Thread(
+            target=broadcaster.publish, args=(StreamEvent("log", {"n": 1}),)
+        )
+        thread.start()
+        thread.join()
+
+        assert (await sub.get(timeout=1)).data == {"n": 1}
+
+    async def test_slow_subscriber_overflows_without_blocking(self):
+        """A full queue flags the subscriber instead of blocking the publisher."""
+        from core.event_stream import EventBroadcaster, StreamEvent
+
+        broadcaster = EventBroadcaster(queue_size=2)
+        slow = broadcaster.subscribe()
+
+        for i in range(5):
+            broadcaster.publish(StreamEvent("log", {"n": i}))
+
+        assert slow.overflowed is True
+        slow.drain()
+        assert slow.overflowed is False
+        assert await slow.get(timeout=0.01) is None
+
+    async def test_close_unsubscribes(self):
+        """Closed subscriptions no longer receive events."""
+        from core.event_stream import EventBroadcaster
+
+        broadcaster = EventBroadcaster()
+        sub = broadcaster.subscribe()
+        sub.close()
+
+        assert broadcaster.subscriber_count == 0
+
+
+class TestDashboardEventStream:
+    """Tests for api.system.stream_events."""
+
+    @pytest.fixture
+    def request_mock(self):
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(return_value=False)
+        return request
+
+    async def test_resume_replays_missed_logs_then_streams_live(self, request_mock):
+        """Entries after the cursor are replayed, then live entries follow once."""
+        from api import system
+        from core.event_stream import StreamEvent
+        from core.providers import LogService
+
+        log = LogService()
+        for i in range(4):
+            log.log_event(f"Message {i}")
+        log.add_listener(system._forward_log_entry)
+
+        status = StreamEvent("status", {"modules": []})
+        with patch.object(system, "_status_event", AsyncMock(return_value=status)):
+            stream = system.stream_events(request_mock, log, after=2)
+            frames = [await stream.__anext__() for _ in range(3)]
+
+            log.log_event("Live message")
+            live = await asyncio.wait_for(stream.__anext__(), timeout=1)
+            await stream.aclose()
+
+        assert "Message 2" in frames[0] and "id: 3" in frames[0]
+        assert "Message 3" in frames[1]
+        assert frames[2].startswith("event: status")
+        assert "Live message" in live and "id: 5" in live
+
+    async def test_new_client_only_gets_new_logs(self, request_mock):
+        """Without a cursor, existing entries are not replayed."""
+        from api import system
+        from core.event_stream import StreamEvent
+        from core.providers import LogService
+
+        log = LogService()
+        log.log_event("Old message")
+
+        status = StreamEvent("status", {})
+        with patch.object(system, "_status_event", AsyncMock(return_value=status)):
+            stream = system.stream_events(request_mock, log)
+            first = await stream.__anext__()
+            await stream.aclose()
+
+        assert first.startswith("event: status")
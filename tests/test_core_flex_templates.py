@@ -0,0 +1,134 @@
+"""
+Unit Tests for core.flex_templates and the pre-built reply messages.
+
+Tests that rendered templates match the equivalent dicts, that cached
+encodings are reused end to end, and that LineClient sends them as-is.
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+def _substitute(value, slots):
+    """Reference: replace Slot instances the slow way."""
+    from core.flex_templates import Slot
+
+    if isinstance(value, Slot):
+        return slots[value.name]
+    if isinstance(value, dict):
+        return {k: _substitute(v, slots) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, slots) for v in value]
+    return value
+
+
+class TestFlexTemplate:
+    """Tests for FlexTemplate and PreparedMessage."""
+
+    def test_render_matches_dict_substitution(self):
+        """Slots are filled with correctly escaped JSON values."""
+        from core.flex_templates import FlexTemplate, Slot
+
+        skeleton = {
+            "type": "bubble",
+            "body": {"contents": [
+                {"type": "text", "text": Slot("title")},
+                {"type": "text", "text": Slot("title"), "color": Slot("color")},
+            ]},
+            "footer": {"contents": Slot("buttons")},
+        }
+        values = {
+            "title": '引號 "quoted" \\ back\nslash \x00',
+            "color": "#00B900",
+            "buttons": [{"type": "button", "action": {"uri": "https://a.com/?x=1&y=2"}}],
+        }
+
+        rendered = FlexTemplate(skeleton).render(**values)
+
+        assert json.loads(rendered.json) == _substitute(skeleton, values)
+        assert rendered == _substitute(skeleton, values)
+
+    def test_missing_slot_raises(self):
+        """Every slot needs a value."""
+        from core.flex_templates import FlexTemplate, Slot
+
+        with pytest.raises(KeyError):
+            FlexTemplate({"text": Slot("title")}).render()
+
+    def test_flex_message_embeds_cached_encoding(self):
+        """Wrapping a prepared bubble reuses its bytes verbatim."""
+        from core.flex_templates import PreparedMessage, encode_messages, flex_message
+
+        bubble = PreparedMessage.from_dict({"type": "bubble", "body": {"text": "hi"}})
+        message = flex_message("alt", bubble)
+
+        assert bubble.json in message.json
+        assert message["contents"]["body"]["text"] == "hi"
+        # A plain flex dict around a prepared bubble encodes the same way
+        plain = {"type": "flex", "altText": "alt", "contents": bubble}
+        assert encode_messages([plain]) == b"[" + message.json + b"]"
+
+
+class TestPrebuiltMessages:
+    """Tests for the chatbot and administrative reply templates."""
+
+    def test_sop_result_variants(self):
+        """Optional category and link footer are only present when needed."""
+        from modules.chatbot.routers.bot import create_sop_result_flex
+
+        plain = create_sop_result_flex("請假", "說明", 0.65)
+        full = create_sop_result_flex(
+            "請假", "見 https://a.com/x 與 ap13.ragic.com/form", 0.9, "人事"
+        )
+
+        assert "footer" not in plain
+        assert len(plain["body"]["contents"]) == 4
+        assert plain["body"]["contents"][1]["contents"][0]["color"] == "#FFA500"
+
+        assert full["body"]["contents"][1]["text"] == "📁 人事"
+        uris = [b["action"]["uri"] for b in full["footer"]["contents"]]
+        assert uris == ["https://a.com/x", "https://ap13.ragic.com/form"]
+        assert full["footer"]["contents"][1]["action"]["label"] == "🔗 開啟連結 2"
+
+    def test_admin_menu_rendered_once(self):
+        """The static menu is reused for the same LIFF URL."""
+        from modules.administrative.messages import create_admin_menu_flex
+
+        settings = MagicMock(line_liff_id_leave="1234-abcd")
+        with patch("modules.administrative.messages.menu.get_admin_settings", return_value=settings):
+            first = create_admin_menu_flex()
+            second = create_admin_menu_flex()
+
+        assert first is second
+        leave_button = first["body"]["contents"][0]["contents"][0]
+        assert leave_button["action"] == {"type": "uri", "uri": "line://app/1234-abcd"}
+
+
+class TestLineClientPreparedMessages:
+    """Tests for sending prepared messages through LineClient."""
+
+    @pytest.mark.asyncio
+    async def test_prepared_messages_sent_as_raw_body(self):
+        """Prepared messages are sent as pre-encoded bytes."""
+        from core.flex_templates import PreparedMessage, flex_message
+        from core.line_client import LineClient
+
+        client = LineClient(channel_secret="secret", access_token="token")
+        bubble = PreparedMessage.from_dict({"type": "bubble"})
+        messages = [{"type": "text", "text": "hi"}, flex_message("alt", bubble)]
+
+        with patch.object(client._client, "post", new_callable=AsyncMock) as mock_post:
+            mock_post.return_value = MagicMock(status_code=200)
+            assert await client.post_reply("reply-token", messages) is True
+
+        kwargs = mock_post.call_args.kwargs
+        assert "json" not in kwargs
+        assert json.loads(kwargs["content"]) == {
+            "replyToken": "reply-token",
+            "messages": [
+                {"type": "text", "text": "hi"},
+                {"type": "flex", "altText": "alt", "contents": {"type": "bubble"}},
+            ],
+        }
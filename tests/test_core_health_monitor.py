@@ -0,0 +1,129 @@
+"""
+Unit Tests for core.health_monitor module.
+
+Tests concurrent checks, per-check timeouts, snapshot caching and the
+background prober lifecycle.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+def _check(result: dict, delay: float = 0.0, calls: list | None = None):
+    """Build a health check coroutine function."""
+
+    async def check() -> dict:
+        if calls is not None:
+            calls.append(time.perf_counter())
+        await asyncio.sleep(delay)
+        return result
+
+    return check
+
+
+class TestHealthMonitor:
+    """Tests for HealthMonitor."""
+
+    async def test_checks_run_concurrently(self):
+        """Total probe time is the slowest check, not the sum."""
+        from core.health_monitor import HealthMonitor
+
+        monitor = HealthMonitor()
+        for i in range(5):
+            monitor.register(f"svc{i}", _check({"status": "healthy"}, delay=0.1))
+
+        start = time.perf_counter()
+        snapshots = await monitor.refresh()
+        elapsed = time.perf_counter() - start
+
+        assert len(snapshots) == 5
+        assert elapsed < 0.3
+
+    async def test_timeout_and_exception_become_error_snapshots(self):
+        """A slow or failing check does not fail the probe."""
+        from core.health_monitor import HealthMonitor
+
+        async def broken() -> dict:
+            raise RuntimeError("connection refused")
+
+        monitor = HealthMonitor(timeout=0.05)
+        monitor.register("slow", _check({"status": "healthy"}, delay=1.0))
+        monitor.register("broken", broken)
+        monitor.register("ok", _check({"status": "healthy", "message": "Connected"}))
+
+        snapshots = {s.name: s for s in await monitor.get_snapshots()}
+
+        assert snapshots["slow"].status == "error"
+        assert "Timed out" in snapshots["slow"].message
+        assert snapshots["broken"].status == "error"
+        assert snapshots["broken"].details["Error"] == "connection refused"
+        assert snapshots["ok"].message == "Connected"
+
+    async def test_fresh_snapshots_are_served_from_cache(self):
+        """Reads within the TTL do not call upstream again."""
+        from core.health_monitor import HealthMonitor
+
+        calls: list = []
+        monitor = HealthMonitor(ttl=60)
+        monitor.register("ragic", _check({"status": "healthy"}, calls=calls))
+
+        first = await monitor.get_snapshots()
+        second = await monitor.get_snapshots()
+
+        assert len(calls) == 1
+        assert first[0] is second[0]
+        assert second[0].age_seconds >= 0
+
+    async def test_stale_snapshots_returned_while_refreshing(self):
+        """Stale data is returned immediately and refreshed in the background."""
+        from core.health_monitor import HealthMonitor
+
+        calls: list = []
+        monitor = HealthMonitor(ttl=0)
+        monitor.register("ragic", _check({"status": "healthy"}, delay=0.05, calls=calls))
+
+        first = await monitor.get_snapshots()
+        await asyncio.sleep(0.01)
+        stale = await monitor.get_snapshots()
+
+        assert stale[0] is first[0]
+        await asyncio.sleep(0.1)
+        assert len(calls) == 2
+        assert (await monitor.get_snapshots())[0] is not first[0]
+
+    async def test_concurrent_refreshes_share_one_probe(self):
+        """Parallel refresh calls join the in-flight probe."""
+        from core.health_monitor import HealthMonitor
+
+        calls: list = []
+        monitor = HealthMonitor()
+        monitor.register("line", _check({"status": "healthy"}, delay=0.05, calls=calls))
+
+        await asyncio.gather(*(monitor.refresh() for _ in range(10)))
+
+        assert len(calls) == 1
+
+    async def test_prober_runs_and_stop_closes_clients(self):
+        """The prober fills the cache; stop() cancels it and closes resources."""
+        from core.health_monitor import HealthMonitor
+
+        closed = []
+
+        async def close() -> None:
+            closed.append(True)
+
+        monitor = HealthMonitor(interval=0.01)
+        monitor.register("line", _check({"status": "healthy"}), close=close)
+        monitor.start()
+        await asyncio.sleep(0.05)
+
+        assert (await monitor.get_snapshots())[0].status == "healthy"
+
+        await monitor.stop()
+
+        assert closed == [True]
+        assert monitor.has_checks is False
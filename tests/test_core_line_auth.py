@@ -448,3 +448,89 @@ class TestAuthErrorMessages:
             # Simple check: at least one CJK character
             has_chinese = any('\u4e00' <= char <= '\u9fff' for char in message)
             assert has_chinese, f"Message '{key}' should be in Chinese: {message}"
+
+
+# =============================================================================
+# Test LINE Binding Cache
+# =============================================================================
+
+
+class TestLineBindingCache:
+    """Tests for LineBindingCache and its use in AuthService.is_user_authenticated."""
+
+    @pytest.fixture
+    def auth_service_with_cache(self):
+        """Create an AuthService with an isolated binding cache."""
+        from core.services.auth import AuthService
+        from core.services.binding_cache import LineBindingCache
+
+        config = MagicMock()
+        config.get = MagicMock(side_effect=lambda key, default=None: default)
+        cache = LineBindingCache()
+        service = AuthService(
+            ragic_service=MagicMock(),
+            config_loader=config,
+            binding_cache=cache,
+        )
+        return service, cache
+
+    def test_positive_and_negative_ttl(self):
+        """Test that negative entries expire sooner than positive ones."""
+        from core.services.binding_cache import LineBindingCache
+
+        cache = LineBindingCache(positive_ttl=60, negative_ttl=0)
+        cache.set("Ubound", True)
+        cache.set("Uunbound", False)
+
+        assert cache.get("Ubound") is True
+        assert cache.get("Uunbound") is None
+        assert cache.get("Uunknown") is None
+
+    def test_max_entries_evicts_oldest(self):
+        """Test that the oldest entry is evicted once the cache is full."""
+        from core.services.binding_cache import LineBindingCache
+
+        cache = LineBindingCache(max_entries=2)
+        cache.set("U1", True)
+        cache.set("U2", True)
+        cache.set("U3", True)
+
+        assert cache.get("U1") is None
+        assert cache.get("U2") is True
+        assert cache.get("U3") is True
+
+    def test_invalidate_ignores_none(self):
+        """Test that invalidate drops given IDs and tolerates None."""
+        from core.services.binding_cache import LineBindingCache
+
+        cache = LineBindingCache()
+        cache.set("U1", True)
+        cache.set("U2", False)
+        cache.invalidate("U1", None)
+
+        assert cache.get("U1") is None
+        assert cache.get("U2") is False
+
+    @pytest.mark.asyncio
+    async def test_is_user_authenticated_hits_db_once(self, auth_service_with_cache, mock_db_session):
+        """Test that repeated auth checks are served from cache."""
+        service, cache = auth_service_with_cache
+        service.is_user_bound = AsyncMock(return_value=True)
+
+        assert await service.is_user_authenticated("U123", mock_db_session) is True
+        assert await service.is_user_authenticated("U123", mock_db_session) is True
+
+        service.is_user_bound.assert_called_once_with("U123", mock_db_session)
+        assert cache.get_stats()["hits"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_forces_db_lookup(self, auth_service_with_cache, mock_db_session):
+        """Test that an invalidated (previously unbound) user is re-checked."""
+        service, cache = auth_service_with_cache
+        service.is_user_bound = AsyncMock(side_effect=[False, True])
+
+        assert await service.is_user_authenticated("U123", mock_db_session) is False
+        cache.invalidate("U123")
+        assert await service.is_user_authenticated("U123", mock_db_session) is True
+
+        assert service.is_user_bound.call_count == 2
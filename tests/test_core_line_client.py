@@ -276,6 +276,153 @@ class TestLineClientGetProfile:
         assert result is None
 
 
+class TestLineClientProfileCache:
+    """Tests for cached, deduplicated profile resolution."""
+    
+    @staticmethod
+    def _profile_response(user_id: str) -> MagicMock:
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"userId": user_id, "displayName": f"User {user_id}"}
+        return mock_response
+    
+    @pytest.mark.asyncio
+    async def test_get_profile_cached(self):
+        """Test repeated get_profile() calls hit LINE only once."""
+        from core.line_client import LineClient
+        
+        client = LineClient(channel_secret="secret", access_token="token")
+        
+        with patch.object(client._client, 'get', new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = self._profile_response("U123")
+            
+            first = await client.get_profile("U123")
+            second = await client.get_profile("U123")
+            
+            assert first == second == {"userId": "U123", "displayName": "User U123"}
+            mock_get.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_not_found_is_not_cached(self):
+        """Test failed lookups are retried on the next call."""
+        from core.line_client import LineClient
+        
+        client = LineClient(channel_secret="secret", access_token="token")
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        
+        with patch.object(client._client, 'get', new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = mock_response
+            
+            assert await client.get_profile("U404") is None
+            assert await client.get_profile("U404") is None
+            assert mock_get.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_deduplicated(self):
+        """Test concurrent lookups for the same user share one request."""
+        import asyncio
+        from core.line_client import LineClient
+        
+        client = LineClient(channel_secret="secret", access_token="token")
+        
+        async def slow_get(url, headers=None):
+            await asyncio.sleep(0.01)
+            return self._profile_response(url.rsplit("/", 1)[-1])
+        
+        with patch.object(client._client, 'get', side_effect=slow_get) as mock_get:
+            results = await asyncio.gather(*(client.get_profile("U123") for _ in range(10)))
+            
+            assert all(r["userId"] == "U123" for r in results)
+            assert mock_get.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_cache_shared_by_clients_of_a_channel(self):
+        """Test short-lived clients of one channel share cached profiles."""
+        from core.line_client import LineClient
+        
+        first = LineClient(channel_secret="secret", access_token="token")
+        with patch.object(first._client, 'get', new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = self._profile_response("U123")
+            await first.get_profile("U123")
+        await first.close()
+        
+        second = LineClient(channel_secret="secret", access_token="token")
+        other_channel = LineClient(channel_secret="secret", access_token="other-token")
+        with patch.object(second._client, 'get', new_callable=AsyncMock) as second_get, \
+                patch.object(other_channel._client, 'get', new_callable=AsyncMock) as other_get:
+            other_get.return_value = self._profile_response("U123")
+            
+            assert (await second.get_profile("U123"))["userId"] == "U123"
+            await other_channel.get_profile("U123")
+            
+            second_get.assert_not_called()
+            other_get.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_finished_lookup_keeps_newer_inflight_task(self):
+        """Test a finishing lookup does not drop a newer task for the same user."""
+        import asyncio
+        from core.line_profiles import LineProfileResolver
+        
+        release = asyncio.Event()
+        
+        async def fetch(user_id):
+            await release.wait()
+            return {"userId": user_id}
+        
+        resolver = LineProfileResolver()
+        first = asyncio.create_task(resolver.resolve("U1", fetch))
+        await asyncio.sleep(0)
+        newer = asyncio.create_task(release.wait())
+        resolver._inflight["U1"] = newer
+        
+        release.set()
+        assert await first == {"userId": "U1"}
+        assert resolver._inflight["U1"] is newer
+        await newer
+    
+    @pytest.mark.asyncio
+    async def test_get_profiles_bounded_concurrency(self):
+        """Test get_profiles() dedupes IDs and limits parallel LINE calls."""
+        import asyncio
+        from core.line_client import LineClient
+        from core.line_profiles import LineProfileResolver
+        
+        client = LineClient(channel_secret="secret", access_token="token")
+        client._profiles = LineProfileResolver(max_concurrency=3)
+        
+        active = 0
+        peak = 0
+        
+        async def slow_get(url, headers=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return self._profile_response(url.rsplit("/", 1)[-1])
+        
+        user_ids = [f"U{i}" for i in range(10)] + ["U0", "U1"]
+        
+        with patch.object(client._client, 'get', side_effect=slow_get) as mock_get:
+            profiles = await client.get_profiles(user_ids)
+        
+        assert set(profiles) == {f"U{i}" for i in range(10)}
+        assert profiles["U5"]["userId"] == "U5"
+        assert mock_get.call_count == 10
+        assert peak <= 3
+    
+    @pytest.mark.asyncio
+    async def test_get_profiles_not_configured(self):
+        """Test get_profiles() returns None for every ID when not configured."""
+        from core.line_client import LineClient
+        
+        client = LineClient()
+        
+        assert await client.get_profiles(["U1", "U2"]) == {"U1": None, "U2": None}
+
+
 class TestLineClientClose:
     """Tests for close() method."""
     
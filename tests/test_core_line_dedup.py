@@ -0,0 +1,114 @@
+"""
+Unit Tests for core.line_dedup module.
+
+Tests that redelivered LINE webhook events are recognised by their
+webhookEventId in memory and via the shared database table.
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+def _event(event_id=None, text="hi"):
+    event = {"type": "message", "message": {"type": "text", "text": text}}
+    if event_id:
+        event["webhookEventId"] = event_id
+    return event
+
+
+class TestLineEventDeduplicator:
+    """Tests for the in-memory deduplicator."""
+
+    async def test_redelivery_is_dropped(self):
+        """An ID already accepted is filtered out of later deliveries."""
+        from core.line_dedup import LineEventDeduplicator
+
+        dedup = LineEventDeduplicator()
+
+        first = await dedup.filter_new("chatbot", [_event("A"), _event("B")])
+        second = await dedup.filter_new("chatbot", [_event("B"), _event("C")])
+
+        assert [e["webhookEventId"] for e in first] == ["A", "B"]
+        assert [e["webhookEventId"] for e in second] == ["C"]
+        assert dedup.get_stats()["duplicates"] == 1
+
+    async def test_events_without_id_and_repeats_within_batch(self):
+        """Events without an ID always pass; a repeated ID in one batch passes once."""
+        from core.line_dedup import LineEventDeduplicator
+
+        dedup = LineEventDeduplicator()
+
+        fresh = await dedup.filter_new("chatbot", [_event(), _event("A"), _event("A"), _event()])
+
+        assert len(fresh) == 3
+        assert [e.get("webhookEventId") for e in fresh] == [None, "A", None]
+
+    async def test_release_and_expiry(self):
+        """Released or expired IDs are accepted again."""
+        from core.line_dedup import LineEventDeduplicator
+
+        dedup = LineEventDeduplicator(ttl=60)
+        await dedup.filter_new("chatbot", [_event("A")])
+        await dedup.release(["A"])
+        assert len(await dedup.filter_new("chatbot", [_event("A")])) == 1
+
+        with patch("core.line_dedup.time.monotonic", return_value=1e12):
+            assert len(await dedup.filter_new("chatbot", [_event("A")])) == 1
+
+    async def test_size_bound_evicts_oldest(self):
+        """The LRU keeps at most max_entries IDs."""
+        from core.line_dedup import LineEventDeduplicator
+
+        dedup = LineEventDeduplicator(max_entries=2)
+        await dedup.filter_new("chatbot", [_event("A"), _event("B"), _event("C")])
+
+        assert dedup.get_stats()["entries"] == 2
+        assert len(await dedup.filter_new("chatbot", [_event("A")])) == 1
+
+
+class TestDatabaseLineEventDeduplicator:
+    """Tests for the PostgreSQL-backed deduplicator."""
+
+    def _session_factory(self, session):
+        @asynccontextmanager
+        async def factory():
+            yield session
+
+        return factory
+
+    async def test_only_inserted_ids_are_processed(self):
+        """IDs already claimed by another instance (insert conflict) are skipped."""
+        from core.line_dedup import DatabaseLineEventDeduplicator
+
+        result = MagicMock()
+        result.scalars.return_value = ["A"]
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        dedup = DatabaseLineEventDeduplicator()
+        with patch("core.database.get_standalone_session", self._session_factory(session)):
+            fresh = await dedup.filter_new("chatbot", [_event("A"), _event("B")])
+            # Locally known IDs are answered without a query
+            calls = session.execute.await_count
+            await dedup.filter_new("chatbot", [_event("A")])
+
+        assert [e["webhookEventId"] for e in fresh] == ["A"]
+        assert session.execute.await_count == calls
+        assert dedup.get_stats()["backend"] == "database"
+
+    async def test_database_error_fails_open(self):
+        """If the table cannot be reached, events are processed rather than lost."""
+        from core.line_dedup import DatabaseLineEventDeduplicator
+
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=RuntimeError("connection refused"))
+
+        dedup = DatabaseLineEventDeduplicator()
+        with patch("core.database.get_standalone_session", self._session_factory(session)):
+            fresh = await dedup.filter_new("chatbot", [_event("A"), _event("B")])
+
+        assert len(fresh) == 2
@@ -0,0 +1,226 @@
+"""
+Unit Tests for core.line_dispatch module.
+
+Tests background processing of LINE webhook events: per-user ordering,
+cross-user concurrency, bounded queues and the acknowledging endpoint.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def _event(user_id: str, text: str) -> dict:
+    return {
+        "type": "message",
+        "source": {"type": "user", "userId": user_id},
+        "message": {"type": "text", "text": text},
+    }
+
+
+@pytest.fixture(autouse=True)
+def fresh_dispatchers():
+    """Forget module dispatchers between tests."""
+    from core.line_dedup import reset_line_event_deduplicator
+    from core.line_dispatch import reset_line_dispatchers
+
+    reset_line_dispatchers()
+    reset_line_event_deduplicator()
+    yield
+    reset_line_dispatchers()
+    reset_line_event_deduplicator()
+
+
+class TestLineEventDispatcher:
+    """Tests for LineEventDispatcher."""
+
+    @pytest.mark.asyncio
+    async def test_per_user_order_preserved(self):
+        """Events from one user are handled in arrival order."""
+        from core.line_dispatch import LineEventDispatcher
+
+        handled: list[str] = []
+
+        async def handler(event):
+            # Earlier events take longer; order must still hold
+            await asyncio.sleep(0.01 * (5 - int(event["message"]["text"])))
+            handled.append(event["message"]["text"])
+
+        dispatcher = LineEventDispatcher("test", handler, workers=4)
+        for i in range(5):
+            assert dispatcher.enqueue(_event("U1", str(i)))
+        await dispatcher.join()
+
+        assert handled == ["0", "1", "2", "3", "4"]
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_different_users_processed_concurrently(self):
+        """Slow events for many users overlap instead of running back to back."""
+        from core.line_dispatch import LineEventDispatcher
+
+        async def handler(event):
+            await asyncio.sleep(0.1)
+
+        dispatcher = LineEventDispatcher("test", handler, workers=8)
+        users = [f"U{i:032x}" for i in range(32)]
+        start = time.perf_counter()
+        for user in users:
+            dispatcher.enqueue(_event(user, "hi"))
+        await dispatcher.join()
+        elapsed = time.perf_counter() - start
+
+        assert dispatcher.processed == 32
+        assert elapsed < 32 * 0.1 / 2
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects(self):
+        """Enqueue reports rejection once the bounded queue is full."""
+        from core.line_dispatch import LineEventDispatcher
+
+        release = asyncio.Event()
+
+        async def handler(event):
+            await release.wait()
+
+        dispatcher = LineEventDispatcher("test", handler, workers=1, queue_size=2)
+        results = [dispatcher.enqueue(_event("U1", str(i))) for i in range(5)]
+
+        assert results.count(False) >= 2
+        assert dispatcher.get_stats()["rejected"] == results.count(False)
+
+        release.set()
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_failures_counted_and_stop_drains(self):
+        """Handler errors are counted; stop() processes what is queued."""
+        from core.line_dispatch import LineEventDispatcher
+
+        async def handler(event):
+            if event["message"]["text"] == "bad":
+                raise RuntimeError("boom")
+
+        dispatcher = LineEventDispatcher("test", handler, workers=2)
+        dispatcher.enqueue(_event("U1", "ok"))
+        dispatcher.enqueue(_event("U2", "bad"))
+        await dispatcher.stop()
+
+        stats = dispatcher.get_stats()
+        assert stats["processed"] == 1
+        assert stats["failed"] == 1
+        assert stats["queued"] == 0
+
+
+class TestLineWebhookEndpoint:
+    """Tests for the acknowledging /webhook/line/{module} endpoint."""
+
+    SECRET = "test_channel_secret"
+
+    @pytest.fixture
+    def app_and_module(self):
+        from core.server import create_base_app, set_registry
+
+        context = MagicMock()
+        context.config.get = MagicMock(side_effect=lambda key, default=None: default)
+
+        handled: list[dict] = []
+
+        async def handle_line_event(event, ctx):
+            await asyncio.sleep(0.2)
+            handled.append(event)
+
+        module = MagicMock()
+        module.get_line_bot_config.return_value = {"channel_secret": self.SECRET}
+        module.handle_line_event = handle_line_event
+        registry = MagicMock()
+        registry.get_module.return_value = module
+
+        app = create_base_app(context)
+        set_registry(app, registry)
+        return app, handled
+
+    def _post(self, client, events):
+        body = json.dumps({"events": events}).encode()
+        signature = base64.b64encode(
+            hmac.new(self.SECRET.encode(), body, hashlib.sha256).digest()
+        ).decode()
+        return client.post(
+            "/webhook/line/chatbot",
+            content=body,
+            headers={"x-line-signature": signature, "Content-Type": "application/json"},
+        )
+
+    def test_acknowledges_before_processing(self, app_and_module):
+        """The webhook answers immediately; events are handled in the background."""
+        from fastapi.testclient import TestClient
+
+        from core.line_dispatch import get_line_dispatch_stats
+
+        app, handled = app_and_module
+        with TestClient(app) as client:
+            start = time.perf_counter()
+            response = self._post(client, [_event("U1", "a"), _event("U2", "b")])
+            elapsed = time.perf_counter() - start
+
+            assert response.status_code == 200
+            assert response.json() == {"accepted": 2, "duplicates": 0}
+            assert elapsed < 0.2
+
+            deadline = time.time() + 5
+            while len(handled) < 2 and time.time() < deadline:
+                time.sleep(0.02)
+
+        assert len(handled) == 2
+        assert get_line_dispatch_stats()[0]["processed"] == 2
+
+    def test_redelivered_event_processed_once(self, app_and_module):
+        """A redelivery of an accepted webhookEventId is acknowledged but skipped."""
+        from fastapi.testclient import TestClient
+
+        app, handled = app_and_module
+        event = dict(_event("U1", "a"), webhookEventId="01HXYZ")
+        redelivery = dict(event, deliveryContext={"isRedelivery": True})
+        with TestClient(app) as client:
+            first = self._post(client, [event])
+            second = self._post(client, [redelivery])
+
+            deadline = time.time() + 5
+            while not handled and time.time() < deadline:
+                time.sleep(0.02)
+            time.sleep(0.3)
+
+        assert first.json() == {"accepted": 1, "duplicates": 0}
+        assert second.json() == {"accepted": 0, "duplicates": 1}
+        assert len(handled) == 1
+
+    def test_full_queue_requests_redelivery(self, app_and_module):
+        """A full queue answers 503; the redelivery accepts only the rejected
+        events and skips the ones that were already queued."""
+        from unittest.mock import patch
+
+        from fastapi.testclient import TestClient
+
+        app, _ = app_and_module
+        events = [
+            dict(_event("U1", "a"), webhookEventId="01HQUEUED"),
+            dict(_event("U2", "b"), webhookEventId="01HREJECTED"),
+        ]
+        dispatcher = MagicMock()
+        dispatcher.enqueue.side_effect = [True, False, True]
+        with patch("core.server.get_line_event_dispatcher", return_value=dispatcher), \
+                TestClient(app) as client:
+            first = self._post(client, events)
+            second = self._post(client, events)
+
+        assert first.status_code == 503
+        assert second.status_code == 200
+        assert second.json() == {"accepted": 1, "duplicates": 1}
+        assert dispatcher.enqueue.call_args.args[0]["webhookEventId"] == "01HREJECTED"
@@ -0,0 +1,181 @@
+"""
+Unit Tests for core.line_notify module.
+
+Tests recipient/message batching, bounded concurrency, retries and
+per-recipient delivery reporting of LineNotificationDispatcher.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+def _response(status_code, headers=None, body=None):
+    return httpx.Response(
+        status_code,
+        headers=headers,
+        json=body or {},
+        request=httpx.Request("POST", "https://api.line.me/v2/bot/message/multicast"),
+    )
+
+
+class FakeLineClient:
+    """Records send_messages() calls and answers from a script."""
+
+    def __init__(self, responses=None, delay=0.0):
+        self.calls = []
+        self._responses = list(responses or [])
+        self._delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def is_configured(self):
+        return True
+
+    async def send_messages(self, endpoint, payload, messages, retry_key=None):
+        self.calls.append((endpoint, payload, list(messages), retry_key))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay)
+            response = self._responses.pop(0) if self._responses else _response(200)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        finally:
+            self.in_flight -= 1
+
+
+def _messages(n):
+    return [{"type": "text", "text": f"m{i}"} for i in range(n)]
+
+
+class TestLineNotificationDispatcher:
+    """Tests for LineNotificationDispatcher.send()."""
+
+    async def test_chunks_recipients_and_batches_messages(self):
+        """1201 users x 7 messages -> 3 multicast chunks x 2 batches, in order."""
+        from core.line_notify import LineNotificationDispatcher
+
+        client = FakeLineClient()
+        users = [f"U{i}" for i in range(1201)] + ["U0", ""]
+
+        report = await LineNotificationDispatcher(client).send(users, _messages(7))
+
+        assert report.all_delivered
+        assert len(report.results) == 1201
+        assert report.requests == 6
+        sizes = sorted(len(payload["to"]) for endpoint, payload, _, _ in client.calls if endpoint == "multicast")
+        assert sizes == [201, 201, 500, 500, 500, 500]
+        first_chunk = [c for c in client.calls if c[1]["to"] == [f"U{i}" for i in range(500)]]
+        assert [len(c[2]) for c in first_chunk] == [5, 2]
+
+    async def test_single_recipient_uses_push(self):
+        """One recipient is sent with push, not multicast."""
+        from core.line_notify import LineNotificationDispatcher
+
+        client = FakeLineClient()
+
+        await LineNotificationDispatcher(client).send(["U1"], _messages(1))
+
+        assert client.calls[0][0] == "push"
+        assert client.calls[0][1] == {"to": "U1"}
+
+    async def test_bounded_concurrency(self):
+        """No more than max_concurrency requests are in flight."""
+        from core.line_notify import LineNotificationDispatcher
+
+        client = FakeLineClient(delay=0.01)
+        users = [f"U{i}" for i in range(5000)]
+
+        await LineNotificationDispatcher(client, max_concurrency=3).send(users, _messages(1))
+
+        assert len(client.calls) == 10
+        assert client.max_in_flight == 3
+
+    async def test_retries_rate_limit_with_same_retry_key(self):
+        """429 is retried after Retry-After under the same retry key."""
+        from core.line_notify import LineNotificationDispatcher
+
+        client = FakeLineClient([
+            _response(429, headers={"Retry-After": "0"}),
+            httpx.ConnectError("reset"),
+            _response(200),
+        ])
+
+        report = await LineNotificationDispatcher(client, backoff=0).send(["U1", "U2"], _messages(1))
+
+        assert report.all_delivered
+        assert report.retries == 2
+        assert len({call[3] for call in client.calls}) == 1
+
+    async def test_retry_after_capped(self):
+        """A huge Retry-After is clamped to MAX_BACKOFF."""
+        from unittest.mock import AsyncMock, patch
+
+        from core.line_notify import LineNotificationDispatcher
+
+        client = FakeLineClient([_response(429, headers={"Retry-After": "3600"}), _response(200)])
+
+        with patch("core.line_notify.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            report = await LineNotificationDispatcher(client).send(["U1"], _messages(1))
+
+        assert report.all_delivered
+        # The fake client's own zero-delay sleeps go through the same patch
+        delays = [call.args[0] for call in sleep.await_args_list if call.args[0]]
+        assert delays == [LineNotificationDispatcher.MAX_BACKOFF]
+
+    async def test_conflict_after_retry_counts_as_delivered(self):
+        """409 on a retry means LINE already accepted the first attempt."""
+        from core.line_notify import LineNotificationDispatcher
+
+        client = FakeLineClient([_response(500), _response(409)])
+
+        report = await LineNotificationDispatcher(client, backoff=0).send(["U1"], _messages(1))
+
+        assert report.all_delivered
+
+    async def test_failure_reported_per_recipient_and_stops_later_batches(self):
+        """A rejected chunk is reported failed; its later batches are not sent."""
+        from core.line_notify import LineNotificationDispatcher
+
+        client = FakeLineClient([_response(400, body={"message": "Invalid to"})])
+        users = [f"U{i}" for i in range(501)]
+
+        report = await LineNotificationDispatcher(client, max_concurrency=1).send(users, _messages(6))
+
+        failed = report.results["U0"]
+        assert failed.delivered is False
+        assert failed.batches_sent == 0
+        assert failed.status_code == 400
+        assert failed.error == "HTTP 400: Invalid to"
+        assert report.failed == [f"U{i}" for i in range(500)]
+        assert report.results["U500"].delivered is True
+        assert len(client.calls) == 3
+
+    async def test_gives_up_after_max_retries(self):
+        """Persistent server errors fail after max_retries retries."""
+        from core.line_notify import LineNotificationDispatcher
+
+        client = FakeLineClient([_response(503)] * 10)
+
+        report = await LineNotificationDispatcher(client, max_retries=2, backoff=0).send(["U1"], _messages(1))
+
+        assert report.failed == ["U1"]
+        assert len(client.calls) == 3
+
+    async def test_unconfigured_client(self):
+        """Nothing is sent without credentials."""
+        from core.line_notify import LineNotificationDispatcher
+
+        client = MagicMock()
+        client.is_configured.return_value = False
+
+        report = await LineNotificationDispatcher(client).send(["U1"], _messages(1))
+
+        assert report.results["U1"].error == "LINE client not configured"
+        client.send_messages.assert_not_called()
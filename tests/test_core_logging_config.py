@@ -0,0 +1,120 @@
+"""
+Unit Tests for core.logging_config queue mode.
+
+Tests that queue logging hands records to a background listener, drops
+and counts records when the queue is full, and flushes on shutdown.
+"""
+
+import logging
+import queue
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def restore_root_logger(tmp_path, monkeypatch):
+    """Point log files at tmp_path and restore root handlers afterwards."""
+    import os
+
+    from core import logging_config
+
+    monkeypatch.setattr(logging_config, "get_log_path", lambda: tmp_path / "test.log")
+    # Force file logging even when the tests run inside a container
+    exists = os.path.exists
+    monkeypatch.setattr(os.path, "exists", lambda path: False if path == "/.dockerenv" else exists(path))
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield tmp_path / "test.log"
+    logging_config.shutdown_logging()
+    for handler in root.handlers:
+        if handler not in handlers:
+            handler.close()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class TestQueueLogging:
+    """Tests for setup_logging(use_queue=True)."""
+
+    def test_records_written_after_shutdown_flush(self, restore_root_logger):
+        """Queued records reach the file handler, masked, once flushed."""
+        from core.logging_config import BoundedQueueHandler, setup_logging, shutdown_logging
+
+        setup_logging(use_queue=True)
+        root = logging.getLogger()
+        assert len(root.handlers) == 1
+        assert isinstance(root.handlers[0], BoundedQueueHandler)
+
+        for i in range(50):
+            logging.getLogger("test.queue").info(f"event {i} password=hunter2")
+        shutdown_logging()
+
+        content = restore_root_logger.read_text(encoding="utf-8")
+        assert "event 49" in content
+        assert "hunter2" not in content
+        # Handlers are restored so late records are still written
+        assert not isinstance(root.handlers[0], BoundedQueueHandler)
+
+    def test_exception_traceback_survives_queue(self, restore_root_logger):
+        """Tracebacks are rendered before the record crosses threads."""
+        from core.logging_config import setup_logging, shutdown_logging
+
+        setup_logging(use_queue=True)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("test.queue").exception("failed")
+        shutdown_logging()
+
+        content = restore_root_logger.read_text(encoding="utf-8")
+        assert "ValueError: boom" in content
+
+    def test_full_queue_drops_and_counts(self):
+        """A full queue never blocks the caller; drops are counted and reported."""
+        from core.logging_config import BoundedQueueHandler, _DropReportingListener
+
+        records: list[str] = []
+        release = threading.Event()
+
+        class SlowHandler(logging.Handler):
+            def emit(self, record):
+                release.wait(timeout=5)
+                records.append(record.getMessage())
+
+        log_queue: queue.Queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue)
+        listener = _DropReportingListener(log_queue, handler, SlowHandler())
+        logger = logging.getLogger("test.queue.drop")
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            listener.start()
+            for i in range(20):
+                logger.warning(f"event {i}")
+            assert handler.dropped > 0
+
+            release.set()
+            while not log_queue.empty():
+                time.sleep(0.01)
+            logger.warning("after")
+            listener.stop()
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+
+        assert any("dropped" in message for message in records)
+        assert records[-1] == "after"
+
+    def test_stats(self, restore_root_logger):
+        """get_logging_stats reports the active mode."""
+        from core.logging_config import get_logging_stats, setup_logging, shutdown_logging
+
+        setup_logging(use_queue=True, queue_size=123)
+        stats = get_logging_stats()
+        shutdown_logging()
+
+        assert stats["mode"] == "queue"
+        assert stats["capacity"] == 123
+        assert get_logging_stats() == {"mode": "sync"}
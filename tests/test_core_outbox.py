@@ -0,0 +1,319 @@
+"""
+Unit Tests for core.outbox module.
+
+Tests writing notifications to the outbox and delivering claimed rows:
+SMTP connection reuse per batch, retry scheduling, LINE multicast merging
+and delivery metrics.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiosmtplib
+import pytest
+
+from core.models.outbox import NotificationOutbox, OutboxChannel, OutboxStatus
+from core.services.email import EmailService
+
+
+def _row(channel: str, recipient: str, **kwargs) -> NotificationOutbox:
+    """Outbox row as loaded from the database (column defaults applied)."""
+    payload = kwargs.pop("payload", {"html": "<p>hi</p>", "text": None})
+    return NotificationOutbox(
+        channel=channel,
+        sender=kwargs.pop("sender", "core"),
+        recipient=recipient,
+        subject=kwargs.pop("subject", "Subject"),
+        payload=payload,
+        status=OutboxStatus.PENDING,
+        attempts=kwargs.pop("attempts", 0),
+        created_at=datetime.now(timezone.utc) - timedelta(seconds=2),
+        **kwargs,
+    )
+
+
+class FakeSMTP:
+    """Stands in for aiosmtplib.SMTP."""
+
+    instances: list["FakeSMTP"] = []
+    send_errors: dict[str, Exception] = {}
+
+    def __init__(self, **kwargs):
+        self.is_connected = False
+        self.sent: list[str] = []
+        FakeSMTP.instances.append(self)
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def send_message(self, message):
+        error = FakeSMTP.send_errors.get(message["To"])
+        if error is not None:
+            raise error
+        self.sent.append(message["To"])
+
+    async def quit(self):
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+
+
+@pytest.fixture
+def fake_smtp():
+    FakeSMTP.instances = []
+    FakeSMTP.send_errors = {}
+    service = EmailService({
+        "host": "smtp.example.com",
+        "username": "user",
+        "password": "secret",
+        "from_email": "noreply@example.com",
+    })
+    with patch.object(aiosmtplib, "SMTP", FakeSMTP), \
+            patch("core.services.email.get_email_service", return_value=service):
+        yield FakeSMTP
+
+
+class TestAddToOutbox:
+    """Tests for add_email / add_line_push."""
+
+    def test_add_email_adds_pending_row_to_session(self):
+        """The row joins the caller's transaction; nothing is sent."""
+        from core.outbox import add_email
+
+        db = MagicMock()
+        row = add_email(db, "user@example.com", "Hello", "<p>hi</p>", "hi")
+
+        db.add.assert_called_once_with(row)
+        assert row.channel == OutboxChannel.EMAIL
+        assert row.payload == {"html": "<p>hi</p>", "text": "hi"}
+
+    def test_add_line_push(self):
+        """LINE rows carry the messages and the sending client name."""
+        from core.outbox import add_line_push
+
+        db = MagicMock()
+        messages = [{"type": "text", "text": "核准"}]
+        row = add_line_push(db, "U1", messages, sender="administrative")
+
+        assert row.channel == OutboxChannel.LINE
+        assert row.sender == "administrative"
+        assert row.payload == {"messages": messages}
+
+    def test_content_columns_encrypted(self):
+        """Recipient, subject and payload are stored encrypted."""
+        import os
+
+        from sqlalchemy.dialects import postgresql
+
+        from core.security.encryption import EncryptionService
+
+        columns = NotificationOutbox.__table__.columns
+        link = "https://example.com/verify?token=t"
+        values = {
+            "recipient": "user@example.com",
+            "subject": "請點擊連結完成驗證",
+            "payload": {"html": f"<a href='{link}'>驗證</a>", "text": link},
+        }
+        dialect = postgresql.dialect()
+        service = EncryptionService(master_key=os.urandom(32))
+        with patch("core.security.encryption.get_encryption_service", return_value=service):
+            for name, value in values.items():
+                stored = columns[name].type.bind_processor(dialect)(value)
+                assert "user@example.com" not in stored and "token" not in stored
+                assert "驗證" not in stored
+                assert columns[name].type.result_processor(dialect, None)(stored) == value
+
+
+class TestOutboxDispatcher:
+    """Tests for OutboxDispatcher delivery of claimed rows."""
+
+    @pytest.mark.asyncio
+    async def test_email_batch_uses_one_connection(self, fake_smtp):
+        """All emails of a batch go over one SMTP connection."""
+        from core.outbox import OutboxDispatcher
+
+        dispatcher = OutboxDispatcher()
+        rows = [_row(OutboxChannel.EMAIL, f"u{i}@example.com") for i in range(3)]
+        await dispatcher._deliver(rows)
+
+        assert len(fake_smtp.instances) == 1
+        assert fake_smtp.instances[0].sent == ["u0@example.com", "u1@example.com", "u2@example.com"]
+        assert all(row.status == OutboxStatus.SENT and row.sent_at for row in rows)
+        stats = dispatcher.get_stats()
+        assert stats["sent"] == 3
+        assert stats["sent_last_minute"] == 3
+        assert stats["lag_max_seconds"] >= 2
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_rejected_email_does_not_stop_batch(self, fake_smtp):
+        """A permanent rejection fails that row; the rest are still sent."""
+        from core.outbox import OutboxDispatcher
+
+        fake_smtp.send_errors = {"bad@example.com": aiosmtplib.SMTPResponseException(550, "No such user")}
+        dispatcher = OutboxDispatcher()
+        rows = [
+            _row(OutboxChannel.EMAIL, "bad@example.com"),
+            _row(OutboxChannel.EMAIL, "ok@example.com"),
+        ]
+        await dispatcher._deliver(rows)
+
+        assert rows[0].status == OutboxStatus.FAILED
+        assert "No such user" in rows[0].last_error
+        assert rows[1].status == OutboxStatus.SENT
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_connection_failure_schedules_retry(self, fake_smtp):
+        """Rows not sent because the connection broke are retried later."""
+        from core.outbox import OutboxDispatcher
+
+        fake_smtp.send_errors = {"a@example.com": aiosmtplib.SMTPServerDisconnected("gone")}
+        dispatcher = OutboxDispatcher(backoff=10.0)
+        rows = [_row(OutboxChannel.EMAIL, "a@example.com"), _row(OutboxChannel.EMAIL, "b@example.com")]
+        before = datetime.now(timezone.utc)
+        await dispatcher._deliver(rows)
+
+        for row in rows:
+            assert row.status == OutboxStatus.PENDING
+            assert row.attempts == 1
+            assert row.next_attempt_at >= before + timedelta(seconds=10)
+        assert dispatcher.retries == 2
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_last_attempt_marks_failed(self, fake_smtp):
+        """A row out of attempts is marked failed instead of rescheduled."""
+        from core.outbox import OutboxDispatcher
+
+        fake_smtp.send_errors = {"a@example.com": aiosmtplib.SMTPResponseException(451, "Try later")}
+        dispatcher = OutboxDispatcher(max_attempts=3)
+        row = _row(OutboxChannel.EMAIL, "a@example.com", attempts=2)
+        await dispatcher._deliver([row])
+
+        assert row.status == OutboxStatus.FAILED
+        assert dispatcher.failed == 1
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_identical_line_pushes_merged(self):
+        """LINE rows with the same messages are sent as one notification."""
+        from core.line_notify import DeliveryResult, NotificationReport
+        from core.outbox import OutboxDispatcher
+
+        messages = [{"type": "text", "text": "請假已核准"}]
+        client = MagicMock()
+        dispatcher = OutboxDispatcher()
+        dispatcher.register_line_client("administrative", client)
+        rows = [
+            _row(OutboxChannel.LINE, user, sender="administrative", payload={"messages": messages})
+            for user in ("U1", "U2")
+        ]
+        report = NotificationReport(results={
+            "U1": DeliveryResult("U1", delivered=True, status_code=200),
+            "U2": DeliveryResult("U2", status_code=400, error="HTTP 400"),
+        })
+
+        with patch("core.line_notify.LineNotificationDispatcher") as dispatcher_cls:
+            dispatcher_cls.return_value.send = AsyncMock(return_value=report)
+            await dispatcher._deliver(rows)
+
+        dispatcher_cls.assert_called_once_with(client)
+        dispatcher_cls.return_value.send.assert_awaited_once_with(["U1", "U2"], messages)
+        assert rows[0].status == OutboxStatus.SENT
+        assert rows[1].status == OutboxStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_unknown_line_sender_fails(self):
+        """Rows for an unregistered LINE client fail permanently."""
+        from core.outbox import OutboxDispatcher
+
+        dispatcher = OutboxDispatcher()
+        row = _row(OutboxChannel.LINE, "U1", sender="missing", payload={"messages": []})
+        await dispatcher._deliver([row])
+
+        assert row.status == OutboxStatus.FAILED
+        assert "missing" in row.last_error
+
+
+class TestDispatchOnce:
+    """Tests for OutboxDispatcher.dispatch_once transactions."""
+
+    @pytest.mark.asyncio
+    async def test_claim_committed_before_sending(self):
+        """Rows are leased and committed first; results are saved afterwards."""
+        from contextlib import asynccontextmanager
+
+        from core.outbox import OutboxDispatcher
+
+        rows = [_row(OutboxChannel.EMAIL, "a@example.com")]
+        sessions: list[MagicMock] = []
+        open_sessions = 0
+
+        @asynccontextmanager
+        async def fake_session():
+            nonlocal open_sessions
+            session = MagicMock()
+            result = MagicMock()
+            result.scalars.return_value = rows
+            session.execute = AsyncMock(return_value=result)
+            sessions.append(session)
+            open_sessions += 1
+            try:
+                yield session
+            finally:
+                open_sessions -= 1
+
+        async def deliver(claimed):
+            assert open_sessions == 0
+            assert claimed[0].next_attempt_at > datetime.now(timezone.utc) + timedelta(minutes=4)
+            dispatcher._mark_sent(claimed[0])
+
+        dispatcher = OutboxDispatcher()
+        dispatcher._deliver = deliver
+        with patch("core.database.get_standalone_session", fake_session):
+            assert await dispatcher.dispatch_once() == 1
+
+        assert len(sessions) == 2
+        purge = str(sessions[0].execute.await_args_list[1].args[0])
+        assert "notification_outbox.status" in purge and "created_at" in purge
+        statement, params = sessions[1].execute.await_args.args
+        assert "UPDATE notification_outbox" in str(statement)
+        assert params[0]["status"] == OutboxStatus.SENT
+        assert params[0]["attempts"] == 1
+
+
+class TestMagicLinkOutbox:
+    """Tests for AuthService.initiate_magic_link with a database session."""
+
+    @pytest.mark.asyncio
+    async def test_verification_email_written_to_outbox(self):
+        """With a session the magic link email is committed to the outbox."""
+        from core.services.auth import AuthService
+
+        service = AuthService.__new__(AuthService)
+        employee = MagicMock(is_active=True)
+        employee.name = "王小明"
+        service._ragic_service = MagicMock()
+        service._ragic_service.verify_email_exists = AsyncMock(return_value=employee)
+        service._security_config = {"magic_link_expire_minutes": 15}
+        service._email_config = {}
+        service._app_name = "Admin System"
+        service.generate_magic_link = MagicMock(return_value="https://example.com/verify?token=t")
+        service._send_verification_email = AsyncMock()
+
+        db = MagicMock()
+        db.commit = AsyncMock()
+        dispatcher = MagicMock()
+        with patch("core.outbox.get_outbox_dispatcher", return_value=dispatcher):
+            await service.initiate_magic_link("user@example.com", "Uline_sub_123", db=db)
+
+        service._send_verification_email.assert_not_called()
+        row = db.add.call_args[0][0]
+        assert row.recipient == "user@example.com"
+        assert "王小明" in row.payload["html"]
+        assert "https://example.com/verify?token=t" in row.payload["html"]
+        assert "https://example.com/verify?token=t" in row.payload["text"]
+        db.commit.assert_awaited_once()
+        dispatcher.wake.assert_called_once()
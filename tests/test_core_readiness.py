@@ -0,0 +1,118 @@
+"""
+Unit Tests for core.readiness module.
+
+Tests startup phase tracking and the `/ready` endpoint.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(autouse=True)
+def fresh_readiness():
+    """Use a fresh ReadinessTracker singleton per test."""
+    from core.readiness import reset_readiness
+
+    reset_readiness()
+    yield
+    reset_readiness()
+
+
+class TestReadinessTracker:
+    """Tests for ReadinessTracker."""
+
+    def test_ready_when_no_phases(self):
+        """An instance with nothing to warm up is ready."""
+        from core.readiness import ReadinessTracker
+
+        assert ReadinessTracker().is_ready() is True
+
+    def test_pending_phase_blocks_readiness(self):
+        """Any pending phase keeps the instance not ready."""
+        from core.readiness import ReadinessTracker
+
+        tracker = ReadinessTracker()
+        tracker.register("database")
+        tracker.register("embedding_model")
+        tracker.mark_ready("database")
+
+        assert tracker.is_ready() is False
+        assert tracker.get_phase_status("embedding_model") == "pending"
+
+        tracker.mark_ready("embedding_model")
+        assert tracker.is_ready() is True
+
+    def test_failed_phase_is_degraded_not_blocking(self):
+        """A failed phase finishes warmup but flags the instance as degraded."""
+        from core.readiness import ReadinessTracker
+
+        tracker = ReadinessTracker()
+        tracker.register("initial_sync", "Initial Ragic sync")
+        tracker.mark_failed("initial_sync", "Ragic unreachable")
+
+        report = tracker.snapshot()
+        assert report["ready"] is True
+        assert report["degraded"] is True
+        assert report["phases"]["initial_sync"]["status"] == "failed"
+        assert report["phases"]["initial_sync"]["detail"] == "Ragic unreachable"
+        assert report["phases"]["initial_sync"]["duration_ms"] is not None
+
+    def test_reregister_restarts_phase(self):
+        """Registering an existing phase resets it to pending."""
+        from core.readiness import ReadinessTracker
+
+        tracker = ReadinessTracker()
+        tracker.register("initial_sync")
+        tracker.mark_ready("initial_sync")
+        tracker.register("initial_sync")
+
+        assert tracker.get_phase_status("initial_sync") == "pending"
+
+    def test_singleton(self):
+        """get_readiness returns the same instance until reset."""
+        from core.readiness import get_readiness, reset_readiness
+
+        first = get_readiness()
+        assert get_readiness() is first
+        reset_readiness()
+        assert get_readiness() is not first
+
+
+class TestReadyEndpoint:
+    """Tests for the `/ready` endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        from core.server import create_base_app
+
+        context = MagicMock()
+        context.config.get = MagicMock(side_effect=lambda key, default=None: default)
+        return TestClient(create_base_app(context))
+
+    def test_returns_503_while_warming_up(self, client):
+        """Load balancers get 503 until all phases finish."""
+        from core.readiness import get_readiness
+
+        get_readiness().register("embedding_model")
+
+        response = client.get("/ready")
+
+        assert response.status_code == 503
+        assert response.json()["phases"]["embedding_model"]["status"] == "pending"
+        # Liveness is unaffected
+        assert client.get("/health").status_code == 200
+
+    def test_returns_200_when_ready(self, client):
+        """Once every phase has finished the instance is routable."""
+        from core.readiness import get_readiness
+
+        readiness = get_readiness()
+        readiness.register("database")
+        readiness.mark_ready("database")
+
+        response = client.get("/ready")
+
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
@@ -231,3 +231,76 @@ class TestModuleLoader:
         loader = ModuleLoader(registry)
         
         assert loader._registry is registry
+
+
+class TestStartupProfiling:
+    """Tests for per-module startup timing."""
+    
+    @pytest.fixture(autouse=True)
+    def reset_singleton(self):
+        """Reset singleton before each test."""
+        from core.registry import ModuleRegistry
+        ModuleRegistry._instance = None
+        yield
+        ModuleRegistry._instance = None
+    
+    def test_register_records_on_entry_time(self, app_context, mock_module):
+        """Test register() records on_entry time for the module."""
+        from core.registry import ModuleRegistry
+        
+        registry = ModuleRegistry()
+        registry.set_context(app_context)
+        registry.register(mock_module)
+        
+        report = registry.get_startup_report()
+        
+        assert [m["name"] for m in report["modules"]] == ["mock_module"]
+        assert report["modules"][0]["on_entry_ms"] >= 0
+        assert report["total_ms"] == report["modules"][0]["total_ms"]
+    
+    def test_loader_records_import_time(self, tmp_path):
+        """Test load_from_directory() records import time per module."""
+        from core.registry import ModuleRegistry, ModuleLoader
+        
+        (tmp_path / "slow_module.py").write_text(
+            "import time\n"
+            "from core.interface import IAppModule\n"
+            "time.sleep(0.02)\n"
+            "class SlowModule(IAppModule):\n"
+            "    def get_module_name(self): return 'slow'\n"
+            "    def on_entry(self, context): pass\n"
+            "    def handle_event(self, context, event): return None\n",
+            encoding="utf-8",
+        )
+        
+        registry = ModuleRegistry()
+        count = ModuleLoader(registry).load_from_directory(str(tmp_path))
+        
+        report = registry.get_startup_report()
+        
+        assert count == 1
+        assert report["modules"][0]["name"] == "slow"
+        assert report["modules"][0]["import_ms"] >= 20
+    
+    @pytest.mark.asyncio
+    async def test_report_sorted_slowest_first(self, mock_module_factory):
+        """Test async_startup time is recorded and the report is sorted by total."""
+        from core.registry import ModuleRegistry
+        
+        registry = ModuleRegistry()
+        fast = mock_module_factory("fast")
+        slow = mock_module_factory("slow")
+        
+        async def slow_startup():
+            import asyncio
+            await asyncio.sleep(0.02)
+        
+        slow.async_startup = slow_startup
+        registry.register(fast)
+        registry.register(slow)
+        registry.record_import_time("fast", 1.0)
+        
+        await registry.async_startup_all()
+        
+        names = [m["name"] for m in registry.get_startup_report()["modules"]]
+        assert names == ["slow", "fast"]
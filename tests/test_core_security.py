@@ -346,6 +346,23 @@ class TestEncryptedType:
         
         assert result is None
     
+    def test_encrypted_json_roundtrip(self):
+        """Test EncryptedJSONType encrypts the serialized document."""
+        from core.security.encryption import EncryptedJSONType, EncryptionService
+        
+        encrypted_type = EncryptedJSONType()
+        document = {"html": "<a href='https://example.com/?token=t'>登入</a>", "text": None}
+        dialect = MagicMock()
+        service = EncryptionService(master_key=os.urandom(32))
+        
+        with patch("core.security.encryption.get_encryption_service", return_value=service):
+            encrypted = encrypted_type.process_bind_param(document, dialect)
+            
+            assert "token" not in encrypted
+            assert encrypted_type.process_result_value(encrypted, dialect) == document
+            assert encrypted_type.process_bind_param(None, dialect) is None
+            assert encrypted_type.process_result_value(None, dialect) is None
+    
     def test_generate_blind_index_helper_function(self, mock_env_vars):
         """Test generate_blind_index() helper function."""
         from core.security.encryption import generate_blind_index
@@ -157,3 +157,164 @@ class TestAuthService:
         service2 = get_auth_service()
 
         assert service1 is service2
+
+
+class TestLineIdTokenLocalVerification:
+    """Tests for offline LINE ID Token verification against JWKS (locally generated keys)."""
+
+    CHANNEL_ID = "1234567890"
+
+    @pytest.fixture
+    def signing_key(self):
+        """Generate an ES256 key pair and its public JWK."""
+        import json
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from jwt.algorithms import ECAlgorithm
+
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        jwk = json.loads(ECAlgorithm.to_jwk(private_key.public_key()))
+        jwk.update({"kid": "test-kid", "alg": "ES256", "use": "sig"})
+        return private_key, jwk
+
+    @pytest.fixture
+    def make_token(self, signing_key):
+        """Factory for signed LINE-style ID Tokens."""
+        import jwt
+
+        private_key, _ = signing_key
+
+        def _make(**overrides):
+            now = int(datetime.now(timezone.utc).timestamp())
+            claims = {
+                "iss": "https://access.line.me",
+                "sub": "U1234567890abcdef",
+                "aud": self.CHANNEL_ID,
+                "exp": now + 3600,
+                "iat": now,
+                "name": "Test User",
+            }
+            claims.update(overrides)
+            return jwt.encode(claims, private_key, algorithm="ES256", headers={"kid": "test-kid"})
+
+        return _make
+
+    @pytest.fixture
+    def auth_service(self, signing_key):
+        """Create AuthService with a JWKS verifier that never touches the network."""
+        from core.services.auth import AuthService
+        from core.services.line_jwks import LineJwksVerifier
+
+        _, jwk = signing_key
+        fetch_jwks = AsyncMock(return_value={"keys": [jwk]})
+        config = MagicMock()
+        config.get = MagicMock(
+            side_effect=lambda key, default=None: self.CHANNEL_ID if key == "line.channel_id" else default
+        )
+        service = AuthService(
+            ragic_service=MagicMock(),
+            config_loader=config,
+            jwks_verifier=LineJwksVerifier(fetch_jwks=fetch_jwks),
+        )
+        service._verify_line_id_token_remote = AsyncMock()
+        service.fetch_jwks = fetch_jwks
+        return service
+
+    @pytest.mark.asyncio
+    async def test_valid_token_verified_locally(self, auth_service, make_token):
+        """Test that a valid ES256 token is verified without calling LINE's verify API."""
+        token_data = await auth_service.verify_line_id_token(make_token())
+
+        assert token_data["sub"] == "U1234567890abcdef"
+        assert token_data["name"] == "Test User"
+        auth_service._verify_line_id_token_remote.assert_not_called()
+        auth_service.fetch_jwks.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_token_raises(self, auth_service, make_token):
+        """Test that an expired token raises LineIdTokenExpiredError."""
+        from core.services.auth import LineIdTokenExpiredError
+
+        now = int(datetime.now(timezone.utc).timestamp())
+        token = make_token(exp=now - 3600, iat=now - 7200)
+
+        with pytest.raises(LineIdTokenExpiredError):
+            await auth_service.verify_line_id_token(token)
+
+    @pytest.mark.asyncio
+    async def test_wrong_audience_raises(self, auth_service, make_token):
+        """Test that a token for another channel is rejected."""
+        from core.services.auth import LineIdTokenInvalidError
+
+        with pytest.raises(LineIdTokenInvalidError):
+            await auth_service.verify_line_id_token(make_token(aud="other-channel"))
+
+    @pytest.mark.asyncio
+    async def test_wrong_issuer_raises(self, auth_service, make_token):
+        """Test that a token from another issuer is rejected."""
+        from core.services.auth import LineIdTokenInvalidError
+
+        with pytest.raises(LineIdTokenInvalidError):
+            await auth_service.verify_line_id_token(make_token(iss="https://evil.example.com"))
+
+    @pytest.mark.asyncio
+    async def test_foreign_signature_raises(self, auth_service):
+        """Test that a token signed by an unknown key with a known kid is rejected."""
+        import jwt
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from core.services.auth import LineIdTokenInvalidError
+
+        now = int(datetime.now(timezone.utc).timestamp())
+        forged = jwt.encode(
+            {"iss": "https://access.line.me", "sub": "U1", "aud": self.CHANNEL_ID,
+             "exp": now + 3600, "iat": now},
+            ec.generate_private_key(ec.SECP256R1()),
+            algorithm="ES256",
+            headers={"kid": "test-kid"},
+        )
+
+        with pytest.raises(LineIdTokenInvalidError):
+            await auth_service.verify_line_id_token(forged)
+
+    @pytest.mark.asyncio
+    async def test_unsupported_algorithm_falls_back_to_remote(self, auth_service):
+        """Test that HS256 tokens fall back to LINE's verify API."""
+        import jwt
+
+        token = jwt.encode({"sub": "U1"}, "channel-secret-channel-secret-0000", algorithm="HS256")
+        auth_service._verify_line_id_token_remote.return_value = {
+            "iss": "https://access.line.me", "aud": self.CHANNEL_ID, "sub": "Uremote",
+        }
+
+        token_data = await auth_service.verify_line_id_token(token)
+
+        assert token_data["sub"] == "Uremote"
+        auth_service._verify_line_id_token_remote.assert_called_once_with(token)
+
+    @pytest.mark.asyncio
+    async def test_verified_token_is_cached(self, auth_service, make_token):
+        """Test that repeated verification of the same token skips the JWKS verifier."""
+        token = make_token()
+        first = await auth_service.verify_line_id_token(token)
+
+        with patch.object(auth_service._jwks_verifier, "verify", new_callable=AsyncMock) as mock_verify:
+            second = await auth_service.verify_line_id_token(token)
+
+        assert second == first
+        mock_verify.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stale_keys_refreshed_in_background(self, signing_key, make_token):
+        """Test that stale keys are still used while a background refresh runs."""
+        import asyncio
+        from core.services.line_jwks import LineJwksVerifier
+
+        _, jwk = signing_key
+        fetch_jwks = AsyncMock(return_value={"keys": [jwk]})
+        verifier = LineJwksVerifier(fetch_jwks=fetch_jwks, refresh_interval=0)
+        verifier.load_jwks({"keys": [jwk]})
+
+        claims = await verifier.verify(make_token(), self.CHANNEL_ID)
+        await asyncio.sleep(0)
+
+        assert claims["sub"] == "U1234567890abcdef"
+        fetch_jwks.assert_called_once()
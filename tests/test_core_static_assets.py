@@ -0,0 +1,171 @@
+"""
+Unit Tests for core.static_assets module.
+
+Tests precompression, encoding negotiation, ETag revalidation and
+fingerprinted immutable caching.
+"""
+
+import gzip
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def asset_dir(tmp_path):
+    """Directory with a compressible script and a tiny file."""
+    (tmp_path / "app.js").write_text("console.log('hello');\n" * 200, encoding="utf-8")
+    (tmp_path / "tiny.txt").write_text("hi", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def client(asset_dir):
+    """App serving the asset directory through PrecompressedStaticFiles."""
+    from core.static_assets import PrecompressedStaticFiles
+
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=asset_dir), name="static")
+    return TestClient(app)
+
+
+class TestBuildAsset:
+    """Tests for build_asset and encoding selection."""
+
+    def test_compressible_asset_has_gzip(self, asset_dir):
+        """Large text assets get a gzip representation."""
+        from core.static_assets import build_asset
+
+        data = (asset_dir / "app.js").read_bytes()
+        asset = build_asset("app.js", data)
+
+        assert "javascript" in asset.media_type
+        assert gzip.decompress(asset.representations["gzip"]) == data
+        assert len(asset.representations["gzip"]) < len(data)
+
+    def test_small_asset_not_compressed(self):
+        """Assets below the size threshold are served as-is."""
+        from core.static_assets import build_asset
+
+        asset = build_asset("tiny.txt", b"hi")
+
+        assert list(asset.representations) == ["identity"]
+        assert asset.select_encoding("gzip, br") == "identity"
+
+    def test_select_encoding_respects_q_values(self, asset_dir):
+        """Encodings with q=0 are never selected."""
+        from core.static_assets import build_asset
+
+        asset = build_asset("app.js", (asset_dir / "app.js").read_bytes())
+
+        assert asset.select_encoding("gzip") == "gzip"
+        assert asset.select_encoding("gzip;q=0, identity") == "identity"
+        assert asset.select_encoding("*") == "gzip"
+        assert asset.select_encoding(None) == "identity"
+
+    def test_etag_differs_per_representation(self):
+        """Each representation has its own strong ETag."""
+        from core.static_assets import build_asset
+
+        asset = build_asset("a.js", b"x" * 4096)
+
+        assert asset.etag() != asset.etag("gzip")
+        assert not asset.etag().startswith("W/")
+
+
+class TestPrecompressedStaticFiles:
+    """Tests for serving assets through the StaticFiles mount."""
+
+    def test_serves_gzip_when_accepted(self, client):
+        """Clients accepting gzip receive the precompressed body."""
+        response = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["cache-control"] == "no-cache"
+        assert response.text.startswith("console.log")
+
+    def test_serves_identity_without_accept_encoding(self, client):
+        """Clients without gzip support receive the raw body."""
+        response = client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_if_none_match_returns_304(self, client):
+        """A matching ETag is answered with 304 and no body."""
+        first = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+        second = client.get(
+            "/static/app.js",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]},
+        )
+
+        assert second.status_code == 304
+        assert second.content == b""
+
+    def test_fingerprinted_url_is_immutable(self, client):
+        """Requests carrying the current fingerprint are cached as immutable."""
+        mount = next(route for route in client.app.routes if route.path == "/static")
+        fingerprint = mount.app.store.get("app.js").fingerprint
+
+        fresh = client.get(f"/static/app.js?v={fingerprint}")
+        stale = client.get("/static/app.js?v=old")
+
+        assert "immutable" in fresh.headers["cache-control"]
+        assert stale.headers["cache-control"] == "no-cache"
+
+    def test_file_change_is_picked_up(self, client, asset_dir):
+        """Edited files are reloaded on the next request."""
+        path = asset_dir / "tiny.txt"
+        before = client.get("/static/tiny.txt")
+        path.write_text("changed", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+        after = client.get("/static/tiny.txt")
+
+        assert after.text == "changed"
+        assert after.headers["etag"] != before.headers["etag"]
+
+    def test_missing_and_traversal_paths_404(self, client):
+        """Unknown files and paths outside the directory are not served."""
+        assert client.get("/static/missing.js").status_code == 404
+        assert client.get("/static/../conftest.py").status_code == 404
+
+
+class TestStaticAssetStore:
+    """Tests for StaticAssetStore helpers."""
+
+    def test_derive_rebuilds_only_on_change(self, asset_dir):
+        """Derived assets are cached until the source or key changes."""
+        from core.static_assets import StaticAssetStore
+
+        store = StaticAssetStore(asset_dir)
+        source = store.get("tiny.txt")
+        calls = []
+
+        def transform(data: bytes) -> bytes:
+            calls.append(data)
+            return data.upper()
+
+        first = store.derive("tiny.upper", source, transform, key="v1")
+        again = store.derive("tiny.upper", source, transform, key="v1")
+        rekeyed = store.derive("tiny.upper", source, transform, key="v2")
+
+        assert first is again
+        assert rekeyed is not first
+        assert first.representations["identity"] == b"HI"
+        assert len(calls) == 2
+
+    def test_preload_registered_stores(self, asset_dir, monkeypatch):
+        """preload_static_assets loads every file of registered stores."""
+        from core import static_assets
+
+        monkeypatch.setattr(static_assets, "_registered_stores", [])
+        store = static_assets.register_static_assets(static_assets.StaticAssetStore(asset_dir))
+
+        assert static_assets.preload_static_assets() == 2
+        assert store.get("app.js") is not None
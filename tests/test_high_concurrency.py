@@ -208,6 +208,108 @@ class TestDatabaseConnectionPool:
             f"[PASS] {NUM_CONCURRENT} concurrent operations: avg={avg_time*1000:.2f}ms, all successful")
 
 
+class TestLineEventSessionPool:
+    """Test LINE event handlers use the main connection pool, not a tiny thread-local pool."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_follow_events_do_not_queue(self):
+        """
+        POOL-03: 20 concurrent LINE follow events should run their auth query in
+        parallel on the main pool instead of queueing behind 2 connections.
+        """
+        from contextlib import asynccontextmanager
+        from modules.administrative.administrative_module import AdministrativeModule
+
+        NUM_EVENTS = 20
+        QUERY_TIME = 0.05  # 50ms simulated auth query
+        MAIN_POOL_CONNECTIONS = 60  # pool_size=20 + max_overflow=40
+        OLD_THREAD_LOCAL_CONNECTIONS = 2  # pool_size=2, max_overflow=0
+
+        pool = asyncio.Semaphore(MAIN_POOL_CONNECTIONS)
+        in_use = 0
+        peak = 0
+
+        @asynccontextmanager
+        async def pooled_session():
+            nonlocal in_use, peak
+            async with pool:
+                in_use += 1
+                peak = max(peak, in_use)
+                try:
+                    yield AsyncMock()
+                finally:
+                    in_use -= 1
+
+        async def slow_auth_check(user_id, db, app_context=None):
+            await asyncio.sleep(QUERY_TIME)
+            return False, [{"type": "text", "text": "verify"}]
+
+        with patch('modules.administrative.administrative_module.get_admin_settings'):
+            module = AdministrativeModule()
+
+        with patch('core.database.session.get_standalone_session', pooled_session), \
+                patch('core.database.session.get_thread_local_session',
+                      side_effect=AssertionError("request path must not use thread-local sessions")), \
+                patch('core.line_auth.line_auth_check', slow_auth_check), \
+                patch('core.line_client.LineClient') as MockLineClient:
+            MockLineClient.return_value.post_reply = AsyncMock(return_value=True)
+            MockLineClient.return_value.close = AsyncMock()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(
+                module._handle_follow_event(f"U{i}", f"reply-{i}")
+                for i in range(NUM_EVENTS)
+            ))
+            elapsed = time.perf_counter() - start
+
+        queued_time = NUM_EVENTS / OLD_THREAD_LOCAL_CONNECTIONS * QUERY_TIME
+        assert MockLineClient.return_value.post_reply.call_count == NUM_EVENTS
+        assert peak > OLD_THREAD_LOCAL_CONNECTIONS, f"Peak concurrent sessions only {peak}"
+        assert elapsed < queued_time / 2, (
+            f"{NUM_EVENTS} events took {elapsed*1000:.1f}ms; "
+            f"queueing behind 2 connections would take {queued_time*1000:.0f}ms"
+        )
+
+        print(
+            f"[PASS] {NUM_EVENTS} LINE events in {elapsed*1000:.1f}ms "
+            f"(peak {peak} sessions, 2-connection pool would need {queued_time*1000:.0f}ms)")
+
+
+class TestConfigAccessBenchmark:
+    """Benchmark request-path configuration access."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_lookup_faster_than_reloading(self):
+        """
+        CONFIG-01: Request handlers read the shared snapshot instead of
+        building and loading a new ConfigLoader per call.
+        """
+        from core.app_context import ConfigLoader
+        from core.providers import get_configuration_provider
+
+        ITERATIONS = 2000
+
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            loader = ConfigLoader()
+            loader.load()
+            loader.get("security.magic_link_expire_minutes", 15)
+        reload_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            get_configuration_provider().get("security.magic_link_expire_minutes", 15)
+        snapshot_time = time.perf_counter() - start
+
+        assert snapshot_time * 10 < reload_time, (
+            f"snapshot {snapshot_time*1000:.2f}ms vs reload {reload_time*1000:.2f}ms"
+        )
+
+        print(
+            f"[PASS] {ITERATIONS} config reads: snapshot {snapshot_time*1000:.2f}ms, "
+            f"ConfigLoader().load() {reload_time*1000:.2f}ms")
+
+
 class TestVectorServiceThreadSafety:
     """Test VectorService is thread-safe for concurrent access."""
 
@@ -197,6 +197,109 @@ class TestLiffConfiguration:
             "Leave form should include LIFF SDK"
 
 
+class TestAuthPageTemplateCache:
+    """Test the compiled auth page template cache."""
+
+    @pytest.fixture
+    def template_dir(self, tmp_path):
+        (tmp_path / "page.html").write_text(
+            "<title>{{APP_NAME}}</title><script>liff.init('{{LIFF_ID}}')</script>{{UNSET}}",
+            encoding="utf-8",
+        )
+        return tmp_path
+
+    def test_render_substitutes_placeholders(self, template_dir):
+        """Known placeholders are replaced; unknown ones are left as-is."""
+        from core.api.templates import TemplateCache
+
+        cache = TemplateCache(directory=template_dir)
+        html = cache.render("page.html", {"APP_NAME": "Admin", "LIFF_ID": None})
+
+        assert html == "<title>Admin</title><script>liff.init('')</script>{{UNSET}}"
+        assert cache.get("page.html").placeholders == {"APP_NAME", "LIFF_ID", "UNSET"}
+
+    def test_template_read_once(self, template_dir):
+        """Templates are compiled once, not read on every render."""
+        from core.api.templates import TemplateCache
+
+        cache = TemplateCache(directory=template_dir)
+        cache.render("page.html", {})
+        (template_dir / "page.html").write_text("changed", encoding="utf-8")
+
+        assert "changed" not in cache.render("page.html", {})
+
+    def test_auto_reload_on_mtime_change(self, template_dir):
+        """Debug mode picks up template edits by mtime."""
+        from core.api.templates import TemplateCache
+
+        cache = TemplateCache(directory=template_dir, auto_reload=True)
+        cache.render("page.html", {})
+        path = template_dir / "page.html"
+        path.write_text("changed {{APP_NAME}}", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+        assert cache.render("page.html", {"APP_NAME": "X"}) == "changed X"
+
+    def test_missing_template_raises(self, template_dir):
+        """Missing templates raise FileNotFoundError."""
+        from core.api.templates import TemplateCache
+
+        with pytest.raises(FileNotFoundError):
+            TemplateCache(directory=template_dir).render("missing.html", {})
+
+    def test_render_page_cached_with_etag(self, template_dir):
+        """Pre-rendered pages are reused per variable set with a stable ETag."""
+        from core.api.templates import TemplateCache
+        from core.static_assets import if_none_match
+
+        cache = TemplateCache(directory=template_dir)
+        first = cache.render_page("page.html", {"APP_NAME": "A", "LIFF_ID": "1"})
+        again = cache.render_page("page.html", {"LIFF_ID": "1", "APP_NAME": "A"})
+        other = cache.render_page("page.html", {"APP_NAME": "A", "LIFF_ID": "2"})
+
+        assert again is first
+        assert other.etag != first.etag
+        assert if_none_match(first.etag, first.etag)
+        assert if_none_match(f'W/{first.etag}, "x"', first.etag)
+        assert not if_none_match(other.etag, first.etag)
+
+    def test_login_page_revalidates_with_etag(self):
+        """The login page sends an ETag and answers 304 when unchanged."""
+        from fastapi import FastAPI
+        from core.api.auth import router
+
+        app = FastAPI()
+        app.include_router(router)
+
+        with patch.dict(os.environ, {"AUTH_LIFF_ID": "etag-liff-id"}, clear=False):
+            client = TestClient(app)
+            response = client.get("/auth/page/login?app=chatbot")
+            etag = response.headers["etag"]
+
+            cached = client.get("/auth/page/login?app=chatbot", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert "etag-liff-id" in response.text
+        assert response.headers["cache-control"] == "no-cache"
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+    def test_verify_result_page_not_cacheable(self):
+        """The verify result page embeds the token and must not be stored."""
+        from fastapi import FastAPI
+        from core.api.auth import router
+
+        app = FastAPI()
+        app.include_router(router)
+
+        response = TestClient(app).get("/auth/page/verify-result?token=secret-token")
+
+        assert response.status_code == 200
+        assert "secret-token" in response.text
+        assert response.headers["cache-control"] == "no-store"
+
+
 class TestLiffIdMapping:
     """Test the internal LIFF ID mapping logic."""
 